@@ -0,0 +1,14 @@
+"""Benchmark suite for the memory service.
+
+Generates deterministic synthetic corpora, loads them through
+``MemoryService.import_memories`` and reports per-operation throughput
+and p50/p95/p99 latency as JSON::
+
+    python -m benchmarks run --backend numpy --size 1k --size 10k --output run.json
+    python -m benchmarks run --backend numpy --size 10k --baseline run.json
+    python -m benchmarks compare baseline.json run.json --threshold 0.2
+
+Run from the repository root with the ``memories`` package installed.
+A comparison exits 1 when any metric regressed by more than the
+threshold, so it can gate CI.
+"""
@@ -0,0 +1,109 @@
+"""Command-line entry point: ``python -m benchmarks``."""
+
+import json
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+import typer
+
+from benchmarks import harness
+from benchmarks.backends import BACKENDS, drop_store, make_store
+from benchmarks.corpus import parse_size
+from memories.config import Settings
+from memories.services.memory_service import MemoryService
+
+app = typer.Typer()
+
+
+@app.callback()
+def main() -> None:
+    """Benchmark the memory service against synthetic corpora."""
+
+
+@app.command()
+def run(
+    backend: str = typer.Option("numpy", help=f"One of: {', '.join(BACKENDS)}."),
+    size: list[str] = typer.Option(["1k"], help="Corpus size (1k, 10k, 100k, 1M); repeatable."),
+    operations: int = typer.Option(200, help="Timed calls per operation."),
+    seed: int = typer.Option(0, help="Corpus and workload seed."),
+    embedding: str = typer.Option("hashing", help="numpy backend embedder: hashing or default."),
+    output: Path | None = typer.Option(None, help="Also write the report to this file."),
+    baseline: Path | None = typer.Option(None, help="Report to compare against."),
+    threshold: float = typer.Option(0.2, help="Allowed fractional regression."),
+) -> None:
+    """Load each corpus size into a fresh store and time every operation."""
+    if backend not in BACKENDS:
+        _fail(f"Unknown backend '{backend}' (choose from {', '.join(BACKENDS)})")
+    if embedding not in ("hashing", "default"):
+        _fail("--embedding must be 'hashing' or 'default'")
+
+    report = {
+        "backend": backend,
+        "embedding": embedding,
+        "seed": seed,
+        "operations": operations,
+        "runs": [],
+    }
+    for text in size:
+        corpus_size = parse_size(text)
+        with tempfile.TemporaryDirectory(prefix="memories-bench-") as workdir:
+            settings = Settings(
+                collection_name=f"bench_{uuid.uuid4().hex[:12]}",
+                data_dir=workdir,
+                outbox=False,
+            )
+            store = make_store(backend, settings, Path(workdir), embedding)
+            try:
+                service = MemoryService(store=store, settings=settings)
+                report["runs"].append(
+                    harness.run(
+                        service,
+                        corpus_size,
+                        operations,
+                        seed=seed,
+                        half_life_hours=settings.decay_half_life_hours,
+                    )
+                )
+            finally:
+                drop_store(backend, store)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        output.write_text(text + "\n")
+    if baseline:
+        _report_regressions(json.loads(baseline.read_text()), report, threshold)
+
+
+@app.command()
+def compare(
+    baseline: Path = typer.Argument(..., help="Earlier report."),
+    current: Path = typer.Argument(..., help="New report."),
+    threshold: float = typer.Option(0.2, help="Allowed fractional regression."),
+) -> None:
+    """Exit 1 if CURRENT regressed against BASELINE beyond the threshold."""
+    _report_regressions(
+        json.loads(baseline.read_text()), json.loads(current.read_text()), threshold
+    )
+
+
+def _report_regressions(baseline: dict, current: dict, threshold: float) -> None:
+    try:
+        regressions = harness.compare(baseline, current, threshold)
+    except ValueError as exc:
+        _fail(str(exc))
+    print(json.dumps({"threshold": threshold, "regressions": regressions}, indent=2),
+          file=sys.stderr)
+    if regressions:
+        raise typer.Exit(code=1)
+
+
+def _fail(message: str) -> None:
+    print(json.dumps({"error": message}), file=sys.stderr)
+    raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,163 @@
+"""Store backends the benchmark can drive ``MemoryService`` against.
+
+* ``fake`` — dicts in this process, no embeddings (word-overlap
+  ranking); isolates service overhead.
+* ``numpy`` — the embedded ``NumpyStore`` in a temporary directory.
+* ``chroma-ephemeral`` — ``ChromaDBAdapter`` on an in-process
+  ``chromadb.EphemeralClient``.
+* ``chroma`` — ``ChromaDBAdapter`` on the server at
+  ``CHROMADB_HOST``:``CHROMADB_PORT``.
+
+``--embedding hashing`` gives the NumPy store a cheap bag-of-words
+embedder so runs measure the store rather than the model.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+import numpy as np
+
+from memories.config import Settings
+from memories.stores.outbox import matches_where
+
+BACKENDS = ("fake", "numpy", "chroma-ephemeral", "chroma")
+
+_WORD = re.compile(r"\w+")
+
+
+def hashing_embedding_function(texts: list[str]) -> list[np.ndarray]:
+    """Bag-of-words embedding: each word hashed into one of 384 buckets."""
+    vectors = []
+    for text in texts:
+        vector = np.zeros(384, dtype=np.float32)
+        for word in _WORD.findall(text.lower()):
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 384] += 1.0
+        vectors.append(vector)
+    return vectors
+
+
+def make_store(backend: str, settings: Settings, workdir: Path, embedding: str):
+    """Build the VectorStore for *backend* (one of ``BACKENDS``)."""
+    if backend == "fake":
+        return FakeStore()
+    if backend == "numpy":
+        from memories.stores.numpy_store import NumpyStore
+
+        return NumpyStore(
+            path=str(workdir),
+            collection_name=settings.collection_name,
+            embedding_function=(
+                hashing_embedding_function if embedding == "hashing" else None
+            ),
+        )
+
+    import chromadb
+
+    from memories.stores.chromadb_adapter import ChromaDBAdapter
+
+    if backend == "chroma-ephemeral":
+        return ChromaDBAdapter(
+            host="",
+            port=0,
+            collection_name=settings.collection_name,
+            client=chromadb.EphemeralClient(),
+        )
+    if backend == "chroma":
+        return ChromaDBAdapter(
+            host=settings.chromadb_host,
+            port=settings.chromadb_port,
+            collection_name=settings.collection_name,
+        )
+    raise ValueError(f"Unknown backend '{backend}' (choose from {', '.join(BACKENDS)})")
+
+
+def drop_store(backend: str, store) -> None:
+    """Remove what the run created on a shared server."""
+    if backend.startswith("chroma"):
+        store._client.delete_collection(store._collection_name)
+
+
+class FakeStore:
+    """VectorStore held in dicts; searches rank by shared query words."""
+
+    def __init__(self) -> None:
+        self._docs: dict[str, dict] = {}
+
+    def store(self, id: str, content: str, metadata: dict) -> None:
+        self.store_many([id], [content], [metadata])
+
+    def store_many(self, ids: list[str], contents: list[str], metadatas: list[dict]) -> None:
+        for id, content, metadata in zip(ids, contents, metadatas):
+            self._docs.setdefault(id, _doc(id, content, metadata))
+
+    def upsert_many(self, ids, contents, metadatas, embeddings=None) -> None:
+        for id, content, metadata in zip(ids, contents, metadatas):
+            self._docs[id] = _doc(id, content, metadata)
+
+    def get(self, id: str, include_content: bool = True) -> dict | None:
+        return self.get_many([id])[0]
+
+    def get_many(self, ids: list[str], include_content: bool = True) -> list[dict | None]:
+        return [_copy(self._docs.get(id)) for id in ids]
+
+    def search(self, query, n_results, where=None, include_content=True) -> list[dict]:
+        return self.search_many([query], n_results, where)[0]
+
+    def search_many(self, queries, n_results, where=None, include_content=True):
+        candidates = [d for d in self._docs.values() if matches_where(d["metadata"], where)]
+        results = []
+        for query in queries:
+            words = set(_WORD.findall(query.lower()))
+            scored = []
+            for doc in candidates:
+                shared = len(words & set(_WORD.findall(doc["content"].lower())))
+                if shared:
+                    scored.append({**_copy(doc), "distance": 1.0 - shared / len(words)})
+            scored.sort(key=lambda hit: hit["distance"])
+            results.append(scored[:n_results])
+        return results
+
+    def get_page(
+        self, where=None, limit=100, cursor=None, include_embeddings=False, include_content=True
+    ):
+        offset = int(cursor or 0)
+        matches = [d for d in self._docs.values() if matches_where(d["metadata"], where)]
+        page = [_copy(doc) for doc in matches[offset:offset + limit]]
+        return page, str(offset + limit) if len(page) == limit else None
+
+    def delete(self, id: str) -> None:
+        self.delete_many([id])
+
+    def delete_many(self, ids: list[str]) -> None:
+        for id in ids:
+            self._docs.pop(id, None)
+
+    def update_metadata(self, id: str, metadata: dict) -> None:
+        self.update_metadata_many([id], [metadata])
+
+    def update_metadata_many(self, ids: list[str], metadatas: list[dict]) -> None:
+        for id, patch in zip(ids, metadatas):
+            if id in self._docs:
+                self._docs[id]["metadata"].update(patch)
+
+    def count(self) -> int:
+        return len(self._docs)
+
+    def heartbeat(self) -> bool:
+        return True
+
+    def stats(self) -> dict:
+        return {}
+
+    def embedding_model(self) -> str:
+        return ""
+
+
+def _doc(id: str, content: str, metadata: dict) -> dict:
+    return {"id": id, "content": content, "metadata": dict(metadata)}
+
+
+def _copy(doc: dict | None) -> dict | None:
+    """Shallow copy so callers never mutate stored metadata."""
+    return None if doc is None else {**doc, "metadata": dict(doc["metadata"])}
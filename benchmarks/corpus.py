@@ -0,0 +1,94 @@
+"""Deterministic synthetic memory corpora.
+
+Records are generated lazily in ``memory export`` format (``{id,
+content, metadata}`` with every derived column filled in), so a
+million-memory corpus streams into ``MemoryService.import_memories``
+without being held in RAM.  Record *i* is a pure function of
+``(seed, i)``: the workload can pick IDs and decay policies by index
+without keeping a list of them.
+"""
+
+import random
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+
+from memories.services.decay import compute_expires_at
+
+# Decay-policy mix by ``index % 10``: 50% stable, 30% contextual,
+# 20% reinforceable.
+_POLICY_BY_DIGIT = ["stable"] * 5 + ["contextual"] * 3 + ["reinforceable"] * 2
+
+AGENTS = ["planner", "coder", "reviewer", "researcher", "ops"]
+PROJECTS = [f"project-{n:02d}" for n in range(20)]
+TYPES = ["preference", "convention", "fact", "decision", "todo", "incident"]
+
+WORDS = (
+    "deploy staging cluster token rotate schema migration cache latency index "
+    "review branch release hotfix config secret pipeline test flaky retry queue "
+    "worker database replica backup restore metrics alert dashboard budget "
+    "customer invoice refund feature flag rollout canary timeout socket daemon "
+    "embedding vector search partition compact decay reinforce memory agent "
+    "prompt context window summary style naming lint format typing docstring"
+).split()
+
+# Memories are created up to this long before the benchmark runs.
+_MAX_AGE_DAYS = 60
+
+
+def parse_size(text: str) -> int:
+    """Parse corpus sizes such as ``1k``, ``10k``, ``1M`` or ``2500``."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def memory_id(index: int) -> str:
+    """Stable ID of corpus record *index*."""
+    return f"bench-{index:08d}"
+
+
+def decay_policy(index: int) -> str:
+    """Decay policy of corpus record *index*."""
+    return _POLICY_BY_DIGIT[index % 10]
+
+
+def random_text(rng: random.Random, words: int) -> str:
+    """A sentence of *words* vocabulary words."""
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate(
+    size: int,
+    seed: int = 0,
+    half_life_hours: float = 720,
+    now: datetime | None = None,
+) -> Iterator[dict]:
+    """Yield *size* export-format records with realistic metadata."""
+    now = now or datetime.now(timezone.utc)
+    for index in range(size):
+        rng = random.Random(seed * 1_000_003 + index)
+        policy = decay_policy(index)
+        created = now - timedelta(hours=rng.uniform(0, _MAX_AGE_DAYS * 24))
+        reinforced = None
+        if policy == "reinforceable" and rng.random() < 0.5:
+            reinforced = created + (now - created) * rng.random()
+
+        metadata = {
+            "agent": rng.choice(AGENTS),
+            "personality": "",
+            "project": rng.choice(PROJECTS) if rng.random() < 0.8 else "",
+            "type": rng.choice(TYPES),
+            "global_": rng.random() < 0.1,
+            "decay_policy": policy,
+            "created_at": created.isoformat(),
+            "created_at_ts": created.timestamp(),
+            "last_reinforced_at": reinforced.isoformat() if reinforced else "",
+            "last_reinforced_at_ts": reinforced.timestamp() if reinforced else 0.0,
+            "deleted": False,
+            "expires_at": compute_expires_at(policy, created, reinforced, half_life_hours),
+        }
+        yield {
+            "id": memory_id(index),
+            "content": random_text(rng, rng.randint(8, 24)),
+            "metadata": metadata,
+        }
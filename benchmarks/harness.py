@@ -0,0 +1,154 @@
+"""Workload driver, latency summaries and baseline comparison.
+
+One run bulk-loads a synthetic corpus through
+``MemoryService.import_memories`` and then times *operations* calls of
+each of create, search, get, reinforce and delete (in that order, so
+deletes never hide the memories other operations touch).
+"""
+
+import random
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from benchmarks import corpus
+from memories.models import DecayPolicy, MemoryCreate
+from memories.services.memory_service import MemoryService
+
+OPERATIONS = ("create", "search", "get", "reinforce", "delete")
+
+# Metrics where a larger value is a regression; throughput is the reverse.
+_LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def run(
+    service: MemoryService,
+    size: int,
+    operations: int,
+    seed: int = 0,
+    half_life_hours: float = 720,
+) -> dict:
+    """Load a *size*-record corpus into *service* and time each operation."""
+    if size < 10:
+        raise ValueError("Corpus size must be at least 10")
+
+    start = time.perf_counter()
+    records = corpus.generate(size, seed=seed, half_life_hours=half_life_hours)
+    for _ in service.import_memories(records):
+        pass
+    load_seconds = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    deletions = iter(rng.sample(range(size), min(operations, size)))
+    calls: dict[str, Callable[[], object]] = {
+        "create": lambda: service.create_memory(_random_create(rng)),
+        "search": lambda: service.search_memories(
+            corpus.random_text(rng, rng.randint(2, 4)),
+            project=rng.choice(corpus.PROJECTS) if rng.random() < 0.5 else "",
+            limit=10,
+            min_confidence=0.3,
+        ),
+        "get": lambda: service.get_memory(corpus.memory_id(rng.randrange(size))),
+        "reinforce": lambda: service.reinforce_memory(
+            corpus.memory_id(_reinforceable_index(rng, size))
+        ),
+        "delete": lambda: service.delete_memory(corpus.memory_id(next(deletions))),
+    }
+    timings = {
+        name: _time_calls(call, operations if name != "delete" else min(operations, size))
+        for name, call in calls.items()
+    }
+    return {
+        "size": size,
+        "load": {
+            "seconds": round(load_seconds, 3),
+            "throughput": round(size / load_seconds, 1),
+        },
+        "operations": {name: summarize(samples) for name, samples in timings.items()},
+    }
+
+
+def summarize(samples: list[float]) -> dict:
+    """Count, throughput (ops/s) and latency percentiles for *samples* (seconds)."""
+    latencies = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "count": len(samples),
+        "throughput": round(len(samples) / sum(samples), 1),
+        "mean_ms": round(float(latencies.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    """List metrics in *current* more than *threshold* worse than *baseline*.
+
+    Runs are matched by corpus size; latency percentiles regress when
+    they grow and throughputs when they shrink.  Sizes or operations
+    missing from either report are skipped.
+    """
+    if baseline["backend"] != current["backend"]:
+        raise ValueError(
+            f"Baseline is for backend '{baseline['backend']}', "
+            f"not '{current['backend']}'"
+        )
+
+    base_runs = {r["size"]: r for r in baseline["runs"]}
+    regressions = []
+    for run_ in current["runs"]:
+        base = base_runs.get(run_["size"])
+        if base is None:
+            continue
+        pairs = [("load", base["load"], run_["load"])]
+        pairs += [
+            (name, base["operations"][name], stats)
+            for name, stats in run_["operations"].items()
+            if name in base["operations"]
+        ]
+        for name, old, new in pairs:
+            for metric in (*_LATENCY_METRICS, "throughput"):
+                if metric not in old or metric not in new or not old[metric]:
+                    continue
+                change = new[metric] / old[metric] - 1
+                worse = -change if metric == "throughput" else change
+                if worse > threshold:
+                    regressions.append({
+                        "size": run_["size"],
+                        "operation": name,
+                        "metric": metric,
+                        "baseline": old[metric],
+                        "current": new[metric],
+                        "change": round(change, 3),
+                    })
+    return regressions
+
+
+def _time_calls(call: Callable[[], object], count: int) -> list[float]:
+    """Run *call* *count* times; return each call's wall time in seconds."""
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _random_create(rng: random.Random) -> MemoryCreate:
+    return MemoryCreate(
+        content=corpus.random_text(rng, rng.randint(8, 24)),
+        agent=rng.choice(corpus.AGENTS),
+        project=rng.choice(corpus.PROJECTS),
+        type=rng.choice(corpus.TYPES),
+        decay_policy=rng.choice(list(DecayPolicy)),
+    )
+
+
+def _reinforceable_index(rng: random.Random, size: int) -> int:
+    """A random corpus index whose decay policy is reinforceable."""
+    while True:
+        index = rng.randrange(size)
+        if corpus.decay_policy(index) == "reinforceable":
+            return index
@@ -2,11 +2,15 @@
 
 Wires configuration → adapter → service.  The adapter and service are
 instantiated lazily so that import-time operations (``--help``, tab
-completion) work even when ChromaDB is unreachable.
+completion) work even when ChromaDB is unreachable.  ``settings.backend``
+selects between the ChromaDB adapter (which caches resolved collections
+under ``data_dir``) and the in-process NumPy store;
+``settings.outbox`` wraps either in the write-ahead ``OutboxStore`` (which
+then connects to the store only when it first needs it), and
+``settings.lexical_index`` gives the service a BM25 keyword index.
+``get_async_service`` wires the asyncio variant (ChromaDB only).
 """
 
-from memories.config import settings
-
 
 def get_service():
     """Return the lazily-initialized MemoryService singleton.
@@ -15,13 +19,140 @@ def get_service():
     ``memory --help`` works without a running database.
     """
     if not hasattr(get_service, "_instance"):
+        # Imported here so ``memories.client`` stays dependency-free.
+        from memories.config import settings
         from memories.services.memory_service import MemoryService
-        from memories.stores.chromadb_adapter import ChromaDBAdapter
 
-        adapter = ChromaDBAdapter(
+        if settings.outbox:
+            from memories.stores.outbox import Outbox, OutboxStore
+
+            # Creates only touch the local outbox, so they keep working
+            # while the store's server is unreachable.
+            adapter = OutboxStore(
+                None,
+                Outbox(path=f"{settings.data_dir}/outbox.sqlite"),
+                batch_size=settings.batch_size,
+                retry_seconds=settings.outbox_retry_seconds,
+                connect=lambda: _vector_store(settings),
+            )
+        else:
+            adapter = _vector_store(settings)
+
+        get_service._instance = MemoryService(
+            store=adapter,
+            settings=settings,
+            result_cache=_result_cache(settings),
+            lexical_index=_lexical_index(settings),
+        )
+    return get_service._instance
+
+
+async def get_async_service():
+    """Return the lazily-initialized AsyncMemoryService singleton.
+
+    Backed by ``chromadb.AsyncHttpClient``; raises ValueError when
+    ``settings.backend`` is not ``"chromadb"``.
+    """
+    if not hasattr(get_async_service, "_instance"):
+        from memories.config import settings
+        from memories.services.async_memory_service import AsyncMemoryService
+        from memories.stores.async_chromadb_adapter import AsyncChromaDBAdapter
+
+        if settings.backend != "chromadb":
+            raise ValueError("The async service requires BACKEND=chromadb")
+
+        adapter = await AsyncChromaDBAdapter.connect(
             host=settings.chromadb_host,
             port=settings.chromadb_port,
             collection_name=settings.collection_name,
+            embedding_cache=_embedding_cache(settings),
+            partition_index=_partition_index(settings),
+            connect_timeout=settings.chromadb_connect_timeout,
+            read_timeout=settings.chromadb_read_timeout,
+            keepalive_seconds=settings.chromadb_keepalive_seconds,
+            retries=settings.chromadb_retries,
+            retry_backoff=settings.chromadb_retry_backoff,
         )
-        get_service._instance = MemoryService(store=adapter, settings=settings)
-    return get_service._instance
+        get_async_service._instance = AsyncMemoryService(
+            store=adapter,
+            settings=settings,
+            result_cache=_result_cache(settings),
+            lexical_index=_lexical_index(settings),
+        )
+    return get_async_service._instance
+
+
+def _vector_store(settings):
+    """The VectorStore selected by ``settings.backend``."""
+    if settings.backend == "numpy":
+        from memories.stores.numpy_store import NumpyStore
+
+        return NumpyStore(
+            path=settings.data_dir,
+            collection_name=settings.collection_name,
+            embedding_cache=_embedding_cache(settings),
+        )
+
+    from memories.stores.chromadb_adapter import ChromaDBAdapter
+    from memories.stores.collection_cache import CollectionCache
+
+    return ChromaDBAdapter(
+        host=settings.chromadb_host,
+        port=settings.chromadb_port,
+        collection_name=settings.collection_name,
+        embedding_cache=_embedding_cache(settings),
+        partition_index=_partition_index(settings),
+        collection_cache=(
+            CollectionCache(path=f"{settings.data_dir}/collections.sqlite")
+            if settings.chromadb_collection_cache
+            else None
+        ),
+        connect_timeout=settings.chromadb_connect_timeout,
+        read_timeout=settings.chromadb_read_timeout,
+        keepalive_seconds=settings.chromadb_keepalive_seconds,
+        retries=settings.chromadb_retries,
+        retry_backoff=settings.chromadb_retry_backoff,
+    )
+
+
+def _embedding_cache(settings):
+    """On-disk query-embedding cache, or None when disabled."""
+    from memories.stores.embedding_cache import EmbeddingCache
+
+    if settings.embedding_cache_size <= 0:
+        return None
+    return EmbeddingCache(
+        path=f"{settings.data_dir}/embedding_cache.sqlite",
+        max_entries=settings.embedding_cache_size,
+    )
+
+
+def _result_cache(settings):
+    """Shared search-result cache, or None when disabled."""
+    from memories.services.result_cache import ResultCache
+
+    if settings.result_cache_ttl <= 0:
+        return None
+    return ResultCache(
+        path=f"{settings.data_dir}/result_cache.sqlite",
+        ttl_seconds=settings.result_cache_ttl,
+        max_entries=settings.result_cache_size,
+    )
+
+
+def _lexical_index(settings):
+    """BM25 index for lexical and hybrid search, or None when disabled."""
+    from memories.services.lexical_index import LexicalIndex
+
+    if not settings.lexical_index:
+        return None
+    return LexicalIndex(path=f"{settings.data_dir}/lexical_index.sqlite")
+
+
+def _partition_index(settings):
+    """id → partition lookup when project partitioning is on, else None."""
+    from memories.stores.partition_index import PartitionIndex
+
+    if not settings.partition_by_project:
+        return None
+    return PartitionIndex(path=f"{settings.data_dir}/partitions.sqlite")
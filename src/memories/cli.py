@@ -4,22 +4,66 @@ Thin layer that translates shell arguments into MemoryService calls
 and formats the results.  All business logic lives in the service layer.
 """
 
+import atexit
 import json
+import os
 import sys
+from collections import deque
+from pathlib import Path
 
 import typer
 
+from memories import profiling
 from memories.config import settings
-from memories.models import DecayPolicy, MemoryCreate, OutputFormat
-from memories.services.memory_service import InvalidOperationError, MemoryNotFoundError
+from memories.models import (
+    ConsolidateKeep,
+    DecayPolicy,
+    ListSort,
+    MemoryCreate,
+    OutputFormat,
+    SearchMode,
+)
+from memories.services.memory_service import (
+    DuplicateMemoryError,
+    InvalidOperationError,
+    MemoryNotFoundError,
+)
 
 app = typer.Typer()
 
+# Fields `--fields` can select (as printed, so ``global`` not ``global_``).
+_MEMORY_FIELDS = (
+    "id",
+    "content",
+    "agent",
+    "personality",
+    "project",
+    "type",
+    "global",
+    "decay_policy",
+    "confidence",
+    "created_at",
+    "last_reinforced_at",
+)
+_SEARCH_FIELDS = (*_MEMORY_FIELDS, "similarity", "score")
+
+# One compact encoder for every NDJSON line (json.dumps with custom
+# separators builds a new encoder per call).
+_encode_compact = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
 
 # Force Typer to keep subcommand mode even with a single command.
 @app.callback()
-def main() -> None:
+def main(
+    ctx: typer.Context,
+    profile: bool = typer.Option(
+        False, "--profile", help="Print a per-phase timing breakdown to stderr"
+    ),
+) -> None:
     """Persistent, searchable memory for AI agents."""
+    if (profile or settings.profile_spans) and ctx.invoked_subcommand != "serve":
+        profiling.start().command = ctx.invoked_subcommand or ""
+        ctx.call_on_close(_emit_profile)
 
 
 # ---------------------------------------------------------------------------
@@ -37,6 +81,18 @@ def output_json(data: dict, file=None) -> None:
     print(json.dumps(data, indent=2, default=str), file=file)
 
 
+def output_ndjson(data: dict, file=None, flush: bool = True) -> None:
+    """Write *data* as one compact JSON line, flushed unless *flush* is False.
+
+    The line goes out in a single ``write`` so the daemon relays it as
+    one frame.
+    """
+    file = file or sys.stdout
+    file.write(_encode_compact(data) + "\n")
+    if flush:
+        file.flush()
+
+
 def output_text(data: dict, file=None) -> None:
     """Render *data* as human-readable text.
 
@@ -46,6 +102,15 @@ def output_text(data: dict, file=None) -> None:
     """
     file = file or sys.stdout
 
+    # Batched search: one results section per query.
+    if "queries" in data and isinstance(data["queries"], list):
+        for i, group in enumerate(data["queries"]):
+            if i:
+                print(file=file)
+            print(f"Query: {group['query']}\n", file=file)
+            output_text(group, file=file)
+        return
+
     # Search results get special treatment: per-result blocks + summary.
     if "results" in data and isinstance(data["results"], list):
         for i, item in enumerate(data["results"]):
@@ -53,8 +118,23 @@ def output_text(data: dict, file=None) -> None:
                 _print_padded(item, file)
             if i < len(data["results"]) - 1:
                 print(file=file)  # Blank line between results.
+        if "succeeded" in data:
+            print(f"\n{data['succeeded']} succeeded, {data['failed']} failed", file=file)
+            return
         count = data.get("count", len(data["results"]))
         print(f"\nFound {count} memories", file=file)
+        if data.get("next_cursor"):
+            print(f"Next cursor: {data['next_cursor']}", file=file)
+        return
+
+    # Consolidation: one line per cluster, then the counts.
+    if "groups" in data and isinstance(data["groups"], list):
+        for group in data["groups"]:
+            removed = ", ".join(group["remove"])
+            print(f"keep {group['keep']}  remove {removed}", file=file)
+        if data["groups"]:
+            print(file=file)
+        _print_padded({k: v for k, v in data.items() if k != "groups"}, file)
         return
 
     # Single-memory or status output: padded key-value pairs.
@@ -75,10 +155,89 @@ def _print_padded(data: dict, file) -> None:
 def _output(data: dict, fmt: OutputFormat, file=None) -> None:
     """Route to the appropriate formatter based on ``--format``."""
     file = file or sys.stdout
-    if fmt == OutputFormat.JSON:
-        output_json(data, file=file)
-    else:
-        output_text(data, file=file)
+    with profiling.span("cli.output"):
+        if fmt == OutputFormat.JSON:
+            output_json(data, file=file)
+        elif fmt == OutputFormat.NDJSON:
+            output_ndjson(data, file=file)
+        else:
+            output_text(data, file=file)
+
+
+def _output_results(result, fmt: OutputFormat, fields: set[str] | None = None) -> None:
+    """Print a search or list response; NDJSON gets one line per memory.
+
+    The NDJSON path reads each result's attributes directly instead of
+    going through ``model_dump`` and ``_clean_output``.  Batched search
+    lines carry their ``query``; a listing with more pages ends with a
+    ``{"next_cursor": ...}`` line.
+    """
+    if fmt != OutputFormat.NDJSON:
+        _output(_dump(result, fields), fmt)
+        return
+
+    with profiling.span("cli.output"):
+        groups = result.queries if "queries" in type(result).model_fields else [result]
+        columns = None
+        for group in groups:
+            query = getattr(group, "query", None)
+            for item in group.results:
+                if columns is None:
+                    columns = _columns(type(item), fields)
+                values = item.__dict__
+                row = {key: values[name] for name, key in columns}
+                if query is not None:
+                    row["query"] = query
+                output_ndjson(row, flush=False)
+        if getattr(result, "next_cursor", None):
+            output_ndjson({"next_cursor": result.next_cursor}, flush=False)
+        sys.stdout.flush()
+
+
+def _columns(model: type, fields: set[str] | None) -> list[tuple[str, str]]:
+    """``(attribute, output key)`` pairs of *model* to print, in field order."""
+    columns = []
+    for name in model.model_fields:
+        key = "global" if name == "global_" else name
+        if fields is None or key in fields:
+            columns.append((name, key))
+    return columns
+
+
+def _dump(model, fields: set[str] | None = None) -> dict:
+    """Serialize a response model for output, keeping only *fields* if given."""
+    with profiling.span("cli.serialize"):
+        include = None if fields is None else _projection(model, fields)
+        return _clean_output(model.model_dump(mode="json", include=include))
+
+
+def _projection(model, fields: set[str]) -> dict | set[str]:
+    """``model_dump(include=...)`` keeping *fields* of every memory in *model*."""
+    names = {"global_" if field == "global" else field for field in fields}
+    if "queries" in type(model).model_fields:
+        group = {"query": True, "count": True, "results": {"__all__": names}}
+        return {"queries": {"__all__": group}}
+    if "results" in type(model).model_fields:
+        return {"results": {"__all__": names}, "count": True, "next_cursor": True}
+    return names
+
+
+def _parse_fields(text: str | None, allowed: tuple[str, ...]) -> set[str] | None:
+    """Validate a comma-separated ``--fields`` list (None if not given)."""
+    if text is None:
+        return None
+    fields = {field.strip() for field in text.split(",") if field.strip()}
+    unknown = sorted(fields - set(allowed))
+    if unknown or not fields:
+        output_json(
+            {
+                "error": f"Unknown field(s): {', '.join(unknown) or '(none given)'}",
+                "fields": list(allowed),
+            },
+            file=sys.stderr,
+        )
+        raise typer.Exit(code=1)
+    return fields
 
 
 def _clean_output(data: dict) -> dict:
@@ -93,6 +252,8 @@ def _clean_output(data: dict) -> dict:
         for item in data["results"]:
             if "global_" in item:
                 item["global"] = item.pop("global_")
+    for group in data.get("queries", []):
+        _clean_output(group)
     return data
 
 
@@ -109,17 +270,23 @@ def _handle_error(exc: Exception) -> None:
     """
     if isinstance(exc, MemoryNotFoundError):
         output_json({"error": f"Memory '{exc.id}' not found"}, file=sys.stderr)
+    elif isinstance(exc, DuplicateMemoryError):
+        output_json({"error": str(exc), "id": exc.id}, file=sys.stderr)
     elif isinstance(exc, InvalidOperationError):
         output_json({"error": str(exc)}, file=sys.stderr)
+    elif settings.backend == "numpy":
+        output_json({"error": str(exc)}, file=sys.stderr)
     else:
-        host = f"{settings.chromadb_host}:{settings.chromadb_port}"
-        output_json(
-            {"error": f"Cannot connect to ChromaDB at {host}. Is Docker running?"},
-            file=sys.stderr,
-        )
+        output_json({"error": _connection_error_message()}, file=sys.stderr)
     raise typer.Exit(code=1)
 
 
+def _connection_error_message() -> str:
+    """Describe a failure to reach the configured ChromaDB server."""
+    host = f"{settings.chromadb_host}:{settings.chromadb_port}"
+    return f"Cannot connect to ChromaDB at {host}. Is Docker running?"
+
+
 # ---------------------------------------------------------------------------
 # Lazy service access
 # ---------------------------------------------------------------------------
@@ -127,9 +294,40 @@ def _handle_error(exc: Exception) -> None:
 
 def _get_service():
     """Return the lazily-initialized MemoryService."""
-    from memories import get_service
+    with profiling.span("cli.service_init"):
+        from memories import get_service
 
-    return get_service()
+        return get_service()
+
+
+def _emit_profile() -> None:
+    """Print the recorded profile to stderr; append it to PROFILE_METRICS_FILE."""
+    profile = profiling.stop()
+    if profile is None:
+        return
+    output_json({"profile": profile.as_dict()}, file=sys.stderr)
+    if settings.profile_metrics_file:
+        path = Path(settings.profile_metrics_file).expanduser()
+        try:
+            with open(path, "a") as metrics:
+                metrics.write(profile.to_openmetrics())
+        except OSError as exc:
+            output_json({"error": f"Cannot write profile to {path}: {exc}"}, file=sys.stderr)
+
+
+def _flush_reinforcements() -> None:
+    """atexit hook: apply reinforcements queued by ``search --reinforce-hits``."""
+    try:
+        _get_service().flush_reinforcements()
+    except Exception as exc:
+        output_json({"error": f"Reinforce-hits flush failed: {exc}"}, file=sys.stderr)
+
+
+def _flush_due() -> None:
+    """Daemon idle hook: drain the outbox and queued reinforcements when due."""
+    service = _get_service()
+    service.flush_outbox(due_only=True)
+    service.flush_reinforcements(due_only=True)
 
 
 # ---------------------------------------------------------------------------
@@ -139,16 +337,28 @@ def _get_service():
 
 @app.command()
 def create(
-    content: str = typer.Argument(..., help="Memory content to store"),
+    content: str = typer.Argument(None, help="Memory content to store"),
     agent: str = typer.Option("", help="Agent identifier"),
     personality: str = typer.Option("", help="Personality identifier"),
     project: str = typer.Option("", help="Project identifier"),
     type: str = typer.Option("", help="Memory type"),
     global_: bool = typer.Option(False, "--global", help="Mark as global memory"),
     decay: DecayPolicy = typer.Option(DecayPolicy.STABLE, help="Decay policy"),
+    batch: bool = typer.Option(
+        False, "--batch", help="Read JSONL records from stdin (or --file); emit NDJSON"
+    ),
+    file: typer.FileText = typer.Option(
+        None, "--file", help="JSONL input for --batch instead of stdin"
+    ),
     format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
 ) -> None:
-    """Store a new memory."""
+    """Store a new memory (or many, with --batch)."""
+    if batch:
+        _create_batch(file or sys.stdin)
+        return
+    if content is None:
+        output_json({"error": "Missing content (or pass --batch)"}, file=sys.stderr)
+        raise typer.Exit(code=1)
     try:
         service = _get_service()
         data = MemoryCreate(
@@ -161,16 +371,60 @@ def create(
             decay_policy=decay,
         )
         result = service.create_memory(data)
-        _output(_clean_output(result.model_dump(mode="json")), format)
+        _output(_dump(result), format)
     except typer.Exit:
         raise
     except Exception as exc:
         _handle_error(exc)
 
 
+def _create_batch(lines) -> None:
+    """Stream JSONL records into ``create_memories``; print NDJSON results.
+
+    Each input line is a MemoryCreate object (``global`` and ``decay``
+    are accepted as aliases).  Invalid lines are reported on stderr
+    with their line number and skipped; the exit code is 1 if any were.
+    """
+    failed = []
+
+    def records():
+        for line_no, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield _parse_batch_record(line)
+            except ValueError as exc:
+                failed.append(line_no)
+                output_json({"line": line_no, "error": str(exc)}, file=sys.stderr)
+
+    try:
+        service = _get_service()
+        for result in service.create_memories(records()):
+            output_ndjson(_dump(result))
+    except Exception as exc:
+        _handle_error(exc)
+    if failed:
+        raise typer.Exit(code=1)
+
+
+def _parse_batch_record(line: str) -> MemoryCreate:
+    """Parse one JSONL line into a MemoryCreate, accepting CLI-style keys."""
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("Expected a JSON object")
+    if "global" in record:
+        record["global_"] = record.pop("global")
+    if "decay" in record:
+        record["decay_policy"] = record.pop("decay")
+    return MemoryCreate.model_validate(record)
+
+
 @app.command()
 def search(
-    query: str = typer.Argument(..., help="Search query"),
+    queries: list[str] = typer.Argument(None, help="Search query (repeat for several)"),
+    queries_file: typer.FileText = typer.Option(
+        None, "--queries-file", help="File with one query per line ('-' for stdin)"
+    ),
     agent: str = typer.Option("", help="Filter by agent"),
     personality: str = typer.Option("", help="Filter by personality"),
     project: str = typer.Option("", help="Filter by project"),
@@ -180,23 +434,59 @@ def search(
     min_confidence: float = typer.Option(
         0.3, "--min-confidence", help="Minimum confidence threshold"
     ),
+    reinforce_hits: bool = typer.Option(
+        False, "--reinforce-hits", help="Reinforce the reinforceable results"
+    ),
+    mode: SearchMode = typer.Option(
+        SearchMode.SEMANTIC, help="Ranking: embeddings, BM25 keywords, or both fused"
+    ),
+    fields: str = typer.Option(
+        None, "--fields", help="Comma-separated result fields to output (e.g. id,similarity)"
+    ),
     format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
 ) -> None:
-    """Search memories by semantic similarity."""
+    """Search memories by semantic similarity.
+
+    Several queries (arguments and/or --queries-file) run as one batched
+    store call and are reported grouped per query.  --mode lexical finds
+    exact identifiers without embedding the query; --mode hybrid fuses
+    both rankings.  --reinforce-hits
+    queues the reinforcements and writes them in one batch after the
+    results are printed (at exit, or from the `memory serve` idle loop).
+    --fields without content leaves the text on the server.
+    """
+    projection = _parse_fields(fields, _SEARCH_FIELDS)
+    queries = list(queries or [])
+    if queries_file is not None:
+        queries.extend(line.strip() for line in queries_file if line.strip())
+    if not queries:
+        output_json({"error": "Missing query"}, file=sys.stderr)
+        raise typer.Exit(code=1)
+
+    filters = {
+        "agent": agent,
+        "personality": personality,
+        "project": project,
+        "type_": type,
+        # --global flag means "only global"; absence means "no filter".
+        "global_": True if global_ else None,
+        "limit": limit,
+        "min_confidence": min_confidence,
+        "reinforce_hits": reinforce_hits,
+        "mode": mode,
+        "include_content": projection is None or "content" in projection,
+    }
+    if reinforce_hits:
+        # unregister first so repeated searches in the daemon register once.
+        atexit.unregister(_flush_reinforcements)
+        atexit.register(_flush_reinforcements)
     try:
         service = _get_service()
-        result = service.search_memories(
-            query=query,
-            agent=agent,
-            personality=personality,
-            project=project,
-            type_=type,
-            # --global flag means "only global"; absence means "no filter".
-            global_=True if global_ else None,
-            limit=limit,
-            min_confidence=min_confidence,
-        )
-        _output(_clean_output(result.model_dump(mode="json")), format)
+        if len(queries) == 1 and queries_file is None:
+            result = service.search_memories(query=queries[0], **filters)
+        else:
+            result = service.search_many(queries=queries, **filters)
+        _output_results(result, format, projection)
     except typer.Exit:
         raise
     except Exception as exc:
@@ -206,13 +496,66 @@ def search(
 @app.command()
 def get(
     id: str = typer.Argument(..., help="Memory ID"),
+    fields: str = typer.Option(
+        None, "--fields", help="Comma-separated fields to output (e.g. id,confidence)"
+    ),
     format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
 ) -> None:
     """Retrieve a memory by ID."""
+    projection = _parse_fields(fields, _MEMORY_FIELDS)
     try:
         service = _get_service()
-        result = service.get_memory(id)
-        _output(_clean_output(result.model_dump(mode="json")), format)
+        result = service.get_memory(
+            id, include_content=projection is None or "content" in projection
+        )
+        _output(_dump(result, projection), format)
+    except typer.Exit:
+        raise
+    except Exception as exc:
+        _handle_error(exc)
+
+
+@app.command("list")
+def list_(
+    agent: str = typer.Option("", help="Filter by agent"),
+    personality: str = typer.Option("", help="Filter by personality"),
+    project: str = typer.Option("", help="Filter by project"),
+    type: str = typer.Option("", help="Filter by memory type"),
+    global_: bool = typer.Option(False, "--global", help="Filter to global memories"),
+    min_confidence: float = typer.Option(
+        0.0, "--min-confidence", help="Minimum confidence threshold"
+    ),
+    sort: ListSort = typer.Option(
+        ListSort.STORED, help="Store order (cheapest), newest first, or most confident first"
+    ),
+    limit: int = typer.Option(10, min=1, help="Memories per page"),
+    cursor: str = typer.Option(None, help="next_cursor of the previous page"),
+    fields: str = typer.Option(
+        None, "--fields", help="Comma-separated result fields to output (e.g. id,project)"
+    ),
+    format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
+) -> None:
+    """List memories by metadata filters, without a query or embedding.
+
+    Prints one page and a next_cursor; pass it back with --cursor (and
+    the same filters and --sort) for the next page.
+    """
+    projection = _parse_fields(fields, _MEMORY_FIELDS)
+    try:
+        service = _get_service()
+        result = service.list_memories(
+            agent=agent,
+            personality=personality,
+            project=project,
+            type_=type,
+            global_=True if global_ else None,
+            min_confidence=min_confidence,
+            sort=sort,
+            limit=limit,
+            cursor=cursor,
+            include_content=projection is None or "content" in projection,
+        )
+        _output_results(result, format, projection)
     except typer.Exit:
         raise
     except Exception as exc:
@@ -221,20 +564,34 @@ def get(
 
 @app.command()
 def reinforce(
-    id: str = typer.Argument(..., help="Memory ID"),
+    ids: list[str] = typer.Argument(None, help="Memory IDs ('-' reads IDs from stdin)"),
+    from_search: str = typer.Option(
+        None, "--from-search", help="Also reinforce the results of this search query"
+    ),
+    agent: str = typer.Option("", help="Filter --from-search by agent"),
+    project: str = typer.Option("", help="Filter --from-search by project"),
+    limit: int = typer.Option(10, help="Max --from-search results"),
     format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
 ) -> None:
-    """Reinforce a memory (reset its decay timer)."""
+    """Reinforce memories (reset their decay timers).
+
+    Several IDs are validated and updated in one batched round-trip and
+    reported per ID; the exit code is 1 if any failed.
+    """
     try:
         service = _get_service()
-        result = service.reinforce_memory(id)
-        # Map service field name to spec-expected name.
-        output_data = {
-            "id": result["id"],
-            "confidence": result["confidence"],
-            "last_reinforced_at": result["reinforced_at"],
-        }
-        _output(output_data, format)
+        if _is_single_id(ids, from_search):
+            result = service.reinforce_memory(ids[0])
+            # Map service field name to spec-expected name.
+            output_data = {
+                "id": result["id"],
+                "confidence": result["confidence"],
+                "last_reinforced_at": result["reinforced_at"],
+            }
+            _output(output_data, format)
+            return
+        selected = _select_ids(ids, from_search, agent, project, limit)
+        _output_bulk(service.reinforce_memories(selected), format)
     except typer.Exit:
         raise
     except Exception as exc:
@@ -243,20 +600,66 @@ def reinforce(
 
 @app.command()
 def delete(
-    id: str = typer.Argument(..., help="Memory ID"),
+    ids: list[str] = typer.Argument(None, help="Memory IDs ('-' reads IDs from stdin)"),
+    from_search: str = typer.Option(
+        None, "--from-search", help="Also delete the results of this search query"
+    ),
+    agent: str = typer.Option("", help="Filter --from-search by agent"),
+    project: str = typer.Option("", help="Filter --from-search by project"),
+    limit: int = typer.Option(10, help="Max --from-search results"),
     format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
 ) -> None:
-    """Soft-delete a memory."""
+    """Soft-delete memories.
+
+    Several IDs are validated and updated in one batched round-trip and
+    reported per ID; the exit code is 1 if any failed.
+    """
     try:
         service = _get_service()
-        result = service.delete_memory(id)
-        _output(result, format)
+        if _is_single_id(ids, from_search):
+            _output(service.delete_memory(ids[0]), format)
+            return
+        selected = _select_ids(ids, from_search, agent, project, limit)
+        _output_bulk(service.delete_memories(selected), format)
     except typer.Exit:
         raise
     except Exception as exc:
         _handle_error(exc)
 
 
+def _is_single_id(ids: list[str] | None, from_search: str | None) -> bool:
+    """True for the classic one-ID form, which keeps its original output."""
+    if not ids and not from_search:
+        output_json({"error": "Missing ID (or pass '-' or --from-search)"}, file=sys.stderr)
+        raise typer.Exit(code=1)
+    return ids is not None and len(ids) == 1 and ids[0] != "-" and not from_search
+
+
+def _select_ids(
+    ids: list[str] | None, from_search: str | None, agent: str, project: str, limit: int
+) -> list[str]:
+    """Expand ID arguments, '-' (whitespace-separated IDs on stdin) and a search."""
+    selected: list[str] = []
+    for id in ids or []:
+        if id == "-":
+            selected.extend(sys.stdin.read().split())
+        else:
+            selected.append(id)
+    if from_search:
+        found = _get_service().search_memories(
+            from_search, agent=agent, project=project, limit=limit
+        )
+        selected.extend(item.id for item in found.results)
+    return selected
+
+
+def _output_bulk(result: dict, fmt: OutputFormat) -> None:
+    """Print a bulk per-ID report; exit 1 if any ID failed."""
+    _output(result, fmt)
+    if result["failed"]:
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def status(
     format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
@@ -272,15 +675,265 @@ def status(
         _output(result, format)
     except typer.Exit:
         raise
-    except Exception:
+    except Exception as exc:
         # Can't even connect — report unhealthy with connection details.
-        host = f"{settings.chromadb_host}:{settings.chromadb_port}"
+        if settings.backend == "numpy":
+            host, error = settings.data_dir, str(exc)
+        else:
+            host = f"{settings.chromadb_host}:{settings.chromadb_port}"
+            error = _connection_error_message()
         output_json(
-            {
-                "status": "unhealthy",
-                "host": host,
-                "error": f"Cannot connect to ChromaDB at {host}. Is Docker running?",
-            },
+            {"status": "unhealthy", "host": host, "error": error},
             file=sys.stderr,
         )
         raise typer.Exit(code=1)
+
+
+@app.command()
+def migrate(
+    format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
+) -> None:
+    """Backfill expiry and epoch-timestamp metadata on stored memories.
+
+    Run once on collections created by older versions, and again after
+    changing DECAY_HALF_LIFE_HOURS.
+    """
+    try:
+        service = _get_service()
+        result = service.migrate_metadata()
+        _output(result, format)
+    except typer.Exit:
+        raise
+    except Exception as exc:
+        _handle_error(exc)
+
+
+@app.command()
+def export(
+    agent: str = typer.Option("", help="Only export this agent's memories"),
+    project: str = typer.Option("", help="Only export this project's memories"),
+    include_deleted: bool = typer.Option(
+        False, "--include-deleted", help="Also export soft-deleted memories"
+    ),
+    embeddings: bool = typer.Option(
+        False, "--embeddings", help="Include each memory's embedding vector"
+    ),
+) -> None:
+    """Stream memories to stdout as NDJSON, one record per line.
+
+    Records hold the raw stored metadata, so `memory import` restores
+    them exactly.  The collection is read page by page, and output is
+    flushed once per page.
+    """
+    try:
+        service = _get_service()
+        records = service.export_memories(
+            agent=agent,
+            project=project,
+            include_deleted=include_deleted,
+            include_embeddings=embeddings,
+        )
+        for count, record in enumerate(records, start=1):
+            output_ndjson(record, flush=count % settings.batch_size == 0)
+        sys.stdout.flush()
+    except typer.Exit:
+        raise
+    except Exception as exc:
+        _handle_error(exc)
+
+
+@app.command("import")
+def import_(
+    file: Path = typer.Argument(
+        ..., exists=True, dir_okay=False, help="NDJSON file from `memory export`"
+    ),
+    checkpoint: Path = typer.Option(
+        None, help="Resume checkpoint (default: FILE.checkpoint)"
+    ),
+    restart: bool = typer.Option(
+        False, "--restart", help="Ignore an existing checkpoint and start over"
+    ),
+) -> None:
+    """Restore memories from `memory export` output, resumably.
+
+    Records are upserted by ID in batches, reusing exported embeddings
+    from the same model.  After each batch the input offset is saved to
+    the checkpoint file; an interrupted import run again resumes there.
+    The checkpoint is removed once the whole file is imported.
+    """
+    checkpoint = checkpoint or file.with_name(file.name + ".checkpoint")
+    start = 0
+    if checkpoint.exists() and not restart:
+        start = json.loads(checkpoint.read_text())["offset"]
+
+    failed = []
+    # End offsets of records handed to the service but not yet committed.
+    offsets: deque[int] = deque()
+    totals = {"imported": 0, "reused_embeddings": 0, "resumed_from": start}
+
+    with open(file, "rb") as lines:
+        lines.seek(start)
+
+        def records():
+            offset = start
+            for line in lines:
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = _parse_import_record(line)
+                except ValueError as exc:
+                    failed.append(offset)
+                    output_json({"offset": offset, "error": str(exc)}, file=sys.stderr)
+                    continue
+                offsets.append(offset)
+                yield record
+
+        try:
+            service = _get_service()
+            for batch in service.import_memories(records()):
+                for _ in range(batch["imported"]):
+                    committed = offsets.popleft()
+                _write_checkpoint(checkpoint, committed)
+                totals["imported"] += batch["imported"]
+                totals["reused_embeddings"] += batch["reused_embeddings"]
+        except Exception as exc:
+            _handle_error(exc)
+
+    checkpoint.unlink(missing_ok=True)
+    output_json(totals)
+    if failed:
+        raise typer.Exit(code=1)
+
+
+def _parse_import_record(line: bytes) -> dict:
+    """Parse and check one `memory export` line."""
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("Expected a JSON object")
+    if not isinstance(record.get("id"), str) or not record["id"]:
+        raise ValueError("Missing 'id'")
+    if not isinstance(record.get("content"), str):
+        raise ValueError("Missing 'content'")
+    if not isinstance(record.get("metadata"), dict):
+        raise ValueError("Missing 'metadata'")
+    return record
+
+
+def _write_checkpoint(path: Path, offset: int) -> None:
+    """Atomically record that the input is committed up to *offset*."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"offset": offset}))
+    os.replace(tmp, path)
+
+
+@app.command()
+def compact(
+    grace_hours: float = typer.Option(
+        None, help="Hours at confidence 0.0 before purging (default: COMPACT_GRACE_HOURS)"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Only report what would be reclaimed"
+    ),
+    archive: typer.FileTextWrite = typer.Option(
+        None, "--archive", mode="a", help="Append purged memories to this JSONL file"
+    ),
+    format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
+) -> None:
+    """Permanently remove soft-deleted and fully-decayed memories."""
+
+    def write_archive(page: list[dict]) -> None:
+        for doc in page:
+            output_ndjson(doc, file=archive)
+
+    try:
+        service = _get_service()
+        result = service.compact(
+            grace_hours=grace_hours,
+            dry_run=dry_run,
+            archive=write_archive if archive else None,
+        )
+        _output(result, format)
+    except typer.Exit:
+        raise
+    except Exception as exc:
+        _handle_error(exc)
+
+
+@app.command()
+def consolidate(
+    threshold: float = typer.Option(
+        None,
+        min=0.0,
+        max=1.0,
+        help="Cosine similarity that makes two memories duplicates "
+        "(default: CONSOLIDATE_THRESHOLD)",
+    ),
+    project: str = typer.Option(
+        None, help="Only this project ('' for memories without one; default: all)"
+    ),
+    keep: ConsolidateKeep = typer.Option(
+        ConsolidateKeep.NEWEST, help="Which memory of each cluster survives"
+    ),
+    hard: bool = typer.Option(
+        False, "--hard", help="Remove merged memories outright instead of soft-deleting"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Only report the clusters that would be merged"
+    ),
+    format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
+) -> None:
+    """Merge near-duplicate memories within each project."""
+    try:
+        service = _get_service()
+        result = service.consolidate(
+            threshold=threshold,
+            project=project,
+            keep=keep,
+            hard_delete=hard,
+            dry_run=dry_run,
+        )
+        _output(result, format)
+    except typer.Exit:
+        raise
+    except Exception as exc:
+        _handle_error(exc)
+
+
+@app.command()
+def flush(
+    retries: int = typer.Option(3, help="Backed-off retries before giving up"),
+    format: OutputFormat = typer.Option(OutputFormat.JSON, help="Output format"),
+) -> None:
+    """Write memories queued in the local outbox (OUTBOX=true) to the store."""
+    try:
+        service = _get_service()
+        result = service.flush_outbox(retries=retries)
+    except Exception as exc:
+        _handle_error(exc)
+    _output(result, format)
+    if "error" in result:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def serve(
+    socket: str = typer.Option(
+        "", "--socket", help="Unix socket path (default: DAEMON_SOCKET)"
+    ),
+) -> None:
+    """Run a warm daemon that the `memory` command forwards to."""
+    from memories.daemon import serve as serve_forever
+
+    path = socket or settings.daemon_socket
+    try:
+        # Connect up front so the first forwarded command is already warm.
+        _get_service()
+    except Exception as exc:
+        _handle_error(exc)
+    output_json({"status": "serving", "socket": path}, file=sys.stderr)
+    try:
+        serve_forever(app, path, on_idle=_flush_due)
+    except RuntimeError as exc:
+        output_json({"error": str(exc)}, file=sys.stderr)
+        raise typer.Exit(code=1)
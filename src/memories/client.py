@@ -0,0 +1,115 @@
+"""Thin ``memory`` entry point that forwards commands to a warm daemon.
+
+Deliberately imports only the standard library: when ``memory serve``
+is listening on its Unix socket, a command costs one interpreter start
+plus one local round-trip instead of importing typer, pydantic and
+chromadb and reconnecting to ChromaDB.  When no daemon is reachable the
+command runs in-process exactly as before.
+
+The socket path comes from ``DAEMON_SOCKET`` (the environment only — a
+``.env`` file is not read here); set it to an empty string to disable
+forwarding.  ``PROFILE_SPANS=true`` in the environment is passed on as
+``--profile``, and an in-process run also times the CLI import.
+
+Wire protocol: the client sends one JSON line ``{"argv": [...]}``; the
+daemon answers with JSON lines ``{"stdout": str}`` / ``{"stderr": str}``
+as output is produced, then ``{"exit": int}``.
+"""
+
+import json
+import os
+import socket
+import sys
+
+from memories import profiling
+
+DEFAULT_SOCKET = "~/.memories/daemon.sock"
+
+# Commands that must never be forwarded (the daemon itself, and import,
+# whose file argument and checkpoint are relative to the caller).
+_LOCAL_COMMANDS = {"serve", "import"}
+
+# Flags that read stdin or paths relative to the caller's working directory.
+_LOCAL_FLAGS = {"--archive", "--batch", "--file", "--queries-file"}
+
+# A bare "-" argument means "read from stdin" (e.g. `memory delete -`).
+_STDIN_ARG = "-"
+
+# Global option of the Typer app; it must precede the command name.
+_PROFILE_FLAG = "--profile"
+
+
+def socket_path() -> str:
+    """Resolve the daemon socket path from the environment."""
+    return os.path.expanduser(os.environ.get("DAEMON_SOCKET", DEFAULT_SOCKET))
+
+
+def main() -> None:
+    """Forward ``sys.argv`` to the daemon, or fall back to in-process."""
+    argv = sys.argv[1:]
+    path = socket_path()
+    if _profile_requested(argv):
+        profiling.start()
+        if _PROFILE_FLAG not in argv:
+            argv = [_PROFILE_FLAG, *argv]
+
+    if path and not _runs_locally(argv):
+        exit_code = _forward(path, argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    with profiling.span("cli.import"):
+        from memories.cli import app
+
+    app(args=argv)
+
+
+def _profile_requested(argv: list[str]) -> bool:
+    """True for ``--profile`` or a truthy ``PROFILE_SPANS`` environment variable."""
+    env = os.environ.get("PROFILE_SPANS", "").strip().lower()
+    return _PROFILE_FLAG in argv or env in ("1", "true", "yes", "on")
+
+
+def _runs_locally(argv: list[str]) -> bool:
+    """Return True for commands that need this process (stdin, files, the daemon)."""
+    argv = [arg for arg in argv if arg != _PROFILE_FLAG]
+    if not argv:
+        return False
+    return argv[0] in _LOCAL_COMMANDS or any(
+        arg == _STDIN_ARG or arg.split("=", 1)[0] in _LOCAL_FLAGS for arg in argv
+    )
+
+
+def _forward(path: str, argv: list[str]) -> int | None:
+    """Run *argv* on the daemon and relay its output.
+
+    Returns the command's exit code, or None if no daemon accepted the
+    connection (so the caller can run the command itself).
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps({"argv": argv}).encode() + b"\n")
+        stream.flush()
+
+        for line in stream:
+            frame = json.loads(line)
+            if "stdout" in frame:
+                sys.stdout.write(frame["stdout"])
+            elif "stderr" in frame:
+                sys.stderr.write(frame["stderr"])
+            elif "exit" in frame:
+                sys.stdout.flush()
+                return frame["exit"]
+
+    # Daemon went away mid-command; output may be partial.
+    print(
+        json.dumps({"error": "Memory daemon closed the connection unexpectedly"}),
+        file=sys.stderr,
+    )
+    return 1
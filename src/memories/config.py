@@ -5,19 +5,79 @@ defaults for local development.  Import `settings` from this module
 wherever configuration values are needed.
 """
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
+from memories.client import DEFAULT_SOCKET
+
 
 class Settings(BaseSettings):
     """All configuration knobs for the memories service."""
 
+    # Storage backend: "chromadb" (HTTP server) or "numpy" (in-process)
+    backend: Literal["chromadb", "numpy"] = "chromadb"
+    data_dir: str = "~/.memories"
+
     # ChromaDB connection
     chromadb_host: str = "localhost"
     chromadb_port: int = 8000
+    # HTTP tuning: timeouts in seconds (0 waits forever), idle connections
+    # kept this long, and dropped connections retried with doubling backoff
+    chromadb_connect_timeout: float = 5.0
+    chromadb_read_timeout: float = 60.0
+    chromadb_keepalive_seconds: float = 40.0
+    chromadb_retries: int = 3
+    chromadb_retry_backoff: float = 0.5  # seconds before the first retry
+    # Cache resolved collection ids under data_dir to skip the handshake
+    chromadb_collection_cache: bool = True
 
     # Collection and query defaults
     collection_name: str = "memories"
+    # ChromaDB only: one collection per project plus a shared global one
+    partition_by_project: bool = False
     default_limit: int = 10
+    batch_size: int = 500  # Documents per store_many call in bulk operations
+
+    # `memory compact` purges memories at confidence 0.0 for this long
+    compact_grace_hours: float = 168  # 7 days
+
+    # `memory consolidate` merges memories at least this cosine-similar
+    consolidate_threshold: float = 0.95
+
+    # What `memory create` does with content already stored in the same
+    # scope: "allow" it, "reject" it, or "merge" into the existing memory.
+    # Except under "allow", a copy in another scope lends its embedding.
+    duplicate_policy: Literal["allow", "reject", "merge"] = "allow"
+
+    # Queue creates in a local outbox under data_dir and return at once;
+    # `memory serve` or `memory flush` moves them into the store
+    outbox: bool = False
+    outbox_retry_seconds: float = 1.0  # First backoff after a failed flush
+
+    # Query embeddings cached on disk under data_dir (0 disables)
+    embedding_cache_size: int = 10000
+
+    # BM25 keyword index under data_dir for `search --mode lexical|hybrid`
+    # (opt-in); `memory migrate` indexes memories created while it was off
+    lexical_index: bool = False
+
+    # Search results shared across processes under data_dir (0 TTL disables)
+    result_cache_ttl: float = 0  # seconds
+    result_cache_size: int = 1000
+
+    # `search --reinforce-hits` queues reinforcements; the daemon applies
+    # them once the oldest has waited this long (processes flush at exit)
+    reinforce_flush_seconds: float = 5.0
+
+    # Unix socket for `memory serve`; the thin client reads DAEMON_SOCKET
+    # from the environment directly, so keep the two in sync.
+    daemon_socket: str = DEFAULT_SOCKET
+
+    # `memory --profile` (or this) prints per-phase timings to stderr;
+    # a metrics file also gets them appended as OpenMetrics samples
+    profile_spans: bool = False
+    profile_metrics_file: str = ""
 
     # Confidence / decay tuning
     min_confidence: float = 0.3
@@ -0,0 +1,176 @@
+"""Long-lived ``memory serve`` process holding a warm MemoryService.
+
+Listens on a Unix socket and runs each forwarded command through the
+same Typer app the CLI uses, streaming stdout/stderr back as JSON
+frames (see ``memories.client`` for the protocol).  Requests are
+handled one at a time: commands write to ``sys.stdout``, which is
+process-global, and the service singleton is shared.
+
+Between requests the server calls an optional *on_idle* hook (about
+every half second), which the CLI uses to flush write-behind work.
+
+The daemon uses its own Settings (environment and ``.env`` as seen
+when it started); clients' environments are not forwarded.
+
+A daemon holds an exclusive lock on ``<socket>.lock`` while it runs, and
+its socket only appears at the configured path once it is listening.
+"""
+
+import fcntl
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+
+import typer
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that forwards every write as a ``{name: text}`` frame."""
+
+    def __init__(self, wfile, name: str) -> None:
+        self._wfile = wfile
+        self._name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            self._wfile.write(json.dumps({self._name: text}).encode() + b"\n")
+        return len(text)
+
+    def flush(self) -> None:
+        self._wfile.flush()
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    """Execute one forwarded command per connection."""
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        argv = json.loads(line)["argv"]
+
+        stdout = _FrameWriter(self.wfile, "stdout")
+        stderr = _FrameWriter(self.wfile, "stderr")
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            exit_code = run_command(self.server.command, argv)
+        self.wfile.write(json.dumps({"exit": exit_code}).encode() + b"\n")
+
+
+class _Server(socketserver.UnixStreamServer):
+    """Unix socket server that runs ``on_idle`` from its poll loop."""
+
+    on_idle = None
+    lock = None  # Open ``<socket>.lock`` file, flocked while serving.
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.lock is not None:
+            self.lock.close()
+
+    def service_actions(self) -> None:
+        if self.on_idle is None:
+            return
+        try:
+            self.on_idle()
+        except Exception as exc:
+            # Keep serving; the hook retries on the next poll.
+            print(json.dumps({"error": str(exc)}), file=sys.stderr)
+
+
+def run_command(command, argv: list[str]) -> int:
+    """Invoke the Click *command* with *argv* and return its exit code.
+
+    Mirrors Click's standalone mode (usage errors print and exit 2)
+    without calling ``sys.exit`` inside the daemon.
+    """
+    try:
+        result = command.main(args=argv, prog_name="memory", standalone_mode=False)
+    except Exception as exc:
+        if hasattr(exc, "show") and hasattr(exc, "exit_code"):
+            # Click usage / parameter errors.
+            exc.show(file=sys.stderr)
+            return exc.exit_code
+        print(json.dumps({"error": str(exc)}), file=sys.stderr)
+        return 1
+    return result if isinstance(result, int) else 0
+
+
+def make_server(
+    app: typer.Typer, path: str, on_idle=None
+) -> socketserver.UnixStreamServer:
+    """Bind a server for *app* to the Unix socket at *path*.
+
+    *on_idle*, if given, is called with no arguments between requests.
+    Raises RuntimeError if another daemon is running (or starting) there.
+
+    The server holds ``<path>.lock`` until ``server_close``, so a socket
+    found at *path* without a lock holder is stale and replaced.  It
+    binds and listens on a temporary name and is then renamed to *path*,
+    so *path* never names a socket that refuses connections.
+    """
+    path = os.path.expanduser(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    lock = open(f"{path}.lock", "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        if _is_listening(path):  # A daemon from before the lock file.
+            raise RuntimeError(f"A memory daemon is already listening on {path}")
+        staging = f"{path}.{os.getpid()}"
+        if os.path.exists(staging):
+            os.unlink(staging)
+        old_umask = os.umask(0o077)  # Socket is private to the current user.
+        try:
+            server = _Server(staging, _CommandHandler)
+        finally:
+            os.umask(old_umask)
+        os.replace(staging, path)
+    except BlockingIOError:
+        lock.close()
+        raise RuntimeError(f"A memory daemon is already running on {path}") from None
+    except BaseException:
+        lock.close()
+        raise
+    server.server_address = path
+    server.lock = lock
+    server.command = typer.main.get_command(app)
+    server.on_idle = on_idle
+    return server
+
+
+def serve(app: typer.Typer, path: str, on_idle=None) -> None:
+    """Serve *app* on the Unix socket at *path* until SIGINT/SIGTERM."""
+    server = make_server(app, path, on_idle)
+
+    def _stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Unlink while still holding the lock, so a successor's socket is safe.
+        if os.path.exists(server.server_address):
+            os.unlink(server.server_address)
+        server.server_close()
+
+
+def _is_listening(path: str) -> bool:
+    """Return True if something accepts connections on *path*."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
@@ -26,6 +26,30 @@ class OutputFormat(str, Enum):
 
     JSON = "json"
     TEXT = "text"
+    NDJSON = "ndjson"  # One compact JSON object per line, per result
+
+
+class SearchMode(str, Enum):
+    """How search ranks memories."""
+
+    SEMANTIC = "semantic"  # Embedding similarity
+    LEXICAL = "lexical"  # BM25 keyword match, no embedding
+    HYBRID = "hybrid"  # Both, fused by reciprocal rank
+
+
+class ListSort(str, Enum):
+    """Order of `memory list` results."""
+
+    STORED = "stored"  # Store order, paged straight from the store
+    CREATED_AT = "created_at"  # Newest first
+    CONFIDENCE = "confidence"  # Most confident first
+
+
+class ConsolidateKeep(str, Enum):
+    """Which memory of a near-duplicate cluster `consolidate` keeps."""
+
+    NEWEST = "newest"  # Latest created_at
+    REINFORCED = "reinforced"  # Latest last_reinforced_at, then created_at
 
 
 # ---------------------------------------------------------------------------
@@ -65,9 +89,16 @@ class MemoryResponse(BaseModel):
 
 
 class SearchResultItem(MemoryResponse):
-    """MemoryResponse augmented with a similarity score from search."""
+    """MemoryResponse augmented with its ranking from search.
+
+    ``similarity`` is the vector distance to the query (lower is
+    closer); None for hits only the keyword ranking found.  ``score`` is
+    the BM25 score in lexical mode and the fused rank score in hybrid
+    mode (higher is better); None in semantic mode.
+    """
 
-    similarity: float
+    similarity: float | None = None
+    score: float | None = None
 
 
 class SearchResponse(BaseModel):
@@ -75,3 +106,23 @@ class SearchResponse(BaseModel):
 
     results: list[SearchResultItem]
     count: int
+
+
+class ListResponse(BaseModel):
+    """One page of a metadata listing, with the cursor for the next."""
+
+    results: list[MemoryResponse]
+    count: int
+    next_cursor: str | None = None
+
+
+class QuerySearchResponse(SearchResponse):
+    """SearchResponse tagged with the query that produced it."""
+
+    query: str
+
+
+class MultiSearchResponse(BaseModel):
+    """Search results grouped per query for a batched search."""
+
+    queries: list[QuerySearchResponse]
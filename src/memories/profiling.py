@@ -0,0 +1,131 @@
+"""Lightweight timing spans behind ``memory --profile``.
+
+Code marks its phases with ``with span("chromadb.query"):`` or the
+``@timed("service.search")`` decorator.  Until ``start()`` is called,
+``span`` hands back one shared no-op context manager and ``timed``
+calls straight through, so disabled instrumentation costs a global
+lookup per phase.  A started ``Profile`` accumulates the call count
+and wall time of every span name; spans nest, so a parent's time
+includes its children's.
+
+Deliberately imports only the standard library: ``memories.client``
+uses it to time the CLI import before anything else is loaded.
+"""
+
+import functools
+import time
+from contextlib import nullcontext
+
+_NOOP = nullcontext()
+
+# The profile being recorded, or None (the common, zero-cost case).
+_active: "Profile | None" = None
+
+
+class Profile:
+    """Per-span call counts and wall time for one command."""
+
+    def __init__(self) -> None:
+        self.command = ""
+        self.started = time.perf_counter()
+        self.elapsed: float | None = None
+        # name -> [calls, seconds], in first-seen order.
+        self.spans: dict[str, list] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Record one *seconds*-long call of span *name*."""
+        totals = self.spans.setdefault(name, [0, 0.0])
+        totals[0] += 1
+        totals[1] += seconds
+
+    def as_dict(self) -> dict:
+        """JSON-ready breakdown with times in milliseconds."""
+        elapsed = self.elapsed
+        if elapsed is None:
+            elapsed = time.perf_counter() - self.started
+        return {
+            "command": self.command,
+            "total_ms": round(elapsed * 1000, 3),
+            "spans": {
+                name: {"count": calls, "total_ms": round(seconds * 1000, 3)}
+                for name, (calls, seconds) in self.spans.items()
+            },
+        }
+
+    def to_openmetrics(self, timestamp: float | None = None) -> str:
+        """Render as timestamped OpenMetrics samples, one line per span."""
+        timestamp = time.time() if timestamp is None else timestamp
+        data = self.as_dict()
+        command = _label(data["command"])
+        lines = [
+            f'memories_profile_total_seconds{{command="{command}"}} '
+            f"{data['total_ms'] / 1000:.6f} {timestamp:.3f}"
+        ]
+        for name, (calls, seconds) in self.spans.items():
+            labels = f'{{command="{command}",span="{_label(name)}"}}'
+            lines.append(f"memories_profile_span_seconds{labels} {seconds:.6f} {timestamp:.3f}")
+            lines.append(f"memories_profile_span_calls{labels} {calls} {timestamp:.3f}")
+        return "\n".join(lines) + "\n"
+
+
+class _Span:
+    """Context manager adding its wall time to a profile on exit."""
+
+    __slots__ = ("_profile", "_name", "_start")
+
+    def __init__(self, profile: Profile, name: str) -> None:
+        self._profile = profile
+        self._name = name
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self._profile.add(self._name, time.perf_counter() - self._start)
+        return False
+
+
+def span(name: str):
+    """Context manager timing the enclosed block as span *name*."""
+    if _active is None:
+        return _NOOP
+    return _Span(_active, name)
+
+
+def timed(name: str):
+    """Decorator timing every call of the function as span *name*."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with _Span(_active, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def start() -> Profile:
+    """Begin recording (or keep the profile already being recorded)."""
+    global _active
+    if _active is None:
+        _active = Profile()
+    return _active
+
+
+def stop() -> Profile | None:
+    """Stop recording and return the profile, or None if none was active."""
+    global _active
+    profile, _active = _active, None
+    if profile is not None:
+        profile.elapsed = time.perf_counter() - profile.started
+    return profile
+
+
+def _label(value: str) -> str:
+    """Escape an OpenMetrics label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,14 +1,19 @@
 """Service layer — business logic for memory operations."""
 
-from memories.services.decay import compute_confidence
+from memories.services.async_memory_service import AsyncMemoryService
+from memories.services.decay import compute_confidence, compute_confidence_batch
 from memories.services.memory_service import (
+    DuplicateMemoryError,
     InvalidOperationError,
     MemoryNotFoundError,
     MemoryService,
 )
 
 __all__ = [
+    "AsyncMemoryService",
     "compute_confidence",
+    "compute_confidence_batch",
+    "DuplicateMemoryError",
     "InvalidOperationError",
     "MemoryNotFoundError",
     "MemoryService",
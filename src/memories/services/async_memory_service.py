@@ -0,0 +1,533 @@
+"""Asyncio variant of MemoryService.
+
+Same operations, arguments and results as ``MemoryService``, awaiting
+an ``AsyncVectorStore`` instead of calling a blocking one, so many
+agents sharing one event loop can overlap their memory calls.  All
+validation, metadata, search planning and confidence logic is inherited
+from ``BaseMemoryService``; the methods here only sequence the awaits.
+
+The lexical index, the result cache and the migration marker are local
+files, so every read and write of them runs in a worker thread
+(``asyncio.to_thread``) rather than on the event loop, and the lexical
+queries of one ``search_many`` run concurrently.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Iterable
+from itertools import islice
+
+from memories.config import Settings
+from memories.models import (
+    ConsolidateKeep,
+    ListResponse,
+    ListSort,
+    MemoryCreate,
+    MemoryResponse,
+    MultiSearchResponse,
+    SearchMode,
+    SearchResponse,
+)
+from memories.services.lexical_index import LexicalIndex
+from memories.services.memory_service import BaseMemoryService
+from memories.services.result_cache import ResultCache
+from memories.stores.vector_store import AsyncVectorStore
+
+
+class AsyncMemoryService(BaseMemoryService):
+    """Business logic layer over an AsyncVectorStore."""
+
+    def __init__(
+        self,
+        store: AsyncVectorStore,
+        settings: Settings,
+        result_cache: ResultCache | None = None,
+        lexical_index: LexicalIndex | None = None,
+    ) -> None:
+        super().__init__(store, settings, result_cache, lexical_index)
+
+    # ------------------------------------------------------------------
+    # Create
+    # ------------------------------------------------------------------
+
+    async def create_memory(self, data: MemoryCreate) -> MemoryResponse:
+        """Store a new memory (duplicate policy as in MemoryService.create_memory)."""
+        memory_id, metadata, response = self._prepare_memory(data)
+        embedding = None
+        if self._settings.duplicate_policy != "allow":
+            page, _ = await self._store.get_page(
+                where=self._duplicate_where(metadata, same_scope=True), limit=1
+            )
+            if page:
+                return await self._refresh_duplicate(page[0])
+            page, _ = await self._store.get_page(
+                where=self._duplicate_where(metadata, same_scope=False),
+                limit=1,
+                include_embeddings=True,
+            )
+            embedding = self._reusable_embedding(page)
+
+        if embedding is None:
+            await self._store.store(memory_id, data.content, metadata)
+        else:
+            await self._store.upsert_many(
+                [memory_id], [data.content], [metadata], [embedding]
+            )
+        await asyncio.to_thread(self._index, [memory_id], [data.content], [metadata])
+        await asyncio.to_thread(self._invalidate_results)
+        return response
+
+    async def create_memories(
+        self, records: Iterable[MemoryCreate]
+    ) -> AsyncIterator[MemoryResponse]:
+        """Bulk-create memories in ``batch_size`` chunks, yielding each response.
+
+        Duplicate policy as in MemoryService.create_memories.
+        """
+        records = iter(records)
+        while chunk := list(islice(records, self._settings.batch_size)):
+            prepared = [self._prepare_memory(data) for data in chunk]
+            existing = []
+            if self._settings.duplicate_policy != "allow":
+                where = self._batch_duplicate_where([metadata for _, metadata, _ in prepared])
+                async for page in self._scan(where, include_embeddings=True):
+                    existing += page
+            rows, responses, patches, error = self._plan_batch_create(chunk, prepared, existing)
+            await self._store_rows(rows)
+            if patches:
+                await self._store.update_metadata_many(list(patches), list(patches.values()))
+                await asyncio.to_thread(
+                    self._patch_index, list(patches), list(patches.values())
+                )
+            if rows or patches:
+                await asyncio.to_thread(self._invalidate_results)
+            for response in responses:
+                yield response
+            if error is not None:
+                raise error
+
+    async def _store_rows(self, rows: list[tuple]) -> None:
+        """Store and index planned rows (see MemoryService._store_rows)."""
+        plain, embedded = self._split_rows(rows)
+        if plain:
+            await self._store.store_many(*plain)
+        if embedded:
+            await self._store.upsert_many(*embedded)
+        if rows:
+            await asyncio.to_thread(
+                self._index, *([row[i] for row in rows] for i in range(3))
+            )
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    async def search_memories(
+        self,
+        query: str,
+        agent: str = "",
+        personality: str = "",
+        project: str = "",
+        type_: str = "",
+        global_: bool | None = None,
+        limit: int = 10,
+        min_confidence: float = 0.3,
+        reinforce_hits: bool = False,
+        mode: SearchMode = SearchMode.SEMANTIC,
+        include_content: bool = True,
+    ) -> SearchResponse:
+        """Search with metadata filters and confidence gating (see *mode*).
+
+        In hybrid mode the semantic and lexical rankings are fetched
+        concurrently.
+        """
+        filters = self._search_filters(agent, personality, project, type_, global_)
+        await self._ensure_migrated(min_confidence)
+        grouped, misses, where, save = await asyncio.to_thread(
+            self._plan_search, [query], filters, limit, min_confidence, mode, include_content
+        )
+
+        async def semantic() -> None:
+            if misses:
+                hits = await self._store.search(
+                    query, n_results=limit, where=where, include_content=include_content
+                )
+                await asyncio.to_thread(save, [hits])
+
+        _, lexical = await asyncio.gather(
+            semantic(), self._lexical_rankings([query], mode, where, limit, include_content)
+        )
+        (raw_results,) = self._merge_rankings(mode, grouped, lexical, limit)
+        items = self._search_items(raw_results, min_confidence, reinforce_hits)
+        return SearchResponse(results=items, count=len(items))
+
+    async def search_many(
+        self,
+        queries: list[str],
+        agent: str = "",
+        personality: str = "",
+        project: str = "",
+        type_: str = "",
+        global_: bool | None = None,
+        limit: int = 10,
+        min_confidence: float = 0.3,
+        reinforce_hits: bool = False,
+        mode: SearchMode = SearchMode.SEMANTIC,
+        include_content: bool = True,
+    ) -> MultiSearchResponse:
+        """Run several searches with shared filters in one store call.
+
+        The store batches the queries (and fans out across partitions
+        concurrently); each query's lexical ranking runs concurrently
+        with the others and with the store call.  Results are grouped
+        per query, in input order.
+        """
+        filters = self._search_filters(agent, personality, project, type_, global_)
+        await self._ensure_migrated(min_confidence)
+        grouped, misses, where, save = await asyncio.to_thread(
+            self._plan_search, queries, filters, limit, min_confidence, mode, include_content
+        )
+
+        async def semantic() -> None:
+            if misses:
+                fetched = await self._store.search_many(
+                    [queries[i] for i in misses],
+                    n_results=limit,
+                    where=where,
+                    include_content=include_content,
+                )
+                await asyncio.to_thread(save, fetched)
+
+        _, lexical = await asyncio.gather(
+            semantic(), self._lexical_rankings(queries, mode, where, limit, include_content)
+        )
+        grouped = self._merge_rankings(mode, grouped, lexical, limit)
+        return self._multi_search_response(queries, grouped, min_confidence, reinforce_hits)
+
+    # ------------------------------------------------------------------
+    # Get / reinforce / delete
+    # ------------------------------------------------------------------
+
+    async def get_memory(self, id: str, include_content: bool = True) -> MemoryResponse:
+        """Retrieve a single memory by ID (MemoryNotFoundError if missing)."""
+        doc = await self._store.get(id, include_content=include_content)
+        return self._memory_response(id, doc)
+
+    async def list_memories(
+        self,
+        agent: str = "",
+        personality: str = "",
+        project: str = "",
+        type_: str = "",
+        global_: bool | None = None,
+        min_confidence: float = 0.0,
+        sort: ListSort = ListSort.STORED,
+        limit: int = 10,
+        cursor: str | None = None,
+        include_content: bool = True,
+    ) -> ListResponse:
+        """Page through memories by metadata (see MemoryService.list_memories)."""
+        await self._ensure_migrated(min_confidence)
+        where = self._build_where(agent, personality, project, type_, global_, min_confidence)
+        state = self._decode_cursor(cursor, sort)
+        if sort == ListSort.STORED:
+            docs, store_cursor = await self._store.get_page(
+                where=where,
+                limit=limit,
+                cursor=state.get("store"),
+                include_content=include_content,
+            )
+            next_state = None
+            if store_cursor is not None:
+                next_state = {"sort": sort.value, "store": store_cursor}
+            return self._list_response(docs, min_confidence, next_state)
+
+        after = tuple(state["after"]) if "after" in state else None
+        best: list[tuple[float, str, dict]] = []
+        async for page in self._scan(where, include_content=include_content):
+            best = self._list_merge(best, page, sort, after, limit)
+        return self._sorted_list_response(best, sort, limit, min_confidence)
+
+    async def reinforce_memory(self, id: str) -> dict:
+        """Reset the decay timer for a reinforceable memory."""
+        now, patch = self._reinforcement(id, await self._store.get(id))
+        await self._store.update_metadata(id, patch)
+        await asyncio.to_thread(self._patch_index, [id], [patch])
+        await asyncio.to_thread(self._invalidate_results)
+
+        return {"id": id, "reinforced_at": now, "confidence": 1.0}
+
+    async def reinforce_memories(self, ids: list[str]) -> dict:
+        """Reinforce many memories with one batched get and update."""
+        return await self._apply_bulk(ids, self._prepare_reinforce)
+
+    async def flush_reinforcements(self, due_only: bool = False) -> int:
+        """Apply queued ``reinforce_hits`` reinforcements in one update.
+
+        Nothing flushes at interpreter exit for the async service, so
+        callers await this periodically (``due_only=True``) and before
+        shutting down.
+        """
+        if due_only and not self._reinforcements.due():
+            return 0
+        ids, patches = self._reinforcements.drain()
+        if ids:
+            await self._store.update_metadata_many(ids, patches)
+            await asyncio.to_thread(self._patch_index, ids, patches)
+            await asyncio.to_thread(self._invalidate_results)
+        return len(ids)
+
+    async def delete_memory(self, id: str) -> dict:
+        """Soft-delete a memory by setting its deleted flag."""
+        self._check_deletable(id, await self._store.get(id))
+        await self._store.update_metadata(id, {"deleted": True})
+        await asyncio.to_thread(self._unindex, [id])
+        await asyncio.to_thread(self._invalidate_results)
+
+        return {"id": id, "deleted": True}
+
+    async def delete_memories(self, ids: list[str]) -> dict:
+        """Soft-delete many memories with one batched get and update."""
+        report = await self._apply_bulk(ids, self._prepare_delete)
+        await asyncio.to_thread(
+            self._unindex, [r["id"] for r in report["results"] if "error" not in r]
+        )
+        return report
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    async def get_status(self) -> dict:
+        """Check store health and return collection stats."""
+        healthy = await self._store.heartbeat()
+        if not healthy:
+            return await asyncio.to_thread(self._status, False, 0, await self._store.stats())
+        count, stats = await asyncio.gather(self._store.count(), self._store.stats())
+        return await asyncio.to_thread(self._status, True, count, stats)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    async def migrate_metadata(self) -> dict:
+        """Backfill derived metadata (and the lexical index), page by page."""
+        scanned = updated = indexed = 0
+        async for page in self._scan():
+            scanned += len(page)
+            ids, metadatas = self._migration_updates(page)
+            if ids:
+                await self._store.update_metadata_many(ids, metadatas)
+                updated += len(ids)
+            indexed += await asyncio.to_thread(
+                self._index, *self._page_columns(page, dict(zip(ids, metadatas)))
+            )
+        if updated:
+            await asyncio.to_thread(self._invalidate_results)
+        await asyncio.to_thread(self._mark_migrated)
+        return self._migration_report(scanned, updated, indexed)
+
+    async def _ensure_migrated(self, min_confidence: float) -> None:
+        """Backfill ``expires_at`` once (see MemoryService._ensure_migrated)."""
+        if (
+            min_confidence <= 0
+            or self._migrated
+            or not await asyncio.to_thread(self._migration_due)
+        ):
+            return
+        page, _ = await self._store.get_page(limit=1, include_content=False)
+        if self._predates_expiry(page):
+            await self.migrate_metadata()
+        else:
+            await asyncio.to_thread(self._mark_migrated)
+
+    async def export_memories(
+        self,
+        agent: str = "",
+        project: str = "",
+        include_deleted: bool = False,
+        include_embeddings: bool = False,
+    ) -> AsyncIterator[dict]:
+        """Yield every matching memory page by page (see MemoryService.export_memories)."""
+        where = self._export_where(agent, project, include_deleted)
+        async for page in self._scan(where, include_embeddings):
+            for record in page:
+                yield record
+
+    async def import_memories(self, records: Iterable[dict]) -> AsyncIterator[dict]:
+        """Upsert exported records in chunks (see MemoryService.import_memories)."""
+        model = self._store.embedding_model()
+        records = iter(records)
+        while chunk := list(islice(records, self._settings.batch_size)):
+            ids, contents, metadatas, embeddings = self._import_batch(chunk, model)
+            await self._store.upsert_many(ids, contents, metadatas, embeddings)
+            await asyncio.to_thread(self._index, ids, contents, metadatas)
+            await asyncio.to_thread(self._invalidate_results)
+            yield {
+                "imported": len(chunk),
+                "reused_embeddings": sum(e is not None for e in embeddings),
+            }
+
+    async def compact(
+        self,
+        grace_hours: float | None = None,
+        dry_run: bool = False,
+        archive: Callable[[list[dict]], None] | None = None,
+    ) -> dict:
+        """Hard-delete soft-deleted and long-dead memories (see MemoryService.compact)."""
+        where = self._compact_where(grace_hours)
+
+        deleted = decayed = 0
+        cursor = None
+        while True:
+            page, next_cursor = await self._store.get_page(
+                where=where, limit=self._settings.batch_size, cursor=cursor
+            )
+            page_deleted, page_decayed = self._compact_counts(page)
+            deleted += page_deleted
+            decayed += page_decayed
+            if page and not dry_run:
+                if archive is not None:
+                    archive(page)
+                ids = [doc["id"] for doc in page]
+                await self._store.delete_many(ids)
+                await asyncio.to_thread(self._unindex, ids)
+            if next_cursor is None:
+                break
+            cursor = next_cursor if dry_run else None
+
+        if (deleted or decayed) and not dry_run:
+            await asyncio.to_thread(self._invalidate_results)
+        return self._compact_report(deleted, decayed, dry_run)
+
+    async def consolidate(
+        self,
+        threshold: float | None = None,
+        project: str | None = None,
+        keep: ConsolidateKeep = ConsolidateKeep.NEWEST,
+        hard_delete: bool = False,
+        dry_run: bool = False,
+    ) -> dict:
+        """Merge near-duplicate memories per project (see MemoryService.consolidate)."""
+        if threshold is None:
+            threshold = self._settings.consolidate_threshold
+        if project is None:
+            projects = sorted({
+                doc["metadata"].get("project", "")
+                async for page in self._scan({"deleted": False}, include_content=False)
+                for doc in page
+            })
+        else:
+            projects = [project]
+
+        scanned = 0
+        plan: list[dict] = []
+        for name in projects:
+            candidates = []
+            where = {"project": name, "deleted": False}
+            async for page in self._scan(where, include_embeddings=True, include_content=False):
+                scanned += len(page)
+                candidates += self._consolidation_candidates(page, keep)
+            plan += self._consolidation_plan(name, candidates, threshold)
+
+        removed = [id for cluster in plan for id in cluster["remove"]]
+        if removed and not dry_run:
+            for ids in self._batches(removed):
+                if hard_delete:
+                    await self._store.delete_many(ids)
+                else:
+                    await self._store.update_metadata_many(
+                        ids, [{"deleted": True}] * len(ids)
+                    )
+            await asyncio.to_thread(self._unindex, removed)
+            await asyncio.to_thread(self._invalidate_results)
+        return self._consolidation_report(scanned, plan, hard_delete, dry_run)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    async def _refresh_duplicate(self, doc: dict) -> MemoryResponse:
+        """Return existing memory *doc* for a merged create."""
+        patch = self._merge_duplicate(doc)
+        if patch is not None:
+            await self._store.update_metadata(doc["id"], patch)
+            await asyncio.to_thread(self._patch_index, [doc["id"]], [patch])
+            await asyncio.to_thread(self._invalidate_results)
+            doc = {**doc, "metadata": {**doc["metadata"], **patch}}
+        return self._memory_response(doc["id"], doc)
+
+    async def _lexical_rankings(
+        self,
+        queries: list[str],
+        mode: SearchMode,
+        where: dict,
+        limit: int,
+        include_content: bool,
+    ) -> list[list[dict]]:
+        """Lexical hits per query, run concurrently ([] in semantic mode)."""
+        if mode == SearchMode.SEMANTIC:
+            return []
+        return list(
+            await asyncio.gather(
+                *(self._lexical_search(q, where, limit, include_content) for q in queries)
+            )
+        )
+
+    async def _lexical_search(
+        self, query: str, where: dict, limit: int, include_content: bool = True
+    ) -> list[dict]:
+        """Top *limit* live memories by BM25 (see MemoryService._lexical_search)."""
+        page_size = max(limit * 2, 20)
+        hits: list[dict] = []
+        offset = 0
+        while len(hits) < limit:
+            ranked = await asyncio.to_thread(
+                self._lexical_ranked, query, where, page_size, offset
+            )
+            if ranked:
+                ids = [id for id, _ in ranked]
+                docs = await asyncio.to_thread(self._indexed_docs, ids, include_content)
+                missing = [id for id in ids if id not in docs]
+                if missing:
+                    docs.update(zip(missing, await self._store.get_many(missing, include_content)))
+                hits += self._lexical_hits(ranked, [docs[id] for id in ids], where)
+            if len(ranked) < page_size:
+                break
+            offset += page_size
+        return hits[:limit]
+
+    async def _scan(
+        self,
+        where: dict | None = None,
+        include_embeddings: bool = False,
+        include_content: bool = True,
+    ) -> AsyncIterator[list[dict]]:
+        """Yield the store's documents page by page (``batch_size`` each)."""
+        cursor = None
+        while True:
+            page, cursor = await self._store.get_page(
+                where=where,
+                limit=self._settings.batch_size,
+                cursor=cursor,
+                include_embeddings=include_embeddings,
+                include_content=include_content,
+            )
+            if page:
+                yield page
+            if cursor is None:
+                return
+
+    async def _apply_bulk(
+        self,
+        ids: list[str],
+        prepare: Callable[[str, dict | None], tuple[dict, dict]],
+    ) -> dict:
+        """Validate *ids* with one get_many and apply patches with one update."""
+        ids = list(dict.fromkeys(ids))
+        docs = await self._store.get_many(ids) if ids else []
+        results, update_ids, patches = self._plan_bulk(ids, docs, prepare)
+        if update_ids:
+            await self._store.update_metadata_many(update_ids, patches)
+            await asyncio.to_thread(self._patch_index, update_ids, patches)
+            await asyncio.to_thread(self._invalidate_results)
+        return self._bulk_report(results)
@@ -0,0 +1,70 @@
+"""Near-duplicate clustering for ``memory consolidate``.
+
+Pure functions over an embedding matrix — no store access.  Cosine
+similarities are computed one ``block_size`` × ``block_size`` tile at
+a time (only the upper triangle of tiles), so peak memory is the
+embeddings plus one tile rather than the full N × N matrix.  Pairs at
+or above the threshold are joined with union-find, which makes
+clusters transitive: A~B and B~C put A and C together even when A and
+C alone fall below the threshold.
+"""
+
+from collections.abc import Iterator
+
+import numpy as np
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so dot products are cosine similarities."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def similar_pairs(
+    vectors: np.ndarray, threshold: float, block_size: int
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Yield ``(rows, cols)`` index arrays of pairs with cosine >= *threshold*.
+
+    *vectors* must already be unit length.  Each pair ``i < j`` is
+    reported once; one tile's pairs are yielded per step.
+    """
+    n = len(vectors)
+    for start in range(0, n, block_size):
+        block = vectors[start:start + block_size]
+        for other in range(start, n, block_size):
+            sims = block @ vectors[other:other + block_size].T
+            rows, cols = np.nonzero(sims >= threshold)
+            rows += start
+            cols += other
+            upper = rows < cols
+            if upper.any():
+                yield rows[upper], cols[upper]
+
+
+def cluster_duplicates(
+    vectors: np.ndarray, threshold: float, block_size: int
+) -> list[list[int]]:
+    """Group row indices of *vectors* connected by cosine >= *threshold*.
+
+    Returns only groups of two or more, each in ascending row order.
+    """
+    vectors = normalize(vectors)
+    parent = list(range(len(vectors)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for rows, cols in similar_pairs(vectors, threshold, block_size):
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(parent)):
+        groups.setdefault(find(i), []).append(i)
+    return [members for members in groups.values() if len(members) > 1]
@@ -1,11 +1,20 @@
 """Confidence decay computation for memories.
 
-Pure function — no classes, no state, no I/O.  The only logic here
-is the linear-decay formula applied differently per decay policy.
+Pure functions — no classes, no state, no I/O.  The only logic here
+is the linear-decay formula applied differently per decay policy, plus
+its inverse: the epoch at which a memory's confidence reaches zero.
+``compute_confidence_batch`` is the vectorized form for many memories.
 """
 
+from collections.abc import Sequence
 from datetime import datetime, timezone
 
+import numpy as np
+
+# expires_at for memories that never decay (9999-12-31T23:59:59Z).  A
+# finite number, because ChromaDB metadata must be JSON-serializable.
+NEVER_EXPIRES = 253402300799.0
+
 
 def compute_confidence(
     decay_policy: str,
@@ -41,3 +50,64 @@ def compute_confidence(
 
     confidence = max(0.0, 1.0 - (age_hours / half_life_hours))
     return round(confidence, 4)
+
+
+def compute_confidence_batch(
+    decay_policies: Sequence[str] | np.ndarray,
+    created_at: Sequence[float] | np.ndarray,
+    last_reinforced_at: Sequence[float] | np.ndarray,
+    half_life_hours: float,
+    now: float | None = None,
+) -> np.ndarray:
+    """Vectorized compute_confidence over epoch-second arrays.
+
+    *last_reinforced_at* uses NaN for "never reinforced".  Returns a
+    float64 array in [0.0, 1.0] rounded to 4 decimal places, matching
+    compute_confidence element for element.  *now* is epoch seconds.
+    """
+    policies = np.asarray(decay_policies)
+    created = np.asarray(created_at, dtype=np.float64)
+    reinforced = np.asarray(last_reinforced_at, dtype=np.float64)
+    if now is None:
+        now = datetime.now(timezone.utc).timestamp()
+
+    # Reinforceable memories age from their last reinforcement, if any.
+    use_reinforced = (policies == "reinforceable") & ~np.isnan(reinforced)
+    start = np.where(use_reinforced, reinforced, created)
+    age_hours = (now - start) / 3600
+
+    confidence = np.maximum(0.0, 1.0 - age_hours / half_life_hours)
+    confidence = np.where(policies == "stable", 1.0, confidence)
+    return np.round(confidence, 4)
+
+
+def compute_expires_at(
+    decay_policy: str,
+    created_at: datetime,
+    last_reinforced_at: datetime | None,
+    half_life_hours: float,
+) -> float:
+    """Return the epoch seconds at which confidence decays to 0.0.
+
+    Stored as ``expires_at`` metadata so searches can filter in the
+    store: confidence >= c exactly when ``expires_at >= now + c * half_life``.
+    Stable memories get NEVER_EXPIRES.
+    """
+    if decay_policy == "stable":
+        return NEVER_EXPIRES
+
+    if decay_policy == "reinforceable" and last_reinforced_at is not None:
+        start = last_reinforced_at
+    else:
+        start = created_at
+    return start.timestamp() + half_life_hours * 3600
+
+
+def min_expires_at(
+    min_confidence: float,
+    half_life_hours: float,
+    now: datetime | None = None,
+) -> float:
+    """Return the smallest ``expires_at`` that still has *min_confidence*."""
+    now = now or datetime.now(timezone.utc)
+    return now.timestamp() + min_confidence * half_life_hours * 3600
@@ -0,0 +1,190 @@
+"""Local BM25 keyword index over memory content.
+
+Embeddings blur exact identifiers (ticket numbers, file paths,
+function names), so ``search --mode lexical|hybrid`` also ranks
+memories with SQLite FTS5's BM25.  The index is a SQLite file under
+``data_dir`` that the service updates on every create, soft delete,
+import and compact; ``migrate_metadata`` backfills memories written
+before it existed.
+
+Only live (not soft-deleted) memories are indexed, together with their
+scope columns (agent, personality, project, type, global), which never
+change after creation, so filtered lookups are answered here.  Each row
+also keeps the memory's full metadata, which the service patches on
+every reinforce, so lexical results are built without the store.  Rows
+indexed before metadata was kept have none; the service reads those
+from the store until ``migrate_metadata`` re-indexes them.  Decay
+changes with time and is checked by the service against the metadata.
+
+Query text is split on whitespace and each chunk becomes an FTS phrase
+of its word tokens (``PROJ-1234`` → ``"proj 1234"``, ``cli.py`` →
+``"cli py"``), matching how the default tokenizer split the content.
+Chunks are OR-ed so BM25 ranks by how many, and how rare, the matched
+terms are.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+# Reciprocal rank fusion damping constant (Cormack et al. use 60).
+RRF_K = 60
+
+# Metadata keys stored beside the text for filtering, in column order.
+_SCOPE = ("agent", "personality", "project", "type", "global_")
+
+# Bound on the number of ``?`` placeholders per IN (...) query.
+_CHUNK = 500
+
+# Word tokens as FTS5's unicode61 tokenizer sees them (no underscores).
+_TOKEN = re.compile(r"[^\W_]+")
+
+
+def fts_query(text: str) -> str:
+    """Translate free text into an FTS5 MATCH expression ("" if no words)."""
+    phrases = []
+    for chunk in text.split():
+        tokens = _TOKEN.findall(chunk)
+        if tokens:
+            phrases.append('"' + " ".join(tokens) + '"')
+    return " OR ".join(dict.fromkeys(phrases))
+
+
+def reciprocal_rank_fusion(rankings: list[list[dict]], limit: int) -> list[dict]:
+    """Merge ranked hit lists by summed ``1 / (RRF_K + rank)`` per ID.
+
+    Each hit keeps the document from the first list it appears in (and
+    any ``distance`` it carries); ``score`` is set to the fused score
+    (higher ranks first).
+    """
+    scores: dict[str, float] = {}
+    docs: dict[str, dict] = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, start=1):
+            scores[hit["id"]] = scores.get(hit["id"], 0.0) + 1.0 / (RRF_K + rank)
+            docs.setdefault(hit["id"], hit)
+    order = sorted(scores, key=scores.__getitem__, reverse=True)[:limit]
+    return [{**docs[id], "score": round(scores[id], 6)} for id in order]
+
+
+class LexicalIndex:
+    """FTS5 table of live memory content plus their scope columns."""
+
+    def __init__(self, path: str) -> None:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                rowid INTEGER PRIMARY KEY,
+                id TEXT UNIQUE NOT NULL,
+                agent TEXT NOT NULL,
+                personality TEXT NOT NULL,
+                project TEXT NOT NULL,
+                type TEXT NOT NULL,
+                global_ INTEGER NOT NULL,
+                metadata TEXT
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS terms USING fts5(content);
+            """
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(docs)")}
+        if "metadata" not in columns:  # Index files from before metadata was kept.
+            self._db.execute("ALTER TABLE docs ADD COLUMN metadata TEXT")
+        self._db.commit()
+
+    def put_many(self, ids: list[str], contents: list[str], metadatas: list[dict]) -> None:
+        """Index (or re-index) memories by ID."""
+        with self._lock, self._db:
+            self._delete(ids)
+            for id, content, meta in zip(ids, contents, metadatas):
+                scope = [meta.get(key, "") for key in _SCOPE[:-1]]
+                rowid = self._db.execute(
+                    "INSERT INTO docs (id, agent, personality, project, type, global_, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (id, *scope, bool(meta.get("global_", False)), json.dumps(meta)),
+                ).lastrowid
+                self._db.execute(
+                    "INSERT INTO terms (rowid, content) VALUES (?, ?)", (rowid, content)
+                )
+
+    def patch_many(self, ids: list[str], patches: list[dict]) -> None:
+        """Merge metadata patches into indexed memories (others are ignored)."""
+        with self._lock, self._db:
+            for id, patch in zip(ids, patches):
+                row = self._db.execute(
+                    "SELECT metadata FROM docs WHERE id = ? AND metadata IS NOT NULL", (id,),
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE docs SET metadata = ? WHERE id = ?",
+                        (json.dumps({**json.loads(row[0]), **patch}), id),
+                    )
+
+    def remove_many(self, ids: list[str]) -> None:
+        """Drop memories from the index (unknown IDs are ignored)."""
+        with self._lock, self._db:
+            self._delete(ids)
+
+    def get_many(self, ids: list[str]) -> dict[str, dict]:
+        """Indexed memories among *ids* as ``{id, content, metadata}``, keyed by ID.
+
+        Rows indexed without metadata are omitted.
+        """
+        found: dict[str, dict] = {}
+        with self._lock:
+            for start in range(0, len(ids), _CHUNK):
+                chunk = ids[start:start + _CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                for id, content, metadata in self._db.execute(
+                    "SELECT docs.id, terms.content, docs.metadata FROM docs "
+                    "JOIN terms ON terms.rowid = docs.rowid "
+                    f"WHERE docs.id IN ({placeholders}) AND docs.metadata IS NOT NULL",
+                    chunk,
+                ):
+                    found[id] = {"id": id, "content": content, "metadata": json.loads(metadata)}
+        return found
+
+    def search(
+        self, query: str, limit: int, offset: int = 0, where: dict | None = None
+    ) -> list[tuple[str, float]]:
+        """Rank memories matching *query*; return ``(id, bm25 score)`` pairs.
+
+        Plain equality conditions on scope keys in *where* (as built by
+        the service) are applied here; other conditions are ignored and
+        left to the caller.  Higher scores are better.
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+        sql = (
+            "SELECT docs.id, -bm25(terms) FROM terms "
+            "JOIN docs ON docs.rowid = terms.rowid WHERE terms MATCH ?"
+        )
+        params: list = [match]
+        for key in _SCOPE:
+            value = (where or {}).get(key)
+            if value is not None and not isinstance(value, dict):
+                sql += f" AND docs.{key} = ?"
+                params.append(value)
+        sql += " ORDER BY bm25(terms) LIMIT ? OFFSET ?"
+        with self._lock:
+            return self._db.execute(sql, (*params, limit, offset)).fetchall()
+
+    def stats(self) -> dict:
+        """Return the number of indexed memories."""
+        with self._lock:
+            (documents,) = self._db.execute("SELECT COUNT(*) FROM docs").fetchone()
+        return {"documents": documents}
+
+    def _delete(self, ids: list[str]) -> None:
+        """Remove rows for *ids* from both tables (caller holds the lock)."""
+        for id in ids:
+            row = self._db.execute("SELECT rowid FROM docs WHERE id = ?", (id,)).fetchone()
+            if row is not None:
+                self._db.execute("DELETE FROM terms WHERE rowid = ?", row)
+                self._db.execute("DELETE FROM docs WHERE rowid = ?", row)
@@ -3,22 +3,64 @@
 Orchestrates all create / search / get / reinforce / delete / status
 operations.  Depends only on the VectorStore protocol and Settings —
 never imports ChromaDB directly.
+
+Everything that does not touch the store (metadata construction,
+where-clauses, confidence, validation) lives on ``BaseMemoryService``
+so the asyncio variant in ``async_memory_service`` shares it.
 """
 
+import base64
+import hashlib
+import heapq
+import json
+import math
 import uuid
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime, timezone
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+
+import numpy as np
 
 from memories.config import Settings
 from memories.models import (
+    ConsolidateKeep,
     DecayPolicy,
+    ListResponse,
+    ListSort,
     MemoryCreate,
     MemoryResponse,
+    MultiSearchResponse,
+    QuerySearchResponse,
+    SearchMode,
     SearchResponse,
     SearchResultItem,
 )
-from memories.services.decay import compute_confidence
+from memories.profiling import timed
+from memories.services.consolidation import cluster_duplicates
+from memories.services.decay import (
+    compute_confidence_batch,
+    compute_expires_at,
+    min_expires_at,
+)
+from memories.services.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from memories.services.result_cache import ResultCache, result_cache_key
+from memories.services.write_behind import ReinforcementBuffer
+from memories.stores.outbox import OutboxStore, matches_where
 from memories.stores.vector_store import VectorStore
 
+# Width of the min_confidence buckets in result-cache keys.  A cached
+# search pushes down the bucket's lower edge, so every threshold in the
+# bucket can be served from it after exact filtering.
+_CONFIDENCE_BUCKET = 0.05
+
+# Orders (negated sort value, id) entries of a sorted listing.
+_LIST_ORDER = itemgetter(0, 1)
+
+# Metadata that must match for two memories to count as duplicates.
+_SCOPE_KEYS = ("agent", "personality", "project", "type", "global_")
+
 
 # ---------------------------------------------------------------------------
 # Custom exceptions — the CLI maps these to user-facing error output.
@@ -39,29 +81,834 @@ class InvalidOperationError(Exception):
         super().__init__(message)
 
 
+class DuplicateMemoryError(InvalidOperationError):
+    """Raised by create under ``duplicate_policy="reject"`` for repeated content."""
+
+    def __init__(self, id: str) -> None:
+        self.id = id
+        super().__init__(f"Memory duplicates existing memory '{id}'")
+
+
 # ---------------------------------------------------------------------------
-# Service
+# Shared logic
 # ---------------------------------------------------------------------------
 
-class MemoryService:
-    """Business logic layer sitting between the CLI and the VectorStore."""
+class BaseMemoryService:
+    """Store-independent logic shared by the sync and async services."""
 
-    def __init__(self, store: VectorStore, settings: Settings) -> None:
+    def __init__(
+        self,
+        store,
+        settings: Settings,
+        result_cache: ResultCache | None = None,
+        lexical_index: LexicalIndex | None = None,
+    ) -> None:
         self._store = store
         self._settings = settings
+        self._result_cache = result_cache
+        self._lexical_index = lexical_index
+        self._reinforcements = ReinforcementBuffer(
+            max_delay_seconds=settings.reinforce_flush_seconds,
+            max_entries=settings.batch_size,
+        )
+        self._migrated = False
 
-    # ------------------------------------------------------------------
-    # Create
-    # ------------------------------------------------------------------
+    @timed("service.result_cache")
+    def _lookup_results(
+        self,
+        queries: list[str],
+        filters: dict,
+        limit: int,
+        min_confidence: float,
+        include_content: bool = True,
+    ) -> tuple[list[list[dict] | None], list[int], dict, Callable]:
+        """Split *queries* into result-cache hits and misses.
 
-    def create_memory(self, data: MemoryCreate) -> MemoryResponse:
-        """Store a new memory and return it with confidence 1.0.
+        Returns ``(grouped, misses, where, save)``: *grouped* holds cached
+        raw hits with None at each index in *misses*.  The caller runs
+        the missed queries with *where* and hands their results to
+        ``save``, which fills *grouped* and populates the cache.
+
+        With the cache on, the pushed-down threshold is the lower edge of
+        *min_confidence*'s bucket so cached hits are valid for every
+        threshold in it; callers filter exactly afterwards.  Hits fetched
+        without content are cached under their own keys.
+        """
+        if self._result_cache is None:
+            grouped: list = [None] * len(queries)
+
+            def save(fetched: list[list[dict]]) -> None:
+                grouped[:] = fetched
+
+            where = self._build_where(**filters, min_confidence=min_confidence)
+            return grouped, list(range(len(queries))), where, save
+
+        bucket = round(
+            math.floor(round(min_confidence / _CONFIDENCE_BUCKET, 6))
+            * _CONFIDENCE_BUCKET,
+            4,
+        )
+        key_filters = filters if include_content else {**filters, "content": False}
+        keys = [result_cache_key(q, key_filters, limit, bucket) for q in queries]
+        # Read the generation before querying: results that race with a
+        # write are stored under the old generation and never served.
+        generation = self._result_cache.generation()
+        grouped = self._result_cache.get_many(keys, generation)
+        misses = [i for i, results in enumerate(grouped) if results is None]
+
+        def save(fetched: list[list[dict]]) -> None:
+            for i, results in zip(misses, fetched):
+                grouped[i] = results
+            self._result_cache.put_many([keys[i] for i in misses], fetched, generation)
+
+        return grouped, misses, self._build_where(**filters, min_confidence=bucket), save
+
+    def _invalidate_results(self) -> None:
+        """Bump the result-cache generation after a write."""
+        if self._result_cache is not None:
+            self._result_cache.bump()
+
+    def _index(self, ids: list[str], contents: list[str], metadatas: list[dict]) -> int:
+        """Bring the lexical index up to date for these documents.
+
+        Live memories are (re-)indexed and soft-deleted ones dropped.
+        Returns how many were indexed (0 without an index).
+        """
+        if self._lexical_index is None:
+            return 0
+        live = [i for i, meta in enumerate(metadatas) if not meta.get("deleted", False)]
+        self._lexical_index.put_many(
+            [ids[i] for i in live], [contents[i] for i in live], [metadatas[i] for i in live]
+        )
+        self._unindex([id for i, id in enumerate(ids) if metadatas[i].get("deleted", False)])
+        return len(live)
+
+    def _unindex(self, ids: list[str]) -> None:
+        """Drop deleted memories from the lexical index."""
+        if self._lexical_index is not None and ids:
+            self._lexical_index.remove_many(ids)
+
+    def _patch_index(self, ids: list[str], patches: list[dict]) -> None:
+        """Merge metadata written to the store into the lexical index's copy."""
+        if self._lexical_index is not None and ids:
+            self._lexical_index.patch_many(ids, patches)
+
+    def _indexed_docs(self, ids: list[str], include_content: bool) -> dict[str, dict]:
+        """Documents for *ids* as the lexical index holds them, keyed by ID.
+
+        IDs indexed without metadata are omitted; the caller reads them
+        from the store.
+        """
+        docs = self._lexical_index.get_many(ids)
+        if not include_content:
+            for doc in docs.values():
+                doc["content"] = ""
+        return docs
+
+    @timed("service.lexical")
+    def _lexical_ranked(
+        self, query: str, where: dict, limit: int, offset: int
+    ) -> list[tuple[str, float]]:
+        """One page of BM25-ranked ``(id, score)`` candidates for *query*."""
+        if self._lexical_index is None:
+            raise InvalidOperationError(
+                "Lexical and hybrid search need the lexical index (LEXICAL_INDEX=true)"
+            )
+        return self._lexical_index.search(query, limit, offset, where)
+
+    @staticmethod
+    def _lexical_hits(
+        ranked: list[tuple[str, float]], docs: list[dict | None], where: dict
+    ) -> list[dict]:
+        """Documents for *ranked* that still satisfy *where*.
+
+        The index only filters by scope; expiry (and anything the index
+        missed) is checked against the documents' metadata.  Hits carry
+        the BM25 ``score`` instead of a ``distance``.
+        """
+        return [
+            {**doc, "score": round(score, 6)}
+            for (_, score), doc in zip(ranked, docs)
+            if doc is not None and matches_where(doc["metadata"], where)
+        ]
+
+    @staticmethod
+    def _search_filters(
+        agent: str, personality: str, project: str, type_: str, global_: bool | None
+    ) -> dict:
+        """Scope filters of a search, keyed as ``_build_where`` takes them."""
+        return {
+            "agent": agent,
+            "personality": personality,
+            "project": project,
+            "type_": type_,
+            "global_": global_,
+        }
+
+    def _plan_search(
+        self,
+        queries: list[str],
+        filters: dict,
+        limit: int,
+        min_confidence: float,
+        mode: SearchMode,
+        include_content: bool = True,
+    ) -> tuple[list[list[dict] | None], list[int], dict, Callable | None]:
+        """``(grouped, misses, where, save)`` for *queries* as in _lookup_results.
+
+        Lexical mode never asks the vector store, so it has no misses,
+        no *save*, and *where* carries the exact confidence threshold.
+        """
+        if mode == SearchMode.LEXICAL:
+            where = self._build_where(**filters, min_confidence=min_confidence)
+            return [[] for _ in queries], [], where, None
+        return self._lookup_results(queries, filters, limit, min_confidence, include_content)
+
+    @staticmethod
+    def _merge_rankings(
+        mode: SearchMode,
+        semantic: list[list[dict]],
+        lexical: list[list[dict]],
+        limit: int,
+    ) -> list[list[dict]]:
+        """Raw hits per query for *mode* (hybrid fuses both rankings)."""
+        if mode == SearchMode.LEXICAL:
+            return lexical
+        if mode == SearchMode.HYBRID:
+            return [
+                reciprocal_rank_fusion([hits, keyword_hits], limit)
+                for hits, keyword_hits in zip(semantic, lexical)
+            ]
+        return semantic
+
+    def _search_items(
+        self, raw_results: list[dict], min_confidence: float, reinforce_hits: bool
+    ) -> list[SearchResultItem]:
+        """Confidence-gated items, queuing their reinforcement if asked."""
+        items = self._to_search_items(raw_results, min_confidence)
+        if reinforce_hits:
+            self._queue_reinforcements(raw_results, items)
+        return items
+
+    def _multi_search_response(
+        self,
+        queries: list[str],
+        grouped: list[list[dict]],
+        min_confidence: float,
+        reinforce_hits: bool,
+    ) -> MultiSearchResponse:
+        """One QuerySearchResponse per query, in input order."""
+        responses = []
+        for query, raw_results in zip(queries, grouped):
+            items = self._search_items(raw_results, min_confidence, reinforce_hits)
+            responses.append(
+                QuerySearchResponse(query=query, results=items, count=len(items))
+            )
+        return MultiSearchResponse(queries=responses)
+
+    def _memory_response(
+        self, id: str, doc: dict | None, confidence: float | None = None
+    ) -> MemoryResponse:
+        """Build the get response, or raise if *doc* is missing/deleted."""
+        if doc is None or doc["metadata"].get("deleted", False):
+            raise MemoryNotFoundError(id)
+
+        meta = doc["metadata"]
+        if confidence is None:
+            confidence = self._compute_confidence_from_meta(meta)
+
+        return MemoryResponse(
+            id=doc["id"],
+            content=doc["content"],
+            agent=meta.get("agent", ""),
+            personality=meta.get("personality", ""),
+            project=meta.get("project", ""),
+            type=meta.get("type", ""),
+            global_=meta.get("global_", False),
+            decay_policy=DecayPolicy(meta["decay_policy"]),
+            confidence=confidence,
+            created_at=meta.get("created_at", ""),
+            last_reinforced_at=meta.get("last_reinforced_at", ""),
+        )
+
+    @staticmethod
+    def _encode_cursor(state: dict) -> str:
+        """Opaque ``list`` cursor carrying *state*."""
+        return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str | None, sort: ListSort) -> dict:
+        """State of a ``list`` cursor issued for *sort* ({} without one)."""
+        if not cursor:
+            return {}
+        try:
+            state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, UnicodeDecodeError):
+            state = None
+        if not isinstance(state, dict) or state.get("sort") != sort.value:
+            raise InvalidOperationError(f"Invalid cursor for --sort {sort.value}")
+        return state
+
+    def _list_entries(
+        self, page: list[dict], sort: ListSort, after: tuple | None
+    ) -> list[tuple[float, str, dict]]:
+        """``(-sort value, id, doc)`` for *page*, keeping those after *after*."""
+        if sort == ListSort.CONFIDENCE:
+            values = self._compute_confidences([d["metadata"] for d in page]).tolist()
+        else:
+            values = [_epochs_from_meta(d["metadata"])[0] for d in page]
+        entries = [(-value, doc["id"], doc) for value, doc in zip(values, page)]
+        if after is not None:
+            entries = [entry for entry in entries if _LIST_ORDER(entry) > after]
+        return entries
+
+    def _list_merge(
+        self,
+        best: list[tuple[float, str, dict]],
+        page: list[dict],
+        sort: ListSort,
+        after: tuple | None,
+        limit: int,
+    ) -> list[tuple[float, str, dict]]:
+        """Fold *page* into *best*, the first *limit* + 1 entries in list order."""
+        entries = best + self._list_entries(page, sort, after)
+        return heapq.nsmallest(limit + 1, entries, key=_LIST_ORDER)
+
+    def _sorted_list_response(
+        self,
+        best: list[tuple[float, str, dict]],
+        sort: ListSort,
+        limit: int,
+        min_confidence: float,
+    ) -> ListResponse:
+        """First *limit* of *best*, with a cursor after the last if more remain."""
+        next_state = None
+        if len(best) > limit:
+            next_state = {"sort": sort.value, "after": list(_LIST_ORDER(best[limit - 1]))}
+        docs = [doc for *_, doc in best[:limit]]
+        return self._list_response(docs, min_confidence, next_state)
+
+    def _list_response(
+        self, docs: list[dict], min_confidence: float, next_state: dict | None
+    ) -> ListResponse:
+        """Responses for *docs* at or above *min_confidence*, plus the next cursor."""
+        confidences = (
+            self._compute_confidences([d["metadata"] for d in docs]).tolist() if docs else []
+        )
+        results = [
+            self._memory_response(doc["id"], doc, confidence)
+            for doc, confidence in zip(docs, confidences)
+            if confidence >= min_confidence
+        ]
+        return ListResponse(
+            results=results,
+            count=len(results),
+            next_cursor=None if next_state is None else self._encode_cursor(next_state),
+        )
 
-        Generates a UUID, stamps created_at, and persists via the
-        VectorStore.  A just-created memory always has full confidence.
+    def _reinforcement(self, id: str, doc: dict | None) -> tuple[str, dict]:
+        """Validate that *doc* can be reinforced; return (timestamp, patch)."""
+        if doc is None or doc["metadata"].get("deleted", False):
+            raise MemoryNotFoundError(id)
+
+        policy = doc["metadata"].get("decay_policy", "")
+        if policy != DecayPolicy.REINFORCEABLE.value:
+            # Policy-specific messages per spec so the user knows *why* it failed.
+            if policy == DecayPolicy.STABLE.value:
+                msg = "Memory has stable decay policy, reinforcement has no effect"
+            elif policy == DecayPolicy.CONTEXTUAL.value:
+                msg = "Memory has contextual decay policy, reinforcement is not supported"
+            else:
+                msg = f"Memory has {policy} decay policy, cannot be reinforced"
+            raise InvalidOperationError(msg)
+
+        now_dt = datetime.now(timezone.utc)
+        now = now_dt.isoformat()
+        expires_at = compute_expires_at(
+            policy, now_dt, now_dt, self._settings.decay_half_life_hours
+        )
+        return now, {
+            "last_reinforced_at": now,
+            "last_reinforced_at_ts": now_dt.timestamp(),
+            "expires_at": expires_at,
+        }
+
+    def _queue_reinforcements(
+        self, raw_results: list[dict], items: list[SearchResultItem]
+    ) -> None:
+        """Queue reinforcement of the reinforceable memories among *items*.
+
+        Patches are built from the raw hits' metadata (search never
+        returns deleted memories), so no extra ``get`` is needed.
+        """
+        returned = {
+            item.id
+            for item in items
+            if item.decay_policy == DecayPolicy.REINFORCEABLE
+        }
+        patches = {}
+        for doc in raw_results:
+            if doc["id"] in returned:
+                _, patches[doc["id"]] = self._reinforcement(doc["id"], doc)
+        self._reinforcements.add(patches)
+
+    def _plan_bulk(
+        self,
+        ids: list[str],
+        docs: list[dict | None],
+        prepare: Callable[[str, dict | None], tuple[dict, dict]],
+    ) -> tuple[list[dict], list[str], list[dict]]:
+        """Validate each ID with *prepare*, collecting per-ID outcomes.
+
+        *prepare* returns ``(result, metadata patch)`` or raises one of
+        the service errors.  Returns the per-ID results (errors inline)
+        plus the IDs and patches to apply in one batched update.
         """
+        results, update_ids, patches = [], [], []
+        for id, doc in zip(ids, docs):
+            try:
+                result, patch = prepare(id, doc)
+            except (MemoryNotFoundError, InvalidOperationError) as exc:
+                results.append({"id": id, "error": str(exc)})
+                continue
+            results.append(result)
+            update_ids.append(id)
+            patches.append(patch)
+        return results, update_ids, patches
+
+    @staticmethod
+    def _bulk_report(results: list[dict]) -> dict:
+        """Wrap per-ID bulk results with success and failure counts."""
+        failed = sum("error" in result for result in results)
+        return {
+            "results": results,
+            "succeeded": len(results) - failed,
+            "failed": failed,
+        }
+
+    def _prepare_reinforce(self, id: str, doc: dict | None) -> tuple[dict, dict]:
+        """Bulk-reinforce step: confirmation and metadata patch for one ID."""
+        now, patch = self._reinforcement(id, doc)
+        return {"id": id, "reinforced_at": now, "confidence": 1.0}, patch
+
+    def _prepare_delete(self, id: str, doc: dict | None) -> tuple[dict, dict]:
+        """Bulk-delete step: confirmation and metadata patch for one ID."""
+        self._check_deletable(id, doc)
+        return {"id": id, "deleted": True}, {"deleted": True}
+
+    def _check_deletable(self, id: str, doc: dict | None) -> None:
+        """Raise unless *doc* exists and is not already soft-deleted."""
+        if doc is None:
+            raise MemoryNotFoundError(id)
+
+        if doc["metadata"].get("deleted", False):
+            raise InvalidOperationError(f"Memory '{id}' is already deleted")
+
+    def _status(self, healthy: bool, count: int, store_stats: dict) -> dict:
+        """Assemble the status payload from store health and stats."""
+        if self._settings.backend == "numpy":
+            host = self._settings.data_dir
+        else:
+            host = f"{self._settings.chromadb_host}:{self._settings.chromadb_port}"
+
+        status = {
+            "status": "healthy" if healthy else "unhealthy",
+            "backend": self._settings.backend,
+            "host": host,
+            "collection": self._settings.collection_name,
+            "count": count,
+        }
+        status.update(store_stats)
+        if self._result_cache is not None:
+            status["result_cache"] = self._result_cache.stats()
+        if self._lexical_index is not None:
+            status["lexical_index"] = self._lexical_index.stats()
+        return status
+
+    def _migration_marker(self) -> Path:
+        """File under ``data_dir`` recording that this collection was migrated."""
+        s = self._settings
+        location = (
+            f"{s.chromadb_host}:{s.chromadb_port}" if s.backend == "chromadb" else s.backend
+        )
+        key = hashlib.sha256(f"{location}/{s.collection_name}".encode()).hexdigest()[:16]
+        return Path(s.data_dir).expanduser() / "migrated" / key
+
+    def _migration_due(self) -> bool:
+        """True until this collection is known to carry ``expires_at``."""
+        if not self._migrated and self._migration_marker().exists():
+            self._migrated = True
+        return not self._migrated
+
+    def _mark_migrated(self) -> None:
+        """Record that every stored memory has its derived metadata."""
+        marker = self._migration_marker()
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+        self._migrated = True
+
+    @staticmethod
+    def _predates_expiry(page: list[dict]) -> bool:
+        """True if *page* (the oldest stored memory) was written without expires_at."""
+        return bool(page) and "expires_at" not in page[0]["metadata"]
+
+    def _migration_report(self, scanned: int, updated: int, indexed: int) -> dict:
+        """Migration counts, with ``indexed`` only when a lexical index exists."""
+        report = {"scanned": scanned, "updated": updated}
+        if self._lexical_index is not None:
+            report["indexed"] = indexed
+        return report
+
+    def _migration_updates(self, page: list[dict]) -> tuple[list[str], list[dict]]:
+        """IDs and derived-metadata patches for the stale documents in *page*."""
+        ids, metadatas = [], []
+        for doc in page:
+            meta = doc["metadata"]
+            if "decay_policy" not in meta or "created_at" not in meta:
+                continue  # Not written by this service.
+            derived = self._derived_metadata(meta)
+            derived["content_hash"] = content_hash(doc["content"])
+            if any(meta.get(key) != value for key, value in derived.items()):
+                ids.append(doc["id"])
+                metadatas.append(derived)
+        return ids, metadatas
+
+    @staticmethod
+    def _export_where(agent: str, project: str, include_deleted: bool) -> dict | None:
+        """Where clause for an export (None exports everything)."""
+        where: dict = {} if include_deleted else {"deleted": False}
+        if agent:
+            where["agent"] = agent
+        if project:
+            where["project"] = project
+        return where or None
+
+    def _import_batch(
+        self, chunk: list[dict], model: str
+    ) -> tuple[list[str], list[str], list[dict], list[list[float] | None]]:
+        """Upsert arguments for one import chunk (later duplicates win).
+
+        An exported embedding is reused only if it was made by *model*,
+        the store's own embedding model; anything else is re-embedded.
+        """
+        by_id = {record["id"]: record for record in chunk}
+        records = list(by_id.values())
+        embeddings = [
+            record.get("embedding")
+            if model and record.get("embedding_model") == model
+            else None
+            for record in records
+        ]
+        return (
+            [record["id"] for record in records],
+            [record["content"] for record in records],
+            [record["metadata"] for record in records],
+            embeddings,
+        )
+
+    @staticmethod
+    def _duplicate_where(metadata: dict, same_scope: bool) -> dict:
+        """Select live memories with *metadata*'s content hash (and scope)."""
+        where = {"content_hash": metadata["content_hash"], "deleted": False}
+        if same_scope:
+            where.update({key: metadata[key] for key in _SCOPE_KEYS})
+        return where
+
+    def _merge_duplicate(self, doc: dict) -> dict | None:
+        """Apply the duplicate policy to *doc*, an existing same-scope copy.
+
+        Raises DuplicateMemoryError under ``reject``; under ``merge``
+        returns the patch that refreshes a reinforceable memory's decay
+        timer (None when there is nothing to refresh).
+        """
+        if self._settings.duplicate_policy == "reject":
+            raise DuplicateMemoryError(doc["id"])
+        if doc["metadata"].get("decay_policy") != DecayPolicy.REINFORCEABLE.value:
+            return None
+        _, patch = self._reinforcement(doc["id"], doc)
+        return patch
+
+    @staticmethod
+    def _batch_duplicate_where(metadatas: list[dict]) -> dict:
+        """Select live memories sharing a content hash with any of *metadatas*."""
+        hashes = sorted({metadata["content_hash"] for metadata in metadatas})
+        return {"content_hash": {"$in": hashes}, "deleted": False}
+
+    def _plan_batch_create(
+        self,
+        chunk: list[MemoryCreate],
+        prepared: list[tuple[str, dict, MemoryResponse]],
+        existing: list[dict],
+    ) -> tuple[list[tuple], list[MemoryResponse], dict[str, dict], Exception | None]:
+        """Apply the duplicate policy to one ``create_memories`` chunk.
+
+        *existing* holds the live memories sharing a content hash with
+        the chunk (see ``_batch_duplicate_where``), with embeddings.  A
+        record repeating an earlier one in the chunk counts as a
+        duplicate of it.  Returns ``(rows, responses, patches, error)``:
+        rows to store as ``(id, content, metadata, embedding or None)``,
+        one response per accepted record in input order, merge patches
+        by memory ID, and the DuplicateMemoryError that stops the batch
+        under ``reject`` (the records before it are still stored).
+        """
+        if self._settings.duplicate_policy == "allow":
+            rows = [(id, data.content, meta, None) for data, (id, meta, _) in zip(chunk, prepared)]
+            return rows, [response for _, _, response in prepared], {}, None
+
+        same_scope: dict[tuple, dict] = {}
+        by_hash: dict[str, list[dict]] = {}
+        for doc in existing:
+            same_scope.setdefault(_scope_key(doc["metadata"]), doc)
+            by_hash.setdefault(doc["metadata"]["content_hash"], []).append(doc)
+
+        rows: list[tuple] = []
+        responses: list[MemoryResponse] = []
+        patches: dict[str, dict] = {}
+        for data, (memory_id, metadata, response) in zip(chunk, prepared):
+            key = _scope_key(metadata)
+            doc = same_scope.get(key)
+            if doc is None:
+                others = by_hash.get(metadata["content_hash"])
+                embedding = self._reusable_embedding(others) if others else None
+                rows.append((memory_id, data.content, metadata, embedding))
+                responses.append(response)
+                same_scope[key] = {"id": memory_id, "content": data.content, "metadata": metadata}
+                continue
+            try:
+                patch = self._merge_duplicate(doc)
+            except DuplicateMemoryError as exc:
+                return rows, responses, patches, exc
+            if patch is not None:
+                patches[doc["id"]] = {**patches.get(doc["id"], {}), **patch}
+                doc = same_scope[key] = {**doc, "metadata": {**doc["metadata"], **patch}}
+            responses.append(self._memory_response(doc["id"], doc))
+        return rows, responses, patches, None
+
+    @staticmethod
+    def _split_rows(rows: list[tuple]) -> tuple[tuple | None, tuple | None]:
+        """Column lists for ``store_many`` and ``upsert_many`` from planned rows.
+
+        Returns ``(plain, embedded)``: ``(ids, contents, metadatas)`` of the
+        rows without an embedding and the same plus ``embeddings`` for the
+        rest, each None when empty.
+        """
+        plain = [row[:3] for row in rows if row[3] is None]
+        embedded = [row for row in rows if row[3] is not None]
+        return (
+            tuple(map(list, zip(*plain))) or None,
+            tuple(map(list, zip(*embedded))) or None,
+        )
+
+    def _reusable_embedding(self, page: list[dict]) -> list[float] | None:
+        """An embedding from *page* made by the store's own model, if any."""
+        embedded = [doc for doc in page if doc.get("embedding")]
+        model = self._store.embedding_model() if embedded else ""
+        for doc in embedded:
+            if model and doc.get("embedding_model") == model:
+                return doc["embedding"]
+        return None
+
+    @staticmethod
+    def _consolidation_candidates(
+        page: list[dict], keep: ConsolidateKeep
+    ) -> list[tuple[str, tuple[float, float], list[float]]]:
+        """``(id, survivor rank, embedding)`` for embedded memories in *page*."""
+        candidates = []
+        for doc in page:
+            if doc.get("embedding") is None:
+                continue
+            created, reinforced = _epochs_from_meta(doc["metadata"])
+            if keep == ConsolidateKeep.REINFORCED:
+                rank = (0.0 if math.isnan(reinforced) else reinforced, created)
+            else:
+                rank = (created, 0.0)
+            candidates.append((doc["id"], rank, doc["embedding"]))
+        return candidates
+
+    def _consolidation_plan(
+        self,
+        project: str,
+        candidates: list[tuple[str, tuple[float, float], list[float]]],
+        threshold: float,
+    ) -> list[dict]:
+        """Near-duplicate clusters among one project's *candidates*.
+
+        Each cluster keeps its highest-ranked memory and lists the rest
+        for removal.
+        """
+        if len(candidates) < 2:
+            return []
+        groups = cluster_duplicates(
+            np.asarray([embedding for _, _, embedding in candidates]),
+            threshold,
+            self._settings.batch_size,
+        )
+        plan = []
+        for members in groups:
+            members.sort(key=lambda i: candidates[i][1], reverse=True)
+            plan.append({
+                "project": project,
+                "keep": candidates[members[0]][0],
+                "remove": [candidates[i][0] for i in members[1:]],
+            })
+        return plan
+
+    @staticmethod
+    def _consolidation_report(
+        scanned: int, plan: list[dict], hard_delete: bool, dry_run: bool
+    ) -> dict:
+        """Counts plus the clusters themselves for ``consolidate``."""
+        return {
+            "scanned": scanned,
+            "clusters": len(plan),
+            "removed": sum(len(cluster["remove"]) for cluster in plan),
+            "hard_delete": hard_delete,
+            "dry_run": dry_run,
+            "groups": plan,
+        }
+
+    @staticmethod
+    def _compact_counts(page: list[dict]) -> tuple[int, int]:
+        """``(deleted, decayed)`` among a page of compaction candidates."""
+        deleted = sum(bool(doc["metadata"].get("deleted", False)) for doc in page)
+        return deleted, len(page) - deleted
+
+    @staticmethod
+    def _compact_report(deleted: int, decayed: int, dry_run: bool) -> dict:
+        """Counts returned by ``compact``."""
+        return {
+            "reclaimed": deleted + decayed,
+            "deleted": deleted,
+            "decayed": decayed,
+            "dry_run": dry_run,
+        }
+
+    def _batches(self, ids: list[str]) -> Iterator[list[str]]:
+        """Split *ids* into ``batch_size`` slices."""
+        for start in range(0, len(ids), self._settings.batch_size):
+            yield ids[start:start + self._settings.batch_size]
+
+    @staticmethod
+    def _page_columns(
+        page: list[dict], patches: dict[str, dict] | None = None
+    ) -> tuple[list[str], list[str], list[dict]]:
+        """``(ids, contents, metadatas)`` of a page, as ``_index`` takes them.
+
+        *patches* (by ID) are merged into the metadata first.
+        """
+        patches = patches or {}
+        return (
+            [doc["id"] for doc in page],
+            [doc["content"] for doc in page],
+            [{**doc["metadata"], **patches.get(doc["id"], {})} for doc in page],
+        )
+
+    def _compact_where(self, grace_hours: float | None) -> dict:
+        """Select soft-deleted memories and ones dead for *grace_hours*."""
+        if grace_hours is None:
+            grace_hours = self._settings.compact_grace_hours
+        cutoff = datetime.now(timezone.utc).timestamp() - grace_hours * 3600
+        return {"$or": [{"deleted": True}, {"expires_at": {"$lt": cutoff}}]}
+
+    def _derived_metadata(self, meta: dict) -> dict:
+        """Compute expires_at and epoch columns from ISO timestamps."""
+        created_at = datetime.fromisoformat(meta["created_at"])
+        last_reinforced_raw = meta.get("last_reinforced_at", "")
+        last_reinforced_at = (
+            datetime.fromisoformat(last_reinforced_raw)
+            if last_reinforced_raw
+            else None
+        )
+        return {
+            "created_at_ts": created_at.timestamp(),
+            "last_reinforced_at_ts": (
+                last_reinforced_at.timestamp() if last_reinforced_at else 0.0
+            ),
+            "expires_at": compute_expires_at(
+                meta["decay_policy"],
+                created_at,
+                last_reinforced_at,
+                self._settings.decay_half_life_hours,
+            ),
+        }
+
+    def _build_where(
+        self,
+        agent: str,
+        personality: str,
+        project: str,
+        type_: str,
+        global_: bool | None,
+        min_confidence: float,
+    ) -> dict:
+        """Translate search filters into a flat where dict (never deleted).
+
+        A positive *min_confidence* becomes ``expires_at >= now + c·half_life``
+        so decayed memories never take a top-K slot.  Memories written
+        before expires_at existed lack the key; callers run
+        ``_ensure_migrated`` first so they are backfilled.
+        """
+        where: dict = {"deleted": False}
+        if agent:
+            where["agent"] = agent
+        if personality:
+            where["personality"] = personality
+        if project:
+            where["project"] = project
+        if type_:
+            where["type"] = type_
+        if global_ is not None:
+            where["global_"] = global_
+        if min_confidence > 0:
+            where["expires_at"] = {
+                "$gte": min_expires_at(
+                    min_confidence, self._settings.decay_half_life_hours
+                )
+            }
+        return where
+
+    @timed("service.results")
+    def _to_search_items(
+        self, raw_results: list[dict], min_confidence: float
+    ) -> list[SearchResultItem]:
+        """Compute confidence for raw store hits and drop low-confidence ones.
+
+        Items are built with ``model_construct``: every value comes from
+        metadata this service wrote, so per-field validation of large
+        result sets would only cost time.
+        """
+        confidences = self._compute_confidences([r["metadata"] for r in raw_results])
+
+        items: list[SearchResultItem] = []
+        for r, confidence in zip(raw_results, confidences.tolist()):
+            if confidence < min_confidence:
+                continue
+
+            meta = r["metadata"]
+            items.append(
+                SearchResultItem.model_construct(
+                    id=r["id"],
+                    content=r["content"],
+                    agent=meta.get("agent", ""),
+                    personality=meta.get("personality", ""),
+                    project=meta.get("project", ""),
+                    type=meta.get("type", ""),
+                    global_=meta.get("global_", False),
+                    decay_policy=DecayPolicy(meta["decay_policy"]),
+                    confidence=confidence,
+                    created_at=meta.get("created_at", ""),
+                    last_reinforced_at=meta.get("last_reinforced_at", ""),
+                    similarity=r.get("distance"),
+                    score=r.get("score"),
+                )
+            )
+        return items
+
+    def _prepare_memory(self, data: MemoryCreate) -> tuple[str, dict, MemoryResponse]:
+        """Assign an ID and timestamp; build stored metadata and the response."""
         memory_id = str(uuid.uuid4())
-        now = datetime.now(timezone.utc).isoformat()
+        now_dt = datetime.now(timezone.utc)
+        now = now_dt.isoformat()
 
         metadata = {
             "agent": data.agent,
@@ -71,13 +918,20 @@ class MemoryService:
             "global_": data.global_,
             "decay_policy": data.decay_policy.value,
             "created_at": now,
+            "created_at_ts": now_dt.timestamp(),
             "last_reinforced_at": "",
+            "last_reinforced_at_ts": 0.0,
             "deleted": False,
+            "expires_at": compute_expires_at(
+                data.decay_policy.value,
+                now_dt,
+                None,
+                self._settings.decay_half_life_hours,
+            ),
+            "content_hash": content_hash(data.content),
         }
 
-        self._store.store(memory_id, data.content, metadata)
-
-        return MemoryResponse(
+        response = MemoryResponse(
             id=memory_id,
             content=data.content,
             agent=data.agent,
@@ -90,11 +944,168 @@ class MemoryService:
             created_at=now,
             last_reinforced_at="",
         )
+        return memory_id, metadata, response
+
+    def _compute_confidence_from_meta(self, meta: dict) -> float:
+        """Confidence for a single memory's metadata."""
+        return float(self._compute_confidences([meta])[0])
+
+    @timed("service.confidence")
+    def _compute_confidences(self, metas: list[dict]) -> np.ndarray:
+        """Confidence for many memories in one vectorized decay pass.
+
+        Reads the float epoch columns (``created_at_ts`` /
+        ``last_reinforced_at_ts``) and only parses the ISO strings for
+        memories written before those existed.
+        """
+        created = np.empty(len(metas), dtype=np.float64)
+        reinforced = np.empty(len(metas), dtype=np.float64)
+        for i, meta in enumerate(metas):
+            created[i], reinforced[i] = _epochs_from_meta(meta)
+
+        return compute_confidence_batch(
+            [meta["decay_policy"] for meta in metas],
+            created,
+            reinforced,
+            half_life_hours=self._settings.decay_half_life_hours,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+
+class MemoryService(BaseMemoryService):
+    """Business logic layer sitting between the CLI and the VectorStore."""
+
+    def __init__(
+        self,
+        store: VectorStore,
+        settings: Settings,
+        result_cache: ResultCache | None = None,
+        lexical_index: LexicalIndex | None = None,
+    ) -> None:
+        super().__init__(store, settings, result_cache, lexical_index)
+
+    # ------------------------------------------------------------------
+    # Create
+    # ------------------------------------------------------------------
+
+    @timed("service.create")
+    def create_memory(self, data: MemoryCreate) -> MemoryResponse:
+        """Store a new memory and return it with confidence 1.0.
+
+        Generates a UUID, stamps created_at and a content hash, and
+        persists via the VectorStore.  A just-created memory always has
+        full confidence.
+
+        Unless ``settings.duplicate_policy`` is ``"allow"``, the store is
+        first asked for a live memory with the same content hash and
+        scope: ``"reject"`` raises DuplicateMemoryError, ``"merge"``
+        returns that memory instead (reinforcing it if reinforceable).
+        Identical content in another scope is stored as a new memory
+        with the existing embedding, so nothing is re-embedded.  Behind
+        an outbox, see ``_duplicate_pages`` for where copies are sought.
+        """
+        memory_id, metadata, response = self._prepare_memory(data)
+        embedding = None
+        if self._settings.duplicate_policy != "allow":
+            page = next(
+                self._duplicate_pages(self._duplicate_where(metadata, same_scope=True), 1), []
+            )
+            if page:
+                return self._refresh_duplicate(page[0])
+            page = next(
+                self._duplicate_pages(
+                    self._duplicate_where(metadata, same_scope=False), 1, include_embeddings=True
+                ),
+                [],
+            )
+            embedding = self._reusable_embedding(page)
+
+        if embedding is None:
+            self._store.store(memory_id, data.content, metadata)
+        else:
+            self._store.upsert_many([memory_id], [data.content], [metadata], [embedding])
+        self._index([memory_id], [data.content], [metadata])
+        self._invalidate_results()
+        return response
+
+    def create_memories(self, records: Iterable[MemoryCreate]) -> Iterator[MemoryResponse]:
+        """Bulk-create memories, yielding each response once it is stored.
+
+        Consumes *records* lazily in chunks of ``settings.batch_size`` and
+        persists each chunk with one ``store_many`` call, so memory use is
+        bounded by the chunk size however long the input is.
+
+        ``settings.duplicate_policy`` applies as in ``create_memory``,
+        with one content-hash lookup per chunk: ``"merge"`` yields the
+        existing memory, and ``"reject"`` raises DuplicateMemoryError at
+        the first duplicate, after yielding the records stored before it.
+        """
+        records = iter(records)
+        while chunk := list(islice(records, self._settings.batch_size)):
+            prepared = [self._prepare_memory(data) for data in chunk]
+            existing = []
+            if self._settings.duplicate_policy != "allow":
+                where = self._batch_duplicate_where([metadata for _, metadata, _ in prepared])
+                for page in self._duplicate_pages(where, include_embeddings=True):
+                    existing += page
+            rows, responses, patches, error = self._plan_batch_create(chunk, prepared, existing)
+            self._store_rows(rows)
+            if patches:
+                self._store.update_metadata_many(list(patches), list(patches.values()))
+                self._patch_index(list(patches), list(patches.values()))
+            if rows or patches:
+                self._invalidate_results()
+            yield from responses
+            if error is not None:
+                raise error
+
+    def _duplicate_pages(
+        self, where: dict, limit: int | None = None, include_embeddings: bool = False
+    ) -> Iterator[list[dict]]:
+        """Yield pages of live memories matching a duplicate *where*.
+
+        Behind an outbox, pending memories come first (so two quick
+        identical creates are caught before either is flushed) and the
+        store is only asked once it is connected: a create never connects
+        to look for copies, and copies it cannot see are not caught.
+        *limit* caps each page (``batch_size`` by default).
+        """
+        if isinstance(self._store, OutboxStore):
+            pending = self._store.pending(where)[:limit]
+            if pending:
+                yield pending
+            if not self._store.connected():
+                return
+        if limit is not None:
+            page, _ = self._store.get_page(
+                where=where, limit=limit, include_embeddings=include_embeddings
+            )
+            yield page
+        else:
+            yield from self._scan(where, include_embeddings=include_embeddings)
+
+    def _store_rows(self, rows: list[tuple]) -> None:
+        """Store planned ``(id, content, metadata, embedding)`` rows and index them.
+
+        Rows with a reusable embedding are upserted with it; the rest go
+        through one ``store_many`` call.
+        """
+        plain, embedded = self._split_rows(rows)
+        if plain:
+            self._store.store_many(*plain)
+        if embedded:
+            self._store.upsert_many(*embedded)
+        if rows:
+            self._index(*([row[i] for row in rows] for i in range(3)))
 
     # ------------------------------------------------------------------
     # Search
     # ------------------------------------------------------------------
 
+    @timed("service.search")
     def search_memories(
         self,
         query: str,
@@ -105,169 +1116,565 @@ class MemoryService:
         global_: bool | None = None,
         limit: int = 10,
         min_confidence: float = 0.3,
+        reinforce_hits: bool = False,
+        mode: SearchMode = SearchMode.SEMANTIC,
+        include_content: bool = True,
     ) -> SearchResponse:
         """Semantic search with metadata filters and confidence gating.
 
-        Builds a where-clause (always excluding deleted), queries the
-        VectorStore, computes confidence per result, and drops anything
-        below min_confidence.
-        """
-        where: dict = {"deleted": False}
-        if agent:
-            where["agent"] = agent
-        if personality:
-            where["personality"] = personality
-        if project:
-            where["project"] = project
-        if type_:
-            where["type"] = type_
-        if global_ is not None:
-            where["global_"] = global_
+        Builds a where-clause (always excluding deleted, and pushing the
+        confidence threshold down as an ``expires_at`` bound so only live
+        memories are ranked), queries the VectorStore, computes confidence
+        per result, and drops anything below min_confidence.  Raw hits
+        may come from the result cache; confidence is always recomputed.
 
-        raw_results = self._store.search(query, n_results=limit, where=where)
+        *mode* ``LEXICAL`` ranks by BM25 from the lexical index instead
+        (no embedding; matches are read with one ``get_many``), and
+        ``HYBRID`` fuses the semantic and lexical rankings by reciprocal
+        rank.  Both raise InvalidOperationError without a lexical index.
 
-        items: list[SearchResultItem] = []
-        for r in raw_results:
-            meta = r["metadata"]
-            confidence = self._compute_confidence_from_meta(meta)
+        With *reinforce_hits*, the reinforceable results are queued for
+        reinforcement (see flush_reinforcements) rather than written now,
+        so they are reported with their pre-reinforcement confidence.
 
-            if confidence < min_confidence:
-                continue
+        Without *include_content* the store leaves the memory text out of
+        its reply and results carry ``content=""``.
+        """
+        filters = self._search_filters(agent, personality, project, type_, global_)
+        self._ensure_migrated(min_confidence)
+        grouped, misses, where, save = self._plan_search(
+            [query], filters, limit, min_confidence, mode, include_content
+        )
+        if misses:
+            save([
+                self._store.search(
+                    query, n_results=limit, where=where, include_content=include_content
+                )
+            ])
+        lexical = []
+        if mode != SearchMode.SEMANTIC:
+            lexical = [self._lexical_search(query, where, limit, include_content)]
+        (raw_results,) = self._merge_rankings(mode, grouped, lexical, limit)
+        items = self._search_items(raw_results, min_confidence, reinforce_hits)
+        return SearchResponse(results=items, count=len(items))
 
-            items.append(
-                SearchResultItem(
-                    id=r["id"],
-                    content=r["content"],
-                    agent=meta.get("agent", ""),
-                    personality=meta.get("personality", ""),
-                    project=meta.get("project", ""),
-                    type=meta.get("type", ""),
-                    global_=meta.get("global_", False),
-                    decay_policy=DecayPolicy(meta["decay_policy"]),
-                    confidence=confidence,
-                    created_at=meta.get("created_at", ""),
-                    last_reinforced_at=meta.get("last_reinforced_at", ""),
-                    similarity=r.get("distance", 0.0),
+    @timed("service.search_many")
+    def search_many(
+        self,
+        queries: list[str],
+        agent: str = "",
+        personality: str = "",
+        project: str = "",
+        type_: str = "",
+        global_: bool | None = None,
+        limit: int = 10,
+        min_confidence: float = 0.3,
+        reinforce_hits: bool = False,
+        mode: SearchMode = SearchMode.SEMANTIC,
+        include_content: bool = True,
+    ) -> MultiSearchResponse:
+        """Run several searches with shared filters in one store round-trip.
+
+        Each query gets the same filtering and confidence gating as
+        search_memories; results are grouped per query, in input order.
+        Only queries missing from the result cache reach the store.
+        *reinforce_hits*, *mode* and *include_content* behave as in
+        search_memories.
+        """
+        filters = self._search_filters(agent, personality, project, type_, global_)
+        self._ensure_migrated(min_confidence)
+        grouped, misses, where, save = self._plan_search(
+            queries, filters, limit, min_confidence, mode, include_content
+        )
+        if misses:
+            save(
+                self._store.search_many(
+                    [queries[i] for i in misses],
+                    n_results=limit,
+                    where=where,
+                    include_content=include_content,
                 )
             )
-
-        return SearchResponse(results=items, count=len(items))
+        lexical = []
+        if mode != SearchMode.SEMANTIC:
+            lexical = [
+                self._lexical_search(query, where, limit, include_content)
+                for query in queries
+            ]
+        grouped = self._merge_rankings(mode, grouped, lexical, limit)
+        return self._multi_search_response(queries, grouped, min_confidence, reinforce_hits)
 
     # ------------------------------------------------------------------
     # Get
     # ------------------------------------------------------------------
 
-    def get_memory(self, id: str) -> MemoryResponse:
+    @timed("service.get")
+    def get_memory(self, id: str, include_content: bool = True) -> MemoryResponse:
         """Retrieve a single memory by ID.
 
         Raises MemoryNotFoundError if the ID is missing or soft-deleted.
+        Without *include_content* the text is not fetched (``content=""``).
         """
-        doc = self._store.get(id)
-        if doc is None or doc["metadata"].get("deleted", False):
-            raise MemoryNotFoundError(id)
+        return self._memory_response(id, self._store.get(id, include_content=include_content))
 
-        meta = doc["metadata"]
-        confidence = self._compute_confidence_from_meta(meta)
+    # ------------------------------------------------------------------
+    # List
+    # ------------------------------------------------------------------
 
-        return MemoryResponse(
-            id=doc["id"],
-            content=doc["content"],
-            agent=meta.get("agent", ""),
-            personality=meta.get("personality", ""),
-            project=meta.get("project", ""),
-            type=meta.get("type", ""),
-            global_=meta.get("global_", False),
-            decay_policy=DecayPolicy(meta["decay_policy"]),
-            confidence=confidence,
-            created_at=meta.get("created_at", ""),
-            last_reinforced_at=meta.get("last_reinforced_at", ""),
-        )
+    @timed("service.list")
+    def list_memories(
+        self,
+        agent: str = "",
+        personality: str = "",
+        project: str = "",
+        type_: str = "",
+        global_: bool | None = None,
+        min_confidence: float = 0.0,
+        sort: ListSort = ListSort.STORED,
+        limit: int = 10,
+        cursor: str | None = None,
+        include_content: bool = True,
+    ) -> ListResponse:
+        """Page through live memories matching metadata filters, no embedding.
+
+        With *sort* ``STORED`` each call reads one ``get_page`` of
+        *limit* memories in store order.  ``CREATED_AT`` (newest first)
+        and ``CONFIDENCE`` (highest first) scan every match in
+        ``batch_size`` pages, holding only the best *limit* + 1, and
+        resume after the last (value, id) returned.  Confidence is
+        computed per call, so memories decaying between calls can move
+        across a page boundary.
+
+        *cursor* is the ``next_cursor`` of the previous page (None when
+        there are no more); InvalidOperationError if it was issued for
+        another sort.  *include_content* is as in search_memories.
+        """
+        self._ensure_migrated(min_confidence)
+        where = self._build_where(agent, personality, project, type_, global_, min_confidence)
+        state = self._decode_cursor(cursor, sort)
+        if sort == ListSort.STORED:
+            docs, store_cursor = self._store.get_page(
+                where=where,
+                limit=limit,
+                cursor=state.get("store"),
+                include_content=include_content,
+            )
+            next_state = None
+            if store_cursor is not None:
+                next_state = {"sort": sort.value, "store": store_cursor}
+            return self._list_response(docs, min_confidence, next_state)
+
+        after = tuple(state["after"]) if "after" in state else None
+        best: list[tuple[float, str, dict]] = []
+        for page in self._scan(where, include_content=include_content):
+            best = self._list_merge(best, page, sort, after, limit)
+        return self._sorted_list_response(best, sort, limit, min_confidence)
 
     # ------------------------------------------------------------------
     # Reinforce
     # ------------------------------------------------------------------
 
+    @timed("service.reinforce")
     def reinforce_memory(self, id: str) -> dict:
         """Reset decay timer for a reinforceable memory.
 
         Only memories with decay_policy="reinforceable" can be reinforced.
         Updates last_reinforced_at to now and returns confirmation.
         """
-        doc = self._store.get(id)
-        if doc is None or doc["metadata"].get("deleted", False):
-            raise MemoryNotFoundError(id)
+        now, patch = self._reinforcement(id, self._store.get(id))
+        self._store.update_metadata(id, patch)
+        self._patch_index([id], [patch])
+        self._invalidate_results()
 
-        policy = doc["metadata"].get("decay_policy", "")
-        if policy != DecayPolicy.REINFORCEABLE.value:
-            # Policy-specific messages per spec so the user knows *why* it failed.
-            if policy == DecayPolicy.STABLE.value:
-                msg = "Memory has stable decay policy, reinforcement has no effect"
-            elif policy == DecayPolicy.CONTEXTUAL.value:
-                msg = "Memory has contextual decay policy, reinforcement is not supported"
-            else:
-                msg = f"Memory has {policy} decay policy, cannot be reinforced"
-            raise InvalidOperationError(msg)
+        return {"id": id, "reinforced_at": now, "confidence": 1.0}
 
-        now = datetime.now(timezone.utc).isoformat()
-        self._store.update_metadata(id, {"last_reinforced_at": now})
+    @timed("service.reinforce")
+    def reinforce_memories(self, ids: list[str]) -> dict:
+        """Reinforce many memories with one batched get and one batched update.
 
-        return {"id": id, "reinforced_at": now, "confidence": 1.0}
+        Each ID is validated as in reinforce_memory, but failures are
+        reported per ID instead of raised.  Duplicate IDs are collapsed.
+        """
+        return self._apply_bulk(ids, self._prepare_reinforce)
+
+    @timed("service.flush_reinforcements")
+    def flush_reinforcements(self, due_only: bool = False) -> int:
+        """Apply reinforcements queued by ``reinforce_hits`` searches.
+
+        Writes every queued patch with one ``update_metadata_many`` and
+        returns how many memories were reinforced.  With *due_only*,
+        does nothing until the oldest entry has waited
+        ``reinforce_flush_seconds`` or ``batch_size`` entries are queued
+        (the daemon calls this from its idle loop).
+        """
+        if due_only and not self._reinforcements.due():
+            return 0
+        ids, patches = self._reinforcements.drain()
+        if ids:
+            self._store.update_metadata_many(ids, patches)
+            self._patch_index(ids, patches)
+            self._invalidate_results()
+        return len(ids)
 
     # ------------------------------------------------------------------
     # Delete (soft)
     # ------------------------------------------------------------------
 
+    @timed("service.delete")
     def delete_memory(self, id: str) -> dict:
         """Soft-delete a memory by setting its deleted flag.
 
         Raises MemoryNotFoundError if the ID doesn't exist, and
         InvalidOperationError if it's already deleted.
         """
-        doc = self._store.get(id)
-        if doc is None:
-            raise MemoryNotFoundError(id)
-
-        if doc["metadata"].get("deleted", False):
-            raise InvalidOperationError(f"Memory '{id}' is already deleted")
-
+        self._check_deletable(id, self._store.get(id))
         self._store.update_metadata(id, {"deleted": True})
+        self._unindex([id])
+        self._invalidate_results()
 
         return {"id": id, "deleted": True}
 
+    @timed("service.delete")
+    def delete_memories(self, ids: list[str]) -> dict:
+        """Soft-delete many memories with one batched get and one batched update.
+
+        Missing or already-deleted IDs are reported per ID, not raised.
+        """
+        report = self._apply_bulk(ids, self._prepare_delete)
+        self._unindex([r["id"] for r in report["results"] if "error" not in r])
+        return report
+
+    # ------------------------------------------------------------------
+    # Outbox
+    # ------------------------------------------------------------------
+
+    @timed("service.flush_outbox")
+    def flush_outbox(self, retries: int = 0, due_only: bool = False) -> dict:
+        """Write memories queued in the local outbox to the store.
+
+        Returns ``{flushed, pending}`` (plus ``error`` if the store kept
+        failing after *retries* backed-off attempts).  With *due_only*,
+        skips the attempt while a previous failure's backoff is running
+        (the daemon calls this from its idle loop).  Without an outbox
+        there is never anything to flush.
+        """
+        if not isinstance(self._store, OutboxStore):
+            return {"flushed": 0, "pending": 0}
+        result = self._store.flush_due() if due_only else self._store.flush(retries)
+        if result["flushed"]:
+            self._invalidate_results()
+        return result
+
     # ------------------------------------------------------------------
     # Status
     # ------------------------------------------------------------------
 
+    @timed("service.status")
     def get_status(self) -> dict:
         """Check VectorStore health and return collection stats."""
         healthy = self._store.heartbeat()
         count = self._store.count() if healthy else 0
+        return self._status(healthy, count, self._store.stats())
 
-        return {
-            "status": "healthy" if healthy else "unhealthy",
-            "host": f"{self._settings.chromadb_host}:{self._settings.chromadb_port}",
-            "collection": self._settings.collection_name,
-            "count": count,
-        }
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    @timed("service.migrate")
+    def migrate_metadata(self) -> dict:
+        """Backfill (or recompute) derived metadata on every stored memory.
+
+        Writes ``expires_at`` and the float epoch columns
+        ``created_at_ts`` / ``last_reinforced_at_ts`` from the ISO
+        timestamps.  Needed once for collections created before those
+        existed, and again after changing ``decay_half_life_hours``.
+        Pages through the store and writes each page back with one
+        ``update_metadata_many``.  With a lexical index, every live
+        memory is also (re-)indexed and the count reported as ``indexed``.
+        """
+        scanned = updated = indexed = 0
+        for page in self._scan():
+            scanned += len(page)
+            ids, metadatas = self._migration_updates(page)
+            if ids:
+                self._store.update_metadata_many(ids, metadatas)
+                updated += len(ids)
+            indexed += self._index(*self._page_columns(page, dict(zip(ids, metadatas))))
+        if updated:
+            self._invalidate_results()
+        self._mark_migrated()
+        return self._migration_report(scanned, updated, indexed)
+
+    def _ensure_migrated(self, min_confidence: float) -> None:
+        """Backfill ``expires_at`` before the first confidence-gated read.
+
+        Confidence filters push down to ``expires_at``, which collections
+        from before that column lack, so every old memory would vanish
+        from default searches.  The first such read in a process checks
+        the oldest stored memory and runs migrate_metadata if it has no
+        ``expires_at``; a marker under ``data_dir`` skips the check in
+        later processes.
+        """
+        if min_confidence <= 0 or not self._migration_due():
+            return
+        page, _ = self._store.get_page(limit=1, include_content=False)
+        if self._predates_expiry(page):
+            self.migrate_metadata()
+        else:
+            self._mark_migrated()
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export_memories(
+        self,
+        agent: str = "",
+        project: str = "",
+        include_deleted: bool = False,
+        include_embeddings: bool = False,
+    ) -> Iterator[dict]:
+        """Yield every matching memory as a raw ``{id, content, metadata}`` record.
+
+        Pages through the store ``batch_size`` documents at a time with
+        the filters pushed down as a where clause, so memory use does
+        not grow with the collection.  *include_embeddings* adds each
+        record's ``embedding`` and ``embedding_model``.  Memories still
+        queued in the outbox are not exported.
+        """
+        where = self._export_where(agent, project, include_deleted)
+        for page in self._scan(where, include_embeddings):
+            yield from page
+
+    def import_memories(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Upsert exported records in ``batch_size`` chunks.
+
+        *records* are ``export_memories`` dicts, consumed lazily.  Each
+        chunk is written with one ``upsert_many``, so re-importing is
+        idempotent, and embeddings from the store's own model are
+        passed through instead of recomputed.  After each chunk commits,
+        yields ``{imported, reused_embeddings}`` for it (``imported``
+        counts input records, duplicates included) so callers can
+        checkpoint their input position.
+        """
+        model = self._store.embedding_model()
+        records = iter(records)
+        while chunk := list(islice(records, self._settings.batch_size)):
+            ids, contents, metadatas, embeddings = self._import_batch(chunk, model)
+            self._store.upsert_many(ids, contents, metadatas, embeddings)
+            self._index(ids, contents, metadatas)
+            self._invalidate_results()
+            yield {
+                "imported": len(chunk),
+                "reused_embeddings": sum(e is not None for e in embeddings),
+            }
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    @timed("service.compact")
+    def compact(
+        self,
+        grace_hours: float | None = None,
+        dry_run: bool = False,
+        archive: Callable[[list[dict]], None] | None = None,
+    ) -> dict:
+        """Hard-delete soft-deleted memories and long-dead decayed ones.
+
+        A memory is dead once its confidence has been 0.0 for longer
+        than *grace_hours* (default ``settings.compact_grace_hours``),
+        i.e. ``expires_at`` is that far in the past.  Candidates are
+        selected by the store in pages of ``batch_size``; each page is
+        passed to *archive* (if given) and then removed with one
+        ``delete_many``.  With *dry_run* nothing is archived or deleted.
+
+        Memories lacking ``expires_at`` are only reclaimed once
+        ``migrate_metadata`` has backfilled it.
+        """
+        where = self._compact_where(grace_hours)
+
+        deleted = decayed = 0
+        cursor = None
+        while True:
+            page, next_cursor = self._store.get_page(
+                where=where, limit=self._settings.batch_size, cursor=cursor
+            )
+            page_deleted, page_decayed = self._compact_counts(page)
+            deleted += page_deleted
+            decayed += page_decayed
+            if page and not dry_run:
+                if archive is not None:
+                    archive(page)
+                ids = [doc["id"] for doc in page]
+                self._store.delete_many(ids)
+                self._unindex(ids)
+            if next_cursor is None:
+                break
+            # Deleted pages shift later matches forward, so restart from
+            # the beginning; a dry run just pages on.
+            cursor = next_cursor if dry_run else None
+
+        if (deleted or decayed) and not dry_run:
+            self._invalidate_results()
+        return self._compact_report(deleted, decayed, dry_run)
+
+    # ------------------------------------------------------------------
+    # Consolidation
+    # ------------------------------------------------------------------
+
+    @timed("service.consolidate")
+    def consolidate(
+        self,
+        threshold: float | None = None,
+        project: str | None = None,
+        keep: ConsolidateKeep = ConsolidateKeep.NEWEST,
+        hard_delete: bool = False,
+        dry_run: bool = False,
+    ) -> dict:
+        """Merge clusters of near-duplicate live memories within each project.
+
+        Memories of one project (or only *project*, "" being memories
+        without one) are paged in with their embeddings, and pairs with
+        cosine similarity of at least *threshold* (default
+        ``settings.consolidate_threshold``) are clustered in
+        ``batch_size`` blocks, never as a full N × N matrix.  Each
+        cluster keeps its newest memory, or with *keep* ``reinforced``
+        the most recently reinforced one; the others are soft-deleted
+        (or removed outright with *hard_delete*) in ``batch_size``
+        batches.  With *dry_run* only the report is produced.
+
+        Memories without a stored embedding (e.g. still queued in the
+        outbox) are skipped.
+        """
+        if threshold is None:
+            threshold = self._settings.consolidate_threshold
+        if project is None:
+            projects = sorted({
+                doc["metadata"].get("project", "")
+                for page in self._scan({"deleted": False}, include_content=False)
+                for doc in page
+            })
+        else:
+            projects = [project]
+
+        scanned = 0
+        plan: list[dict] = []
+        for name in projects:
+            candidates = []
+            where = {"project": name, "deleted": False}
+            for page in self._scan(where, include_embeddings=True, include_content=False):
+                scanned += len(page)
+                candidates += self._consolidation_candidates(page, keep)
+            plan += self._consolidation_plan(name, candidates, threshold)
+
+        removed = [id for cluster in plan for id in cluster["remove"]]
+        if removed and not dry_run:
+            for ids in self._batches(removed):
+                if hard_delete:
+                    self._store.delete_many(ids)
+                else:
+                    self._store.update_metadata_many(ids, [{"deleted": True}] * len(ids))
+            self._unindex(removed)
+            self._invalidate_results()
+        return self._consolidation_report(scanned, plan, hard_delete, dry_run)
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _compute_confidence_from_meta(self, meta: dict) -> float:
-        """Extract timestamps from metadata and delegate to the decay module."""
-        created_at = datetime.fromisoformat(meta["created_at"])
+    def _apply_bulk(
+        self,
+        ids: list[str],
+        prepare: Callable[[str, dict | None], tuple[dict, dict]],
+    ) -> dict:
+        """Validate *ids* with one get_many and apply patches with one update."""
+        ids = list(dict.fromkeys(ids))
+        docs = self._store.get_many(ids) if ids else []
+        results, update_ids, patches = self._plan_bulk(ids, docs, prepare)
+        if update_ids:
+            self._store.update_metadata_many(update_ids, patches)
+            self._patch_index(update_ids, patches)
+            self._invalidate_results()
+        return self._bulk_report(results)
 
-        last_reinforced_raw = meta.get("last_reinforced_at", "")
-        last_reinforced_at = (
-            datetime.fromisoformat(last_reinforced_raw)
-            if last_reinforced_raw
-            else None
-        )
+    def _refresh_duplicate(self, doc: dict) -> MemoryResponse:
+        """Return existing memory *doc* for a merged create (see create_memory)."""
+        patch = self._merge_duplicate(doc)
+        if patch is not None:
+            self._store.update_metadata(doc["id"], patch)
+            self._patch_index([doc["id"]], [patch])
+            self._invalidate_results()
+            doc = {**doc, "metadata": {**doc["metadata"], **patch}}
+        return self._memory_response(doc["id"], doc)
 
-        return compute_confidence(
-            decay_policy=meta["decay_policy"],
-            created_at=created_at,
-            last_reinforced_at=last_reinforced_at,
-            half_life_hours=self._settings.decay_half_life_hours,
-        )
+    def _lexical_search(
+        self, query: str, where: dict, limit: int, include_content: bool = True
+    ) -> list[dict]:
+        """Top *limit* live memories for *query* by BM25, as raw hits.
+
+        Reads index candidates in pages, with their content and metadata
+        from the index, until *limit* of them pass *where*.  Only
+        candidates indexed without metadata are fetched from the store.
+        """
+        page_size = max(limit * 2, 20)
+        hits: list[dict] = []
+        offset = 0
+        while len(hits) < limit:
+            ranked = self._lexical_ranked(query, where, page_size, offset)
+            if ranked:
+                ids = [id for id, _ in ranked]
+                docs = self._indexed_docs(ids, include_content)
+                missing = [id for id in ids if id not in docs]
+                if missing:
+                    docs.update(zip(missing, self._store.get_many(missing, include_content)))
+                hits += self._lexical_hits(ranked, [docs[id] for id in ids], where)
+            if len(ranked) < page_size:
+                break
+            offset += page_size
+        return hits[:limit]
+
+    def _scan(
+        self,
+        where: dict | None = None,
+        include_embeddings: bool = False,
+        include_content: bool = True,
+    ) -> Iterator[list[dict]]:
+        """Yield the store's documents page by page (``batch_size`` each)."""
+        cursor = None
+        while True:
+            page, cursor = self._store.get_page(
+                where=where,
+                limit=self._settings.batch_size,
+                cursor=cursor,
+                include_embeddings=include_embeddings,
+                include_content=include_content,
+            )
+            if page:
+                yield page
+            if cursor is None:
+                return
+
+
+def _scope_key(metadata: dict) -> tuple:
+    """Content hash plus scope: memories equal here are duplicates."""
+    return (metadata["content_hash"], *(metadata.get(key) for key in _SCOPE_KEYS))
+
+
+def _epochs_from_meta(meta: dict) -> tuple[float, float]:
+    """Return (created, last_reinforced) epoch seconds; NaN if never reinforced."""
+    created = meta.get("created_at_ts")
+    if created is None:
+        created = datetime.fromisoformat(meta["created_at"]).timestamp()
+
+    reinforced = meta.get("last_reinforced_at_ts")
+    if reinforced is None:
+        raw = meta.get("last_reinforced_at", "")
+        reinforced = datetime.fromisoformat(raw).timestamp() if raw else 0.0
+    # 0.0 is the stored "never reinforced" marker (metadata can't hold NaN).
+    return created, reinforced if reinforced > 0 else math.nan
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of *content* with runs of whitespace collapsed and ends trimmed."""
+    return hashlib.sha256(" ".join(content.split()).encode()).hexdigest()
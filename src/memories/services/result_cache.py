@@ -0,0 +1,208 @@
+"""Shared on-disk cache of raw search results.
+
+Sibling agents often issue identical searches within seconds of each
+other.  This cache stores the store's raw hits (content, metadata and
+distance) in a SQLite file under ``data_dir`` so every process sharing
+that directory can reuse them.  Confidence is *not* cached — the
+service recomputes it from the cached timestamps on every read, so
+decay stays exact.
+
+Invalidation is by generation: writes bump a single counter, and an
+entry is only served while its generation matches the current one.
+Entries also expire after ``ttl_seconds`` so memories that decayed out
+of a cached top-K are eventually replaced.
+
+Lookups only read, so concurrent agents never queue on the write lock
+for a hit: the file is in WAL mode, and hit/miss counts are buffered in
+memory and written every ``_FLUSH_SECONDS`` or ``_FLUSH_LOOKUPS``
+lookups, with the next ``put_many`` or ``bump``, on ``stats`` and
+``flush``, and when the cache is garbage collected or the process
+exits.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from pathlib import Path
+
+# Buffered hit/miss counts are written at most this often, or after
+# this many lookups.
+_FLUSH_SECONDS = 30.0
+_FLUSH_LOOKUPS = 256
+
+
+def result_cache_key(query: str, filters: dict, limit: int, min_confidence: float) -> str:
+    """Serialize one search's inputs into a stable cache key."""
+    return json.dumps([query, filters, limit, min_confidence], sort_keys=True)
+
+
+class _Counts:
+    """Hit and miss counts not yet written to the file."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.since: float | None = None
+
+    def add(self, hits: int, misses: int) -> None:
+        """Record one lookup's hit/miss counts."""
+        if self.since is None:
+            self.since = time.monotonic()
+        self.hits += hits
+        self.misses += misses
+
+    def due(self) -> bool:
+        """True once the buffer is old or large enough to be written."""
+        if self.since is None:
+            return False
+        return (
+            self.hits + self.misses >= _FLUSH_LOOKUPS
+            or time.monotonic() - self.since >= _FLUSH_SECONDS
+        )
+
+    def write(self, db: sqlite3.Connection) -> None:
+        """Apply and clear the buffer (caller holds the lock and a transaction)."""
+        if self.since is None:
+            return
+        for name, amount in (("hits", self.hits), ("misses", self.misses)):
+            if amount:
+                db.execute(
+                    "UPDATE counters SET value = value + ? WHERE name = ?", (amount, name),
+                )
+        self.hits, self.misses, self.since = 0, 0, None
+
+
+def _write_counts(db: sqlite3.Connection, lock: threading.Lock, counts: _Counts) -> None:
+    """Write *counts* in its own transaction."""
+    with lock, db:
+        counts.write(db)
+
+
+class ResultCache:
+    """Generation-checked, TTL-bounded map of search key → raw results."""
+
+    def __init__(self, path: str, ttl_seconds: float, max_entries: int) -> None:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_stored_at ON results (stored_at);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO counters
+                VALUES ('generation', 0), ('hits', 0), ('misses', 0);
+            """
+        )
+        self._db.commit()
+        self._counts = _Counts()
+        weakref.finalize(self, _write_counts, self._db, self._lock, self._counts)
+
+    def generation(self) -> int:
+        """Return the current write generation."""
+        with self._lock:
+            return self._counter("generation")
+
+    def bump(self) -> None:
+        """Invalidate every cached entry (called after each write)."""
+        with self._lock, self._db:
+            self._counts.write(self._db)
+            self._add("generation", 1)
+
+    def get_many(self, keys: list[str], generation: int) -> list[list[dict] | None]:
+        """Look up each key; None marks a miss.  Counts hits and misses.
+
+        Only reads the file; the counts are buffered (see the module
+        docstring).
+        """
+        oldest = time.time() - self._ttl
+        found: dict[str, list[dict]] = {}
+        with self._lock:
+            for key in set(keys):
+                row = self._db.execute(
+                    "SELECT payload FROM results "
+                    "WHERE key = ? AND generation = ? AND stored_at >= ?",
+                    (key, generation, oldest),
+                ).fetchone()
+                if row is not None:
+                    found[key] = json.loads(row[0])
+            hits = sum(key in found for key in keys)
+            self._counts.add(hits, len(keys) - hits)
+            if self._counts.due():
+                with self._db:
+                    self._counts.write(self._db)
+        return [found.get(key) for key in keys]
+
+    def put_many(self, keys: list[str], results: list[list[dict]], generation: int) -> None:
+        """Store results computed at *generation*, then evict stale entries.
+
+        Callers pass the generation read *before* querying the store, so
+        results that raced with a write are stored under the old
+        generation and never served.
+        """
+        now = time.time()
+        rows = [
+            (key, generation, now, json.dumps(value))
+            for key, value in zip(keys, results)
+        ]
+        with self._lock, self._db:
+            self._counts.write(self._db)
+            self._db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", rows,
+            )
+            self._db.execute(
+                "DELETE FROM results WHERE generation != ? OR stored_at < ?",
+                (self._counter("generation"), now - self._ttl),
+            )
+            (count,) = self._db.execute("SELECT COUNT(*) FROM results").fetchone()
+            if count > self._max_entries:
+                self._db.execute(
+                    "DELETE FROM results WHERE rowid IN ("
+                    "SELECT rowid FROM results ORDER BY stored_at LIMIT ?)",
+                    (count - self._max_entries,),
+                )
+
+    def flush(self) -> None:
+        """Write buffered hit/miss counts now."""
+        _write_counts(self._db, self._lock, self._counts)
+
+    def stats(self) -> dict:
+        """Return entry count, generation and lifetime hit/miss counters."""
+        self.flush()
+        with self._lock:
+            (entries,) = self._db.execute("SELECT COUNT(*) FROM results").fetchone()
+            counters = dict(self._db.execute("SELECT name, value FROM counters"))
+        return {
+            "entries": entries,
+            "generation": counters["generation"],
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+        }
+
+    def _counter(self, name: str) -> int:
+        """Read a persistent counter (caller holds the lock)."""
+        (value,) = self._db.execute(
+            "SELECT value FROM counters WHERE name = ?", (name,),
+        ).fetchone()
+        return value
+
+    def _add(self, name: str, amount: int) -> None:
+        """Add *amount* to a persistent counter (caller holds the lock)."""
+        if amount:
+            self._db.execute(
+                "UPDATE counters SET value = value + ? WHERE name = ?", (amount, name),
+            )
@@ -0,0 +1,49 @@
+"""Write-behind buffer for reinforce-on-recall.
+
+``search --reinforce-hits`` reinforces the reinforceable memories it
+returns without a store write on the search path: their metadata
+patches are queued here and applied later with one
+``update_metadata_many`` by whoever owns the service (the daemon's idle
+loop, process exit, or an explicit flush).
+"""
+
+import time
+
+
+class ReinforcementBuffer:
+    """Pending reinforcement patches keyed by memory ID.
+
+    Re-queuing an ID replaces its patch, so a memory recalled many
+    times between flushes is written once with the latest timestamp.
+    """
+
+    def __init__(self, max_delay_seconds: float, max_entries: int) -> None:
+        self._max_delay = max_delay_seconds
+        self._max_entries = max_entries
+        self._patches: dict[str, dict] = {}
+        self._oldest: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._patches)
+
+    def add(self, patches: dict[str, dict]) -> None:
+        """Queue *patches* (memory ID → metadata patch)."""
+        if not patches:
+            return
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        self._patches.update(patches)
+
+    def due(self) -> bool:
+        """True once the oldest patch has waited long enough or the buffer is full."""
+        if self._oldest is None:
+            return False
+        return (
+            len(self._patches) >= self._max_entries
+            or time.monotonic() - self._oldest >= self._max_delay
+        )
+
+    def drain(self) -> tuple[list[str], list[dict]]:
+        """Remove and return every queued ``(ids, patches)``."""
+        patches, self._patches, self._oldest = self._patches, {}, None
+        return list(patches), list(patches.values())
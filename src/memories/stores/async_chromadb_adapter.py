@@ -0,0 +1,525 @@
+"""ChromaDB implementation of the AsyncVectorStore protocol.
+
+Mirrors ``ChromaDBAdapter`` on top of ``chromadb.AsyncHttpClient`` so
+an asyncio application can overlap store calls without a thread pool.
+Embeddings are computed client-side in a worker thread (the embedding
+model is CPU-bound and would otherwise block the event loop) and sent
+to the server as vectors.  Partitioned searches query every relevant
+partition concurrently with ``asyncio.gather``.  The query-embedding
+cache and the partition index are SQLite files, so they are read and
+written in worker threads too.
+
+Timeouts, keep-alive and the retrying of dropped connections follow
+``ChromaDBAdapter`` (retries sleep with ``asyncio.sleep``).
+"""
+
+import asyncio
+import functools
+
+import chromadb
+import httpx
+from chromadb.config import Settings as ChromaSettings
+from chromadb.errors import NotFoundError
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+from memories.stores.chromadb_adapter import (
+    _STRAY_WHERE,
+    _build_where,
+    _docs_by_id,
+    _get_include,
+    _grouped_hits,
+    _internals,
+    _merge_by_distance,
+    _moved,
+    _page_from_result,
+    _page_kwargs,
+    _query_include,
+    _route,
+    _transient,
+    _upsert_groups,
+    is_partition,
+    partition_name,
+)
+from memories.stores.embedding_cache import EmbeddingCache, embedding_model_id
+from memories.stores.partition_index import PartitionIndex
+
+
+def _resilient(method):
+    """Await an adapter method through ``AsyncChromaDBAdapter._with_retries``."""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self._with_retries(method, self, *args, **kwargs)
+
+    return wrapper
+
+
+class AsyncChromaDBAdapter:
+    """AsyncVectorStore backed by a remote ChromaDB instance.
+
+    Construct with ``await AsyncChromaDBAdapter.connect(...)``.  Without
+    an *embedding_function* the server embeds documents and queries and
+    the embedding cache is unused.
+    """
+
+    def __init__(
+        self,
+        client,
+        collection,
+        embedding_cache: EmbeddingCache | None = None,
+        partition_index: PartitionIndex | None = None,
+        retries: int = 0,
+        retry_backoff: float = 0.5,
+        embedding_function=None,
+    ) -> None:
+        self._client = client
+        self._retries = retries
+        self._retry_backoff = retry_backoff
+        self._collection = collection
+        self._collection_name = collection.name
+        self._partition_index = partition_index
+        self._partitions = {collection.name: collection}
+        self._base_drained: bool | None = None
+
+        self._embedding_function = embedding_function
+        self._embedding_cache = (
+            embedding_cache if self._embedding_function is not None else None
+        )
+        self._model_id = (
+            embedding_model_id(self._embedding_function)
+            if self._embedding_function is not None
+            else ""
+        )
+
+    @classmethod
+    async def connect(
+        cls,
+        host: str,
+        port: int,
+        collection_name: str,
+        embedding_cache: EmbeddingCache | None = None,
+        partition_index: PartitionIndex | None = None,
+        connect_timeout: float = 0,
+        read_timeout: float = 0,
+        keepalive_seconds: float = 40,
+        retries: int = 0,
+        retry_backoff: float = 0.5,
+        embedding_function=None,
+    ) -> "AsyncChromaDBAdapter":
+        """Open an async HTTP client and get (or create) the collection.
+
+        Timeouts, keep-alive and retries are as in ``ChromaDBAdapter``;
+        connecting is retried like any other call.  *embedding_function*
+        defaults to ChromaDB's default model, as in ``ChromaDBAdapter``.
+        """
+        settings = ChromaSettings(chroma_http_keepalive_secs=keepalive_seconds)
+        timeout = httpx.Timeout(read_timeout or None, connect=connect_timeout or None)
+        if embedding_function is None:
+            embedding_function = DefaultEmbeddingFunction()
+
+        async def open_collection():
+            client = await chromadb.AsyncHttpClient(host=host, port=port, settings=settings)
+            _set_timeout(client, timeout)
+            collection = await client.get_or_create_collection(
+                name=collection_name, embedding_function=embedding_function
+            )
+            return client, collection
+
+        client, collection = await _retrying(open_collection, retries, retry_backoff)
+        adapter = cls(
+            client,
+            collection,
+            embedding_cache,
+            partition_index,
+            retries,
+            retry_backoff,
+            embedding_function,
+        )
+        if adapter._embedding_cache is not None:
+            await asyncio.to_thread(adapter._embedding_cache.retain_model, adapter._model_id)
+        return adapter
+
+    # ------------------------------------------------------------------
+    # AsyncVectorStore protocol methods
+    # ------------------------------------------------------------------
+
+    async def store(self, id: str, content: str, metadata: dict) -> None:
+        """Persist a document, embedding it off the event loop."""
+        await self.store_many([id], [content], [metadata])
+
+    @_resilient
+    async def store_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+    ) -> None:
+        """Persist a batch with one ``add`` call per partition, concurrently."""
+        if self._partition_index is None:
+            groups = {self._collection_name: list(range(len(ids)))}
+        else:
+            groups = {}
+            for i, metadata in enumerate(metadatas):
+                name = partition_name(self._collection_name, metadata)
+                groups.setdefault(name, []).append(i)
+
+        async def add(name: str, rows: list[int]) -> None:
+            collection = await self._partition(name, create=True)
+            documents = [contents[i] for i in rows]
+            await collection.add(
+                ids=[ids[i] for i in rows],
+                documents=documents,
+                metadatas=[metadatas[i] for i in rows],
+                **await self._embeddings(documents),
+            )
+            if self._partition_index is not None:
+                await asyncio.to_thread(
+                    self._partition_index.put_many, [ids[i] for i in rows], name
+                )
+
+        await asyncio.gather(*(add(name, rows) for name, rows in groups.items()))
+
+    @_resilient
+    async def upsert_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+        embeddings: list[list[float] | None] | None = None,
+    ) -> None:
+        """Insert or replace a batch, embedding only rows without a vector."""
+        embeddings = list(embeddings or [None] * len(ids))
+        missing = [i for i, vector in enumerate(embeddings) if vector is None]
+        if missing:
+            computed = await self._embeddings([contents[i] for i in missing])
+            for i, vector in zip(missing, computed.get("embeddings", [])):
+                embeddings[i] = vector
+
+        groups = _upsert_groups(
+            self._collection_name,
+            metadatas,
+            embeddings,
+            partitioned=self._partition_index is not None,
+        )
+        if self._partition_index is not None:
+            moved_ids = await asyncio.to_thread(_moved, self._partition_index, ids, groups)
+            for name, moved in moved_ids.items():
+                collection = await self._partition(name)
+                if collection is not None:
+                    await collection.delete(ids=moved)
+
+        async def upsert(name: str, embedded: bool, rows: list[int]) -> None:
+            collection = await self._partition(name, create=True)
+            kwargs = {"embeddings": [embeddings[i] for i in rows]} if embedded else {}
+            await collection.upsert(
+                ids=[ids[i] for i in rows],
+                documents=[contents[i] for i in rows],
+                metadatas=[metadatas[i] for i in rows],
+                **kwargs,
+            )
+            if self._partition_index is not None:
+                await asyncio.to_thread(
+                    self._partition_index.put_many, [ids[i] for i in rows], name
+                )
+
+        await asyncio.gather(
+            *(upsert(name, embedded, rows) for (name, embedded), rows in groups.items())
+        )
+
+    async def get(self, id: str, include_content: bool = True) -> dict | None:
+        """Retrieve a document by ID, or None if it doesn't exist."""
+        return (await self.get_many([id], include_content))[0]
+
+    @_resilient
+    async def get_many(
+        self, ids: list[str], include_content: bool = True
+    ) -> list[dict | None]:
+        """Retrieve several documents, one ``get`` call per partition."""
+        if not ids:
+            return []
+        include = _get_include(include_content)
+        groups = await self._locate(ids)
+        results = await asyncio.gather(
+            *(
+                self._partitions[name].get(ids=group, include=include)
+                for name, group in groups.items()
+            )
+        )
+        found: dict[str, dict] = {}
+        for result in results:
+            found.update(_docs_by_id(result))
+        return [found.get(id) for id in ids]
+
+    async def search(
+        self,
+        query: str,
+        n_results: int,
+        where: dict | None = None,
+        include_content: bool = True,
+    ) -> list[dict]:
+        """Semantic search with optional metadata filtering."""
+        return (await self.search_many([query], n_results, where, include_content))[0]
+
+    @_resilient
+    async def search_many(
+        self,
+        queries: list[str],
+        n_results: int,
+        where: dict | None = None,
+        include_content: bool = True,
+    ) -> list[list[dict]]:
+        """Embed *queries* once, then query each relevant partition concurrently.
+
+        Every partition receives all queries in a single ``query`` call;
+        per-partition hits are merged by distance.
+        """
+        kwargs: dict = {"n_results": n_results, "include": _query_include(include_content)}
+        kwargs.update(await self._query_input(queries))
+        if where:
+            kwargs["where"] = _build_where(where)
+
+        if self._partition_index is None:
+            return _grouped_hits(await self._collection.query(**kwargs))
+
+        collections = await self._partitions_for(where)
+        results = await asyncio.gather(*(c.query(**kwargs) for c in collections))
+        return _merge_by_distance(list(results), len(queries), n_results)
+
+    @_resilient
+    async def get_page(
+        self,
+        where: dict | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        include_embeddings: bool = False,
+        include_content: bool = True,
+    ) -> tuple[list[dict], str | None]:
+        """Page through the collection; cursors match ``ChromaDBAdapter``."""
+        model = self._model_id if include_embeddings else None
+        if self._partition_index is None:
+            offset = int(cursor or 0)
+            result = await self._collection.get(
+                **_page_kwargs(where, limit, offset, include_embeddings, include_content)
+            )
+            return _page_from_result(result, limit, offset, model)
+
+        names = sorted(await self._partition_names(where))
+        start, offset = cursor.rsplit(":", 1) if cursor else ("", "0")
+        for i, name in enumerate(names):
+            if name < start:
+                continue
+            collection = await self._partition(name)
+            if collection is None:
+                continue
+            first = int(offset) if name == start else 0
+            result = await collection.get(
+                **_page_kwargs(where, limit, first, include_embeddings, include_content)
+            )
+            page, next_offset = _page_from_result(result, limit, first, model)
+            if next_offset is not None:
+                return page, f"{name}:{next_offset}"
+            if page:
+                rest = names[i + 1:]
+                return page, f"{rest[0]}:0" if rest else None
+        return [], None
+
+    async def delete(self, id: str) -> None:
+        """Remove a document permanently."""
+        await self.delete_many([id])
+
+    @_resilient
+    async def delete_many(self, ids: list[str]) -> None:
+        """Remove several documents, one ``delete`` call per partition."""
+        if not ids:
+            return
+        groups = await self._locate(ids)
+        await asyncio.gather(
+            *(self._partitions[name].delete(ids=group) for name, group in groups.items())
+        )
+        if self._partition_index is not None:
+            await asyncio.to_thread(self._partition_index.delete_many, ids)
+
+    async def update_metadata(self, id: str, metadata: dict) -> None:
+        """Merge new metadata keys into an existing document."""
+        await self.update_metadata_many([id], [metadata])
+
+    @_resilient
+    async def update_metadata_many(self, ids: list[str], metadatas: list[dict]) -> None:
+        """Merge metadata into several documents, one ``update`` per partition."""
+        by_id = dict(zip(ids, metadatas))
+        groups = await self._locate(ids)
+        await asyncio.gather(
+            *(
+                self._partitions[name].update(
+                    ids=group, metadatas=[by_id[id] for id in group]
+                )
+                for name, group in groups.items()
+            )
+        )
+
+    @_resilient
+    async def count(self) -> int:
+        """Total documents in the collection (every partition)."""
+        if self._partition_index is None:
+            return await self._collection.count()
+        collections = await self._partitions_for(None)
+        return sum(await asyncio.gather(*(c.count() for c in collections)))
+
+    async def heartbeat(self) -> bool:
+        """Return True if the ChromaDB server is reachable."""
+        try:
+            await self._client.heartbeat()
+            return True
+        except Exception:
+            return False
+
+    def embedding_model(self) -> str:
+        """Id of the client-side embedding function ("" if unknown)."""
+        return self._model_id
+
+    async def stats(self) -> dict:
+        """Report query-embedding cache counters and partition count."""
+        stats: dict = {}
+        if self._embedding_cache is not None:
+            stats["embedding_cache"] = await asyncio.to_thread(self._embedding_cache.stats)
+        if self._partition_index is not None:
+            stats["partitions"] = len(await self._partition_names(None))
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    async def _with_retries(self, func, *args, **kwargs):
+        """Await *func* with this adapter's retry settings (see ``_retrying``)."""
+        return await _retrying(
+            functools.partial(func, *args, **kwargs), self._retries, self._retry_backoff
+        )
+
+    async def _embeddings(self, documents: list[str]) -> dict:
+        """``embeddings=`` for *documents*, computed in a worker thread."""
+        if self._embedding_function is None:
+            return {}
+        vectors = await asyncio.to_thread(self._embedding_function, documents)
+        return {"embeddings": list(vectors)}
+
+    async def _query_input(self, queries: list[str]) -> dict:
+        """Return ``query_embeddings`` (cached or computed off-loop)."""
+        if self._embedding_function is None:
+            return {"query_texts": queries}
+        if self._embedding_cache is None:
+            vectors = await asyncio.to_thread(self._embedding_function, queries)
+            return {"query_embeddings": list(vectors)}
+
+        vectors = await asyncio.to_thread(
+            self._embedding_cache.get_many, self._model_id, queries
+        )
+        missing = [q for q, v in zip(queries, vectors) if v is None]
+        if missing:
+            embedded = list(
+                await asyncio.to_thread(self._embedding_function, missing)
+            )
+            await asyncio.to_thread(
+                self._embedding_cache.put_many, self._model_id, missing, embedded
+            )
+            fresh = iter(embedded)
+            vectors = [v if v is not None else next(fresh) for v in vectors]
+        return {"query_embeddings": vectors}
+
+    async def _partition(self, name: str, create: bool = False):
+        """Return the collection for partition *name* (None if absent)."""
+        collection = self._partitions.get(name)
+        if collection is None:
+            kwargs = {}
+            if self._embedding_function is not None:
+                kwargs["embedding_function"] = self._embedding_function
+            try:
+                collection = (
+                    await self._client.get_or_create_collection(name=name, **kwargs)
+                    if create
+                    else await self._client.get_collection(name=name, **kwargs)
+                )
+            except NotFoundError:
+                return None
+            self._partitions[name] = collection
+        return collection
+
+    async def _partition_names(self, where: dict | None) -> list[str]:
+        """Names of the partitions that can hold matches for *where*."""
+        if self._partition_index is None:
+            return [self._collection_name]
+        routed = _route(self._collection_name, where)
+        if routed is not None:
+            if self._base_drained is None:
+                stray = await self._collection.get(where=_STRAY_WHERE, limit=1, include=[])
+                self._base_drained = not stray["ids"]
+            if not self._base_drained:
+                routed.append(self._collection_name)
+            return routed
+        return [
+            c.name
+            for c in await self._client.list_collections()
+            if is_partition(self._collection_name, c.name)
+        ]
+
+    async def _partitions_for(self, where: dict | None) -> list:
+        """Existing collections that can hold matches for *where*."""
+        names = await self._partition_names(where)
+        collections = await asyncio.gather(*(self._partition(n) for n in names))
+        return [c for c in collections if c is not None]
+
+    async def _locate(self, ids: list[str]) -> dict[str, list[str]]:
+        """Group *ids* by owning partition (IDs found nowhere are omitted)."""
+        if self._partition_index is None:
+            return {self._collection_name: list(ids)}
+
+        known = await asyncio.to_thread(self._partition_index.get_many, ids)
+        unknown = [id for id in ids if id not in known]
+        if unknown:
+            collections = await self._partitions_for(None)
+            results = await asyncio.gather(
+                *(c.get(ids=unknown, include=[]) for c in collections)
+            )
+            for collection, result in zip(collections, results):
+                if result["ids"]:
+                    await asyncio.to_thread(
+                        self._partition_index.put_many, result["ids"], collection.name
+                    )
+                    known.update(dict.fromkeys(result["ids"], collection.name))
+
+        groups: dict[str, list[str]] = {}
+        for id in ids:
+            if id in known and await self._partition(known[id]) is not None:
+                groups.setdefault(known[id], []).append(id)
+        return groups
+
+
+async def _retrying(func, retries: int, backoff: float):
+    """Await *func()*, retrying dropped connections with exponential backoff.
+
+    See ``ChromaDBAdapter._with_retries``; there is no collection cache
+    here, so a ``NotFoundError`` is never retried.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except Exception as exc:
+            if not _transient(exc) or attempt >= retries:
+                raise
+            await asyncio.sleep(backoff * 2 ** attempt)
+            attempt += 1
+
+
+def _set_timeout(client, timeout: httpx.Timeout) -> None:
+    """Apply *timeout* to an async ChromaDB client's connection pool.
+
+    The async counterpart of ``chromadb_adapter._set_timeout``: chromadb
+    keeps one ``httpx.AsyncClient`` per event loop, created with no
+    timeout; this sets it on the current loop's.  Skipped (with a
+    warning) when chromadb's internals changed.
+    """
+    if timeout.connect is None and timeout.read is None:
+        return
+    with _internals("HTTP timeouts"):
+        client._server._get_client().timeout = timeout
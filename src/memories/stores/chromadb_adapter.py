@@ -2,97 +2,860 @@
 
 Connects to a ChromaDB server over HTTP and translates the generic
 VectorStore interface into ChromaDB collection API calls.
+
+Optionally partitions memories by project: each project gets its own
+collection, ``global_`` memories share one, and memories without a
+project stay in the base collection.  Searches filtered to a project
+only touch its partition (plus the global one); unfiltered searches fan
+out to every partition concurrently and merge by distance.
+
+With a ``CollectionCache``, collections resolved once are rebuilt from
+their cached id, so a new process sends no request until the first
+store call; the ChromaDB client (and its identity, tenant and database
+checks) is only created on a cache miss.  Store calls retry dropped
+connections with exponential backoff, and a ``NotFoundError`` (the
+collection was deleted or recreated on the server) drops the cached
+handles and tries once more.
+
+chromadb has no public API for either a collection handle without the
+client handshake or HTTP timeouts, so both use its internals.  They are
+confined to the ``_internals`` helpers at the end of this module.  If a
+chromadb release other than ``_SUPPORTED_CHROMADB`` (pinned in
+pyproject.toml) changed them, the helpers emit a RuntimeWarning and the
+adapter falls back to the public API: collections are resolved through
+the client and chromadb's default timeouts apply.
 """
 
+import functools
+import hashlib
+import time
+import uuid
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property
+
 import chromadb
+import httpx
+from chromadb.config import Settings as ChromaSettings
+from chromadb.errors import NotFoundError
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+from pydantic import ValidationError
+
+from memories.profiling import span, timed
+from memories.stores.collection_cache import CollectionCache
+from memories.stores.embedding_cache import EmbeddingCache, embedding_model_id
+from memories.stores.partition_index import PartitionIndex
+
+# Upper bound on concurrent partition queries during a fan-out.
+_MAX_FANOUT = 8
+
+# chromadb release whose internals the collection cache and timeouts use.
+_SUPPORTED_CHROMADB = "1.5"
+
+# Connection failures worth retrying: the request never reached the
+# server or the connection dropped (e.g. a container restart).  Read
+# timeouts are not retried; the server may still be working on it.
+_TRANSIENT = (
+    httpx.NetworkError,
+    httpx.RemoteProtocolError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
+
+
+def _transient(exc: BaseException) -> bool:
+    """Return True if *exc* is a connection failure worth retrying.
+
+    The ChromaDB client reports a refused connection while it connects
+    as a ``ValueError`` raised from the ``httpx.ConnectError``.
+    """
+    if isinstance(exc, ValueError):
+        exc = exc.__context__
+    return isinstance(exc, _TRANSIENT)
+
+
+def _resilient(method):
+    """Run an adapter method through ``ChromaDBAdapter._with_retries``."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._with_retries(method, self, *args, **kwargs)
+
+    return wrapper
 
 
 class ChromaDBAdapter:
     """VectorStore backed by a remote ChromaDB instance."""
 
-    def __init__(self, host: str, port: int, collection_name: str) -> None:
-        self._client = chromadb.HttpClient(host=host, port=port)
-        self._collection = self._client.get_or_create_collection(
-            name=collection_name,
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        collection_name: str,
+        embedding_cache: EmbeddingCache | None = None,
+        partition_index: PartitionIndex | None = None,
+        client=None,
+        embedding_function=None,
+        collection_cache: CollectionCache | None = None,
+        connect_timeout: float = 0,
+        read_timeout: float = 0,
+        keepalive_seconds: float = 40,
+        retries: int = 0,
+        retry_backoff: float = 0.5,
+    ) -> None:
+        """Connect to ChromaDB.  Passing *partition_index* enables partitioning.
+
+        *client* replaces the HTTP connection to *host*:*port* with an
+        existing ChromaDB client (e.g. ``chromadb.EphemeralClient()``);
+        *collection_cache* is then ignored.  *embedding_function* embeds
+        documents and queries (default: ChromaDB's default model), for
+        resolved and cached collections alike.  Timeouts are in seconds (0
+        waits forever); idle connections are kept *keepalive_seconds*.
+        A dropped connection is retried *retries* times, sleeping
+        *retry_backoff* seconds and doubling after each attempt.
+        """
+        self._host = host
+        self._port = port
+        self._timeout = httpx.Timeout(read_timeout or None, connect=connect_timeout or None)
+        self._keepalive_seconds = keepalive_seconds
+        self._retries = retries
+        self._retry_backoff = retry_backoff
+        if client is not None:
+            self._client = client
+            collection_cache = None  # Cached handles would bypass the client.
+        self._collection_cache = collection_cache
+        self._collection_name = collection_name
+        self._partitions: dict = {}
+        self._embedding_function = (
+            embedding_function if embedding_function is not None else DefaultEmbeddingFunction()
+        )
+
+        with span("chromadb.connect"):
+            self._collection = self._with_retries(self._open, collection_name, True)
+
+        self._partition_index = partition_index
+        self._partitions[collection_name] = self._collection
+        self._pool = (
+            ThreadPoolExecutor(max_workers=_MAX_FANOUT)
+            if partition_index is not None
+            else None
         )
 
+        # Query embeddings are cached per model.
+        self._embedding_cache = embedding_cache
+        self._model_id = embedding_model_id(self._embedding_function)
+        if self._embedding_cache is not None:
+            self._embedding_cache.retain_model(self._model_id)
+
     # ------------------------------------------------------------------
     # VectorStore protocol methods
     # ------------------------------------------------------------------
 
     def store(self, id: str, content: str, metadata: dict) -> None:
         """Persist a document.  ChromaDB generates the embedding."""
-        self._collection.add(ids=[id], documents=[content], metadatas=[metadata])
+        self.store_many([id], [content], [metadata])
+
+    @timed("chromadb.add")
+    @_resilient
+    def store_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+    ) -> None:
+        """Persist a batch with one ``collection.add`` call per partition."""
+        if self._partition_index is None:
+            self._collection.add(ids=ids, documents=contents, metadatas=metadatas)
+            return
+
+        groups: dict[str, list[int]] = {}
+        for i, metadata in enumerate(metadatas):
+            name = partition_name(self._collection_name, metadata)
+            groups.setdefault(name, []).append(i)
+        for name, rows in groups.items():
+            group_ids = [ids[i] for i in rows]
+            self._partition(name, create=True).add(
+                ids=group_ids,
+                documents=[contents[i] for i in rows],
+                metadatas=[metadatas[i] for i in rows],
+            )
+            self._partition_index.put_many(group_ids, name)
+
+    @timed("chromadb.upsert")
+    @_resilient
+    def upsert_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+        embeddings: list[list[float] | None] | None = None,
+    ) -> None:
+        """Insert or replace a batch with ``collection.upsert``.
+
+        Rows with an embedding send it as-is and the rest are embedded as
+        usual, so each partition gets at most two ``upsert`` calls.  A
+        memory whose project moved it to another partition is removed
+        from the old one.
+        """
+        groups = _upsert_groups(
+            self._collection_name,
+            metadatas,
+            embeddings,
+            partitioned=self._partition_index is not None,
+        )
+        if self._partition_index is not None:
+            for name, moved in _moved(self._partition_index, ids, groups).items():
+                collection = self._partition(name)
+                if collection is not None:
+                    collection.delete(ids=moved)
+
+        for (name, embedded), rows in groups.items():
+            group_ids = [ids[i] for i in rows]
+            kwargs = {"embeddings": [embeddings[i] for i in rows]} if embedded else {}
+            self._partition(name, create=True).upsert(
+                ids=group_ids,
+                documents=[contents[i] for i in rows],
+                metadatas=[metadatas[i] for i in rows],
+                **kwargs,
+            )
+            if self._partition_index is not None:
+                self._partition_index.put_many(group_ids, name)
 
-    def get(self, id: str) -> dict | None:
+    def get(self, id: str, include_content: bool = True) -> dict | None:
         """Retrieve a document by ID, or None if it doesn't exist."""
-        result = self._collection.get(ids=[id])
-        if not result["ids"]:
-            return None
-        return {
-            "id": result["ids"][0],
-            "content": result["documents"][0],
-            "metadata": result["metadatas"][0],
-        }
+        return self.get_many([id], include_content)[0]
+
+    @timed("chromadb.get")
+    @_resilient
+    def get_many(
+        self, ids: list[str], include_content: bool = True
+    ) -> list[dict | None]:
+        """Retrieve several documents with one ``get`` call per partition."""
+        if not ids:
+            return []
+        include = _get_include(include_content)
+        found: dict[str, dict] = {}
+        for name, group in self._locate(ids).items():
+            found.update(
+                _docs_by_id(self._partitions[name].get(ids=group, include=include))
+            )
+        return [found.get(id) for id in ids]
 
     def search(
         self,
         query: str,
         n_results: int,
         where: dict | None = None,
+        include_content: bool = True,
     ) -> list[dict]:
         """Semantic search with optional metadata filtering.
 
         When *where* has multiple keys, they are combined with ChromaDB's
         ``$and`` operator so every condition must match.
         """
-        kwargs: dict = {"query_texts": [query], "n_results": n_results}
+        return self.search_many([query], n_results, where, include_content)[0]
+
+    @_resilient
+    def search_many(
+        self,
+        queries: list[str],
+        n_results: int,
+        where: dict | None = None,
+        include_content: bool = True,
+    ) -> list[list[dict]]:
+        """Embed and run all *queries* in a single ``collection.query`` call.
+
+        With an embedding cache, cached vectors are sent as
+        ``query_embeddings`` and only the misses are embedded.  When
+        partitioned, the vectors are computed once and every relevant
+        partition is queried concurrently; hits are merged by distance.
+        Without *include_content* the documents are left out of
+        ``include=`` and never leave the server.
+        """
+        kwargs: dict = {"n_results": n_results, "include": _query_include(include_content)}
+        with span("chromadb.embed"):
+            kwargs.update(self._query_input(queries))
         if where:
             kwargs["where"] = _build_where(where)
 
-        result = self._collection.query(**kwargs)
+        if self._partition_index is None:
+            with span("chromadb.query"):
+                return _grouped_hits(self._collection.query(**kwargs))
 
-        # query() returns lists-of-lists; we always pass a single query.
-        ids = result["ids"][0]
-        docs = result["documents"][0]
-        metas = result["metadatas"][0]
-        distances = result["distances"][0]
+        collections = self._partitions_for(where)
+        with span("chromadb.query"):
+            results = list(self._pool.map(lambda c: c.query(**kwargs), collections))
+        return _merge_by_distance(results, len(queries), n_results)
 
-        return [
-            {
-                "id": ids[i],
-                "content": docs[i],
-                "metadata": metas[i],
-                "distance": distances[i],
-            }
-            for i in range(len(ids))
-        ]
+    @timed("chromadb.get_page")
+    @_resilient
+    def get_page(
+        self,
+        where: dict | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        include_embeddings: bool = False,
+        include_content: bool = True,
+    ) -> tuple[list[dict], str | None]:
+        """Page through the collection with ``get(limit, offset)``.
+
+        The cursor is the next offset; ChromaDB returns documents in
+        insertion order, which metadata updates do not change.  When
+        partitioned, partitions are walked in name order and the cursor
+        is ``"<partition>:<offset>"``; a page never spans two partitions.
+        *include_embeddings* adds each stored vector and the model id.
+        """
+        model = self._model_id if include_embeddings else None
+        if self._partition_index is None:
+            return _get_page(
+                self._collection, where, limit, int(cursor or 0), model, include_content
+            )
+
+        names = sorted(self._partition_names(where))
+        start, offset = cursor.rsplit(":", 1) if cursor else ("", "0")
+        for i, name in enumerate(names):
+            if name < start:
+                continue
+            collection = self._partition(name)
+            if collection is None:
+                continue
+            page, next_offset = _get_page(
+                collection,
+                where,
+                limit,
+                int(offset) if name == start else 0,
+                model,
+                include_content,
+            )
+            if next_offset is not None:
+                return page, f"{name}:{next_offset}"
+            if page:
+                rest = names[i + 1:]
+                return page, f"{rest[0]}:0" if rest else None
+        return [], None
 
     def delete(self, id: str) -> None:
         """Remove a document permanently."""
-        self._collection.delete(ids=[id])
+        self.delete_many([id])
+
+    @timed("chromadb.delete")
+    @_resilient
+    def delete_many(self, ids: list[str]) -> None:
+        """Remove several documents with one ``delete`` call per partition."""
+        if not ids:
+            return
+        for name, group in self._locate(ids).items():
+            self._partitions[name].delete(ids=group)
+        if self._partition_index is not None:
+            self._partition_index.delete_many(ids)
 
     def update_metadata(self, id: str, metadata: dict) -> None:
         """Merge new metadata keys into an existing document."""
-        self._collection.update(ids=[id], metadatas=[metadata])
+        self.update_metadata_many([id], [metadata])
+
+    @timed("chromadb.update")
+    @_resilient
+    def update_metadata_many(self, ids: list[str], metadatas: list[dict]) -> None:
+        """Merge metadata into several documents with one ``update`` call."""
+        if self._partition_index is None:
+            self._collection.update(ids=ids, metadatas=metadatas)
+            return
 
+        by_id = dict(zip(ids, metadatas))
+        for name, group in self._locate(ids).items():
+            self._partitions[name].update(
+                ids=group, metadatas=[by_id[id] for id in group]
+            )
+
+    @timed("chromadb.count")
+    @_resilient
     def count(self) -> int:
-        """Total documents in the collection."""
-        return self._collection.count()
+        """Total documents in the collection (every partition)."""
+        if self._partition_index is None:
+            return self._collection.count()
+        return sum(c.count() for c in self._partitions_for(None))
 
+    @timed("chromadb.heartbeat")
     def heartbeat(self) -> bool:
         """Return True if the ChromaDB server is reachable."""
+        api = self._client
+        if self._collection_cache is not None and self._server is not None:
+            api = self._server
         try:
-            self._client.heartbeat()
+            api.heartbeat()
             return True
         except Exception:
             return False
 
+    def embedding_model(self) -> str:
+        """Id of the client-side embedding function ("" if unknown)."""
+        return self._model_id
+
+    def stats(self) -> dict:
+        """Report query-embedding cache counters and partition count."""
+        stats: dict = {}
+        if self._embedding_cache is not None:
+            stats["embedding_cache"] = self._embedding_cache.stats()
+        if self._partition_index is not None:
+            stats["partitions"] = len(self._partition_names(None))
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def _client(self):
+        """HTTP client, connected on first use (three round-trips)."""
+        client = chromadb.HttpClient(
+            host=self._host, port=self._port, settings=self._http_settings()
+        )
+        _set_timeout(client, self._timeout)
+        return client
+
+    @cached_property
+    def _server(self):
+        """HTTP API for collections built from the cache; sends no request.
+
+        None if chromadb's internals changed (the client is used instead).
+        """
+        server = _server_api(self._http_settings(), self._host, self._port)
+        if server is not None:
+            _set_timeout(server, self._timeout)
+        return server
+
+    def _http_settings(self) -> ChromaSettings:
+        """ChromaDB client settings with this adapter's keep-alive."""
+        return ChromaSettings(chroma_http_keepalive_secs=self._keepalive_seconds)
+
+    def _with_retries(self, func, *args, **kwargs):
+        """Call *func*, retrying dropped connections with exponential backoff.
+
+        A ``NotFoundError`` while collections come from the cache means
+        a cached id went stale: the handles are dropped, the base
+        collection is resolved again and *func* gets one more try.
+        ChromaDB ignores re-added IDs and every other write is
+        idempotent, so repeating a batch that partly landed is safe.
+        """
+        attempt = 0
+        refreshed = False
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except NotFoundError:
+                if refreshed or self._collection_cache is None:
+                    raise
+                refreshed = True
+                self._refresh()
+            except Exception as exc:
+                if not _transient(exc) or attempt >= self._retries:
+                    raise
+                with span("chromadb.retry"):
+                    time.sleep(self._retry_backoff * 2 ** attempt)
+                attempt += 1
+
+    def _open(self, name: str, create: bool = False):
+        """Collection *name*, built from its cached id when it is known.
+
+        Otherwise, or if chromadb's internals changed, it is resolved
+        through the client (created if *create*, else ``NotFoundError``
+        when absent) and its id is cached.
+        """
+        cache = self._collection_cache
+        cached_id = cache.get(self._cache_key(name)) if cache is not None else None
+        if cached_id is not None and self._server is not None:
+            collection = _cached_collection(
+                self._server, name, cached_id, self._embedding_function
+            )
+            if collection is not None:
+                return collection
+        open_collection = (
+            self._client.get_or_create_collection if create else self._client.get_collection
+        )
+        collection = open_collection(name=name, embedding_function=self._embedding_function)
+        if cache is not None:
+            cache.put(self._cache_key(name), str(collection.id))
+        return collection
+
+    def _cache_key(self, name: str) -> str:
+        """``CollectionCache`` key of collection *name* on this server."""
+        return f"{self._host}:{self._port}/{name}"
+
+    def _refresh(self) -> None:
+        """Forget cached collection handles and resolve the base one again."""
+        self._collection_cache.delete_many(
+            [self._cache_key(name) for name in self._partitions]
+        )
+        self._collection = self._open(self._collection_name, create=True)
+        self._partitions = {self._collection_name: self._collection}
+
+    def _query_input(self, queries: list[str]) -> dict:
+        """Return the ``query_embeddings`` or ``query_texts`` argument."""
+        if self._embedding_cache is not None:
+            return {"query_embeddings": self._embed_queries(queries)}
+        if self._partition_index is not None and self._embedding_function is not None:
+            # Embed once here rather than once per partition on the server.
+            return {"query_embeddings": list(self._embedding_function(queries))}
+        return {"query_texts": queries}
+
+    def _embed_queries(self, queries: list[str]) -> list:
+        """Resolve query vectors from the cache, embedding only the misses."""
+        vectors = self._embedding_cache.get_many(self._model_id, queries)
+        missing = [q for q, v in zip(queries, vectors) if v is None]
+        if missing:
+            embedded = list(self._embedding_function(missing))
+            self._embedding_cache.put_many(self._model_id, missing, embedded)
+            fresh = iter(embedded)
+            vectors = [v if v is not None else next(fresh) for v in vectors]
+        return vectors
+
+    def _partition(self, name: str, create: bool = False):
+        """Return the collection for partition *name* (None if absent)."""
+        collection = self._partitions.get(name)
+        if collection is None:
+            try:
+                collection = self._open(name, create)
+            except NotFoundError:
+                return None
+            self._partitions[name] = collection
+        return collection
+
+    def _partition_names(self, where: dict | None) -> list[str]:
+        """Names of the partitions that can hold matches for *where*."""
+        routed = _route(self._collection_name, where)
+        if routed is not None:
+            if not self._base_drained:
+                routed.append(self._collection_name)
+            return routed
+        return [
+            c.name
+            for c in self._client.list_collections()
+            if is_partition(self._collection_name, c.name)
+        ]
+
+    @cached_property
+    def _base_drained(self) -> bool:
+        """True if the base collection holds no project or global memories.
+
+        Such rows were written before partitioning was turned on; while
+        any remain, project and global reads also query the base
+        collection.  Checked once per adapter.
+        """
+        return not self._collection.get(where=_STRAY_WHERE, limit=1, include=[])["ids"]
+
+    def _partitions_for(self, where: dict | None) -> list:
+        """Existing collections that can hold matches for *where*."""
+        collections = (self._partition(name) for name in self._partition_names(where))
+        return [c for c in collections if c is not None]
+
+    def _locate(self, ids: list[str]) -> dict[str, list[str]]:
+        """Group *ids* by owning partition (IDs found nowhere are omitted).
+
+        Uses the partition index; unknown IDs are probed in every
+        partition once and then recorded.
+        """
+        if self._partition_index is None:
+            return {self._collection_name: list(ids)}
+
+        known = self._partition_index.get_many(ids)
+        unknown = [id for id in ids if id not in known]
+        for collection in self._partitions_for(None) if unknown else []:
+            found = collection.get(ids=unknown, include=[])["ids"]
+            if found:
+                self._partition_index.put_many(found, collection.name)
+                known.update(dict.fromkeys(found, collection.name))
+                unknown = [id for id in unknown if id not in known]
+            if not unknown:
+                break
+
+        groups: dict[str, list[str]] = {}
+        for id in ids:
+            if id in known and self._partition(known[id]) is not None:
+                groups.setdefault(known[id], []).append(id)
+        return groups
+
 
 # ------------------------------------------------------------------
 # Helpers
 # ------------------------------------------------------------------
 
+@contextmanager
+def _internals(feature: str):
+    """Turn a chromadb internal that moved into a RuntimeWarning.
+
+    The block is abandoned and the caller falls back to the public API;
+    *feature* names what is lost (e.g. "HTTP timeouts").
+    """
+    try:
+        yield
+    except (AttributeError, ImportError, TypeError, ValidationError) as exc:
+        warnings.warn(
+            f"chromadb {chromadb.__version__} changed internals this adapter "
+            f"relies on ({exc}); {feature} disabled. "
+            f"Install chromadb~={_SUPPORTED_CHROMADB}.0 to restore it.",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+
+
+def _server_api(settings: ChromaSettings, host: str, port: int):
+    """ChromaDB HTTP API for *host*:*port*, without the client's handshake.
+
+    None if chromadb's internals changed.
+    """
+    with _internals("collection cache"):
+        from chromadb.api import ServerAPI
+        from chromadb.config import System
+
+        settings.chroma_api_impl = "chromadb.api.fastapi.FastAPI"
+        settings.chroma_server_host = host
+        settings.chroma_server_http_port = port
+        system = System(settings)
+        server = system.instance(ServerAPI)
+        system.start()
+        return server
+    return None
+
+
+def _cached_collection(server, name: str, id: str, embedding_function):
+    """Collection handle for a known *name* and *id*; sends no request.
+
+    Only the id, tenant and database address requests; the rest of the
+    server-side model (configuration, schema) is not needed client-side
+    because *embedding_function* is given.  None if chromadb's internals
+    changed.
+    """
+    with _internals("collection cache"):
+        from chromadb.api.models.Collection import Collection
+        from chromadb.config import DEFAULT_DATABASE, DEFAULT_TENANT
+        from chromadb.types import Collection as CollectionModel
+
+        model = CollectionModel(
+            id=uuid.UUID(id),
+            name=name,
+            configuration_json={},
+            serialized_schema=None,
+            metadata=None,
+            dimension=None,
+            tenant=DEFAULT_TENANT,
+            database=DEFAULT_DATABASE,
+            version=0,
+            log_position=0,
+        )
+        return Collection(client=server, model=model, embedding_function=embedding_function)
+    return None
+
+
+def _set_timeout(api, timeout: httpx.Timeout) -> None:
+    """Apply *timeout* to a ChromaDB client or HTTP API's connection pool.
+
+    chromadb creates its ``httpx`` session with no timeout and offers no
+    setting for one.  Nothing is touched when both timeouts are 0, or
+    (with a warning) when chromadb's internals changed.
+    """
+    if timeout.connect is None and timeout.read is None:
+        return
+    with _internals("HTTP timeouts"):
+        server = getattr(api, "_server", api)
+        server._session.timeout = timeout
+
+
+def partition_name(base: str, metadata: dict) -> str:
+    """Name of the collection that stores a memory with *metadata*.
+
+    Global memories share ``<base>-global``; project memories go to
+    ``<base>-project-<hash>`` (hashed so any project string yields a
+    valid collection name); everything else stays in *base*.
+    """
+    if metadata.get("global_") is True:
+        return _global_partition(base)
+    project = metadata.get("project", "")
+    if project:
+        digest = hashlib.sha1(project.encode()).hexdigest()[:16]
+        return f"{base}-project-{digest}"
+    return base
+
+
+def is_partition(base: str, name: str) -> bool:
+    """Return True if collection *name* is one of *base*'s partitions."""
+    return (
+        name == base
+        or name == _global_partition(base)
+        or name.startswith(f"{base}-project-")
+    )
+
+
+def _global_partition(base: str) -> str:
+    """Name of the partition shared by global memories."""
+    return f"{base}-global"
+
+
+# Rows in the base collection that partitioning would store elsewhere.
+_STRAY_WHERE = {"$or": [{"project": {"$ne": ""}}, {"global_": True}]}
+
+
+def _route(base: str, where: dict | None) -> list[str] | None:
+    """Partitions a flat *where* can match, or None for all of them.
+
+    Only top-level equality on ``global_`` and ``project`` narrows the
+    set; the filter itself still runs inside each partition.  Callers
+    add *base* while it still holds memories from before partitioning.
+    """
+    if not where:
+        return None
+    global_ = where.get("global_")
+    if global_ is True:
+        return [_global_partition(base)]
+    project = where.get("project")
+    if not isinstance(project, str):
+        return None
+    names = [partition_name(base, {"project": project})]
+    if global_ is None:
+        names.append(_global_partition(base))  # Global memories may carry a project.
+    return names
+
+
+def _upsert_groups(
+    base: str,
+    metadatas: list[dict],
+    embeddings: list[list[float] | None] | None,
+    partitioned: bool,
+) -> dict[tuple[str, bool], list[int]]:
+    """Group upsert rows by (partition, has embedding)."""
+    groups: dict[tuple[str, bool], list[int]] = {}
+    for i, metadata in enumerate(metadatas):
+        name = partition_name(base, metadata) if partitioned else base
+        embedded = embeddings is not None and embeddings[i] is not None
+        groups.setdefault((name, embedded), []).append(i)
+    return groups
+
+
+def _moved(
+    partition_index: PartitionIndex,
+    ids: list[str],
+    groups: dict[tuple[str, bool], list[int]],
+) -> dict[str, list[str]]:
+    """IDs known to live in another partition than the one they now go to."""
+    known = partition_index.get_many(ids)
+    moved: dict[str, list[str]] = {}
+    for (name, _), rows in groups.items():
+        for i in rows:
+            old = known.get(ids[i])
+            if old is not None and old != name:
+                moved.setdefault(old, []).append(ids[i])
+    return moved
+
+
+def _get_page(
+    collection,
+    where: dict | None,
+    limit: int,
+    offset: int,
+    embedding_model: str | None = None,
+    include_content: bool = True,
+) -> tuple[list[dict], str | None]:
+    """One ``get(limit, offset)`` page; the cursor is the next offset."""
+    result = collection.get(
+        **_page_kwargs(
+            where, limit, offset, embedding_model is not None, include_content
+        )
+    )
+    return _page_from_result(result, limit, offset, embedding_model)
+
+
+def _page_kwargs(
+    where: dict | None,
+    limit: int,
+    offset: int,
+    include_embeddings: bool = False,
+    include_content: bool = True,
+) -> dict:
+    """Keyword arguments for one paged ``collection.get`` call."""
+    kwargs: dict = {"limit": limit, "offset": offset}
+    if where:
+        kwargs["where"] = _build_where(where)
+    kwargs["include"] = _get_include(include_content)
+    if include_embeddings:
+        kwargs["include"].append("embeddings")
+    return kwargs
+
+
+def _get_include(include_content: bool) -> list[str]:
+    """``include=`` for ``collection.get``: metadata, plus documents if wanted."""
+    return ["documents", "metadatas"] if include_content else ["metadatas"]
+
+
+def _query_include(include_content: bool) -> list[str]:
+    """``include=`` for ``collection.query``: ``_get_include`` plus distances."""
+    return [*_get_include(include_content), "distances"]
+
+
+def _documents(result: dict) -> list:
+    """The ``documents`` column of a ``get()`` result ("" if not included)."""
+    return result.get("documents") or [""] * len(result["ids"])
+
+
+def _page_from_result(
+    result: dict, limit: int, offset: int, embedding_model: str | None = None
+) -> tuple[list[dict], str | None]:
+    """Convert a ``get()`` result into a page and the next offset cursor.
+
+    With *embedding_model* (embeddings requested), each document also
+    carries its ``embedding`` and the ``embedding_model`` that made it.
+    """
+    page = [
+        {"id": id, "content": doc, "metadata": meta}
+        for id, doc, meta in zip(result["ids"], _documents(result), result["metadatas"])
+    ]
+    if embedding_model is not None:
+        for doc, vector in zip(page, result["embeddings"]):
+            doc["embedding"] = [float(x) for x in vector]
+            doc["embedding_model"] = embedding_model
+    next_cursor = str(offset + len(page)) if len(page) == limit else None
+    return page, next_cursor
+
+
+def _docs_by_id(result: dict) -> dict[str, dict]:
+    """Map each ID in a ``get()`` result to its document dict."""
+    return {
+        id: {"id": id, "content": doc, "metadata": meta}
+        for id, doc, meta in zip(result["ids"], _documents(result), result["metadatas"])
+    }
+
+
+def _merge_by_distance(
+    results: list[dict], n_queries: int, n_results: int
+) -> list[list[dict]]:
+    """Merge per-partition ``query()`` results into one top-K list per query."""
+    merged: list[list[dict]] = [[] for _ in range(n_queries)]
+    for result in results:
+        for hits, partition_hits in zip(merged, _grouped_hits(result)):
+            hits.extend(partition_hits)
+    return [sorted(hits, key=lambda r: r["distance"])[:n_results] for hits in merged]
+
+
+def _grouped_hits(result: dict) -> list[list[dict]]:
+    """Convert a ``query()`` result into one hit list per query, in order."""
+    return [
+        [
+            {
+                "id": ids[i],
+                "content": docs[i],
+                "metadata": metas[i],
+                "distance": distances[i],
+            }
+            for i in range(len(ids))
+        ]
+        for ids, docs, metas, distances in zip(
+            result["ids"],
+            result.get("documents") or [[""] * len(ids) for ids in result["ids"]],
+            result["metadatas"],
+            result["distances"],
+        )
+    ]
+
+
 def _build_where(where: dict) -> dict:
     """Convert a flat filter dict into ChromaDB's ``$and`` format.
 
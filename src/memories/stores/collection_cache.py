@@ -0,0 +1,54 @@
+"""Local cache of resolved ChromaDB collection ids.
+
+Opening a collection by name costs the HTTP client four round-trips
+(identity, tenant and database checks, then ``get_or_create``) before
+the first real request.  The adapter records each collection's id here
+the first time it resolves it, so later processes build the handle
+locally and their first request is the only one.  Entries are keyed by
+``host:port/name``.
+
+The table is a cache of what the server holds: a collection deleted or
+recreated on the server leaves a stale id, which the adapter detects
+(ChromaDB answers ``NotFoundError``), drops and resolves again.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class CollectionCache:
+    """SQLite map from ``host:port/name`` to a collection id."""
+
+    def __init__(self, path: str) -> None:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS collection_ids ("
+            "key TEXT PRIMARY KEY, id TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached collection id for *key*, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id FROM collection_ids WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, id: str) -> None:
+        """Record collection *id* for *key*."""
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO collection_ids VALUES (?, ?)", (key, id),
+            )
+
+    def delete_many(self, keys: list[str]) -> None:
+        """Forget *keys* (after the server rejected their ids)."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM collection_ids WHERE key = ?", [(key,) for key in keys],
+            )
@@ -0,0 +1,226 @@
+"""Persistent LRU cache of query embeddings.
+
+Agents repeat the same recall queries across sessions; caching their
+vectors on disk lets a store skip the embedding model entirely on a
+hit.  Entries are keyed by (embedding-model id, normalized query text)
+in a small SQLite file, evicted least-recently-used beyond
+``max_entries``, and hit/miss counters persist across processes so
+``memory status`` can report them.
+
+Lookups are the hot path and many agent processes share the file, so a
+lookup only reads: the file is in WAL mode (readers never wait for a
+writer), and the ``last_used`` touches and counter increments are
+buffered in memory.  The buffer is written in one transaction every
+``_FLUSH_SECONDS`` or ``_FLUSH_ENTRIES`` touches, before ``put_many``
+evicts, on ``stats`` and ``flush``, and when the cache is garbage
+collected or the process exits.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+import weakref
+from pathlib import Path
+
+import numpy as np
+
+# Buffered usage (last_used touches, hit/miss counts) is written at most
+# this often, or once this many entries were touched.
+_FLUSH_SECONDS = 30.0
+_FLUSH_ENTRIES = 256
+
+
+def normalize_query(text: str) -> str:
+    """Canonical cache key for *text*: NFC, trimmed, single-spaced.
+
+    Case is preserved — whether it matters depends on the model.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_model_id(embedding_function) -> str:
+    """Identify an embedding function by its name and configuration.
+
+    Changing the function (or its model settings) changes the id, so
+    vectors from the old model are never served for the new one.
+    """
+    name_fn = getattr(embedding_function, "name", None)
+    if callable(name_fn):
+        name = name_fn()
+    else:
+        # Plain functions have no name(); fall back to their qualified name.
+        name = getattr(
+            embedding_function, "__qualname__", type(embedding_function).__qualname__
+        )
+
+    config_fn = getattr(embedding_function, "get_config", None)
+    config = config_fn() if callable(config_fn) else {}
+    return f"{name}:{json.dumps(config, sort_keys=True, default=str)}"
+
+
+class _Usage:
+    """Hits, misses and ``last_used`` touches not yet written to the file."""
+
+    def __init__(self) -> None:
+        self.touched: dict[tuple[str, str], float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.since: float | None = None
+
+    def add(self, model: str, found: list[str], hits: int, misses: int) -> None:
+        """Record one lookup: the keys it found and its hit/miss counts."""
+        if self.since is None:
+            self.since = time.monotonic()
+        now = time.time()
+        self.touched.update(((model, key), now) for key in found)
+        self.hits += hits
+        self.misses += misses
+
+    def due(self) -> bool:
+        """True once the buffer is old or large enough to be written."""
+        if self.since is None:
+            return False
+        return (
+            len(self.touched) >= _FLUSH_ENTRIES
+            or time.monotonic() - self.since >= _FLUSH_SECONDS
+        )
+
+    def write(self, db: sqlite3.Connection) -> None:
+        """Apply and clear the buffer (caller holds the lock and a transaction).
+
+        ``last_used`` only moves forward, so an older buffer flushed by
+        another process never undoes a newer touch.
+        """
+        if self.since is None:
+            return
+        db.executemany(
+            "UPDATE entries SET last_used = MAX(last_used, ?) WHERE model = ? AND query = ?",
+            [(used, model, key) for (model, key), used in self.touched.items()],
+        )
+        for name, amount in (("hits", self.hits), ("misses", self.misses)):
+            if amount:
+                db.execute(
+                    "UPDATE counters SET value = value + ? WHERE name = ?", (amount, name),
+                )
+        self.touched, self.hits, self.misses, self.since = {}, 0, 0, None
+
+
+def _write_usage(db: sqlite3.Connection, lock: threading.Lock, usage: _Usage) -> None:
+    """Write *usage* in its own transaction."""
+    with lock, db:
+        usage.write(db)
+
+
+class EmbeddingCache:
+    """Size-bounded on-disk map of (model, query) → float32 vector."""
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                model TEXT NOT NULL,
+                query TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, query)
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0);
+            """
+        )
+        self._db.commit()
+        self._usage = _Usage()
+        weakref.finalize(self, _write_usage, self._db, self._lock, self._usage)
+
+    def get_many(self, model: str, texts: list[str]) -> list[np.ndarray | None]:
+        """Look up each text; None marks a miss.  Counts hits and misses.
+
+        Only reads the file; the touches and counts are buffered (see
+        the module docstring).
+        """
+        keys = [normalize_query(t) for t in texts]
+        with self._lock:
+            found: dict[str, np.ndarray] = {}
+            for key in set(keys):
+                row = self._db.execute(
+                    "SELECT vector FROM entries WHERE model = ? AND query = ?",
+                    (model, key),
+                ).fetchone()
+                if row is not None:
+                    found[key] = np.frombuffer(row[0], dtype=np.float32)
+
+            hits = sum(key in found for key in keys)
+            self._usage.add(model, list(found), hits, len(keys) - hits)
+            if self._usage.due():
+                with self._db:
+                    self._usage.write(self._db)
+        return [found.get(key) for key in keys]
+
+    def put_many(self, model: str, texts: list[str], vectors) -> None:
+        """Store vectors for *texts*, then evict down to ``max_entries``."""
+        now = time.time()
+        rows = [
+            (
+                model,
+                normalize_query(text),
+                np.asarray(vector, dtype=np.float32).tobytes(),
+                now,
+            )
+            for text, vector in zip(texts, vectors)
+        ]
+        with self._lock, self._db:
+            # Recent touches first, so eviction sees the true LRU order.
+            self._usage.write(self._db)
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", rows,
+            )
+            (count,) = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+            if count > self._max_entries:
+                self._db.execute(
+                    "DELETE FROM entries WHERE rowid IN ("
+                    "SELECT rowid FROM entries ORDER BY last_used LIMIT ?)",
+                    (count - self._max_entries,),
+                )
+
+    def retain_model(self, model: str) -> None:
+        """Drop every entry computed by a different embedding model.
+
+        Called whenever a store opens, so it only writes when such
+        entries exist (i.e. after the model changed).
+        """
+        with self._lock:
+            stale = self._db.execute(
+                "SELECT 1 FROM entries WHERE model != ? LIMIT 1", (model,)
+            ).fetchone()
+            if stale is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM entries WHERE model != ?", (model,))
+
+    def flush(self) -> None:
+        """Write buffered ``last_used`` touches and hit/miss counts now."""
+        _write_usage(self._db, self._lock, self._usage)
+
+    def stats(self) -> dict:
+        """Return entry count, capacity and lifetime hit/miss counters."""
+        self.flush()
+        with self._lock:
+            (entries,) = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()
+            counters = dict(self._db.execute("SELECT name, value FROM counters"))
+        return {
+            "entries": entries,
+            "max_entries": self._max_entries,
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+        }
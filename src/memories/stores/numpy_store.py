@@ -0,0 +1,642 @@
+"""In-process NumPy implementation of the VectorStore protocol.
+
+Keeps every embedding in one contiguous float32 matrix and every
+metadata key in its own column, so a search is a single matrix-vector
+product plus a vectorized filter mask — no server, no HTTP.
+
+The collection lives in ``<path>/<collection_name>/`` as a snapshot
+(``records.json`` plus ``embeddings.npy``) and an append-only
+``log.jsonl`` of the puts, metadata updates and deletes made since.  A
+write appends its entries, so its cost does not grow with the
+collection; once the log holds a quarter as many entries as there are
+rows (at least ``_MIN_COMPACT_ENTRIES``) the writer folds it into a new
+snapshot.  Other processes replay only the log entries they have not
+seen, and reload everything after a compaction.  Writers hold an
+exclusive ``flock`` and readers a shared one while touching the files.
+"""
+
+import base64
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from memories.stores.embedding_cache import EmbeddingCache, embedding_model_id
+
+# Initial row capacity of the embedding matrix; doubled as it fills.
+_INITIAL_CAPACITY = 64
+
+# Log entries always allowed before a compaction, however small the collection.
+_MIN_COMPACT_ENTRIES = 256
+
+
+class NumpyStore:
+    """VectorStore backed by an in-memory NumPy matrix on local disk."""
+
+    def __init__(
+        self,
+        path: str,
+        collection_name: str,
+        embedding_function=None,
+        embedding_cache: EmbeddingCache | None = None,
+    ) -> None:
+        self._dir = Path(path).expanduser() / collection_name
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._records_path = self._dir / "records.json"
+        self._matrix_path = self._dir / "embeddings.npy"
+        self._log_path = self._dir / "log.jsonl"
+        self._lock_path = self._dir / ".lock"
+
+        if embedding_function is None:
+            # Same model ChromaDB's server-side default uses, run locally.
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+            embedding_function = DefaultEmbeddingFunction()
+        self._embed = embedding_function
+
+        self._model_id = embedding_model_id(embedding_function)
+        self._embedding_cache = embedding_cache
+        if embedding_cache is not None:
+            embedding_cache.retain_model(self._model_id)
+
+        self._reset()
+        with self._locked(fcntl.LOCK_SH):
+            self._load()
+
+    # ------------------------------------------------------------------
+    # VectorStore protocol methods
+    # ------------------------------------------------------------------
+
+    def store(self, id: str, content: str, metadata: dict) -> None:
+        """Embed and persist a document."""
+        self.store_many([id], [content], [metadata])
+
+    def store_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+    ) -> None:
+        """Embed a batch in one model call and persist it with one log append."""
+        vectors = self._embed_texts(contents)
+        with self._writing():
+            for id, content, metadata, vector in zip(ids, contents, metadatas, vectors):
+                # Like ChromaDB's add(), an existing ID is left untouched.
+                if id not in self._index:
+                    self._log(_put(id, content, metadata, vector))
+
+    def upsert_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+        embeddings: list[list[float] | None] | None = None,
+    ) -> None:
+        """Insert or replace a batch; only rows without an embedding are embedded."""
+        embeddings = embeddings or [None] * len(ids)
+        missing = [i for i, vector in enumerate(embeddings) if vector is None]
+        computed = iter(self._embed_texts([contents[i] for i in missing]) if missing else [])
+        vectors = [
+            _normalize(np.asarray([vector], dtype=np.float32))[0]
+            if vector is not None
+            else next(computed)
+            for vector in embeddings
+        ]
+        with self._writing():
+            for id, content, metadata, vector in zip(ids, contents, metadatas, vectors):
+                self._log(_put(id, content, metadata, vector))
+
+    def get(self, id: str, include_content: bool = True) -> dict | None:
+        """Retrieve a document by ID, or None if it doesn't exist."""
+        self._refresh()
+        row = self._index.get(id)
+        if row is None:
+            return None
+        return self._record(row, include_content)
+
+    def get_many(
+        self, ids: list[str], include_content: bool = True
+    ) -> list[dict | None]:
+        """Retrieve several documents; None for each missing ID."""
+        self._refresh()
+        rows = [self._index.get(id) for id in ids]
+        return [None if row is None else self._record(row, include_content) for row in rows]
+
+    def search(
+        self,
+        query: str,
+        n_results: int,
+        where: dict | None = None,
+        include_content: bool = True,
+    ) -> list[dict]:
+        """Rank documents by similarity to *query* with optional filtering.
+
+        Distances are squared L2 between unit vectors (``2 - 2·cos``),
+        matching what ChromaDB reports for its default ``l2`` space.
+        """
+        return self.search_many([query], n_results, where, include_content)[0]
+
+    def search_many(
+        self,
+        queries: list[str],
+        n_results: int,
+        where: dict | None = None,
+        include_content: bool = True,
+    ) -> list[list[dict]]:
+        """Rank for every query at once with a single matrix product."""
+        self._refresh()
+        rows = np.flatnonzero(self._mask(where))
+        if rows.size == 0 or n_results <= 0:
+            return [[] for _ in queries]
+
+        query_matrix = self._embed_queries(queries)
+        # One (candidates × queries) product covers the whole batch.
+        similarities = self._matrix[rows] @ query_matrix.T
+
+        # argpartition finds each top-k in O(n); only those k get sorted.
+        k = min(n_results, rows.size)
+        grouped = []
+        for column in similarities.T:
+            top = np.argpartition(-column, k - 1)[:k]
+            top = top[np.argsort(-column[top], kind="stable")]
+            results = []
+            for i in top:
+                record = self._record(int(rows[i]), include_content)
+                record["distance"] = max(0.0, 2.0 - 2.0 * float(column[i]))
+                results.append(record)
+            grouped.append(results)
+        return grouped
+
+    def get_page(
+        self,
+        where: dict | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        include_embeddings: bool = False,
+        include_content: bool = True,
+    ) -> tuple[list[dict], str | None]:
+        """Return matching rows in storage order; the cursor is an offset."""
+        self._refresh()
+        offset = int(cursor) if cursor else 0
+        rows = np.flatnonzero(self._mask(where))[offset : offset + limit]
+        page = [self._record(int(row), include_content) for row in rows]
+        if include_embeddings:
+            for doc, row in zip(page, rows):
+                doc["embedding"] = self._matrix[row].tolist()
+                doc["embedding_model"] = self._model_id
+        next_cursor = str(offset + len(page)) if len(page) == limit else None
+        return page, next_cursor
+
+    def delete(self, id: str) -> None:
+        """Remove a document permanently."""
+        self.delete_many([id])
+
+    def delete_many(self, ids: list[str]) -> None:
+        """Remove several documents with a single compaction and log entry."""
+        with self._writing():
+            present = [id for id in ids if id in self._index]
+            if present:
+                self._log({"op": "delete", "ids": present})
+
+    def update_metadata(self, id: str, metadata: dict) -> None:
+        """Merge new metadata keys into an existing document."""
+        self.update_metadata_many([id], [metadata])
+
+    def update_metadata_many(self, ids: list[str], metadatas: list[dict]) -> None:
+        """Merge metadata into several documents with one log entry."""
+        with self._writing():
+            pairs = [(id, m) for id, m in zip(ids, metadatas) if id in self._index]
+            if pairs:
+                self._log({
+                    "op": "update",
+                    "ids": [id for id, _ in pairs],
+                    "metadatas": [m for _, m in pairs],
+                })
+
+    def count(self) -> int:
+        """Total documents in the collection."""
+        self._refresh()
+        return self._size
+
+    def heartbeat(self) -> bool:
+        """Return True if the data directory is usable."""
+        return self._dir.is_dir() and os.access(self._dir, os.W_OK)
+
+    def embedding_model(self) -> str:
+        """Id of the local embedding function."""
+        return self._model_id
+
+    def stats(self) -> dict:
+        """Report query-embedding cache counters, if caching is on."""
+        if self._embedding_cache is None:
+            return {}
+        return {"embedding_cache": self._embedding_cache.stats()}
+
+    # ------------------------------------------------------------------
+    # Filtering
+    # ------------------------------------------------------------------
+
+    def _mask(self, where: dict | None) -> np.ndarray:
+        """Evaluate a ChromaDB-style where clause to a boolean row mask.
+
+        Accepts both the flat ``{key: value}`` dicts the service builds
+        and the ``$and`` / ``$or`` / ``$eq`` / ``$gt`` ... operator forms.
+        """
+        mask = np.ones(self._size, dtype=bool)
+        if not where:
+            return mask
+
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._mask(clause)
+            elif key == "$or":
+                any_mask = np.zeros(self._size, dtype=bool)
+                for clause in condition:
+                    any_mask |= self._mask(clause)
+                mask &= any_mask
+            elif isinstance(condition, dict):
+                for op, value in condition.items():
+                    mask &= self._compare(key, op, value)
+            else:
+                mask &= self._compare(key, "$eq", condition)
+        return mask
+
+    def _compare(self, key: str, op: str, value) -> np.ndarray:
+        """Vectorized comparison of one metadata column against *value*."""
+        column = self._columns.get(key)
+        if column is None:
+            # Missing key: nothing matches except negative operators.
+            return np.full(self._size, op in ("$ne", "$nin"), dtype=bool)
+        column = column[: self._size]
+
+        if op in ("$eq", "$ne"):
+            if isinstance(value, bool):
+                # True == 1 in Python; ChromaDB keeps bools and ints distinct.
+                matches = np.fromiter(
+                    (v is value for v in column), dtype=bool, count=self._size,
+                )
+            else:
+                matches = np.asarray(column == value, dtype=bool)
+            return matches if op == "$eq" else ~matches
+        if op in ("$in", "$nin"):
+            allowed = set(value)
+            matches = np.fromiter(
+                (v in allowed for v in column), dtype=bool, count=self._size,
+            )
+            return matches if op == "$in" else ~matches
+
+        numeric = self._numeric_column(key)
+        with np.errstate(invalid="ignore"):
+            if op == "$gt":
+                return numeric > value
+            if op == "$gte":
+                return numeric >= value
+            if op == "$lt":
+                return numeric < value
+            if op == "$lte":
+                return numeric <= value
+        raise ValueError(f"Unsupported where operator '{op}'")
+
+    def _numeric_column(self, key: str) -> np.ndarray:
+        """Return *key* as float64 with NaN for non-numeric entries (cached)."""
+        cached = self._numeric_cache.get(key)
+        if cached is None:
+            cached = np.array(
+                [
+                    float(v) if isinstance(v, (int, float)) and not isinstance(v, bool)
+                    else np.nan
+                    for v in self._columns[key][: self._size]
+                ],
+                dtype=np.float64,
+            )
+            self._numeric_cache[key] = cached
+        return cached
+
+    # ------------------------------------------------------------------
+    # Row storage
+    # ------------------------------------------------------------------
+
+    def _reset(self) -> None:
+        """Clear all in-memory state."""
+        self._ids: list[str] = []
+        self._index: dict[str, int] = {}
+        self._documents: list[str] = []
+        self._columns: dict[str, np.ndarray] = {}
+        self._numeric_cache: dict[str, np.ndarray] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self._signature: tuple | None = None
+        # Bytes and entries of log.jsonl applied on top of the snapshot.
+        self._log_offset = 0
+        self._log_entries = 0
+        # Rows deleted by log entries, dropped in one pass by _purge().
+        self._dead: list[int] = []
+        # Encoded entries of the write in progress.
+        self._pending: list[bytes] = []
+
+    def _append(self, id: str, content: str, metadata: dict, vector: np.ndarray) -> None:
+        """Add one row, growing the matrix and columns geometrically."""
+        if self._matrix.shape[1] == 0:
+            self._matrix = np.zeros((_INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32)
+        if self._size == self._matrix.shape[0]:
+            self._grow(max(self._size * 2, _INITIAL_CAPACITY))
+
+        row = self._size
+        self._matrix[row] = vector
+        self._ids.append(id)
+        self._documents.append(content)
+        self._index[id] = row
+        self._size += 1
+        self._numeric_cache.clear()
+        for key, value in metadata.items():
+            self._column(key)[row] = value
+
+    def _replace(self, row: int, content: str, metadata: dict, vector: np.ndarray) -> None:
+        """Overwrite one row's content, vector and (entire) metadata."""
+        self._matrix[row] = vector
+        self._documents[row] = content
+        self._numeric_cache.clear()
+        for column in self._columns.values():
+            column[row] = None
+        for key, value in metadata.items():
+            self._column(key)[row] = value
+
+    def _grow(self, capacity: int) -> None:
+        """Resize the embedding matrix and every column to *capacity* rows."""
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[: self._size] = self._matrix[: self._size]
+        self._matrix = matrix
+        for key, column in self._columns.items():
+            grown = np.full(capacity, None, dtype=object)
+            grown[: self._size] = column[: self._size]
+            self._columns[key] = grown
+
+    def _column(self, key: str) -> np.ndarray:
+        """Return the object array for *key*, creating it on first use."""
+        self._numeric_cache.pop(key, None)
+        column = self._columns.get(key)
+        if column is None:
+            column = np.full(self._matrix.shape[0], None, dtype=object)
+            self._columns[key] = column
+        return column
+
+    def _apply(self, entry: dict) -> None:
+        """Apply one log entry to the in-memory collection.
+
+        Deleted rows leave the index at once but stay in the arrays
+        until ``_purge``, so replaying many deletes costs one compaction.
+        """
+        op = entry["op"]
+        if op == "put":
+            row = self._index.get(entry["id"])
+            if row is None:
+                self._append(entry["id"], entry["content"], entry["metadata"], entry["vector"])
+            else:
+                self._replace(row, entry["content"], entry["metadata"], entry["vector"])
+        elif op == "update":
+            for id, metadata in zip(entry["ids"], entry["metadatas"]):
+                row = self._index.get(id)
+                if row is not None:
+                    for key, value in metadata.items():
+                        self._column(key)[row] = value
+        elif op == "delete":
+            self._dead.extend(self._index.pop(id) for id in entry["ids"] if id in self._index)
+
+    def _purge(self) -> None:
+        """Drop the rows of deleted documents."""
+        if self._dead:
+            keep = np.ones(self._size, dtype=bool)
+            keep[self._dead] = False
+            self._dead = []
+            self._compact(keep)
+
+    def _compact(self, keep: np.ndarray) -> None:
+        """Drop every row where *keep* is False."""
+        self._matrix = np.ascontiguousarray(self._matrix[: self._size][keep])
+        self._ids = [i for i, k in zip(self._ids, keep) if k]
+        self._documents = [d for d, k in zip(self._documents, keep) if k]
+        self._columns = {key: col[: self._size][keep] for key, col in self._columns.items()}
+        self._numeric_cache.clear()
+        self._size = len(self._ids)
+        self._index = {id: row for row, id in enumerate(self._ids)}
+
+    def _record(self, row: int, include_content: bool = True) -> dict:
+        """Assemble the ``{id, content, metadata}`` dict for one row."""
+        metadata = {
+            key: column[row]
+            for key, column in self._columns.items()
+            if column[row] is not None
+        }
+        return {
+            "id": self._ids[row],
+            "content": self._documents[row] if include_content else "",
+            "metadata": metadata,
+        }
+
+    def _embed_queries(self, queries: list[str]) -> np.ndarray:
+        """Embed queries, serving repeats from the embedding cache."""
+        if self._embedding_cache is None:
+            return self._embed_texts(queries)
+
+        vectors = self._embedding_cache.get_many(self._model_id, queries)
+        missing = [q for q, v in zip(queries, vectors) if v is None]
+        if missing:
+            embedded = list(self._embed(missing))
+            self._embedding_cache.put_many(self._model_id, missing, embedded)
+            fresh = iter(embedded)
+            vectors = [v if v is not None else next(fresh) for v in vectors]
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+    def _embed_texts(self, texts: list[str]) -> np.ndarray:
+        """Embed *texts* and L2-normalize so dot products are cosines."""
+        return _normalize(np.asarray(self._embed(texts), dtype=np.float32))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self, mode: int):
+        """Hold the collection's ``flock`` in *mode* (shared or exclusive)."""
+        with open(self._lock_path, "a") as lock:
+            fcntl.flock(lock, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _writing(self):
+        """Hold an exclusive lock, catch up, mutate via ``_log``, then persist."""
+        with self._locked(fcntl.LOCK_EX):
+            self._sync()
+            self._pending = []
+            try:
+                yield
+                self._purge()
+                self._persist()
+            except BaseException:
+                self._load()  # Forget changes that did not reach the disk.
+                raise
+
+    def _log(self, entry: dict) -> None:
+        """Apply *entry* now and queue it for the log (inside ``_writing``)."""
+        self._apply(entry)
+        self._pending.append(_encode_entry(entry))
+
+    def _file_signature(self) -> tuple | None:
+        """Identify the files on disk: inode, mtime and size of both parts.
+
+        None while the collection has never been saved.
+        """
+        try:
+            parts = (self._records_path.stat(), self._matrix_path.stat())
+        except FileNotFoundError:
+            return None
+        return tuple((st.st_ino, st.st_mtime_ns, st.st_size) for st in parts)
+
+    def _log_size(self) -> int:
+        """Bytes in the log file (0 if absent)."""
+        try:
+            return self._log_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _refresh(self) -> None:
+        """Catch up with writes another process has made since ours.
+
+        Checking costs two ``stat`` calls; catching up holds a shared
+        lock, so it never sees a writer's half-saved snapshot.
+        """
+        if (self._file_signature(), self._log_size()) != (self._signature, self._log_offset):
+            with self._locked(fcntl.LOCK_SH):
+                self._sync()
+
+    def _sync(self) -> None:
+        """Replay new log entries, or reload after a compaction (caller holds the lock)."""
+        if (
+            self._file_signature() != self._signature
+            or self._log_size() < self._log_offset
+        ):
+            self._load()
+        else:
+            self._replay()
+
+    def _replay(self) -> None:
+        """Apply the complete log lines past ``_log_offset``.
+
+        A trailing partial line (a writer died mid-append) is skipped;
+        the next writer truncates it before appending.
+        """
+        try:
+            with open(self._log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            self._apply(_decode_entry(line))
+            self._log_entries += 1
+        self._log_offset += end
+        self._purge()
+
+    def _persist(self) -> None:
+        """Append the pending entries, or fold everything into a new snapshot."""
+        if not self._pending:
+            return
+        entries = self._log_entries + len(self._pending)
+        if entries >= max(_MIN_COMPACT_ENTRIES, self._size // 4):
+            self._save()
+            return
+        with open(self._log_path, "ab") as f:
+            f.truncate(self._log_offset)  # Drop a torn line left by a crash.
+            f.write(b"".join(self._pending))
+            self._log_offset = f.tell()
+        self._log_entries = entries
+
+    def _load(self) -> None:
+        """Read the snapshot, then replay the log (caller holds the lock)."""
+        self._reset()
+        signature = self._file_signature()
+        if signature is None:
+            self._replay()
+            return
+
+        with open(self._records_path) as f:
+            records = json.load(f)
+        matrix = np.load(self._matrix_path)
+
+        self._ids = records["ids"]
+        self._documents = records["documents"]
+        self._size = len(self._ids)
+        self._index = {id: row for row, id in enumerate(self._ids)}
+        self._matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        for key, values in records["columns"].items():
+            column = np.empty(self._size, dtype=object)
+            column[:] = values
+            self._columns[key] = column
+        if self._size == 0:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._signature = signature
+        self._replay()
+
+    def _save(self) -> None:
+        """Write a snapshot via temp files + atomic rename, then empty the log.
+
+        Log entries are idempotent, so a crash before the log is emptied
+        only replays changes the snapshot already holds.
+        """
+        records = {
+            "ids": self._ids,
+            "documents": self._documents,
+            "columns": {
+                key: column[: self._size].tolist()
+                for key, column in self._columns.items()
+            },
+        }
+        matrix_tmp = self._matrix_path.with_suffix(".tmp.npy")
+        np.save(matrix_tmp, self._matrix[: self._size])
+        os.replace(matrix_tmp, self._matrix_path)
+
+        records_tmp = self._records_path.with_suffix(".tmp")
+        with open(records_tmp, "w") as f:
+            json.dump(records, f)
+        os.replace(records_tmp, self._records_path)
+        self._signature = self._file_signature()
+        with open(self._log_path, "wb"):
+            pass
+        self._log_offset = 0
+        self._log_entries = 0
+
+
+def _put(id: str, content: str, metadata: dict, vector: np.ndarray) -> dict:
+    """Log entry inserting or replacing one document."""
+    return {"op": "put", "id": id, "content": content, "metadata": metadata, "vector": vector}
+
+
+def _encode_entry(entry: dict) -> bytes:
+    """One log line; vectors are stored as base64 little-endian float32."""
+    if entry["op"] == "put":
+        raw = np.asarray(entry["vector"], dtype="<f4").tobytes()
+        entry = {**entry, "vector": base64.b64encode(raw).decode("ascii")}
+    return json.dumps(entry, separators=(",", ":")).encode() + b"\n"
+
+
+def _decode_entry(line: bytes) -> dict:
+    """Inverse of ``_encode_entry``."""
+    entry = json.loads(line)
+    if entry["op"] == "put":
+        entry["vector"] = np.frombuffer(base64.b64decode(entry["vector"]), dtype="<f4")
+    return entry
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length (zero rows are left as-is)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
@@ -0,0 +1,532 @@
+"""Durable local write-ahead outbox for non-blocking creates.
+
+With ``OUTBOX=true`` new memories are appended to a SQLite file under
+``data_dir`` and the create returns at once; embedding and the store's
+``add`` happen later, when the daemon's idle loop or ``memory flush``
+drains the outbox in ``batch_size`` batches.  A failed drain backs off
+exponentially (state shared by every process using ``data_dir``).
+
+The wrapped store can be given as a ``connect`` factory instead; it is
+then built on first use, so creates keep working (and the daemon keeps
+queueing) while the backing server is down.
+
+Until an entry is flushed ``OutboxStore`` keeps it visible: ``get``
+reads it from the outbox, metadata updates (reinforce, delete) are
+applied to it in place, and searches add the pending entries that
+share words with the query, since they have no embedding yet.
+
+Every row carries a version, bumped by each update.  A flush only
+drops the rows it sent whose version is unchanged; a row patched
+mid-flush has its newer metadata written too.  Deleting a row whose
+flush is in flight leaves a tombstone, so the flusher removes the copy
+it just added.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from functools import cached_property
+from pathlib import Path
+
+# Upper bound on the delay between failed drains.
+_MAX_BACKOFF_SECONDS = 300.0
+
+# A claimed batch not flushed within this long (crashed flusher) is
+# handed to the next flusher.
+_LEASE_SECONDS = 120.0
+
+_WORD = re.compile(r"\w+")
+
+
+class Outbox:
+    """SQLite queue of pending ``(id, content, metadata)`` writes."""
+
+    def __init__(self, path: str) -> None:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pending (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT UNIQUE NOT NULL,
+                content TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                claimed_until REAL NOT NULL DEFAULT 0,
+                version INTEGER NOT NULL DEFAULT 0,
+                deleted INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS backoff (
+                name TEXT PRIMARY KEY,
+                value REAL NOT NULL
+            );
+            INSERT OR IGNORE INTO backoff VALUES ('failures', 0), ('retry_at', 0);
+            """
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(pending)")}
+        for column in ("version", "deleted"):
+            if column not in columns:  # Outbox files from before versioning.
+                self._db.execute(
+                    f"ALTER TABLE pending ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+                )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._db.execute(
+                "SELECT COUNT(*) FROM pending WHERE deleted = 0"
+            ).fetchone()
+        return count
+
+    def append_many(self, ids: list[str], contents: list[str], metadatas: list[dict]) -> None:
+        """Durably queue documents (committed before returning)."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO pending (id, content, metadata) VALUES (?, ?, ?)",
+                [
+                    (id, content, json.dumps(metadata))
+                    for id, content, metadata in zip(ids, contents, metadatas)
+                ],
+            )
+
+    def get_many(self, ids: list[str]) -> dict[str, dict]:
+        """Return the pending documents among *ids*, keyed by ID."""
+        found: dict[str, dict] = {}
+        with self._lock:
+            for id in set(ids):
+                row = self._db.execute(
+                    "SELECT id, content, metadata FROM pending "
+                    "WHERE id = ? AND deleted = 0",
+                    (id,),
+                ).fetchone()
+                if row is not None:
+                    found[id] = _doc(row)
+        return found
+
+    def all(self) -> list[dict]:
+        """Every pending document, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, content, metadata FROM pending WHERE deleted = 0 ORDER BY seq"
+            ).fetchall()
+        return [_doc(row) for row in rows]
+
+    def update_many(self, ids: list[str], metadatas: list[dict]) -> set[str]:
+        """Merge metadata into pending documents; return the IDs updated."""
+        updated = set()
+        with self._lock, self._db:
+            for id, patch in zip(ids, metadatas):
+                row = self._db.execute(
+                    "SELECT metadata FROM pending WHERE id = ? AND deleted = 0", (id,),
+                ).fetchone()
+                if row is None:
+                    continue
+                self._db.execute(
+                    "UPDATE pending SET metadata = ?, version = version + 1 WHERE id = ?",
+                    (json.dumps({**json.loads(row[0]), **patch}), id),
+                )
+                updated.add(id)
+        return updated
+
+    def remove_many(self, ids: list[str]) -> None:
+        """Drop *ids*, whose current version the store already holds."""
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM pending WHERE id = ?", [(id,) for id in ids])
+
+    def delete_many(self, ids: list[str]) -> None:
+        """Drop *ids*; those being flushed become tombstones for the flusher."""
+        rows = [(id,) for id in ids]
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM pending WHERE id = ? AND claimed_until < ?",
+                [(id, time.time()) for id in ids],
+            )
+            self._db.executemany(
+                "UPDATE pending SET deleted = 1, version = version + 1 WHERE id = ?", rows,
+            )
+
+    def claim(self, limit: int) -> list[dict]:
+        """Lease up to *limit* unclaimed documents, oldest first.
+
+        Concurrent flushers (daemon and ``memory flush``) never receive
+        the same document while its lease is live.  Each document also
+        carries its ``version`` and ``deleted`` (tombstone) flag.
+        """
+        now = time.time()
+        with self._lock, self._db:
+            rows = self._db.execute(
+                "SELECT id, content, metadata, version, deleted FROM pending "
+                "WHERE claimed_until < ? ORDER BY seq LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self._db.executemany(
+                "UPDATE pending SET claimed_until = ? WHERE id = ?",
+                [(now + _LEASE_SECONDS, row[0]) for row in rows],
+            )
+        return [_claimed(row) for row in rows]
+
+    def settle(self, claimed: list[dict]) -> list[dict]:
+        """Drop flushed documents unchanged since *claimed* was read.
+
+        Returns the others, re-read (newer metadata or a tombstone), so
+        the flusher can write them and settle again.  Documents removed
+        meanwhile (upserted straight into the store) are skipped.
+        """
+        changed = []
+        with self._lock, self._db:
+            for doc in claimed:
+                row = self._db.execute(
+                    "SELECT id, content, metadata, version, deleted FROM pending "
+                    "WHERE id = ?",
+                    (doc["id"],),
+                ).fetchone()
+                if row is None:
+                    continue
+                if row[3] == doc["version"]:
+                    self._db.execute("DELETE FROM pending WHERE id = ?", (doc["id"],))
+                else:
+                    changed.append(_claimed(row))
+        return changed
+
+    def release(self, ids: list[str]) -> None:
+        """Return claimed documents to the queue after a failed flush."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE pending SET claimed_until = 0 WHERE id = ?", [(id,) for id in ids],
+            )
+
+    def retry_at(self) -> float:
+        """Epoch time before which a background flush should not retry."""
+        return self._backoff()["retry_at"]
+
+    def record_failure(self, base_seconds: float) -> float:
+        """Count a failed flush; return the delay until the next attempt."""
+        with self._lock, self._db:
+            (failures,) = self._db.execute(
+                "SELECT value FROM backoff WHERE name = 'failures'"
+            ).fetchone()
+            delay = min(base_seconds * 2 ** failures, _MAX_BACKOFF_SECONDS)
+            self._db.executemany(
+                "UPDATE backoff SET value = ? WHERE name = ?",
+                [(failures + 1, "failures"), (time.time() + delay, "retry_at")],
+            )
+        return delay
+
+    def record_success(self) -> None:
+        """Reset the backoff after a successful flush."""
+        with self._lock, self._db:
+            self._db.execute("UPDATE backoff SET value = 0")
+
+    def stats(self) -> dict:
+        """Pending count and consecutive failed flushes."""
+        backoff = self._backoff()
+        return {"pending": len(self), "failures": int(backoff["failures"])}
+
+    def _backoff(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._db.execute("SELECT name, value FROM backoff"))
+
+
+class OutboxStore:
+    """VectorStore decorator that queues writes in an ``Outbox``.
+
+    Reads go to the wrapped store and are merged with pending entries;
+    ``flush`` moves pending entries into the wrapped store.
+    """
+
+    def __init__(
+        self,
+        store,
+        outbox: Outbox,
+        batch_size: int = 500,
+        retry_seconds: float = 1.0,
+        connect: Callable[[], object] | None = None,
+    ) -> None:
+        """Wrap *store*, or pass None and a *connect* factory to build it lazily.
+
+        A factory that raises (server down) is called again next time.
+        """
+        if store is not None:
+            self._store = store
+        self._connect = connect
+        self._outbox = outbox
+        self._batch_size = batch_size
+        self._retry_seconds = retry_seconds
+
+    @cached_property
+    def _store(self):
+        """The wrapped store, connected on first use."""
+        return self._connect()
+
+    def connected(self) -> bool:
+        """True if the wrapped store exists (given, or connected already)."""
+        return "_store" in self.__dict__
+
+    def pending(self, where: dict | None = None) -> list[dict]:
+        """Pending documents matching *where*, oldest first."""
+        return [doc for doc in self._outbox.all() if matches_where(doc["metadata"], where)]
+
+    # ------------------------------------------------------------------
+    # VectorStore protocol methods
+    # ------------------------------------------------------------------
+
+    def store(self, id: str, content: str, metadata: dict) -> None:
+        """Queue a document; it reaches the store on the next flush."""
+        self._outbox.append_many([id], [content], [metadata])
+
+    def store_many(self, ids: list[str], contents: list[str], metadatas: list[dict]) -> None:
+        """Queue several documents in one local transaction."""
+        self._outbox.append_many(ids, contents, metadatas)
+
+    def upsert_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+        embeddings: list[list[float] | None] | None = None,
+    ) -> None:
+        """Write straight to the store (bulk restores bypass the outbox)."""
+        self._outbox.remove_many(ids)
+        self._store.upsert_many(ids, contents, metadatas, embeddings)
+
+    def get(self, id: str, include_content: bool = True) -> dict | None:
+        """Retrieve a document, pending or stored."""
+        return self.get_many([id], include_content)[0]
+
+    def get_many(
+        self, ids: list[str], include_content: bool = True
+    ) -> list[dict | None]:
+        """Pending documents from the outbox, the rest from the store.
+
+        Pending documents are local, so they always carry their content.
+        """
+        pending = self._outbox.get_many(ids)
+        missing = [id for id in ids if id not in pending]
+        stored = (
+            dict(zip(missing, self._store.get_many(missing, include_content)))
+            if missing
+            else {}
+        )
+        return [pending.get(id) or stored.get(id) for id in ids]
+
+    def search(
+        self,
+        query: str,
+        n_results: int,
+        where: dict | None = None,
+        include_content: bool = True,
+    ) -> list[dict]:
+        """Store search plus lexically matching pending entries."""
+        return self.search_many([query], n_results, where, include_content)[0]
+
+    def search_many(
+        self,
+        queries: list[str],
+        n_results: int,
+        where: dict | None = None,
+        include_content: bool = True,
+    ) -> list[list[dict]]:
+        """Search the store and merge in pending entries per query.
+
+        Pending entries get a distance of ``1 - (shared query words /
+        query words)``, so one containing every query word ranks first.
+        """
+        grouped = self._store.search_many(queries, n_results, where, include_content)
+        pending = self.pending(where)
+        if not pending:
+            return grouped
+
+        merged = []
+        for query, hits in zip(queries, grouped):
+            words = set(_WORD.findall(query.lower()))
+            stored = {hit["id"] for hit in hits}  # Mid-flush entries are in both.
+            local = []
+            for doc in pending:
+                if doc["id"] in stored:
+                    continue
+                shared = words & set(_WORD.findall(doc["content"].lower()))
+                if shared:
+                    local.append({**doc, "distance": 1.0 - len(shared) / len(words)})
+            merged.append(
+                sorted(hits + local, key=lambda hit: hit.get("distance", 0.0))[:n_results]
+            )
+        return merged
+
+    def get_page(
+        self,
+        where: dict | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        include_embeddings: bool = False,
+        include_content: bool = True,
+    ) -> tuple[list[dict], str | None]:
+        """Page through stored documents (pending ones are not included)."""
+        return self._store.get_page(
+            where=where,
+            limit=limit,
+            cursor=cursor,
+            include_embeddings=include_embeddings,
+            include_content=include_content,
+        )
+
+    def delete(self, id: str) -> None:
+        """Remove a document permanently, pending or stored."""
+        self.delete_many([id])
+
+    def delete_many(self, ids: list[str]) -> None:
+        """Remove documents from both the outbox and the store."""
+        self._outbox.delete_many(ids)
+        self._store.delete_many(ids)
+
+    def update_metadata(self, id: str, metadata: dict) -> None:
+        """Merge metadata into a pending or stored document."""
+        self.update_metadata_many([id], [metadata])
+
+    def update_metadata_many(self, ids: list[str], metadatas: list[dict]) -> None:
+        """Patch pending documents locally and the rest in the store."""
+        updated = self._outbox.update_many(ids, metadatas)
+        rest = [(id, m) for id, m in zip(ids, metadatas) if id not in updated]
+        if rest:
+            self._store.update_metadata_many([id for id, _ in rest], [m for _, m in rest])
+
+    def count(self) -> int:
+        """Stored plus pending documents."""
+        return self._store.count() + len(self._outbox)
+
+    def heartbeat(self) -> bool:
+        """Health of the wrapped store."""
+        return self._store.heartbeat()
+
+    def embedding_model(self) -> str:
+        """Embedding model of the wrapped store."""
+        return self._store.embedding_model()
+
+    def stats(self) -> dict:
+        """Wrapped store stats plus outbox counters."""
+        return {**self._store.stats(), "outbox": self._outbox.stats()}
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def flush(self, retries: int = 0) -> dict:
+        """Move pending documents into the store in ``batch_size`` batches.
+
+        A failed batch is released back to the outbox and retried after
+        an exponential backoff, up to *retries* times; after that the
+        flush stops and reports the error.  Returns ``{flushed,
+        pending}`` plus ``error`` if documents were left behind.
+
+        Documents updated or deleted while their batch was in flight are
+        written again until the outbox row matches what was sent.
+        """
+        flushed = 0
+        attempts = 0
+        while batch := self._outbox.claim(self._batch_size):
+            ids = [doc["id"] for doc in batch]
+            try:
+                self._write(batch, add=True)
+                changed = self._outbox.settle(batch)
+                while changed:
+                    self._write(changed, add=False)
+                    changed = self._outbox.settle(changed)
+            except Exception as exc:
+                self._outbox.release(ids)
+                delay = self._outbox.record_failure(self._retry_seconds)
+                if attempts >= retries:
+                    return {"flushed": flushed, "pending": len(self._outbox), "error": str(exc)}
+                attempts += 1
+                time.sleep(delay)
+                continue
+            self._outbox.record_success()
+            flushed += sum(not doc["deleted"] for doc in batch)
+        return {"flushed": flushed, "pending": len(self._outbox)}
+
+    def _write(self, docs: list[dict], add: bool) -> None:
+        """Bring the store in line with claimed outbox *docs*.
+
+        With *add*, live documents are added first.  The store keeps an
+        existing ID on add, so documents updated since they were queued
+        (version above 0; an earlier flush may have added them) also get
+        their full metadata written.  Tombstones are deleted.
+        """
+        live = [doc for doc in docs if not doc["deleted"]]
+        if add and live:
+            self._store.store_many(
+                [doc["id"] for doc in live],
+                [doc["content"] for doc in live],
+                [doc["metadata"] for doc in live],
+            )
+        patched = [doc for doc in live if doc["version"] or not add]
+        if patched:
+            self._store.update_metadata_many(
+                [doc["id"] for doc in patched], [doc["metadata"] for doc in patched],
+            )
+        deleted = [doc["id"] for doc in docs if doc["deleted"]]
+        if deleted:
+            self._store.delete_many(deleted)
+
+    def flush_due(self) -> dict:
+        """Flush once unless the outbox is empty or backing off."""
+        if not len(self._outbox) or time.time() < self._outbox.retry_at():
+            return {"flushed": 0, "pending": len(self._outbox)}
+        return self.flush()
+
+
+def _doc(row: tuple) -> dict:
+    """Build a store-shaped document from a ``pending`` row."""
+    id, content, metadata = row
+    return {"id": id, "content": content, "metadata": json.loads(metadata)}
+
+
+def _claimed(row: tuple) -> dict:
+    """Build a claimed document (with ``version`` and ``deleted``) from a row."""
+    *fields, version, deleted = row
+    return {**_doc(tuple(fields)), "version": version, "deleted": bool(deleted)}
+
+
+def matches_where(meta: dict, where: dict | None) -> bool:
+    """Evaluate a ChromaDB-style where clause against one metadata dict."""
+    for key, condition in (where or {}).items():
+        if key == "$and":
+            if not all(matches_where(meta, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(meta, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not all(_compare(meta, key, op, value) for op, value in condition.items()):
+                return False
+        elif not _compare(meta, key, "$eq", condition):
+            return False
+    return True
+
+
+def _compare(meta: dict, key: str, op: str, value) -> bool:
+    """Compare one metadata value against *value* (missing keys never match)."""
+    if key not in meta:
+        return op in ("$ne", "$nin")
+    actual = meta[key]
+    if op == "$eq":
+        return actual is value if isinstance(value, bool) else actual == value
+    if op == "$ne":
+        return not _compare(meta, key, "$eq", value)
+    if op == "$in":
+        return actual in value
+    if op == "$nin":
+        return actual not in value
+    if not isinstance(actual, (int, float)) or isinstance(actual, bool):
+        return False
+    if op == "$gt":
+        return actual > value
+    if op == "$gte":
+        return actual >= value
+    if op == "$lt":
+        return actual < value
+    if op == "$lte":
+        return actual <= value
+    raise ValueError(f"Unsupported where operator '{op}'")
@@ -0,0 +1,60 @@
+"""Local id → partition lookup for the partitioned ChromaDB adapter.
+
+With project partitioning each memory lives in one of many ChromaDB
+collections.  Operations by ID (get, reinforce, delete) look the owning
+collection up here instead of probing every partition.  The table is a
+cache of what the server holds: IDs it does not know (e.g. written from
+another machine) are found by probing and then recorded.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+# Bound on the number of ``?`` placeholders per IN (...) query.
+_CHUNK = 500
+
+
+class PartitionIndex:
+    """SQLite map from memory ID to the name of its collection."""
+
+    def __init__(self, path: str) -> None:
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS partitions ("
+            "id TEXT PRIMARY KEY, partition TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def get_many(self, ids: list[str]) -> dict[str, str]:
+        """Return the known partition for each of *ids* (unknown IDs omitted)."""
+        found: dict[str, str] = {}
+        with self._lock:
+            for start in range(0, len(ids), _CHUNK):
+                chunk = ids[start:start + _CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(
+                    self._db.execute(
+                        f"SELECT id, partition FROM partitions WHERE id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+        return found
+
+    def put_many(self, ids: list[str], partition: str) -> None:
+        """Record that every ID in *ids* lives in *partition*."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO partitions VALUES (?, ?)",
+                [(id, partition) for id in ids],
+            )
+
+    def delete_many(self, ids: list[str]) -> None:
+        """Forget *ids* (after they are deleted from the store)."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "DELETE FROM partitions WHERE id = ?", [(id,) for id in ids],
+            )
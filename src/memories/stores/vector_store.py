@@ -3,6 +3,10 @@
 Defined as a `typing.Protocol` so any class with matching method
 signatures satisfies it via structural subtyping — no inheritance
 required.
+
+Reads take ``include_content=False`` to skip the document text: those
+documents come back with ``content`` set to ``""`` (metadata is always
+returned, since the service needs it for confidence and filtering).
 """
 
 from typing import Protocol
@@ -15,27 +19,92 @@ class VectorStore(Protocol):
         """Persist a document with its metadata."""
         ...
 
-    def get(self, id: str) -> dict | None:
+    def store_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+    ) -> None:
+        """Persist several documents in a single backend call."""
+        ...
+
+    def upsert_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+        embeddings: list[list[float] | None] | None = None,
+    ) -> None:
+        """Insert or replace documents by ID.
+
+        Non-None *embeddings* are stored as given (they must come from
+        ``embedding_model()``); the rest are embedded by the backend.
+        """
+        ...
+
+    def get(self, id: str, include_content: bool = True) -> dict | None:
         """Retrieve a single document by ID, or None if missing."""
         ...
 
+    def get_many(
+        self, ids: list[str], include_content: bool = True
+    ) -> list[dict | None]:
+        """Retrieve several documents in one call; None marks each missing ID."""
+        ...
+
     def search(
         self,
         query: str,
         n_results: int,
         where: dict | None = None,
+        include_content: bool = True,
     ) -> list[dict]:
         """Return documents similar to *query*, optionally filtered."""
         ...
 
+    def search_many(
+        self,
+        queries: list[str],
+        n_results: int,
+        where: dict | None = None,
+        include_content: bool = True,
+    ) -> list[list[dict]]:
+        """Run several queries in one backend call; one result list per query."""
+        ...
+
+    def get_page(
+        self,
+        where: dict | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        include_embeddings: bool = False,
+        include_content: bool = True,
+    ) -> tuple[list[dict], str | None]:
+        """Return up to *limit* documents matching *where*, in stable order.
+
+        *cursor* is the opaque value returned by the previous page; the
+        returned cursor is None once the scan is complete.  With
+        *include_embeddings* each document also has ``embedding`` (list
+        of floats) and ``embedding_model`` (id of the model behind it).
+        """
+        ...
+
     def delete(self, id: str) -> None:
         """Permanently remove a document by ID."""
         ...
 
+    def delete_many(self, ids: list[str]) -> None:
+        """Permanently remove several documents in one call (missing IDs ignored)."""
+        ...
+
     def update_metadata(self, id: str, metadata: dict) -> None:
         """Merge *metadata* into an existing document's metadata."""
         ...
 
+    def update_metadata_many(self, ids: list[str], metadatas: list[dict]) -> None:
+        """Merge per-document metadata into several documents at once."""
+        ...
+
     def count(self) -> int:
         """Return the total number of stored documents."""
         ...
@@ -43,3 +112,115 @@ class VectorStore(Protocol):
     def heartbeat(self) -> bool:
         """Return True if the backend is reachable."""
         ...
+
+    def stats(self) -> dict:
+        """Return backend-specific diagnostics for ``memory status``."""
+        ...
+
+    def embedding_model(self) -> str:
+        """Identify the model behind stored embeddings ("" if unknown)."""
+        ...
+
+
+class AsyncVectorStore(Protocol):
+    """Awaitable counterpart of VectorStore for asyncio applications.
+
+    Same operations and semantics; backend I/O must not block the
+    event loop.
+    """
+
+    async def store(self, id: str, content: str, metadata: dict) -> None:
+        """Persist a document with its metadata."""
+        ...
+
+    async def store_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+    ) -> None:
+        """Persist several documents in a single backend call."""
+        ...
+
+    async def upsert_many(
+        self,
+        ids: list[str],
+        contents: list[str],
+        metadatas: list[dict],
+        embeddings: list[list[float] | None] | None = None,
+    ) -> None:
+        """Insert or replace documents by ID, reusing given embeddings."""
+        ...
+
+    async def get(self, id: str, include_content: bool = True) -> dict | None:
+        """Retrieve a single document by ID, or None if missing."""
+        ...
+
+    async def get_many(
+        self, ids: list[str], include_content: bool = True
+    ) -> list[dict | None]:
+        """Retrieve several documents in one call; None marks each missing ID."""
+        ...
+
+    async def search(
+        self,
+        query: str,
+        n_results: int,
+        where: dict | None = None,
+        include_content: bool = True,
+    ) -> list[dict]:
+        """Return documents similar to *query*, optionally filtered."""
+        ...
+
+    async def search_many(
+        self,
+        queries: list[str],
+        n_results: int,
+        where: dict | None = None,
+        include_content: bool = True,
+    ) -> list[list[dict]]:
+        """Run several queries at once; one result list per query."""
+        ...
+
+    async def get_page(
+        self,
+        where: dict | None = None,
+        limit: int = 100,
+        cursor: str | None = None,
+        include_embeddings: bool = False,
+        include_content: bool = True,
+    ) -> tuple[list[dict], str | None]:
+        """Return up to *limit* documents matching *where*, in stable order."""
+        ...
+
+    async def delete(self, id: str) -> None:
+        """Permanently remove a document by ID."""
+        ...
+
+    async def delete_many(self, ids: list[str]) -> None:
+        """Permanently remove several documents in one call (missing IDs ignored)."""
+        ...
+
+    async def update_metadata(self, id: str, metadata: dict) -> None:
+        """Merge *metadata* into an existing document's metadata."""
+        ...
+
+    async def update_metadata_many(self, ids: list[str], metadatas: list[dict]) -> None:
+        """Merge per-document metadata into several documents at once."""
+        ...
+
+    async def count(self) -> int:
+        """Return the total number of stored documents."""
+        ...
+
+    async def heartbeat(self) -> bool:
+        """Return True if the backend is reachable."""
+        ...
+
+    async def stats(self) -> dict:
+        """Return backend-specific diagnostics for status output."""
+        ...
+
+    def embedding_model(self) -> str:
+        """Identify the model behind stored embeddings ("" if unknown)."""
+        ...
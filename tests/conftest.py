@@ -5,14 +5,19 @@ Integration fixtures require a running ChromaDB instance; tests that use
 them are marked with ``@pytest.mark.integration``.
 """
 
+import threading
 import uuid
 from unittest.mock import MagicMock
 
 import pytest
 
+from benchmarks.backends import hashing_embedding_function
+from memories import config
 from memories.config import Settings
 from memories.services.memory_service import MemoryService
 from memories.stores.chromadb_adapter import ChromaDBAdapter
+from memories.stores.numpy_store import NumpyStore
+from memories.stores.partition_index import PartitionIndex
 
 
 # ---------------------------------------------------------------------------
@@ -27,17 +32,35 @@ def pytest_configure(config):
     )
 
 
+# ---------------------------------------------------------------------------
+# Global settings — keep CLI-driven tests out of ~/.memories
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_data_dir(tmp_path_factory):
+    """Point the shared settings' data_dir at a temporary directory.
+
+    The CLI builds its service from ``memories.config.settings``; without
+    this its sqlite caches and indexes would land in the real home
+    directory.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(config.settings, "data_dir", str(tmp_path_factory.mktemp("data")))
+        yield
+
+
 # ---------------------------------------------------------------------------
 # Settings fixture — uses a unique collection name per test
 # ---------------------------------------------------------------------------
 
 @pytest.fixture()
-def settings():
-    """Return a Settings instance with a unique collection name."""
+def settings(tmp_path):
+    """Return a Settings instance with a unique collection name and data dir."""
     return Settings(
         chromadb_host="localhost",
         chromadb_port=8000,
         collection_name=f"test_{uuid.uuid4().hex[:12]}",
+        data_dir=str(tmp_path / "data"),
     )
 
 
@@ -50,12 +73,17 @@ def mock_vector_store():
     """Return a MagicMock satisfying the VectorStore Protocol."""
     mock = MagicMock()
     mock.store.return_value = None
+    mock.store_many.return_value = None
     mock.get.return_value = None
+    mock.get_many.return_value = []
     mock.search.return_value = []
+    mock.get_page.return_value = ([], None)
     mock.delete.return_value = None
+    mock.delete_many.return_value = None
     mock.update_metadata.return_value = None
     mock.count.return_value = 0
     mock.heartbeat.return_value = True
+    mock.stats.return_value = {}
     return mock
 
 
@@ -93,6 +121,21 @@ def chromadb_adapter(settings):
         pass  # Best-effort cleanup; don't fail the test.
 
 
+@pytest.fixture()
+def partitioned_adapter(settings, tmp_path):
+    """Create a project-partitioned ChromaDBAdapter; drop all its collections after."""
+    adapter = ChromaDBAdapter(
+        host=settings.chromadb_host,
+        port=settings.chromadb_port,
+        collection_name=settings.collection_name,
+        partition_index=PartitionIndex(str(tmp_path / "partitions.sqlite")),
+    )
+    yield adapter
+    for collection in adapter._client.list_collections():
+        if collection.name.startswith(settings.collection_name):
+            adapter._client.delete_collection(collection.name)
+
+
 # ---------------------------------------------------------------------------
 # Service with real ChromaDB — for integration tests
 # ---------------------------------------------------------------------------
@@ -101,3 +144,61 @@ def chromadb_adapter(settings):
 def real_memory_service(chromadb_adapter, settings):
     """Return a MemoryService wired to a real ChromaDB adapter."""
     return MemoryService(store=chromadb_adapter, settings=settings)
+
+
+# ---------------------------------------------------------------------------
+# In-process NumPy store — runs without Docker or a model download
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def numpy_store(tmp_path, settings):
+    """Return a NumpyStore persisted under a temporary directory.
+
+    Uses the benchmarks' hashing embedder: texts sharing words are
+    similar and unrelated texts are orthogonal, with no model download.
+    """
+    return NumpyStore(
+        path=str(tmp_path),
+        collection_name=settings.collection_name,
+        embedding_function=hashing_embedding_function,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Every backend in turn — for the shared VectorStore contract tests
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(
+    params=["numpy_store", pytest.param("chromadb_adapter", marks=pytest.mark.integration)],
+    ids=["numpy", "chromadb"],
+)
+def vector_store(request):
+    """Yield each VectorStore implementation (ChromaDB needs a server)."""
+    return request.getfixturevalue(request.param)
+
+
+# ---------------------------------------------------------------------------
+# Thread watch — asserts async code keeps blocking I/O off the event loop
+# ---------------------------------------------------------------------------
+
+@pytest.fixture()
+def thread_watch(monkeypatch):
+    """Return ``(watch, calls)``.
+
+    ``watch(obj, names)`` wraps *obj*'s methods so each call appends
+    ``(name, ran on the main thread)`` to *calls*; ``asyncio.run`` runs
+    the event loop on the main thread.
+    """
+    calls: list[tuple[str, bool]] = []
+
+    def watch(obj, names):
+        for name in names:
+            method = getattr(obj, name)
+
+            def wrapper(*args, _method=method, _name=name, **kwargs):
+                calls.append((_name, threading.current_thread() is threading.main_thread()))
+                return _method(*args, **kwargs)
+
+            monkeypatch.setattr(obj, name, wrapper)
+
+    return watch, calls
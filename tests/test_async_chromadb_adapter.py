@@ -0,0 +1,176 @@
+"""Integration tests for AsyncChromaDBAdapter against a live ChromaDB.
+
+Each test opens its own adapter on a disposable collection inside one
+``asyncio.run`` call.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from memories.models import MemoryCreate
+from memories.services.async_memory_service import AsyncMemoryService
+from memories.stores.async_chromadb_adapter import AsyncChromaDBAdapter, _set_timeout
+from memories.stores.partition_index import PartitionIndex
+
+pytestmark = pytest.mark.integration
+
+
+def _run(settings, test, partition_index=None, **kwargs):
+    """Run *test(adapter)* on a fresh adapter, then drop its collections."""
+
+    async def main():
+        adapter = await AsyncChromaDBAdapter.connect(
+            host=settings.chromadb_host,
+            port=settings.chromadb_port,
+            collection_name=settings.collection_name,
+            partition_index=partition_index,
+            **kwargs,
+        )
+        try:
+            await test(adapter)
+        finally:
+            for collection in await adapter._client.list_collections():
+                if collection.name.startswith(settings.collection_name):
+                    await adapter._client.delete_collection(collection.name)
+
+    asyncio.run(main())
+
+
+class TestAsyncAdapter:
+    """Verify the async adapter honours the VectorStore contract."""
+
+    def test_round_trip_and_search(self, settings):
+        async def test(adapter):
+            await adapter.store_many(
+                ["a", "b"], ["red apples", "blue sky"], [{"n": 1}, {"n": 2}]
+            )
+            assert (await adapter.get("a"))["content"] == "red apples"
+            assert (await adapter.get("a", include_content=False))["content"] == ""
+            grouped = await adapter.search_many(["sky", "apples"], n_results=1)
+            assert [g[0]["id"] for g in grouped] == ["b", "a"]
+            await adapter.update_metadata("a", {"n": 5})
+            assert (await adapter.get("a"))["metadata"]["n"] == 5
+            await adapter.delete("a")
+            assert await adapter.get("a") is None
+            assert await adapter.count() == 1
+            assert await adapter.heartbeat() is True
+
+        _run(settings, test)
+
+    def test_partitioned_fan_out(self, settings, tmp_path):
+        async def test(adapter):
+            await adapter.store_many(
+                ["p1", "p2", "g1"],
+                ["alpha cats", "beta cats", "global cats"],
+                [
+                    {"project": "alpha", "global_": False},
+                    {"project": "beta", "global_": False},
+                    {"project": "", "global_": True},
+                ],
+            )
+            everything = await adapter.search("cats", n_results=5)
+            assert {r["id"] for r in everything} == {"p1", "p2", "g1"}
+            alpha = await adapter.search("cats", n_results=5, where={"project": "alpha"})
+            assert {r["id"] for r in alpha} == {"p1"}
+            assert await adapter.count() == 3
+
+            seen, cursor = [], None
+            while True:
+                page, cursor = await adapter.get_page(limit=2, cursor=cursor)
+                seen.extend(doc["id"] for doc in page)
+                if cursor is None:
+                    break
+            assert sorted(seen) == ["g1", "p1", "p2"]
+
+        _run(settings, test, PartitionIndex(str(tmp_path / "partitions.sqlite")))
+
+    def test_memories_from_before_partitioning_found(self, settings, tmp_path):
+        """Turning partitioning on keeps older project memories searchable."""
+        async def test(adapter):
+            await adapter.store("old", "alpha cats", {"project": "alpha", "global_": False})
+            partitioned = AsyncChromaDBAdapter(
+                adapter._client,
+                adapter._collection,
+                partition_index=PartitionIndex(str(tmp_path / "partitions.sqlite")),
+            )
+            alpha = await partitioned.search("cats", n_results=5, where={"project": "alpha"})
+            assert [r["id"] for r in alpha] == ["old"]
+
+        _run(settings, test)
+
+    def test_service_end_to_end(self, settings):
+        async def test(adapter):
+            service = AsyncMemoryService(store=adapter, settings=settings)
+            created = await asyncio.gather(
+                service.create_memory(MemoryCreate(content="async one")),
+                service.create_memory(MemoryCreate(content="async two")),
+            )
+            found = await service.search_memories("async", limit=5)
+            assert {r.id for r in found.results} == {m.id for m in created}
+
+        _run(settings, test)
+
+    def test_timeouts_applied(self, settings):
+        async def test(adapter):
+            timeout = adapter._client._server._get_client().timeout
+            assert (timeout.connect, timeout.read) == (2.0, 7.0)
+            assert await adapter.count() == 0
+
+        _run(settings, test, connect_timeout=2, read_timeout=7)
+
+    def test_missing_timeout_internals_keep_defaults(self):
+        """A client without the expected internals only loses the timeouts."""
+        with pytest.warns(RuntimeWarning, match="HTTP timeouts disabled"):
+            _set_timeout(object(), httpx.Timeout(1.0))
+
+
+class TestAsyncRetries:
+    """Verify dropped connections are retried as in ChromaDBAdapter."""
+
+    @staticmethod
+    def _adapter(count_side_effect, retries=2):
+        collection = AsyncMock()
+        collection.name = "c"
+        collection.count.side_effect = count_side_effect
+        adapter = AsyncChromaDBAdapter(
+            MagicMock(), collection, retries=retries, retry_backoff=0
+        )
+        return adapter, collection
+
+    def test_dropped_connection_retried(self):
+        adapter, collection = self._adapter([httpx.ConnectError("refused"), 3])
+        assert asyncio.run(adapter.count()) == 3
+        assert collection.count.await_count == 2
+
+    def test_read_timeout_not_retried(self):
+        adapter, collection = self._adapter(httpx.ReadTimeout("slow"))
+        with pytest.raises(httpx.ReadTimeout):
+            asyncio.run(adapter.count())
+        assert collection.count.await_count == 1
+
+
+class TestAsyncPartitionIndex:
+    """Verify partition-index lookups run off the event loop."""
+
+    def test_partition_index_off_loop(self, tmp_path, thread_watch):
+        index = PartitionIndex(str(tmp_path / "partitions.sqlite"))
+        watch, calls = thread_watch
+        watch(index, ["get_many", "put_many", "delete_many"])
+        collection = AsyncMock()
+        collection.name = "c"
+        collection.get.return_value = {"ids": [], "metadatas": []}
+        client = AsyncMock()
+        client.get_or_create_collection.return_value = collection
+        adapter = AsyncChromaDBAdapter(client, collection, partition_index=index)
+
+        async def run():
+            await adapter.store_many(["a"], ["text"], [{"project": "p"}])
+            await adapter.upsert_many(["a"], ["text"], [{"project": "q"}], [[0.1]])
+            await adapter.delete_many(["a"])
+
+        asyncio.run(run())
+        assert {name for name, _ in calls} == {"get_many", "put_many", "delete_many"}
+        assert [name for name, on_loop in calls if on_loop] == []
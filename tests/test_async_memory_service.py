@@ -0,0 +1,256 @@
+"""Unit tests for AsyncMemoryService.
+
+Uses an ``AsyncMock`` store so the tests run without ChromaDB; each
+test drives its coroutine with ``asyncio.run``.  Validation and
+confidence logic are shared with MemoryService and covered there, so
+these tests focus on the awaited store calls.
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from memories.models import ListSort, MemoryCreate, SearchMode
+from memories.services.lexical_index import LexicalIndex
+from memories.services.async_memory_service import AsyncMemoryService
+from memories.services.memory_service import (
+    DuplicateMemoryError,
+    InvalidOperationError,
+    MemoryNotFoundError,
+    content_hash,
+)
+from memories.services.result_cache import ResultCache
+
+
+@pytest.fixture()
+def async_store():
+    """Return an AsyncMock satisfying the AsyncVectorStore Protocol."""
+    mock = AsyncMock()
+    mock.get.return_value = None
+    mock.search.return_value = []
+    mock.get_page.return_value = ([], None)
+    mock.count.return_value = 0
+    mock.heartbeat.return_value = True
+    mock.stats.return_value = {}
+    return mock
+
+
+@pytest.fixture()
+def async_service(async_store, settings):
+    """Return an AsyncMemoryService wired to the mock store."""
+    return AsyncMemoryService(store=async_store, settings=settings)
+
+
+def _doc(**meta) -> dict:
+    metadata = {
+        "decay_policy": "stable",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "deleted": False,
+        **meta,
+    }
+    return {"id": "m1", "content": "hello", "metadata": metadata}
+
+
+class TestCreate:
+    """Verify creates await the store."""
+
+    def test_create_memory(self, async_service, async_store):
+        result = asyncio.run(async_service.create_memory(MemoryCreate(content="hi")))
+        assert result.confidence == 1.0
+        async_store.store.assert_awaited_once()
+
+    def test_create_memories_chunks(self, async_service, async_store, settings):
+        settings.batch_size = 2
+
+        async def collect():
+            records = (MemoryCreate(content=str(i)) for i in range(5))
+            return [r async for r in async_service.create_memories(records)]
+
+        assert len(asyncio.run(collect())) == 5
+        assert async_store.store_many.await_count == 3
+
+    def test_create_memories_rejects_duplicates(self, async_store, settings):
+        """The batch path applies duplicate_policy like create_memory."""
+        settings = settings.model_copy(update={"duplicate_policy": "reject"})
+        service = AsyncMemoryService(store=async_store, settings=settings)
+        stored = _doc(content_hash=content_hash("dup"), agent="", personality="",
+                      project="", type="", global_=False)
+        async_store.get_page.return_value = ([stored], None)
+        results = []
+
+        async def collect():
+            records = [MemoryCreate(content="fresh"), MemoryCreate(content="dup")]
+            async for result in service.create_memories(records):
+                results.append(result)
+
+        with pytest.raises(DuplicateMemoryError):
+            asyncio.run(collect())
+        assert [r.content for r in results] == ["fresh"]
+        assert async_store.store_many.await_args[0][0] == [results[0].id]
+        async_store.get_page.assert_awaited_once()
+
+
+class TestSearch:
+    """Verify searches share filtering and confidence gating."""
+
+    def test_search_memories(self, async_service, async_store):
+        async_store.search.return_value = [{**_doc(), "distance": 0.2}]
+        result = asyncio.run(async_service.search_memories("q", project="p"))
+        assert result.count == 1
+        where = async_store.search.await_args[1]["where"]
+        assert where["project"] == "p" and where["deleted"] is False
+
+    def test_search_many_grouped(self, async_service, async_store):
+        async_store.search_many.return_value = [[{**_doc(), "distance": 0.1}], []]
+        result = asyncio.run(async_service.search_many(["a", "b"]))
+        assert [g.count for g in result.queries] == [1, 0]
+
+    def test_reinforce_hits_flushed_on_demand(self, async_service, async_store):
+        async_store.search.return_value = [
+            {**_doc(decay_policy="reinforceable"), "distance": 0.1}
+        ]
+        asyncio.run(async_service.search_memories("q", reinforce_hits=True))
+        async_store.update_metadata_many.assert_not_awaited()
+        assert asyncio.run(async_service.flush_reinforcements()) == 1
+        assert async_store.update_metadata_many.await_args[0][0] == ["m1"]
+
+
+class TestLexicalSearch:
+    """Verify lexical queries run off the event loop, concurrently."""
+
+    def test_search_many_lexical_in_worker_threads(
+        self, async_store, settings, tmp_path, monkeypatch
+    ):
+        index = LexicalIndex(str(tmp_path / "lexical.sqlite"))
+        service = AsyncMemoryService(store=async_store, settings=settings, lexical_index=index)
+        alpha = asyncio.run(service.create_memory(MemoryCreate(content="ticket ALPHA-1")))
+        beta = asyncio.run(service.create_memory(MemoryCreate(content="ticket BETA-2")))
+        threads = []
+        search = index.search
+
+        def recording_search(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return search(*args, **kwargs)
+
+        monkeypatch.setattr(index, "search", recording_search)
+        result = asyncio.run(
+            service.search_many(["ALPHA-1", "BETA-2"], mode=SearchMode.LEXICAL)
+        )
+        assert [[r.id for r in g.results] for g in result.queries] == [[alpha.id], [beta.id]]
+        assert threading.main_thread() not in threads
+        async_store.search_many.assert_not_awaited()
+        async_store.get_many.assert_not_awaited()
+
+    def test_hybrid_fuses_rankings(self, async_store, settings, tmp_path):
+        index = LexicalIndex(str(tmp_path / "lexical.sqlite"))
+        service = AsyncMemoryService(store=async_store, settings=settings, lexical_index=index)
+        created = asyncio.run(service.create_memory(MemoryCreate(content="rotate token")))
+        _, content, metadata = async_store.store.await_args[0]
+        doc = {"id": created.id, "content": content, "metadata": metadata}
+        async_store.get_many.return_value = [doc]
+        async_store.search.return_value = [{**doc, "distance": 0.2}]
+
+        result = asyncio.run(service.search_memories("token", mode=SearchMode.HYBRID))
+        (item,) = result.results
+        assert item.similarity == 0.2 and item.score > 0
+
+
+class TestOffLoop:
+    """Verify local SQLite and marker-file I/O never runs on the event loop."""
+
+    def test_result_cache_and_migration_marker(
+        self, async_store, settings, tmp_path, thread_watch
+    ):
+        cache = ResultCache(str(tmp_path / "results.sqlite"), ttl_seconds=60, max_entries=10)
+        service = AsyncMemoryService(store=async_store, settings=settings, result_cache=cache)
+        watch, calls = thread_watch
+        watch(cache, ["get_many", "put_many", "bump"])
+        watch(service, ["_migration_due", "_mark_migrated"])
+        async_store.search.return_value = [{**_doc(), "distance": 0.1}]
+
+        async def run():
+            await service.search_memories("q")
+            await service.search_memories("q")
+            await service.create_memory(MemoryCreate(content="new"))
+
+        asyncio.run(run())
+        assert {name for name, _ in calls} == {
+            "get_many", "put_many", "bump", "_migration_due", "_mark_migrated",
+        }
+        assert [name for name, on_loop in calls if on_loop] == []
+
+
+class TestGetReinforceDelete:
+    """Verify ID operations and their errors."""
+
+    def test_get_missing_raises(self, async_service):
+        with pytest.raises(MemoryNotFoundError):
+            asyncio.run(async_service.get_memory("nope"))
+
+    def test_reinforce_updates_metadata(self, async_service, async_store):
+        async_store.get.return_value = _doc(decay_policy="reinforceable")
+        result = asyncio.run(async_service.reinforce_memory("m1"))
+        assert result["confidence"] == 1.0
+        patch = async_store.update_metadata.await_args[0][1]
+        assert patch["last_reinforced_at"] == result["reinforced_at"]
+
+    def test_reinforce_stable_rejected(self, async_service, async_store):
+        async_store.get.return_value = _doc()
+        with pytest.raises(InvalidOperationError):
+            asyncio.run(async_service.reinforce_memory("m1"))
+
+    def test_delete_soft_deletes(self, async_service, async_store):
+        async_store.get.return_value = _doc()
+        asyncio.run(async_service.delete_memory("m1"))
+        async_store.update_metadata.assert_awaited_once_with("m1", {"deleted": True})
+
+
+class TestList:
+    """Verify metadata listing."""
+
+    def test_list_sorted_by_created_at(self, async_service, async_store):
+        older = _doc(created_at="2025-01-01T00:00:00+00:00")
+        newer = {**_doc(created_at="2025-02-01T00:00:00+00:00"), "id": "m2"}
+        async_store.get_page.return_value = ([older, newer], None)
+        result = asyncio.run(async_service.list_memories(sort=ListSort.CREATED_AT, limit=1))
+        assert [r.id for r in result.results] == ["m2"]
+        assert result.next_cursor is not None
+
+
+class TestMaintenance:
+    """Verify status, migration and compaction."""
+
+    def test_status(self, async_service, async_store):
+        async_store.count.return_value = 7
+        status = asyncio.run(async_service.get_status())
+        assert status["status"] == "healthy" and status["count"] == 7
+
+    def test_compact_deletes_pages(self, async_service, async_store):
+        async_store.get_page.side_effect = [([_doc(deleted=True)], None)]
+        result = asyncio.run(async_service.compact())
+        assert result["deleted"] == 1
+        async_store.delete_many.assert_awaited_once_with(["m1"])
+
+    def test_consolidate_soft_deletes_duplicates(self, async_service, async_store):
+        first = {**_doc(project="p"), "embedding": [1.0, 0.0]}
+        second = {**_doc(project="p"), "id": "m2", "embedding": [1.0, 0.0]}
+        async_store.get_page.return_value = ([first, second], None)
+        result = asyncio.run(async_service.consolidate(project="p"))
+        assert result["clusters"] == 1 and result["removed"] == 1
+        async_store.update_metadata_many.assert_awaited_once()
+
+    def test_migrate_backfills(self, async_service, async_store):
+        async_store.get_page.return_value = ([_doc()], None)
+        result = asyncio.run(async_service.migrate_metadata())
+        assert result == {"scanned": 1, "updated": 1}
+
+    def test_gated_search_migrates_legacy_store(self, async_service, async_store):
+        """The first confidence-gated read backfills expires_at."""
+        async_store.get_page.return_value = ([_doc()], None)
+        asyncio.run(async_service.search_memories("q"))
+        async_store.update_metadata_many.assert_awaited_once()
+        asyncio.run(async_service.search_memories("q"))
+        assert async_store.get_page.await_count == 2
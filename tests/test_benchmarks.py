@@ -0,0 +1,86 @@
+"""Tests for the benchmark corpus, harness and CLI."""
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from benchmarks import corpus, harness
+from benchmarks.__main__ import app
+from benchmarks.backends import FakeStore
+from memories.services.memory_service import MemoryService
+
+runner = CliRunner()
+
+
+class TestCorpus:
+    """Verify corpus generation is deterministic and well-formed."""
+
+    @pytest.mark.parametrize(
+        "text,size", [("1k", 1000), ("10K", 10_000), ("1M", 1_000_000), ("2500", 2500)]
+    )
+    def test_parse_size(self, text, size):
+        assert corpus.parse_size(text) == size
+
+    def test_same_seed_same_records(self):
+        first = [r["content"] for r in corpus.generate(20, seed=3)]
+        assert first == [r["content"] for r in corpus.generate(20, seed=3)]
+        assert first != [r["content"] for r in corpus.generate(20, seed=4)]
+
+    def test_policy_mix(self):
+        policies = [r["metadata"]["decay_policy"] for r in corpus.generate(100)]
+        assert policies.count("stable") == 50
+        assert policies.count("contextual") == 30
+        assert policies.count("reinforceable") == 20
+
+
+class TestHarness:
+    """Verify a run's report shape and baseline comparison."""
+
+    def test_run_reports_percentiles(self, settings):
+        service = MemoryService(store=FakeStore(), settings=settings)
+        report = harness.run(service, size=50, operations=5)
+        assert report["size"] == 50
+        assert set(report["operations"]) == set(harness.OPERATIONS)
+        stats = report["operations"]["search"]
+        assert stats["count"] == 5
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+    def test_compare_flags_regressions_only(self):
+        def report(p95, throughput):
+            ops = {"search": {"p50_ms": 1.0, "p95_ms": p95, "p99_ms": 3.0, "throughput": throughput}}
+            load = {"seconds": 1.0, "throughput": 100.0}
+            return {"backend": "fake", "runs": [{"size": 10, "load": load, "operations": ops}]}
+
+        regressions = harness.compare(report(2.0, 100.0), report(3.0, 50.0), threshold=0.2)
+        assert {(r["operation"], r["metric"]) for r in regressions} == {
+            ("search", "p95_ms"), ("search", "throughput"),
+        }
+        assert harness.compare(report(2.0, 100.0), report(1.0, 200.0), threshold=0.2) == []
+
+    def test_compare_rejects_other_backend(self):
+        with pytest.raises(ValueError, match="backend"):
+            harness.compare({"backend": "numpy", "runs": []}, {"backend": "fake", "runs": []}, 0.2)
+
+
+class TestCli:
+    """Verify python -m benchmarks run/compare."""
+
+    def test_run_writes_report_and_compares(self, tmp_path):
+        output = tmp_path / "run.json"
+        result = runner.invoke(
+            app,
+            ["run", "--backend", "fake", "--size", "20", "--operations", "3",
+             "--output", str(output)],
+        )
+        assert result.exit_code == 0, result.output
+        report = json.loads(output.read_text())
+        assert report["backend"] == "fake"
+        assert [r["size"] for r in report["runs"]] == [20]
+
+        result = runner.invoke(app, ["compare", str(output), str(output)])
+        assert result.exit_code == 0
+
+    def test_unknown_backend(self):
+        result = runner.invoke(app, ["run", "--backend", "nope"])
+        assert result.exit_code == 1
@@ -1,112 +1,280 @@
-"""Integration tests for ChromaDBAdapter.
+"""ChromaDB-specific integration tests for ChromaDBAdapter.
 
-These tests require a running ChromaDB instance (``docker compose up``).
+The VectorStore contract shared with NumpyStore is covered by
+``test_vector_store.py``.  These tests require a running ChromaDB instance (``docker compose up``).
 Each test gets a unique collection via the ``chromadb_adapter`` fixture
 to prevent cross-test contamination.
 """
 
+from unittest.mock import MagicMock
+
+import httpx
 import pytest
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+from memories.stores.chromadb_adapter import ChromaDBAdapter, _set_timeout, partition_name
+from memories.stores.collection_cache import CollectionCache
+from memories.stores.embedding_cache import EmbeddingCache
+from memories.stores.partition_index import PartitionIndex
 
 pytestmark = pytest.mark.integration
 
 
-class TestStoreAndGet:
-    """Verify round-trip persistence of documents."""
+class TestEmbeddingCache:
+    """Verify cached query vectors are sent as query_embeddings."""
 
-    def test_store_get_round_trip(self, chromadb_adapter):
-        """A stored document can be retrieved with matching content and metadata."""
-        meta = {"agent": "bot", "type": "fact"}
-        chromadb_adapter.store("id-1", "the sky is blue", meta)
+    def test_cached_search_matches_uncached(self, chromadb_adapter, settings, tmp_path):
+        """A cache hit returns the same ranking as embedding from scratch."""
+        chromadb_adapter.store("e1", "user preferences", {"tag": "a"})
+        chromadb_adapter.store("e2", "weather report", {"tag": "a"})
 
-        result = chromadb_adapter.get("id-1")
-        assert result is not None
-        assert result["id"] == "id-1"
-        assert result["content"] == "the sky is blue"
-        assert result["metadata"]["agent"] == "bot"
-        assert result["metadata"]["type"] == "fact"
+        cached = ChromaDBAdapter(
+            host=settings.chromadb_host,
+            port=settings.chromadb_port,
+            collection_name=settings.collection_name,
+            embedding_cache=EmbeddingCache(str(tmp_path / "cache.sqlite"), 10),
+        )
+        expected = [r["id"] for r in chromadb_adapter.search("preferences", n_results=2)]
+        miss = [r["id"] for r in cached.search("preferences", n_results=2)]
+        hit = [r["id"] for r in cached.search("preferences", n_results=2)]
 
-    def test_get_missing_returns_none(self, chromadb_adapter):
-        """Getting a non-existent ID returns None."""
-        assert chromadb_adapter.get("no-such-id") is None
+        assert miss == hit == expected
+        assert cached.stats()["embedding_cache"]["hits"] == 1
 
 
-class TestSearch:
-    """Verify semantic search and metadata filtering."""
+class TestCollectionCache:
+    """Verify cached collection ids replace the connection handshake."""
 
-    def test_search_returns_results_by_relevance(self, chromadb_adapter):
-        """Searching returns results ordered by relevance to the query."""
-        chromadb_adapter.store("s1", "Python is a programming language", {"tag": "a"})
-        chromadb_adapter.store("s2", "The weather is nice today", {"tag": "a"})
-        chromadb_adapter.store("s3", "JavaScript runs in the browser", {"tag": "a"})
+    @staticmethod
+    def _adapter(settings, cache, embedding_function=None):
+        return ChromaDBAdapter(
+            host=settings.chromadb_host,
+            port=settings.chromadb_port,
+            collection_name=settings.collection_name,
+            collection_cache=cache,
+            embedding_function=embedding_function,
+        )
 
-        results = chromadb_adapter.search("programming languages", n_results=3)
-        assert len(results) == 3
-        # The programming-related docs should rank higher than weather.
-        ids = [r["id"] for r in results]
-        assert ids[0] in ("s1", "s3")  # Either programming doc should be first.
+    def test_cached_collection_skips_client(self, chromadb_adapter, settings, tmp_path):
+        """A second adapter opens the collection without creating a client."""
+        cache = CollectionCache(str(tmp_path / "collections.sqlite"))
+        self._adapter(settings, cache).store("c1", "cached handle", {"tag": "a"})
 
-    def test_search_with_where_filter(self, chromadb_adapter):
-        """Only documents matching the where filter are returned."""
-        chromadb_adapter.store("f1", "apples are fruits", {"category": "food"})
-        chromadb_adapter.store("f2", "cars are vehicles", {"category": "transport"})
+        fresh = self._adapter(settings, cache)
+        assert "_client" not in fresh.__dict__
+        assert fresh.get("c1")["content"] == "cached handle"
+        assert fresh.heartbeat() is True
 
-        results = chromadb_adapter.search(
-            "fruits", n_results=10, where={"category": "food"},
-        )
-        assert len(results) == 1
-        assert results[0]["id"] == "f1"
+    def test_stale_id_resolved_again(self, chromadb_adapter, settings, tmp_path):
+        """A collection recreated on the server is found under its new id."""
+        cache = CollectionCache(str(tmp_path / "collections.sqlite"))
+        stale = self._adapter(settings, cache)
+        chromadb_adapter._client.delete_collection(settings.collection_name)
+        chromadb_adapter._client.create_collection(settings.collection_name)
+
+        stale.store("c2", "after recreate", {"tag": "a"})
+        assert stale.get("c2")["content"] == "after recreate"
+        key = f"{settings.chromadb_host}:{settings.chromadb_port}/{settings.collection_name}"
+        assert cache.get(key) == str(stale._collection.id)
+
+    def test_cached_handle_uses_configured_embedding_function(
+        self, chromadb_adapter, settings, tmp_path
+    ):
+        cache = CollectionCache(str(tmp_path / "collections.sqlite"))
+        self._adapter(settings, cache)
+        embedding_function = DefaultEmbeddingFunction()
+
+        fresh = self._adapter(settings, cache, embedding_function)
+        assert "_client" not in fresh.__dict__
+        assert fresh._collection._embedding_function is embedding_function
+
+    def test_missing_timeout_internals_keep_defaults(self):
+        """A client without the expected session only loses the timeouts."""
+        with pytest.warns(RuntimeWarning, match="HTTP timeouts disabled"):
+            _set_timeout(object(), httpx.Timeout(1.0))
+
+    @pytest.mark.parametrize("internal", ["chromadb.config.System", "chromadb.types.Collection"])
+    def test_missing_cache_internals_fall_back_to_client(
+        self, chromadb_adapter, settings, tmp_path, monkeypatch, internal
+    ):
+        """Without the internals, cached ids are ignored and the client is used."""
+        cache = CollectionCache(str(tmp_path / "collections.sqlite"))
+        self._adapter(settings, cache).store("c3", "public api", {"tag": "a"})
+        monkeypatch.delattr(internal)
+
+        with pytest.warns(RuntimeWarning, match="collection cache disabled"):
+            fresh = self._adapter(settings, cache)
+        assert "_client" in fresh.__dict__
+        assert fresh.get("c3")["content"] == "public api"
+        assert fresh.heartbeat() is True
 
-    def test_search_with_compound_and_filter(self, chromadb_adapter):
-        """Multiple where conditions are combined with $and."""
-        chromadb_adapter.store("c1", "doc one", {"agent": "a", "project": "x"})
-        chromadb_adapter.store("c2", "doc two", {"agent": "a", "project": "y"})
-        chromadb_adapter.store("c3", "doc three", {"agent": "b", "project": "x"})
 
-        results = chromadb_adapter.search(
-            "doc", n_results=10, where={"agent": "a", "project": "x"},
+class TestRetries:
+    """Verify dropped connections are retried and other errors are not."""
+
+    @staticmethod
+    def _adapter(count_side_effect, retries=2):
+        client = MagicMock()
+        collection = client.get_or_create_collection.return_value
+        collection._embedding_function = None
+        collection.count.side_effect = count_side_effect
+        adapter = ChromaDBAdapter(
+            host="", port=0, collection_name="c", client=client,
+            retries=retries, retry_backoff=0,
         )
-        assert len(results) == 1
-        assert results[0]["id"] == "c1"
+        return adapter, collection
+
+    def test_dropped_connection_retried(self):
+        """A refused connection is retried transparently."""
+        adapter, collection = self._adapter([httpx.ConnectError("refused"), 3])
+        assert adapter.count() == 3
+        assert collection.count.call_count == 2
+
+    def test_gives_up_after_retries(self):
+        """The error surfaces once every retry has failed."""
+        adapter, collection = self._adapter(httpx.RemoteProtocolError("reset"), retries=1)
+        with pytest.raises(httpx.RemoteProtocolError):
+            adapter.count()
+        assert collection.count.call_count == 2
 
+    def test_read_timeout_not_retried(self):
+        """A timed-out read may still be running on the server, so it is not repeated."""
+        adapter, collection = self._adapter(httpx.ReadTimeout("slow"))
+        with pytest.raises(httpx.ReadTimeout):
+            adapter.count()
+        assert collection.count.call_count == 1
 
-class TestUpdateMetadata:
-    """Verify metadata updates are partial (merge, not replace)."""
 
-    def test_update_single_key(self, chromadb_adapter):
-        """Updating one metadata key does not affect other keys."""
-        chromadb_adapter.store("u1", "update test", {"key_a": "original", "key_b": "keep"})
-        chromadb_adapter.update_metadata("u1", {"key_a": "changed"})
+class TestUpsert:
+    """Verify upsert with and without supplied embeddings."""
 
-        result = chromadb_adapter.get("u1")
-        assert result["metadata"]["key_a"] == "changed"
-        assert result["metadata"]["key_b"] == "keep"
+    def test_upsert_is_idempotent_and_keeps_vectors(self, chromadb_adapter):
+        """Re-upserting replaces in place; supplied vectors are stored as given."""
+        vector = [0.5] * 384
+        for _ in range(2):
+            chromadb_adapter.upsert_many(
+                ["u1", "u2"], ["given", "computed"], [{"n": 1}, {"n": 2}], [vector, None]
+            )
+        assert chromadb_adapter.count() == 2
+        page, _ = chromadb_adapter.get_page(limit=5, include_embeddings=True)
+        by_id = {doc["id"]: doc for doc in page}
+        assert by_id["u1"]["embedding"] == pytest.approx(vector)
+        assert by_id["u2"]["embedding"] != pytest.approx(vector)
 
+    def test_partition_move(self, partitioned_adapter):
+        """Changing a memory's project moves it to the new partition."""
+        partitioned_adapter.store("m1", "moving", {"project": "alpha", "global_": False})
+        partitioned_adapter.upsert_many(["m1"], ["moving"], [{"project": "beta", "global_": False}])
+        assert partitioned_adapter.count() == 1
+        assert partitioned_adapter.get("m1")["metadata"]["project"] == "beta"
 
-class TestDelete:
-    """Verify permanent document deletion."""
 
-    def test_delete_makes_get_return_none(self, chromadb_adapter):
-        """After deletion, get returns None for that ID."""
-        chromadb_adapter.store("d1", "to be deleted", {"a": "b"})
-        chromadb_adapter.delete("d1")
-        assert chromadb_adapter.get("d1") is None
+class TestPartitioning:
+    """Verify project partitioning routes writes and prunes searches."""
 
+    def _seed(self, adapter):
+        adapter.store_many(
+            ["a1", "a2", "b1", "g1", "n1"],
+            ["alpha cats", "alpha dogs", "beta cats", "global cats", "plain cats"],
+            [
+                {"project": "alpha", "global_": False, "deleted": False},
+                {"project": "alpha", "global_": False, "deleted": False},
+                {"project": "beta", "global_": False, "deleted": False},
+                {"project": "alpha", "global_": True, "deleted": False},
+                {"project": "", "global_": False, "deleted": False},
+            ],
+        )
+
+    def test_writes_routed_to_partitions(self, partitioned_adapter, settings):
+        """Each project, global memories and unscoped memories get a collection."""
+        self._seed(partitioned_adapter)
+        base = settings.collection_name
+        names = {c.name for c in partitioned_adapter._client.list_collections()}
+        assert {
+            base,
+            f"{base}-global",
+            partition_name(base, {"project": "alpha"}),
+            partition_name(base, {"project": "beta"}),
+        } <= names
+        assert partitioned_adapter.count() == 5
+        assert partitioned_adapter.stats()["partitions"] == 4
 
-class TestHeartbeat:
-    """Verify connectivity check."""
+    def test_project_search_skips_other_projects(self, partitioned_adapter, settings):
+        """A project filter only queries that project and the global partition."""
+        self._seed(partitioned_adapter)
+        where = {"deleted": False, "project": "alpha"}
+        assert sorted(partitioned_adapter._partition_names(where)) == sorted([
+            partition_name(settings.collection_name, {"project": "alpha"}),
+            f"{settings.collection_name}-global",
+        ])
+        ids = {r["id"] for r in partitioned_adapter.search("cats", n_results=10, where=where)}
+        assert ids == {"a1", "a2", "g1"}
 
-    def test_heartbeat_returns_true(self, chromadb_adapter):
-        """A running ChromaDB instance responds to heartbeat."""
-        assert chromadb_adapter.heartbeat() is True
+    def test_unfiltered_search_merges_by_distance(self, partitioned_adapter):
+        """Fan-out results are globally ordered and capped at n_results."""
+        self._seed(partitioned_adapter)
+        results = partitioned_adapter.search("cats", n_results=3)
+        assert len(results) == 3
+        distances = [r["distance"] for r in results]
+        assert distances == sorted(distances)
 
+    def test_id_operations_use_lookup(self, partitioned_adapter):
+        """get, update and delete find the owning partition."""
+        self._seed(partitioned_adapter)
+        partitioned_adapter.update_metadata("b1", {"deleted": True})
+        assert partitioned_adapter.get("b1")["metadata"]["deleted"] is True
+        partitioned_adapter.delete_many(["a1", "g1"])
+        assert partitioned_adapter.get("a1") is None
+        assert partitioned_adapter.count() == 3
+
+    def test_unknown_ids_probed(self, partitioned_adapter, settings, tmp_path):
+        """An adapter with an empty lookup still finds IDs written elsewhere."""
+        self._seed(partitioned_adapter)
+        fresh = ChromaDBAdapter(
+            host=settings.chromadb_host,
+            port=settings.chromadb_port,
+            collection_name=settings.collection_name,
+            partition_index=PartitionIndex(str(tmp_path / "other.sqlite")),
+        )
+        assert fresh.get("b1")["content"] == "beta cats"
+        assert fresh.get("missing") is None
+
+    def test_memories_from_before_partitioning_found(self, settings, tmp_path):
+        """Turning partitioning on keeps older project memories searchable."""
+        plain = ChromaDBAdapter(
+            host=settings.chromadb_host,
+            port=settings.chromadb_port,
+            collection_name=settings.collection_name,
+        )
+        plain.store("old", "alpha cats", {"project": "alpha", "global_": False})
+        partitioned = ChromaDBAdapter(
+            host=settings.chromadb_host,
+            port=settings.chromadb_port,
+            collection_name=settings.collection_name,
+            partition_index=PartitionIndex(str(tmp_path / "partitions.sqlite")),
+        )
+        try:
+            where = {"project": "alpha"}
+            hits = partitioned.search("cats", n_results=5, where=where)
+            assert [r["id"] for r in hits] == ["old"]
+            page, _ = partitioned.get_page(where=where)
+            assert [doc["id"] for doc in page] == ["old"]
+        finally:
+            plain._client.delete_collection(settings.collection_name)
 
-class TestCount:
-    """Verify document counting."""
+    def test_drained_base_not_queried(self, partitioned_adapter, settings):
+        """Without older rows, project reads skip the base collection."""
+        self._seed(partitioned_adapter)
+        names = partitioned_adapter._partition_names({"project": "alpha"})
+        assert settings.collection_name not in names
 
-    def test_count_matches_stored_documents(self, chromadb_adapter):
-        """Count reflects the number of stored documents."""
-        assert chromadb_adapter.count() == 0
-        chromadb_adapter.store("n1", "first", {"x": "1"})
-        chromadb_adapter.store("n2", "second", {"x": "2"})
-        chromadb_adapter.store("n3", "third", {"x": "3"})
-        assert chromadb_adapter.count() == 3
+    def test_get_page_walks_every_partition(self, partitioned_adapter):
+        """Paging visits all partitions once and ends with a None cursor."""
+        self._seed(partitioned_adapter)
+        seen, cursor = [], None
+        while True:
+            page, cursor = partitioned_adapter.get_page(limit=2, cursor=cursor)
+            seen.extend(doc["id"] for doc in page)
+            if cursor is None:
+                break
+        assert sorted(seen) == ["a1", "a2", "b1", "g1", "n1"]
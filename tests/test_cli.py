@@ -10,6 +10,7 @@ import uuid
 import pytest
 from typer.testing import CliRunner
 
+import memories
 from memories.cli import app
 
 pytestmark = pytest.mark.integration
@@ -60,6 +61,30 @@ class TestCreateCommand:
         assert output["confidence"] == 1.0
 
 
+class TestCreateBatch:
+    """Verify bulk creation from JSONL on stdin."""
+
+    def test_batch_streams_ndjson_ids(self):
+        """Each valid input line yields one NDJSON result with an id."""
+        contents = [_unique_content() for _ in range(3)]
+        lines = [json.dumps({"content": c, "decay": "contextual"}) for c in contents]
+        result = runner.invoke(app, ["create", "--batch"], input="\n".join(lines) + "\n")
+        assert result.exit_code == 0, result.output
+
+        outputs = [json.loads(line) for line in result.output.splitlines()]
+        assert [o["content"] for o in outputs] == contents
+        assert all(o["id"] and o["decay_policy"] == "contextual" for o in outputs)
+
+    def test_batch_reports_invalid_lines(self):
+        """Bad lines are reported with their line number; valid ones still land."""
+        content = _unique_content()
+        stdin = "not json\n" + json.dumps({"content": content}) + "\n"
+        result = runner.invoke(app, ["create", "--batch"], input=stdin)
+        assert result.exit_code == 1
+        assert content in result.output
+        assert '"line": 1' in result.output
+
+
 # ---------------------------------------------------------------------------
 # search command
 # ---------------------------------------------------------------------------
@@ -79,6 +104,39 @@ class TestSearchCommand:
         assert created["id"] in result_ids
 
 
+    def test_search_multiple_queries_grouped(self):
+        """Several query arguments return one result group per query."""
+        first, second = _unique_content(), _unique_content()
+        created_first = _create_memory(first)
+        created_second = _create_memory(second)
+
+        result = runner.invoke(app, ["search", first, second])
+        assert result.exit_code == 0, result.output
+        output = json.loads(result.output)
+        assert [g["query"] for g in output["queries"]] == [first, second]
+        assert created_first["id"] in [r["id"] for r in output["queries"][0]["results"]]
+        assert created_second["id"] in [r["id"] for r in output["queries"][1]["results"]]
+        assert "global" in output["queries"][0]["results"][0]
+
+    def test_lexical_mode_finds_identifier(self, monkeypatch):
+        """--mode lexical matches an exact ticket number once the index is enabled."""
+        monkeypatch.setattr("memories.config.settings.lexical_index", True)
+        monkeypatch.delattr(memories.get_service, "_instance", raising=False)
+        ticket = f"TICKET-{uuid.uuid4().hex[:8]}"
+        created = _create_memory(f"regression tracked in {ticket}")
+
+        try:
+            for mode in ("lexical", "hybrid"):
+                result = runner.invoke(app, ["search", ticket, "--mode", mode])
+                assert result.exit_code == 0, result.output
+                hit = json.loads(result.output)["results"][0]
+                assert hit["id"] == created["id"]
+                assert hit["score"] > 0
+        finally:
+            # Later tests get a fresh service without the index.
+            del memories.get_service._instance
+
+
 # ---------------------------------------------------------------------------
 # get command
 # ---------------------------------------------------------------------------
@@ -142,6 +200,239 @@ class TestDeleteCommand:
         assert output["id"] == created["id"]
         assert output["deleted"] is True
 
+    def test_delete_many_reports_per_id(self):
+        """Several IDs produce one report; a failure sets exit code 1."""
+        first, second = _create_memory(), _create_memory()
+        result = runner.invoke(app, ["delete", first["id"], second["id"], "no-such-id"])
+        assert result.exit_code == 1
+        report = json.loads(result.output)
+        assert report["succeeded"] == 2 and report["failed"] == 1
+        assert report["results"][2]["id"] == "no-such-id"
+
+    def test_delete_ids_from_stdin(self):
+        """'-' reads whitespace-separated IDs from stdin."""
+        first, second = _create_memory(), _create_memory()
+        result = runner.invoke(app, ["delete", "-"], input=f"{first['id']}\n{second['id']}\n")
+        assert result.exit_code == 0
+        assert json.loads(result.output)["succeeded"] == 2
+
+    def test_reinforce_from_search(self):
+        """--from-search reinforces every search hit."""
+        project = f"proj-{uuid.uuid4().hex[:8]}"
+        created = _create_memory("bulk reinforce target", project=project, decay="reinforceable")
+        result = runner.invoke(
+            app, ["reinforce", "--from-search", "bulk reinforce target", "--project", project]
+        )
+        assert result.exit_code == 0
+        report = json.loads(result.output)
+        assert [r["id"] for r in report["results"]] == [created["id"]]
+
+
+class TestReinforceHits:
+    """Verify search --reinforce-hits defers reinforcement to exit."""
+
+    def test_hits_reinforced_by_exit_hook(self, monkeypatch):
+        """The search output is unchanged; the exit hook writes the reinforcement."""
+        hooks = []
+        monkeypatch.setattr("memories.cli.atexit.register", hooks.append)
+        project = f"proj-{uuid.uuid4().hex[:8]}"
+        created = _create_memory("recall reinforce target", project=project, decay="reinforceable")
+
+        result = runner.invoke(
+            app, ["search", "recall reinforce target", "--project", project, "--reinforce-hits"]
+        )
+        assert result.exit_code == 0
+        assert json.loads(result.output)["results"][0]["id"] == created["id"]
+        before = json.loads(runner.invoke(app, ["get", created["id"]]).output)
+        assert before["last_reinforced_at"] == ""
+
+        assert len(hooks) == 1
+        hooks[0]()
+        fetched = json.loads(runner.invoke(app, ["get", created["id"]]).output)
+        assert fetched["last_reinforced_at"]
+
+
+class TestProfile:
+    """Verify --profile prints a timing breakdown to stderr."""
+
+    def test_profile_breakdown(self):
+        created = _create_memory("profiled get")
+        result = runner.invoke(app, ["--profile", "get", created["id"]])
+        assert result.exit_code == 0
+        assert json.loads(result.stdout)["id"] == created["id"]
+
+        profile = json.loads(result.stderr)["profile"]
+        assert profile["command"] == "get"
+        assert {"service.get", "chromadb.get", "cli.serialize", "cli.output"} <= set(
+            profile["spans"]
+        )
+
+    def test_metrics_file(self, monkeypatch, tmp_path):
+        metrics = tmp_path / "profile.om"
+        monkeypatch.setattr("memories.cli.settings.profile_metrics_file", str(metrics))
+        runner.invoke(app, ["--profile", "status"])
+        runner.invoke(app, ["--profile", "status"])
+        lines = metrics.read_text().splitlines()
+        assert sum(line.startswith("memories_profile_total_seconds") for line in lines) == 2
+
+
+class TestExportCommand:
+    """Verify export streams NDJSON records."""
+
+    def test_export_project(self):
+        """Only the project's live memories are exported, with raw metadata."""
+        project = f"proj-{uuid.uuid4().hex[:8]}"
+        kept, dropped = _create_memory(project=project), _create_memory(project=project)
+        runner.invoke(app, ["delete", dropped["id"]])
+
+        result = runner.invoke(app, ["export", "--project", project, "--embeddings"])
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in result.output.splitlines()]
+        assert [r["id"] for r in records] == [kept["id"]]
+        assert records[0]["metadata"]["project"] == project
+        assert records[0]["embedding"]
+
+        everything = runner.invoke(app, ["export", "--project", project, "--include-deleted"])
+        assert len(everything.output.splitlines()) == 2
+
+
+class TestImportCommand:
+    """Verify import restores export output and resumes from checkpoints."""
+
+    def test_round_trip_and_resume(self, tmp_path):
+        project = f"proj-{uuid.uuid4().hex[:8]}"
+        first, second = _create_memory(project=project), _create_memory(project=project)
+        exported = runner.invoke(app, ["export", "--project", project, "--embeddings"]).output
+        lines = exported.splitlines(keepends=True)
+        source = tmp_path / "backup.jsonl"
+        source.write_text("".join(lines))
+
+        # Pretend an earlier run committed the first record.
+        checkpoint = tmp_path / "backup.jsonl.checkpoint"
+        checkpoint.write_text(json.dumps({"offset": len(lines[0].encode())}))
+        runner.invoke(app, ["delete", second["id"]])
+
+        result = runner.invoke(app, ["import", str(source)])
+        assert result.exit_code == 0, result.output
+        summary = json.loads(result.output)
+        assert summary["imported"] == 1 and summary["reused_embeddings"] == 1
+        assert not checkpoint.exists()
+        # The re-imported record overwrote the soft delete.
+        assert runner.invoke(app, ["get", second["id"]]).exit_code == 0
+
+        again = runner.invoke(app, ["import", str(source)])
+        assert json.loads(again.output)["imported"] == 2
+        assert runner.invoke(app, ["get", first["id"]]).exit_code == 0
+
+
+class TestCompactCommand:
+    """Verify compaction purges soft-deleted memories."""
+
+    def test_dry_run_then_archive(self, tmp_path):
+        """A dry run keeps the memory; a real run archives and removes it."""
+        created = _create_memory("compact me")
+        runner.invoke(app, ["delete", created["id"]])
+
+        dry = runner.invoke(app, ["compact", "--dry-run"])
+        assert dry.exit_code == 0
+        assert json.loads(dry.output)["deleted"] >= 1
+
+        archive = tmp_path / "purged.jsonl"
+        result = runner.invoke(app, ["compact", "--archive", str(archive)])
+        assert result.exit_code == 0
+        assert json.loads(result.output)["dry_run"] is False
+        archived = [json.loads(line)["id"] for line in archive.read_text().splitlines()]
+        assert created["id"] in archived
+        assert runner.invoke(app, ["get", created["id"]]).exit_code == 1
+
+
+class TestFieldsOption:
+    """Verify --fields projects output on get, search and list."""
+
+    def test_get_and_search_only_selected_fields(self):
+        """Only the requested keys are printed."""
+        project = f"fields-{uuid.uuid4().hex[:8]}"
+        created = _create_memory("projection test memory", project=project)
+
+        got = runner.invoke(app, ["get", created["id"], "--fields", "id,confidence,global"])
+        assert got.exit_code == 0, got.output
+        assert json.loads(got.output) == {
+            "id": created["id"], "confidence": 1.0, "global": False,
+        }
+
+        found = runner.invoke(
+            app, ["search", "projection test", "--project", project, "--fields", "id,similarity"]
+        )
+        assert found.exit_code == 0
+        data = json.loads(found.output)
+        assert set(data["results"][0]) == {"id", "similarity"}
+        assert data["count"] == 1
+
+        listed = runner.invoke(app, ["list", "--project", project, "--fields", "content"])
+        assert json.loads(listed.output)["results"] == [{"content": "projection test memory"}]
+
+    def test_unknown_field_rejected(self):
+        """An unknown field exits 1 and lists the valid ones."""
+        result = runner.invoke(app, ["list", "--fields", "id,similarity"])
+        assert result.exit_code == 1
+        assert "similarity" in json.loads(result.stderr)["error"]
+
+
+class TestListCommand:
+    """Verify cursor-paginated listing by metadata."""
+
+    def test_pages_through_project_newest_first(self):
+        """Following next_cursor visits every memory once, newest first."""
+        project = f"list-{uuid.uuid4().hex[:8]}"
+        created = [_create_memory(project=project)["id"] for _ in range(3)]
+
+        seen, cursor = [], None
+        while True:
+            args = ["list", "--project", project, "--sort", "created_at", "--limit", "2"]
+            result = runner.invoke(app, args + (["--cursor", cursor] if cursor else []))
+            assert result.exit_code == 0, result.output
+            page = json.loads(result.output)
+            seen += [item["id"] for item in page["results"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == created[::-1]
+
+    def test_store_order_and_bad_cursor(self):
+        """Store order lists the project; a foreign cursor exits 1."""
+        project = f"list-{uuid.uuid4().hex[:8]}"
+        created = _create_memory(project=project)
+        result = runner.invoke(app, ["list", "--project", project])
+        assert result.exit_code == 0
+        assert [item["id"] for item in json.loads(result.output)["results"]] == [created["id"]]
+
+        bad = runner.invoke(app, ["list", "--cursor", "garbage"])
+        assert bad.exit_code == 1
+
+
+class TestConsolidateCommand:
+    """Verify near-duplicate consolidation from the command line."""
+
+    def test_dry_run_then_merge(self):
+        """Two copies in one project form a cluster; the older is soft-deleted."""
+        project = f"consolidate-{uuid.uuid4().hex[:8]}"
+        content = _unique_content()
+        older = _create_memory(content, project=project)
+        newer = _create_memory(content, project=project)
+
+        dry = runner.invoke(app, ["consolidate", "--project", project, "--dry-run"])
+        assert dry.exit_code == 0, dry.output
+        assert json.loads(dry.output)["groups"] == [
+            {"project": project, "keep": newer["id"], "remove": [older["id"]]}
+        ]
+        assert runner.invoke(app, ["get", older["id"]]).exit_code == 0
+
+        result = runner.invoke(app, ["consolidate", "--project", project])
+        assert result.exit_code == 0
+        assert json.loads(result.output)["removed"] == 1
+        assert runner.invoke(app, ["get", older["id"]]).exit_code == 1
+        assert runner.invoke(app, ["get", newer["id"]]).exit_code == 0
+
 
 # ---------------------------------------------------------------------------
 # status command
@@ -174,3 +465,51 @@ class TestTextFormat:
             json.loads(result.output)
         # But it should contain key-value pairs.
         assert "content:" in result.output or "id:" in result.output
+
+
+# ---------------------------------------------------------------------------
+# --format ndjson
+# ---------------------------------------------------------------------------
+
+class TestNdjsonFormat:
+    """Verify --format ndjson prints one compact object per result."""
+
+    def test_search_lines_match_json_results(self):
+        """Each line equals the matching result of the JSON output."""
+        project = f"ndjson-{uuid.uuid4().hex[:8]}"
+        for _ in range(2):
+            _create_memory(project=project)
+        args = ["search", "test memory", "--project", project]
+
+        as_json = json.loads(runner.invoke(app, args).output)["results"]
+        result = runner.invoke(app, args + ["--format", "ndjson"])
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        assert [json.loads(line) for line in lines] == as_json
+        compact = [json.dumps(json.loads(line), separators=(",", ":")) for line in lines]
+        assert lines == compact
+
+    def test_batched_search_and_list_cursor(self):
+        """Batched lines carry their query; a paged listing ends with its cursor."""
+        project = f"ndjson-{uuid.uuid4().hex[:8]}"
+        created = [_create_memory(project=project)["id"] for _ in range(2)]
+
+        result = runner.invoke(
+            app, ["search", "a", "b", "--project", project, "--fields", "id", "--format", "ndjson"]
+        )
+        rows = [json.loads(line) for line in result.output.splitlines()]
+        assert {row["query"] for row in rows} == {"a", "b"}
+        assert {row["id"] for row in rows} == set(created)
+
+        listed = runner.invoke(
+            app, ["list", "--project", project, "--limit", "1", "--format", "ndjson"]
+        )
+        first, cursor = [json.loads(line) for line in listed.output.splitlines()]
+        assert first["id"] in created and set(cursor) == {"next_cursor"}
+
+    def test_single_object_commands(self):
+        """Commands without a result list print one compact line."""
+        result = runner.invoke(app, ["status", "--format", "ndjson"])
+        assert result.exit_code == 0
+        assert len(result.output.splitlines()) == 1
+        assert json.loads(result.output)["status"] == "healthy"
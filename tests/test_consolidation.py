@@ -0,0 +1,62 @@
+"""Unit tests for blockwise near-duplicate clustering.
+
+Pure NumPy — tiny hand-built vectors, with block sizes smaller than
+the input so pairs spanning tiles are exercised.
+"""
+
+import numpy as np
+
+from memories.services.consolidation import cluster_duplicates, normalize, similar_pairs
+
+
+class TestNormalize:
+    """Verify rows are scaled to unit length."""
+
+    def test_unit_rows_and_zero_rows_kept(self):
+        """Non-zero rows get norm 1; all-zero rows stay zero instead of NaN."""
+        result = normalize(np.array([[3.0, 4.0], [0.0, 0.0]]))
+        assert np.allclose(result, [[0.6, 0.8], [0.0, 0.0]])
+
+
+class TestSimilarPairs:
+    """Verify tiles cover every pair exactly once."""
+
+    def test_pairs_across_blocks_match_full_matrix(self):
+        """Blockwise pairs equal the upper triangle of the full similarity matrix."""
+        rng = np.random.default_rng(0)
+        vectors = normalize(rng.normal(size=(23, 8)))
+        full = vectors @ vectors.T
+        expected = {
+            (i, j) for i in range(23) for j in range(i + 1, 23) if full[i, j] >= 0.3
+        }
+
+        found = set()
+        for rows, cols in similar_pairs(vectors, 0.3, block_size=5):
+            found.update(zip(rows.tolist(), cols.tolist()))
+        assert found == expected
+
+
+class TestClusterDuplicates:
+    """Verify union-find grouping of similar rows."""
+
+    def test_groups_transitive_neighbours(self):
+        """A~B and B~C form one cluster; unrelated rows are left out."""
+        vectors = np.array([
+            [1.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.99, 0.14, 0.0],
+            [0.96, 0.28, 0.0],
+            [0.0, 0.0, 1.0],
+            [0.0, 0.02, 1.0],
+        ])
+        groups = cluster_duplicates(vectors, threshold=0.98, block_size=2)
+        assert sorted(groups) == [[0, 2, 3], [4, 5]]
+
+    def test_scale_does_not_matter(self):
+        """Vectors are normalized, so length never affects similarity."""
+        groups = cluster_duplicates(np.array([[1.0, 1.0], [5.0, 5.0]]), 0.99, 10)
+        assert groups == [[0, 1]]
+
+    def test_no_pairs_above_threshold(self):
+        """Orthogonal rows produce no clusters."""
+        assert cluster_duplicates(np.eye(4), threshold=0.5, block_size=3) == []
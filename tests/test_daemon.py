@@ -0,0 +1,179 @@
+"""Tests for the ``memory serve`` daemon and the thin forwarding client.
+
+Uses a small stand-in Typer app so the socket protocol is exercised
+without ChromaDB.  The server runs in a subprocess, as in real use:
+the daemon redirects the process-global ``sys.stdout`` while a command
+runs, so it cannot share a process with the client.
+"""
+
+import fcntl
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import typer
+
+from memories import client
+from memories.daemon import make_server
+
+demo_app = typer.Typer()
+
+
+@demo_app.callback()
+def _main() -> None:
+    """Demo app."""
+
+
+@demo_app.command()
+def echo(text: str) -> None:
+    """Print *text* as JSON."""
+    print(json.dumps({"text": text}))
+
+
+@demo_app.command()
+def fail() -> None:
+    """Write an error and exit 1, like the real commands do."""
+    print(json.dumps({"error": "boom"}), file=sys.stderr)
+    raise typer.Exit(code=1)
+
+
+def _accepts(path: str) -> bool:
+    """Return True once a server accepts connections on *path*."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+@pytest.fixture()
+def daemon(tmp_path):
+    """Run the demo app on a Unix socket; yield the socket path."""
+    path = str(tmp_path / "daemon.sock")
+    code = (
+        "import sys; from memories.daemon import make_server; "
+        "from tests.test_daemon import demo_app; "
+        "make_server(demo_app, sys.argv[1]).serve_forever()"
+    )
+    repo_root = Path(__file__).resolve().parent.parent
+    process = subprocess.Popen([sys.executable, "-c", code, path], cwd=repo_root)
+    deadline = time.monotonic() + 10
+    while not _accepts(path):
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.02)
+    yield path
+    process.terminate()
+    process.wait()
+
+
+class TestForwarding:
+    """Verify commands round-trip through the socket."""
+
+    def test_stdout_and_exit_code(self, daemon, capsys):
+        """Command output is relayed and exit code 0 returned."""
+        assert client._forward(daemon, ["echo", "hi"]) == 0
+        assert json.loads(capsys.readouterr().out) == {"text": "hi"}
+
+    def test_stderr_and_failure_exit_code(self, daemon, capsys):
+        """Errors go to stderr with the command's exit code."""
+        assert client._forward(daemon, ["fail"]) == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert json.loads(captured.err) == {"error": "boom"}
+
+    def test_usage_error_exit_code(self, daemon, capsys):
+        """Click usage errors keep their standard exit code 2."""
+        assert client._forward(daemon, ["echo"]) == 2
+        assert "Missing argument" in capsys.readouterr().err
+
+    def test_serves_multiple_requests(self, daemon, capsys):
+        """The daemon stays up across commands."""
+        for word in ("a", "b", "c"):
+            assert client._forward(daemon, ["echo", word]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)["text"] for line in lines] == ["a", "b", "c"]
+
+
+class TestFallback:
+    """Verify the client runs locally when no daemon is available."""
+
+    def test_missing_socket_returns_none(self, tmp_path):
+        """No socket file means the caller should run in-process."""
+        assert client._forward(str(tmp_path / "absent.sock"), ["echo", "x"]) is None
+
+    def test_serve_never_forwarded(self):
+        """The serve command always runs in the local process."""
+        assert client._runs_locally(["serve"])
+        assert not client._runs_locally(["search", "query"])
+
+    def test_stdin_and_file_flags_run_locally(self):
+        """Commands reading stdin or caller-relative files are not forwarded."""
+        assert client._runs_locally(["create", "--batch"])
+        assert client._runs_locally(["search", "--queries-file=queries.txt"])
+        assert client._runs_locally(["delete", "-"])
+        assert client._runs_locally(["import", "backup.jsonl"])
+
+    def test_profile_flag_forwarded(self):
+        """--profile before the command does not change where it runs."""
+        assert client._runs_locally(["--profile", "serve"])
+        assert not client._runs_locally(["--profile", "search", "query"])
+
+    def test_idle_hook_runs_between_requests(self, tmp_path):
+        """on_idle is polled while the daemon waits for connections."""
+        called = threading.Event()
+        server = make_server(demo_app, str(tmp_path / "idle.sock"), on_idle=called.set)
+        thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01})
+        thread.start()
+        try:
+            assert called.wait(5)
+        finally:
+            server.shutdown()
+            thread.join()
+            server.server_close()
+
+    def test_second_daemon_refuses_live_socket(self, daemon):
+        """Binding over a socket another daemon is using fails loudly."""
+        with pytest.raises(RuntimeError):
+            make_server(demo_app, daemon)
+        assert _accepts(daemon)
+
+    def test_starting_daemon_holds_lock(self, tmp_path):
+        """A daemon that holds the lock but has no socket yet is not replaced."""
+        path = str(tmp_path / "daemon.sock")
+        with open(f"{path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with pytest.raises(RuntimeError):
+                make_server(demo_app, path)
+
+    def test_stale_socket_replaced(self, tmp_path):
+        """A socket left by a dead daemon (no lock holder) is taken over."""
+        path = str(tmp_path / "daemon.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        server = make_server(demo_app, path)
+        try:
+            assert server.server_address == path and _accepts(path)
+        finally:
+            server.server_close()
+
+
+class TestClientImports:
+    """Verify the client entry point stays lightweight."""
+
+    def test_client_avoids_heavy_imports(self):
+        """Importing the client does not pull in typer, pydantic or chromadb."""
+        code = (
+            "import sys, memories.client; "
+            "print(any(m in sys.modules for m in ('typer', 'pydantic', 'chromadb')))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        )
+        assert result.stdout.strip() == "False"
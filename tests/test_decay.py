@@ -5,9 +5,16 @@ with boundary conditions.  Uses the ``now`` parameter on
 ``compute_confidence`` for deterministic results — no mocking needed.
 """
 
+import math
 from datetime import datetime, timedelta, timezone
 
-from memories.services.decay import compute_confidence
+from memories.services.decay import (
+    NEVER_EXPIRES,
+    compute_confidence,
+    compute_confidence_batch,
+    compute_expires_at,
+    min_expires_at,
+)
 
 # Default half-life used throughout tests (matches Settings default).
 HALF_LIFE = 720  # hours (30 days)
@@ -123,3 +130,67 @@ class TestRounding:
         created = _hours_ago(100, now)
         result = compute_confidence("contextual", created, None, HALF_LIFE, now=now)
         assert result == 0.8611
+
+
+# ---------------------------------------------------------------------------
+# Expiry epochs — the store-side form of the confidence threshold
+# ---------------------------------------------------------------------------
+
+class TestExpiresAt:
+    """expires_at is when confidence hits zero; thresholds map onto it."""
+
+    def test_stable_never_expires(self):
+        assert compute_expires_at("stable", _utc_now(), None, HALF_LIFE) == NEVER_EXPIRES
+
+    def test_contextual_expires_one_half_life_after_creation(self):
+        created = _hours_ago(100)
+        expected = created.timestamp() + HALF_LIFE * 3600
+        assert compute_expires_at("contextual", created, None, HALF_LIFE) == expected
+
+    def test_reinforceable_counts_from_last_reinforcement(self):
+        created, reinforced = _hours_ago(1000), _hours_ago(10)
+        expected = reinforced.timestamp() + HALF_LIFE * 3600
+        assert compute_expires_at("reinforceable", created, reinforced, HALF_LIFE) == expected
+
+    def test_threshold_matches_compute_confidence(self):
+        """expires_at >= min_expires_at(c) exactly when confidence >= c."""
+        now = _utc_now()
+        bound = min_expires_at(0.5, HALF_LIFE, now=now)
+        for age in (100, 359, 360, 361, 700):
+            created = _hours_ago(age, now)
+            expires = compute_expires_at("contextual", created, None, HALF_LIFE)
+            confidence = compute_confidence("contextual", created, None, HALF_LIFE, now=now)
+            assert (expires >= bound) == (confidence >= 0.5)
+
+
+# ---------------------------------------------------------------------------
+# Batch computation — vectorized over epoch arrays
+# ---------------------------------------------------------------------------
+
+class TestConfidenceBatch:
+    """compute_confidence_batch agrees with compute_confidence per element."""
+
+    def test_matches_scalar_for_every_policy(self):
+        now = _utc_now()
+        cases = [
+            ("stable", _hours_ago(10000, now), None),
+            ("contextual", _hours_ago(100, now), None),
+            ("contextual", _hours_ago(1000, now), None),
+            ("reinforceable", _hours_ago(1000, now), _hours_ago(360, now)),
+            ("reinforceable", _hours_ago(360, now), None),
+        ]
+        result = compute_confidence_batch(
+            [policy for policy, _, _ in cases],
+            [created.timestamp() for _, created, _ in cases],
+            [r.timestamp() if r else math.nan for _, _, r in cases],
+            HALF_LIFE,
+            now=now.timestamp(),
+        )
+        expected = [
+            compute_confidence(policy, created, reinforced, HALF_LIFE, now=now)
+            for policy, created, reinforced in cases
+        ]
+        assert result.tolist() == expected
+
+    def test_empty_input(self):
+        assert compute_confidence_batch([], [], [], HALF_LIFE).size == 0
@@ -0,0 +1,122 @@
+"""Unit tests for the on-disk query-embedding cache."""
+
+import numpy as np
+
+from memories.stores.embedding_cache import (
+    EmbeddingCache,
+    embedding_model_id,
+    normalize_query,
+)
+
+
+def _cache(tmp_path, max_entries: int = 100) -> EmbeddingCache:
+    return EmbeddingCache(path=str(tmp_path / "cache.sqlite"), max_entries=max_entries)
+
+
+class TestLookup:
+    """Verify hits, misses and key normalization."""
+
+    def test_miss_then_hit(self, tmp_path):
+        cache = _cache(tmp_path)
+        assert cache.get_many("m", ["user preferences"]) == [None]
+
+        cache.put_many("m", ["user preferences"], [np.array([1.0, 2.0])])
+        (vector,) = cache.get_many("m", ["user preferences"])
+        assert vector.tolist() == [1.0, 2.0]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_whitespace_is_normalized(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put_many("m", ["project   conventions "], [np.zeros(2)])
+        assert cache.get_many("m", [" project conventions"])[0] is not None
+        assert normalize_query("  a \n b ") == "a b"
+
+    def test_models_are_isolated(self, tmp_path):
+        """A vector from one model is never served for another."""
+        cache = _cache(tmp_path)
+        cache.put_many("old-model", ["q"], [np.ones(2)])
+        assert cache.get_many("new-model", ["q"]) == [None]
+
+    def test_counters_persist_across_instances(self, tmp_path):
+        _cache(tmp_path).get_many("m", ["a", "b"])
+        assert _cache(tmp_path).stats()["misses"] == 2
+
+
+class TestWrites:
+    """Verify lookups stay read-only and buffered usage is written later."""
+
+    def test_wal_mode(self, tmp_path):
+        cache = _cache(tmp_path)
+        assert cache._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_lookups_do_not_write(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put_many("m", ["q"], [np.zeros(2)])
+        before = cache._db.total_changes
+        for _ in range(5):
+            cache.get_many("m", ["q", "other"])
+        assert cache._db.total_changes == before
+
+        cache.flush()
+        assert cache._db.total_changes > before
+        assert _cache(tmp_path).stats()["hits"] == 5
+
+    def test_usage_flushed_when_collected(self, tmp_path):
+        """Buffered counts reach the file when the cache goes away."""
+        cache = _cache(tmp_path)
+        cache.get_many("m", ["a"])
+        del cache
+        assert _cache(tmp_path).stats()["misses"] == 1
+
+    def test_retain_model_reads_when_nothing_to_drop(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put_many("m", ["q"], [np.zeros(2)])
+        before = cache._db.total_changes
+        cache.retain_model("m")
+        assert cache._db.total_changes == before
+
+
+class TestEviction:
+    """Verify size bounds and invalidation."""
+
+    def test_least_recently_used_evicted(self, tmp_path):
+        cache = _cache(tmp_path, max_entries=2)
+        cache.put_many("m", ["a"], [np.zeros(2)])
+        cache.put_many("m", ["b"], [np.zeros(2)])
+        cache.get_many("m", ["a"])  # Touch "a" so "b" is now the oldest.
+        cache.put_many("m", ["c"], [np.zeros(2)])
+
+        assert cache.stats()["entries"] == 2
+        hits = cache.get_many("m", ["a", "b", "c"])
+        assert [v is not None for v in hits] == [True, False, True]
+
+    def test_retain_model_drops_other_models(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put_many("old", ["q"], [np.zeros(2)])
+        cache.put_many("new", ["q"], [np.zeros(2)])
+        cache.retain_model("new")
+        assert cache.stats()["entries"] == 1
+
+
+class TestModelId:
+    """Verify embedding functions are identified by name and config."""
+
+    def test_config_changes_id(self):
+        class FakeEF:
+            def __init__(self, model):
+                self.model = model
+
+            def name(self):
+                return "fake"
+
+            def get_config(self):
+                return {"model": self.model}
+
+        assert embedding_model_id(FakeEF("a")) != embedding_model_id(FakeEF("b"))
+
+    def test_plain_function(self):
+        def embed(texts):
+            return []
+
+        assert embedding_model_id(embed).startswith("TestModelId.test_plain_function")
@@ -0,0 +1,114 @@
+"""Unit tests for the BM25 lexical index and rank fusion."""
+
+import sqlite3
+
+import pytest
+
+from memories.services.lexical_index import (
+    RRF_K,
+    LexicalIndex,
+    fts_query,
+    reciprocal_rank_fusion,
+)
+
+_META = {"agent": "", "personality": "", "project": "p", "type": "", "global_": False}
+
+
+@pytest.fixture()
+def index(tmp_path):
+    """Return an empty index in a temporary directory."""
+    return LexicalIndex(str(tmp_path / "lexical.sqlite"))
+
+
+class TestFtsQuery:
+    """Verify free text becomes a safe FTS5 expression."""
+
+    def test_identifiers_become_phrases(self):
+        assert fts_query("PROJ-1234 cli.py") == '"PROJ 1234" OR "cli py"'
+
+    def test_syntax_characters_dropped(self):
+        assert fts_query('search_memories "NEAR(" *') == '"search memories" OR "NEAR"'
+        assert fts_query("-- ...") == ""
+
+
+class TestLexicalIndex:
+    """Verify indexing, removal, ranking and scope filters."""
+
+    def test_exact_identifier_ranks_first(self, index):
+        index.put_many(
+            ["a", "b", "c"],
+            ["fixed PROJ-1234 in the parser", "PROJ roadmap for 2024", "unrelated note"],
+            [_META] * 3,
+        )
+        ranked = index.search("PROJ-1234", limit=10)
+        assert [id for id, _ in ranked] == ["a"]
+        assert ranked[0][1] > 0
+
+    def test_reindex_and_remove(self, index):
+        index.put_many(["a"], ["old words"], [_META])
+        index.put_many(["a"], ["new words"], [_META])
+        assert index.search("old", limit=10) == []
+        assert [id for id, _ in index.search("new", limit=10)] == ["a"]
+
+        index.remove_many(["a", "missing"])
+        assert index.search("new", limit=10) == []
+        assert index.stats() == {"documents": 0}
+
+    def test_scope_filters(self, index):
+        index.put_many(
+            ["a", "b"], ["deploy notes", "deploy notes"], [_META, {**_META, "project": "q"}]
+        )
+        where = {"deleted": False, "project": "q", "expires_at": {"$gte": 0}}
+        assert [id for id, _ in index.search("deploy", 10, where=where)] == ["b"]
+
+    def test_documents_and_patches(self, index):
+        """get_many returns content and metadata; patches merge into it."""
+        index.put_many(["a"], ["deploy notes"], [_META])
+        index.patch_many(["a", "missing"], [{"last_reinforced_at": "now"}] * 2)
+        assert index.get_many(["a", "missing"]) == {
+            "a": {
+                "id": "a",
+                "content": "deploy notes",
+                "metadata": {**_META, "last_reinforced_at": "now"},
+            }
+        }
+
+    def test_file_without_metadata_upgraded(self, tmp_path):
+        """Rows indexed before metadata was kept still rank but have no document."""
+        path = str(tmp_path / "lexical.sqlite")
+        db = sqlite3.connect(path)
+        db.executescript(
+            """
+            CREATE TABLE docs (
+                rowid INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, agent TEXT NOT NULL,
+                personality TEXT NOT NULL, project TEXT NOT NULL, type TEXT NOT NULL,
+                global_ INTEGER NOT NULL
+            );
+            CREATE VIRTUAL TABLE terms USING fts5(content);
+            INSERT INTO docs VALUES (1, 'old', '', '', 'p', '', 0);
+            INSERT INTO terms (rowid, content) VALUES (1, 'legacy note');
+            """
+        )
+        db.close()
+        index = LexicalIndex(path)
+        assert [id for id, _ in index.search("legacy", limit=10)] == ["old"]
+        assert index.get_many(["old"]) == {}
+
+    def test_paging(self, index):
+        index.put_many(["a", "b", "c"], ["x"] * 3, [_META] * 3)
+        first = index.search("x", limit=2)
+        rest = index.search("x", limit=2, offset=2)
+        assert len(first) == 2 and len(rest) == 1
+
+
+class TestReciprocalRankFusion:
+    """Verify rankings are fused by summed reciprocal rank."""
+
+    def test_fusion(self):
+        semantic = [{"id": "a", "distance": 0.1}, {"id": "b", "distance": 0.2}]
+        lexical = [{"id": "b", "distance": 9.0}, {"id": "c", "distance": 3.0}]
+        fused = reciprocal_rank_fusion([semantic, lexical], limit=2)
+        assert [hit["id"] for hit in fused] == ["b", "a"]
+        expected = round(1 / (RRF_K + 2) + 1 / (RRF_K + 1), 6)
+        assert fused[0]["score"] == expected
+        assert fused[1]["distance"] == 0.1  # Semantic hits keep their distance.
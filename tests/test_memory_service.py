@@ -10,12 +10,16 @@ from unittest.mock import ANY
 
 import pytest
 
-from memories.models import DecayPolicy, MemoryCreate
+from memories.models import ConsolidateKeep, DecayPolicy, ListSort, MemoryCreate, SearchMode
+from memories.services.lexical_index import LexicalIndex
 from memories.services.memory_service import (
+    DuplicateMemoryError,
     InvalidOperationError,
     MemoryNotFoundError,
     MemoryService,
+    content_hash,
 )
+from memories.services.result_cache import ResultCache
 
 
 # ---------------------------------------------------------------------------
@@ -72,6 +76,15 @@ class TestCreateMemory:
         assert stored_meta["decay_policy"] == "stable"
         assert stored_meta["deleted"] is False
 
+    def test_contextual_metadata_has_expiry(self, memory_service, mock_vector_store, settings):
+        """expires_at is one half-life after creation for decaying memories."""
+        memory_service.create_memory(
+            MemoryCreate(content="x", decay_policy=DecayPolicy.CONTEXTUAL)
+        )
+        meta = mock_vector_store.store.call_args[0][2]
+        created = datetime.fromisoformat(meta["created_at"]).timestamp()
+        assert meta["expires_at"] == created + settings.decay_half_life_hours * 3600
+
     def test_returns_memory_response_with_confidence_one(self, memory_service):
         """A freshly created memory always has confidence 1.0."""
         data = MemoryCreate(content="test", agent="bot", decay_policy=DecayPolicy.CONTEXTUAL)
@@ -83,6 +96,151 @@ class TestCreateMemory:
         assert result.decay_policy == DecayPolicy.CONTEXTUAL
 
 
+class TestDuplicatePolicy:
+    """Verify content-hash duplicate handling on create."""
+
+    def _service(self, mock_vector_store, settings, policy):
+        settings = settings.model_copy(update={"duplicate_policy": policy})
+        return MemoryService(store=mock_vector_store, settings=settings)
+
+    def _existing(self, decay_policy="stable", **meta):
+        return {
+            "id": "old",
+            "content": "Uses  pytest",
+            "metadata": {
+                **_make_metadata(decay_policy=decay_policy, **meta),
+                "content_hash": content_hash("uses pytest"),
+            },
+        }
+
+    def test_hash_normalizes_whitespace(self):
+        assert content_hash("  uses\n pytest ") == content_hash("uses pytest")
+        assert content_hash("uses pytest") != content_hash("Uses pytest")
+
+    def test_allow_skips_lookup(self, memory_service, mock_vector_store):
+        """The default policy stores the hash but never queries for duplicates."""
+        memory_service.create_memory(MemoryCreate(content="uses pytest"))
+        assert mock_vector_store.store.call_args[0][2]["content_hash"] == content_hash(
+            "uses pytest"
+        )
+        mock_vector_store.get_page.assert_not_called()
+
+    def test_reject_same_scope(self, mock_vector_store, settings):
+        service = self._service(mock_vector_store, settings, "reject")
+        mock_vector_store.get_page.return_value = ([self._existing()], None)
+        with pytest.raises(DuplicateMemoryError) as exc:
+            service.create_memory(MemoryCreate(content="uses pytest"))
+        assert exc.value.id == "old"
+        where = mock_vector_store.get_page.call_args[1]["where"]
+        assert where["content_hash"] == content_hash("uses pytest")
+        assert where["project"] == "" and where["deleted"] is False
+        mock_vector_store.store.assert_not_called()
+
+    def test_merge_returns_and_refreshes(self, mock_vector_store, settings):
+        """A reinforceable duplicate is reinforced and returned."""
+        service = self._service(mock_vector_store, settings, "merge")
+        mock_vector_store.get_page.return_value = (
+            [self._existing(decay_policy="reinforceable")], None
+        )
+        result = service.create_memory(
+            MemoryCreate(content="uses pytest", decay_policy=DecayPolicy.REINFORCEABLE)
+        )
+        assert result.id == "old" and result.confidence == 1.0
+        assert mock_vector_store.update_metadata.call_args[0][0] == "old"
+        mock_vector_store.store.assert_not_called()
+
+    def test_other_scope_reuses_embedding(self, mock_vector_store, settings):
+        """Identical text elsewhere is stored anew with the existing vector."""
+        service = self._service(mock_vector_store, settings, "merge")
+        other = {**self._existing(project="other"), "embedding": [0.1, 0.2],
+                 "embedding_model": "model-a"}
+        mock_vector_store.get_page.side_effect = [([], None), ([other], None)]
+        mock_vector_store.embedding_model.return_value = "model-a"
+
+        result = service.create_memory(MemoryCreate(content="uses pytest"))
+        assert result.id != "old"
+        ids, _, _, embeddings = mock_vector_store.upsert_many.call_args[0]
+        assert ids == [result.id] and embeddings == [[0.1, 0.2]]
+        mock_vector_store.store.assert_not_called()
+
+    def test_other_model_embeds_normally(self, mock_vector_store, settings):
+        service = self._service(mock_vector_store, settings, "merge")
+        other = {**self._existing(project="other"), "embedding": [0.1],
+                 "embedding_model": "model-a"}
+        mock_vector_store.get_page.side_effect = [([], None), ([other], None)]
+        mock_vector_store.embedding_model.return_value = "model-b"
+        service.create_memory(MemoryCreate(content="uses pytest"))
+        mock_vector_store.store.assert_called_once()
+
+    def test_batch_reject_stops_at_duplicate(self, mock_vector_store, settings):
+        """create_memories stores the records before a duplicate, then raises."""
+        service = self._service(mock_vector_store, settings, "reject")
+        mock_vector_store.get_page.return_value = ([self._existing()], None)
+        records = [MemoryCreate(content=c) for c in ("fresh", "uses pytest", "later")]
+
+        results = []
+        with pytest.raises(DuplicateMemoryError) as exc:
+            results.extend(service.create_memories(records))
+        assert exc.value.id == "old"
+        assert [r.content for r in results] == ["fresh"]
+        assert mock_vector_store.store_many.call_args[0][0] == [results[0].id]
+        mock_vector_store.get_page.assert_called_once()
+        where = mock_vector_store.get_page.call_args[1]["where"]
+        assert where["content_hash"] == {
+            "$in": sorted(content_hash(c) for c in ("fresh", "uses pytest", "later"))
+        }
+
+    def test_batch_merge(self, mock_vector_store, settings):
+        """Stored and in-batch duplicates both resolve to one memory."""
+        service = self._service(mock_vector_store, settings, "merge")
+        mock_vector_store.get_page.return_value = (
+            [self._existing(decay_policy="reinforceable")], None
+        )
+        records = [
+            MemoryCreate(content="uses pytest", decay_policy=DecayPolicy.REINFORCEABLE),
+            MemoryCreate(content="new"),
+            MemoryCreate(content="new"),
+        ]
+
+        results = list(service.create_memories(records))
+        assert results[0].id == "old"
+        assert results[1].id == results[2].id != "old"
+        assert mock_vector_store.store_many.call_args[0][0] == [results[1].id]
+        assert mock_vector_store.update_metadata_many.call_args[0][0] == ["old"]
+
+
+class TestCreateMemories:
+    """Verify bulk creation is chunked into store_many calls."""
+
+    def test_chunks_by_batch_size(self, memory_service, mock_vector_store, settings):
+        """Records are stored in batch_size chunks, one store_many per chunk."""
+        settings.batch_size = 2
+        records = [MemoryCreate(content=f"memory {i}") for i in range(5)]
+
+        results = list(memory_service.create_memories(records))
+
+        assert [r.content for r in results] == [f"memory {i}" for i in range(5)]
+        chunk_sizes = [len(c[0][0]) for c in mock_vector_store.store_many.call_args_list]
+        assert chunk_sizes == [2, 2, 1]
+        stored_ids = [i for c in mock_vector_store.store_many.call_args_list for i in c[0][0]]
+        assert stored_ids == [r.id for r in results]
+        mock_vector_store.store.assert_not_called()
+
+    def test_consumes_input_lazily(self, memory_service, mock_vector_store, settings):
+        """Only one chunk is pulled from the input before it is yielded."""
+        settings.batch_size = 2
+        pulled = []
+
+        def records():
+            for i in range(100):
+                pulled.append(i)
+                yield MemoryCreate(content=str(i))
+
+        first = next(memory_service.create_memories(records()))
+        assert first.content == "0"
+        assert len(pulled) == 2
+
+
 # ---------------------------------------------------------------------------
 # search_memories
 # ---------------------------------------------------------------------------
@@ -90,6 +248,17 @@ class TestCreateMemory:
 class TestSearchMemories:
     """Verify search filtering, confidence gating, and where-clause construction."""
 
+    def test_epoch_columns_used_without_iso_parsing(self, memory_service, mock_vector_store):
+        """created_at_ts / last_reinforced_at_ts drive confidence when present."""
+        now = datetime.now(timezone.utc).timestamp()
+        meta = _make_metadata(decay_policy="reinforceable", created_at="not-an-iso-string")
+        meta.update(created_at_ts=now - 720 * 3600, last_reinforced_at_ts=now - 360 * 3600)
+        mock_vector_store.search.return_value = [
+            {"id": "r", "content": "x", "metadata": meta, "distance": 0.1},
+        ]
+        result = memory_service.search_memories("query", min_confidence=0.0)
+        assert result.results[0].confidence == pytest.approx(0.5, abs=1e-3)
+
     def test_confidence_filtering(self, memory_service, mock_vector_store):
         """Results below min_confidence are excluded from the response."""
         now_iso = datetime.now(timezone.utc).isoformat()
@@ -122,6 +291,21 @@ class TestSearchMemories:
         where = call_args[1].get("where") or call_args[0][2]
         assert where["deleted"] is False
 
+    def test_confidence_pushed_down_as_expiry_bound(self, memory_service, mock_vector_store, settings):
+        """min_confidence becomes expires_at >= now + c * half_life."""
+        before = datetime.now(timezone.utc).timestamp()
+        memory_service.search_memories("query", min_confidence=0.5)
+        where = mock_vector_store.search.call_args[1]["where"]
+        bound = where["expires_at"]["$gte"]
+        offset = 0.5 * settings.decay_half_life_hours * 3600
+        assert before + offset <= bound <= datetime.now(timezone.utc).timestamp() + offset
+
+    def test_zero_confidence_skips_expiry_bound(self, memory_service, mock_vector_store):
+        """With min_confidence 0 un-migrated memories stay searchable."""
+        memory_service.search_memories("query", min_confidence=0.0)
+        where = mock_vector_store.search.call_args[1]["where"]
+        assert "expires_at" not in where
+
     def test_tag_filters_added(self, memory_service, mock_vector_store):
         """Non-empty tag filters are included in the where clause."""
         memory_service.search_memories("query", agent="bot", project="proj")
@@ -131,6 +315,232 @@ class TestSearchMemories:
         assert where["project"] == "proj"
 
 
+class TestSearchMany:
+    """Verify batched search groups results per query in one store call."""
+
+    def test_single_store_call_grouped_results(self, memory_service, mock_vector_store):
+        """All queries go to one search_many call; results keep query order."""
+        now_iso = datetime.now(timezone.utc).isoformat()
+        mock_vector_store.search_many.return_value = [
+            [{"id": "a", "content": "A", "metadata": _make_metadata(created_at=now_iso), "distance": 0.1}],
+            [],
+        ]
+
+        result = memory_service.search_many(["first", "second"], project="proj", limit=5)
+
+        mock_vector_store.search_many.assert_called_once()
+        call_args = mock_vector_store.search_many.call_args
+        assert call_args[0][0] == ["first", "second"]
+        assert call_args[1]["n_results"] == 5
+        where = call_args[1]["where"]
+        assert where["deleted"] is False and where["project"] == "proj"
+        assert [g.query for g in result.queries] == ["first", "second"]
+        assert [g.count for g in result.queries] == [1, 0]
+        assert result.queries[0].results[0].id == "a"
+
+    def test_confidence_filtering_per_query(self, memory_service, mock_vector_store):
+        """Low-confidence hits are dropped in every group."""
+        stale = _make_metadata(created_at="2020-01-01T00:00:00+00:00", decay_policy="contextual")
+        mock_vector_store.search_many.return_value = [
+            [{"id": "old", "content": "x", "metadata": stale, "distance": 0.1}],
+        ]
+        result = memory_service.search_many(["q"], min_confidence=0.3)
+        assert result.queries[0].count == 0
+
+
+class TestResultCache:
+    """Verify searches are served from the result cache until a write."""
+
+    @pytest.fixture()
+    def cached_service(self, mock_vector_store, settings, tmp_path):
+        cache = ResultCache(str(tmp_path / "results.sqlite"), ttl_seconds=60, max_entries=10)
+        return MemoryService(store=mock_vector_store, settings=settings, result_cache=cache)
+
+    def test_repeat_search_skips_store(self, cached_service, mock_vector_store):
+        """An identical search is answered without a second store query."""
+        now_iso = datetime.now(timezone.utc).isoformat()
+        mock_vector_store.search.return_value = [
+            {"id": "a", "content": "A", "metadata": _make_metadata(created_at=now_iso), "distance": 0.1},
+        ]
+        first = cached_service.search_memories("query", min_confidence=0.3)
+        second = cached_service.search_memories("query", min_confidence=0.32)
+
+        assert mock_vector_store.search.call_count == 1
+        assert [r.id for r in second.results] == [r.id for r in first.results] == ["a"]
+
+    def test_confidence_recomputed_from_cached_timestamps(self, cached_service, mock_vector_store):
+        """Cached hits still pass through exact confidence gating."""
+        half_old = datetime.fromtimestamp(
+            datetime.now(timezone.utc).timestamp() - 360 * 3600, timezone.utc
+        ).isoformat()
+        mock_vector_store.search.return_value = [
+            {"id": "h", "content": "H", "metadata": _make_metadata(created_at=half_old, decay_policy="contextual"), "distance": 0.1},
+        ]
+        assert cached_service.search_memories("q", min_confidence=0.5).count == 1
+        assert cached_service.search_memories("q", min_confidence=0.52).count == 0
+        assert mock_vector_store.search.call_count == 1
+
+    def test_content_free_hits_cached_separately(self, cached_service, mock_vector_store):
+        """A search without content never answers one that needs it."""
+        now_iso = datetime.now(timezone.utc).isoformat()
+        mock_vector_store.search.return_value = [
+            {"id": "a", "content": "", "metadata": _make_metadata(created_at=now_iso), "distance": 0.1},
+        ]
+        cached_service.search_memories("q", include_content=False)
+        assert mock_vector_store.search.call_args[1]["include_content"] is False
+        cached_service.search_memories("q")
+        assert mock_vector_store.search.call_count == 2
+        assert mock_vector_store.search.call_args[1]["include_content"] is True
+
+    def test_bucket_floor_pushed_down(self, cached_service, mock_vector_store, settings):
+        """The store is queried with the bucket's lower edge."""
+        cached_service.search_memories("q", min_confidence=0.33)
+        bound = mock_vector_store.search.call_args[1]["where"]["expires_at"]["$gte"]
+        offset = 0.3 * settings.decay_half_life_hours * 3600
+        assert bound == pytest.approx(datetime.now(timezone.utc).timestamp() + offset, abs=5)
+
+    def test_writes_invalidate(self, cached_service, mock_vector_store):
+        """create, reinforce and delete each force a fresh store query."""
+        cached_service.search_memories("q")
+        cached_service.create_memory(MemoryCreate(content="new"))
+        cached_service.search_memories("q")
+
+        mock_vector_store.get.return_value = {
+            "id": "x", "content": "X", "metadata": _make_metadata(decay_policy="reinforceable"),
+        }
+        cached_service.reinforce_memory("x")
+        cached_service.search_memories("q")
+        cached_service.delete_memory("x")
+        cached_service.search_memories("q")
+
+        assert mock_vector_store.search.call_count == 4
+
+    def test_search_many_fetches_only_misses(self, cached_service, mock_vector_store):
+        """Queries already cached are not sent to the store again."""
+        mock_vector_store.search.return_value = []
+        mock_vector_store.search_many.return_value = [[]]
+        cached_service.search_memories("cached")
+        cached_service.search_many(["cached", "fresh"])
+        assert mock_vector_store.search_many.call_args[0][0] == ["fresh"]
+
+    def test_status_reports_cache(self, cached_service):
+        """Status includes the cache's generation and counters."""
+        cached_service.search_memories("q")
+        stats = cached_service.get_status()["result_cache"]
+        assert stats["misses"] == 1 and stats["entries"] == 1
+
+
+class TestLexicalSearch:
+    """Verify lexical and hybrid search over the BM25 index."""
+
+    @pytest.fixture()
+    def docs(self, mock_vector_store):
+        """Stored documents; get_many serves them by ID."""
+        docs = {}
+        mock_vector_store.get_many.side_effect = lambda ids, include_content=True: [docs.get(id) for id in ids]
+        return docs
+
+    @pytest.fixture()
+    def indexed_service(self, mock_vector_store, settings, tmp_path, docs):
+        index = LexicalIndex(str(tmp_path / "lexical.sqlite"))
+        return MemoryService(store=mock_vector_store, settings=settings, lexical_index=index)
+
+    def _create(self, service, docs, content, **kwargs):
+        created = service.create_memory(MemoryCreate(content=content, **kwargs))
+        _, content, metadata = service._store.store.call_args[0]
+        docs[created.id] = {"id": created.id, "content": content, "metadata": metadata}
+        return created
+
+    def test_lexical_skips_embedding(self, indexed_service, mock_vector_store, docs):
+        """Lexical mode finds the identifier without a vector search."""
+        target = self._create(indexed_service, docs, "Fixed PROJ-1234 in cli.py")
+        self._create(indexed_service, docs, "PROJ planning notes")
+
+        result = indexed_service.search_memories("PROJ-1234", mode=SearchMode.LEXICAL)
+        assert [r.id for r in result.results] == [target.id]
+        assert result.results[0].score > 0
+        assert result.results[0].similarity is None
+        mock_vector_store.search.assert_not_called()
+
+    def test_lexical_reads_index_not_store(self, indexed_service, mock_vector_store, docs):
+        """Results are built from the index, including reinforcements."""
+        created = self._create(
+            indexed_service, docs, "cache warmup steps", decay_policy=DecayPolicy.REINFORCEABLE
+        )
+        mock_vector_store.get.return_value = docs[created.id]
+        reinforced = indexed_service.reinforce_memory(created.id)["reinforced_at"]
+
+        result = indexed_service.search_memories(
+            "warmup", mode=SearchMode.LEXICAL, include_content=False
+        )
+        assert [r.id for r in result.results] == [created.id]
+        assert result.results[0].last_reinforced_at == reinforced
+        assert result.results[0].content == ""
+        mock_vector_store.get_many.assert_not_called()
+
+    def test_rows_without_metadata_read_from_store(self, indexed_service, mock_vector_store, docs):
+        """Memories indexed before metadata was kept fall back to get_many."""
+        old = self._create(indexed_service, docs, "legacy rollout")
+        new = self._create(indexed_service, docs, "rollout checklist")
+        indexed_service._lexical_index._db.execute(
+            "UPDATE docs SET metadata = NULL WHERE id = ?", (old.id,)
+        )
+        result = indexed_service.search_memories("rollout", mode=SearchMode.LEXICAL)
+        assert {r.id for r in result.results} == {old.id, new.id}
+        mock_vector_store.get_many.assert_called_once_with([old.id], True)
+
+    def test_lexical_applies_filters(self, indexed_service, docs):
+        self._create(indexed_service, docs, "deploy runbook", project="a")
+        other = self._create(indexed_service, docs, "deploy runbook", project="b")
+        result = indexed_service.search_memories(
+            "deploy", project="b", mode=SearchMode.LEXICAL
+        )
+        assert [r.id for r in result.results] == [other.id]
+
+    def test_delete_unindexes(self, indexed_service, mock_vector_store, docs):
+        created = self._create(indexed_service, docs, "temporary scratch")
+        mock_vector_store.get.return_value = docs[created.id]
+        indexed_service.delete_memory(created.id)
+        result = indexed_service.search_memories("scratch", mode=SearchMode.LEXICAL)
+        assert result.count == 0
+
+    def test_hybrid_fuses_rankings(self, indexed_service, mock_vector_store, docs):
+        """A memory found by both rankings outranks one found by either."""
+        both = self._create(indexed_service, docs, "rotate token weekly")
+        lexical_only = self._create(indexed_service, docs, "token bucket")
+        semantic_only = self._create(indexed_service, docs, "credential hygiene")
+        mock_vector_store.search.return_value = [
+            {**docs[semantic_only.id], "distance": 0.1},
+            {**docs[both.id], "distance": 0.2},
+        ]
+        result = indexed_service.search_memories("rotate token", mode=SearchMode.HYBRID)
+        assert [r.id for r in result.results][0] == both.id
+        assert {r.id for r in result.results} == {both.id, lexical_only.id, semantic_only.id}
+        by_id = {r.id: r for r in result.results}
+        assert by_id[both.id].similarity == 0.2 and by_id[lexical_only.id].similarity is None
+        assert all(r.score > 0 for r in result.results)
+
+    def test_search_many_lexical(self, indexed_service, docs):
+        first = self._create(indexed_service, docs, "alpha")
+        second = self._create(indexed_service, docs, "beta")
+        result = indexed_service.search_many(["alpha", "beta"], mode=SearchMode.LEXICAL)
+        assert [[r.id for r in q.results] for q in result.queries] == [[first.id], [second.id]]
+
+    def test_migrate_backfills_index(self, indexed_service, mock_vector_store):
+        mock_vector_store.get_page.return_value = (
+            [
+                {"id": "old", "content": "legacy note", "metadata": _make_metadata()},
+                {"id": "gone", "content": "legacy", "metadata": _make_metadata(deleted=True)},
+            ],
+            None,
+        )
+        assert indexed_service.migrate_metadata()["indexed"] == 1
+
+    def test_without_index_rejected(self, memory_service):
+        with pytest.raises(InvalidOperationError):
+            memory_service.search_memories("q", mode=SearchMode.LEXICAL)
+
+
 # ---------------------------------------------------------------------------
 # get_memory
 # ---------------------------------------------------------------------------
@@ -170,6 +580,71 @@ class TestGetMemory:
 # reinforce_memory
 # ---------------------------------------------------------------------------
 
+class TestListMemories:
+    """Verify metadata listing pages without embedding anything."""
+
+    def _docs(self):
+        return [
+            {"id": f"m{day}", "content": f"day {day}", "metadata": _make_metadata(
+                decay_policy="contextual", created_at=f"2025-06-0{day}T00:00:00+00:00"
+            )}
+            for day in (3, 1, 4, 2, 5)
+        ]
+
+    def test_stored_order_passes_store_cursor_through(self, memory_service, mock_vector_store):
+        """Store order is one get_page; its cursor round-trips opaquely."""
+        docs = self._docs()
+        mock_vector_store.get_page.side_effect = [(docs[:2], "2"), (docs[2:4], None)]
+
+        first = memory_service.list_memories(project="p", limit=2)
+        assert [r.id for r in first.results] == ["m3", "m1"]
+        assert first.next_cursor and first.next_cursor != "2"
+        assert mock_vector_store.get_page.call_args[1]["where"] == {"deleted": False, "project": "p"}
+
+        second = memory_service.list_memories(project="p", limit=2, cursor=first.next_cursor)
+        assert mock_vector_store.get_page.call_args[1]["cursor"] == "2"
+        assert second.next_cursor is None
+        mock_vector_store.search.assert_not_called()
+        mock_vector_store.search_many.assert_not_called()
+
+    def test_created_at_pages_newest_first(self, memory_service, mock_vector_store):
+        """Sorted listings scan every page and resume after the last entry."""
+        docs = self._docs()
+        mock_vector_store.get_page.side_effect = lambda **kw: (
+            (docs[:3], "3") if kw["cursor"] is None else (docs[3:], None)
+        )
+
+        ids, cursor = [], None
+        while True:
+            page = memory_service.list_memories(
+                sort=ListSort.CREATED_AT, limit=2, cursor=cursor
+            )
+            ids += [r.id for r in page.results]
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        assert ids == ["m5", "m4", "m3", "m2", "m1"]
+
+    def test_confidence_sort_most_confident_first(self, memory_service, mock_vector_store):
+        """Stable memories (confidence 1.0) come before decaying ones."""
+        docs = self._docs()
+        docs.append({"id": "s", "content": "s", "metadata": _make_metadata()})
+        mock_vector_store.get_page.return_value = (docs, None)
+
+        page = memory_service.list_memories(sort=ListSort.CONFIDENCE, limit=3)
+        assert [r.id for r in page.results][0] == "s"
+        assert page.next_cursor is not None
+
+    def test_cursor_from_other_sort_rejected(self, memory_service, mock_vector_store):
+        """A cursor only resumes the sort that issued it."""
+        mock_vector_store.get_page.return_value = (self._docs(), "5")
+        cursor = memory_service.list_memories(limit=5).next_cursor
+        with pytest.raises(InvalidOperationError):
+            memory_service.list_memories(sort=ListSort.CREATED_AT, cursor=cursor)
+        with pytest.raises(InvalidOperationError):
+            memory_service.list_memories(cursor="not a cursor")
+
+
 class TestReinforceMemory:
     """Verify reinforce logic and policy validation."""
 
@@ -183,6 +658,9 @@ class TestReinforceMemory:
         result = memory_service.reinforce_memory("r1")
         assert result["confidence"] == 1.0
         mock_vector_store.update_metadata.assert_called_once()
+        update = mock_vector_store.update_metadata.call_args[0][1]
+        reinforced = datetime.fromisoformat(update["last_reinforced_at"]).timestamp()
+        assert update["expires_at"] == reinforced + 720 * 3600
 
     def test_stable_raises_invalid_operation(self, memory_service, mock_vector_store):
         """Cannot reinforce a stable memory."""
@@ -246,6 +724,118 @@ class TestDeleteMemory:
             memory_service.delete_memory("nonexistent")
 
 
+# ---------------------------------------------------------------------------
+# bulk reinforce / delete
+# ---------------------------------------------------------------------------
+
+class TestBulkOperations:
+    """Verify bulk operations use one get_many and one update_metadata_many."""
+
+    def test_reinforce_many_reports_per_id(self, memory_service, mock_vector_store):
+        """Valid IDs are updated together; invalid ones are reported inline."""
+        mock_vector_store.get_many.return_value = [
+            {"id": "r1", "content": "a", "metadata": _make_metadata(decay_policy="reinforceable")},
+            {"id": "s1", "content": "b", "metadata": _make_metadata(decay_policy="stable")},
+            None,
+        ]
+        report = memory_service.reinforce_memories(["r1", "s1", "gone", "r1"])
+
+        mock_vector_store.get_many.assert_called_once_with(["r1", "s1", "gone"])
+        ids, patches = mock_vector_store.update_metadata_many.call_args[0]
+        assert ids == ["r1"] and "last_reinforced_at" in patches[0]
+        assert report["succeeded"] == 1 and report["failed"] == 2
+        assert [r["id"] for r in report["results"]] == ["r1", "s1", "gone"]
+        assert "stable decay policy" in report["results"][1]["error"]
+        assert report["results"][2]["error"] == "Memory 'gone' not found"
+
+    def test_delete_many_skips_already_deleted(self, memory_service, mock_vector_store):
+        """Already-deleted memories fail without blocking the rest."""
+        mock_vector_store.get_many.return_value = [
+            {"id": "d1", "content": "a", "metadata": _make_metadata()},
+            {"id": "d2", "content": "b", "metadata": _make_metadata(deleted=True)},
+        ]
+        report = memory_service.delete_memories(["d1", "d2"])
+
+        mock_vector_store.update_metadata_many.assert_called_once_with(
+            ["d1"], [{"deleted": True}]
+        )
+        assert report["results"][0] == {"id": "d1", "deleted": True}
+        assert "already deleted" in report["results"][1]["error"]
+
+    def test_nothing_valid_means_no_update(self, memory_service, mock_vector_store):
+        """No write happens when every ID fails validation."""
+        mock_vector_store.get_many.return_value = [None]
+        report = memory_service.delete_memories(["x"])
+        mock_vector_store.update_metadata_many.assert_not_called()
+        assert report["failed"] == 1
+
+    def test_empty_selection(self, memory_service, mock_vector_store):
+        """An empty ID list makes no store calls."""
+        assert memory_service.reinforce_memories([]) == {
+            "results": [], "succeeded": 0, "failed": 0,
+        }
+        mock_vector_store.get_many.assert_not_called()
+
+
+class TestReinforceHits:
+    """Verify search-time reinforcement is queued and flushed in one batch."""
+
+    @staticmethod
+    def _hits() -> list[dict]:
+        now_iso = datetime.now(timezone.utc).isoformat()
+        return [
+            {
+                "id": "r1",
+                "content": "a",
+                "metadata": _make_metadata(decay_policy="reinforceable", created_at=now_iso),
+                "distance": 0.1,
+            },
+            {
+                "id": "s1",
+                "content": "b",
+                "metadata": _make_metadata(decay_policy="stable", created_at=now_iso),
+                "distance": 0.2,
+            },
+        ]
+
+    def test_search_queues_without_writing(self, memory_service, mock_vector_store):
+        """The search itself makes no metadata writes."""
+        mock_vector_store.search.return_value = self._hits()
+        memory_service.search_memories("query", reinforce_hits=True)
+        mock_vector_store.update_metadata.assert_not_called()
+        mock_vector_store.update_metadata_many.assert_not_called()
+
+    def test_flush_writes_reinforceable_hits_once(self, memory_service, mock_vector_store):
+        """Repeated hits across searches collapse into one batched update."""
+        mock_vector_store.search.return_value = self._hits()
+        mock_vector_store.search_many.return_value = [self._hits(), self._hits()]
+        memory_service.search_memories("query", reinforce_hits=True)
+        memory_service.search_many(["a", "b"], reinforce_hits=True)
+
+        assert memory_service.flush_reinforcements() == 1
+        ids, patches = mock_vector_store.update_metadata_many.call_args[0]
+        assert ids == ["r1"]
+        assert set(patches[0]) == {"last_reinforced_at", "last_reinforced_at_ts", "expires_at"}
+        assert memory_service.flush_reinforcements() == 0
+        mock_vector_store.update_metadata_many.assert_called_once()
+
+    def test_due_only_waits_for_delay(self, memory_service, mock_vector_store, settings):
+        """The idle-loop flush leaves fresh entries queued."""
+        settings.reinforce_flush_seconds = 3600
+        service = MemoryService(store=mock_vector_store, settings=settings)
+        mock_vector_store.search.return_value = self._hits()
+        service.search_memories("query", reinforce_hits=True)
+
+        assert service.flush_reinforcements(due_only=True) == 0
+        assert service.flush_reinforcements() == 1
+
+    def test_off_by_default(self, memory_service, mock_vector_store):
+        """Plain searches queue nothing."""
+        mock_vector_store.search.return_value = self._hits()
+        memory_service.search_memories("query")
+        assert memory_service.flush_reinforcements() == 0
+
+
 # ---------------------------------------------------------------------------
 # get_status
 # ---------------------------------------------------------------------------
@@ -267,3 +857,246 @@ class TestGetStatus:
         result = memory_service.get_status()
         assert result["status"] == "unhealthy"
         assert result["count"] == 0
+
+
+# ---------------------------------------------------------------------------
+# compact
+# ---------------------------------------------------------------------------
+
+class TestCompact:
+    """Verify dead memories are selected by the store and purged in pages."""
+
+    def _pages(self):
+        dead = {**_make_metadata(decay_policy="contextual"), "expires_at": 0.0}
+        return [
+            ([{"id": "d", "content": "D", "metadata": _make_metadata(deleted=True)},
+              {"id": "e", "content": "E", "metadata": dead}], "2"),
+            ([{"id": "f", "content": "F", "metadata": dead}], None),
+        ]
+
+    def test_where_selects_deleted_or_expired_past_grace(self, memory_service, mock_vector_store):
+        """Candidates are soft-deleted or expired more than grace_hours ago."""
+        before = datetime.now(timezone.utc).timestamp()
+        memory_service.compact(grace_hours=24)
+        where = mock_vector_store.get_page.call_args[1]["where"]
+        deleted_clause, expired_clause = where["$or"]
+        assert deleted_clause == {"deleted": True}
+        assert expired_clause["expires_at"]["$lt"] == pytest.approx(before - 24 * 3600, abs=5)
+
+    def test_deletes_each_page_and_restarts_scan(self, memory_service, mock_vector_store):
+        """Every page is removed with delete_many; scanning restarts at the top."""
+        mock_vector_store.get_page.side_effect = self._pages()
+        archived = []
+        result = memory_service.compact(archive=archived.extend)
+
+        assert result == {"reclaimed": 3, "deleted": 1, "decayed": 2, "dry_run": False}
+        assert [c[0][0] for c in mock_vector_store.delete_many.call_args_list] == [["d", "e"], ["f"]]
+        assert [c[1]["cursor"] for c in mock_vector_store.get_page.call_args_list] == [None, None]
+        assert [doc["id"] for doc in archived] == ["d", "e", "f"]
+
+    def test_dry_run_only_counts(self, memory_service, mock_vector_store):
+        """A dry run pages with cursors and deletes nothing."""
+        mock_vector_store.get_page.side_effect = self._pages()
+        archived = []
+        result = memory_service.compact(dry_run=True, archive=archived.extend)
+
+        assert result["reclaimed"] == 3 and result["dry_run"] is True
+        mock_vector_store.delete_many.assert_not_called()
+        assert [c[1]["cursor"] for c in mock_vector_store.get_page.call_args_list] == [None, "2"]
+        assert archived == []
+
+
+class TestConsolidate:
+    """Verify near-duplicates are clustered per project and merged."""
+
+    def _docs(self):
+        def doc(id, project, embedding, created, reinforced=""):
+            meta = _make_metadata(
+                project=project,
+                decay_policy="reinforceable",
+                created_at=created,
+                last_reinforced_at=reinforced,
+            )
+            return {"id": id, "content": id, "metadata": meta, "embedding": embedding}
+
+        return [
+            doc("old", "p", [1.0, 0.0], "2025-01-01T00:00:00+00:00", "2025-06-01T00:00:00+00:00"),
+            doc("new", "p", [0.999, 0.02], "2025-03-01T00:00:00+00:00"),
+            doc("other", "p", [0.0, 1.0], "2025-02-01T00:00:00+00:00"),
+            # Same vector as "old" but a different project: never merged.
+            doc("elsewhere", "q", [1.0, 0.0], "2025-04-01T00:00:00+00:00"),
+        ]
+
+    def _serve_pages(self, mock_vector_store):
+        docs = self._docs()
+
+        def get_page(
+            where=None, limit=100, cursor=None, include_embeddings=False, include_content=True
+        ):
+            project = (where or {}).get("project")
+            page = [d for d in docs if project is None or d["metadata"]["project"] == project]
+            return page, None
+
+        mock_vector_store.get_page.side_effect = get_page
+
+    def test_keeps_newest_and_soft_deletes_rest(self, memory_service, mock_vector_store):
+        """Each project is scanned with embeddings; duplicates are soft-deleted."""
+        self._serve_pages(mock_vector_store)
+        result = memory_service.consolidate(threshold=0.99)
+
+        assert result["clusters"] == 1 and result["removed"] == 1
+        assert result["scanned"] == 4
+        assert result["groups"] == [{"project": "p", "keep": "new", "remove": ["old"]}]
+        mock_vector_store.update_metadata_many.assert_called_once_with(
+            ["old"], [{"deleted": True}]
+        )
+        wheres = [c[1]["where"] for c in mock_vector_store.get_page.call_args_list]
+        assert {"project": "p", "deleted": False} in wheres
+        assert all(c[1]["include_embeddings"] for c in mock_vector_store.get_page.call_args_list[1:])
+
+    def test_keep_reinforced_and_hard_delete(self, memory_service, mock_vector_store):
+        """--keep reinforced prefers the recently reinforced memory; hard deletes."""
+        self._serve_pages(mock_vector_store)
+        result = memory_service.consolidate(
+            threshold=0.99, project="p", keep=ConsolidateKeep.REINFORCED, hard_delete=True
+        )
+
+        assert result["groups"] == [{"project": "p", "keep": "old", "remove": ["new"]}]
+        mock_vector_store.delete_many.assert_called_once_with(["new"])
+        mock_vector_store.update_metadata_many.assert_not_called()
+
+    def test_dry_run_changes_nothing(self, memory_service, mock_vector_store):
+        """A dry run reports clusters without writing."""
+        self._serve_pages(mock_vector_store)
+        result = memory_service.consolidate(threshold=0.99, dry_run=True)
+
+        assert result["removed"] == 1 and result["dry_run"] is True
+        mock_vector_store.update_metadata_many.assert_not_called()
+        mock_vector_store.delete_many.assert_not_called()
+
+    def test_default_threshold_from_settings(self, mock_vector_store, settings):
+        """Without a threshold, CONSOLIDATE_THRESHOLD decides."""
+        self._serve_pages(mock_vector_store)
+        settings.consolidate_threshold = 0.5
+        service = MemoryService(store=mock_vector_store, settings=settings)
+        result = service.consolidate(project="p", dry_run=True)
+        assert result["removed"] == 1
+
+
+class TestExport:
+    """Verify export streams pages with filters pushed down."""
+
+    def test_streams_every_page(self, memory_service, mock_vector_store):
+        """Records are yielded page by page, following the cursor."""
+        mock_vector_store.get_page.side_effect = [
+            ([{"id": "a", "content": "", "metadata": {}}], "1"),
+            ([{"id": "b", "content": "", "metadata": {}}], None),
+        ]
+        records = memory_service.export_memories(project="p", include_embeddings=True)
+        mock_vector_store.get_page.assert_not_called()  # Lazy until iterated.
+
+        assert [r["id"] for r in records] == ["a", "b"]
+        first, second = mock_vector_store.get_page.call_args_list
+        assert first[1]["where"] == {"deleted": False, "project": "p"}
+        assert first[1]["include_embeddings"] is True
+        assert second[1]["cursor"] == "1"
+
+    def test_include_deleted_drops_filter(self, memory_service, mock_vector_store):
+        """With no filters at all the store scans everything."""
+        list(memory_service.export_memories(include_deleted=True))
+        assert mock_vector_store.get_page.call_args[1]["where"] is None
+
+
+class TestImport:
+    """Verify import upserts in batches and reuses same-model embeddings."""
+
+    def test_reuses_matching_embeddings(self, memory_service, mock_vector_store, settings):
+        settings.batch_size = 2
+        mock_vector_store.embedding_model.return_value = "model-a"
+        records = [
+            {"id": "a", "content": "A", "metadata": {}, "embedding": [1.0], "embedding_model": "model-a"},
+            {"id": "b", "content": "B", "metadata": {}, "embedding": [2.0], "embedding_model": "model-b"},
+            {"id": "c", "content": "C", "metadata": {}},
+        ]
+        batches = list(memory_service.import_memories(records))
+
+        assert batches == [
+            {"imported": 2, "reused_embeddings": 1},
+            {"imported": 1, "reused_embeddings": 0},
+        ]
+        first = mock_vector_store.upsert_many.call_args_list[0][0]
+        assert first == (["a", "b"], ["A", "B"], [{}, {}], [[1.0], None])
+
+    def test_duplicate_ids_collapse(self, memory_service, mock_vector_store):
+        """The last record for an ID wins; every input record is counted."""
+        mock_vector_store.embedding_model.return_value = ""
+        records = [
+            {"id": "a", "content": "old", "metadata": {}},
+            {"id": "a", "content": "new", "metadata": {}},
+        ]
+        assert list(memory_service.import_memories(records))[0]["imported"] == 2
+        ids, contents, _, _ = mock_vector_store.upsert_many.call_args[0]
+        assert (ids, contents) == (["a"], ["new"])
+
+
+# ---------------------------------------------------------------------------
+# migrate_metadata
+# ---------------------------------------------------------------------------
+
+class TestMigrateMetadata:
+    """Verify derived-metadata backfill pages through the store."""
+
+    def test_backfills_missing_expiry_page_by_page(self, memory_service, mock_vector_store):
+        """Every page is written back with one update_metadata_many call."""
+        legacy = _make_metadata(decay_policy="contextual")
+        current = {
+            **_make_metadata(),
+            "expires_at": 253402300799.0,
+            "created_at_ts": datetime.fromisoformat("2025-06-01T12:00:00+00:00").timestamp(),
+            "last_reinforced_at_ts": 0.0,
+            "content_hash": content_hash(""),
+        }
+        mock_vector_store.get_page.side_effect = [
+            ([{"id": "a", "content": "", "metadata": legacy}], "1"),
+            ([{"id": "b", "content": "", "metadata": current}], None),
+        ]
+
+        result = memory_service.migrate_metadata()
+
+        assert result == {"scanned": 2, "updated": 1}
+        assert mock_vector_store.get_page.call_args_list[1][1]["cursor"] == "1"
+        ids, metadatas = mock_vector_store.update_metadata_many.call_args[0]
+        created = datetime.fromisoformat(legacy["created_at"]).timestamp()
+        assert ids == ["a"]
+        assert metadatas == [{
+            "created_at_ts": created,
+            "last_reinforced_at_ts": 0.0,
+            "expires_at": created + 720 * 3600,
+            "content_hash": content_hash(""),
+        }]
+
+    def test_first_gated_search_migrates_legacy_store(self, memory_service, mock_vector_store):
+        """Memories without expires_at are backfilled before filtering on it."""
+        legacy = {"id": "a", "content": "", "metadata": _make_metadata()}
+        mock_vector_store.get_page.return_value = ([legacy], None)
+
+        memory_service.search_memories("anything")
+        memory_service.search_memories("anything")
+
+        assert mock_vector_store.update_metadata_many.call_args[0][0] == ["a"]
+        # One probe plus one migration page; the second search skips both.
+        assert mock_vector_store.get_page.call_count == 2
+
+    def test_marker_skips_check_in_later_processes(self, mock_vector_store, settings):
+        MemoryService(store=mock_vector_store, settings=settings).search_memories("q")
+        mock_vector_store.get_page.reset_mock()
+
+        MemoryService(store=mock_vector_store, settings=settings).search_memories("q")
+        MemoryService(store=mock_vector_store, settings=settings).list_memories(
+            min_confidence=0.5
+        )
+        mock_vector_store.get_page.assert_called_once()  # The listing itself.
+
+    def test_ungated_reads_do_not_check(self, memory_service, mock_vector_store):
+        memory_service.search_memories("q", min_confidence=0.0)
+        mock_vector_store.get_page.assert_not_called()
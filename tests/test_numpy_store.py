@@ -0,0 +1,202 @@
+"""NumPy-specific tests for NumpyStore (operator filters, persistence).
+
+The VectorStore contract shared with ChromaDB is covered by
+``test_vector_store.py``.  Runs without Docker: the ``numpy_store``
+fixture uses a deterministic hashing embedder and a temporary directory.
+"""
+
+import fcntl
+import threading
+
+from benchmarks.backends import hashing_embedding_function
+from memories.stores import numpy_store as numpy_store_module
+from memories.stores.embedding_cache import EmbeddingCache
+from memories.stores.numpy_store import NumpyStore
+
+
+class TestSearch:
+    """Verify similarity search and metadata filtering."""
+
+    def test_search_with_chromadb_operators(self, numpy_store):
+        """``$and`` and numeric comparison operators are understood."""
+        numpy_store.store("o1", "doc", {"deleted": False, "rank": 1.0})
+        numpy_store.store("o2", "doc", {"deleted": False, "rank": 5.0})
+        numpy_store.store("o3", "doc", {"deleted": True, "rank": 9.0})
+
+        results = numpy_store.search(
+            "doc",
+            n_results=10,
+            where={"$and": [{"deleted": False}, {"rank": {"$gt": 2.0}}]},
+        )
+        assert [r["id"] for r in results] == ["o2"]
+
+    def test_bool_filter_does_not_match_ints(self, numpy_store):
+        """``False`` and ``0`` are distinct, as in ChromaDB."""
+        numpy_store.store("b1", "doc", {"flag": False})
+        numpy_store.store("b2", "doc", {"flag": 0})
+
+        results = numpy_store.search("doc", n_results=10, where={"flag": False})
+        assert [r["id"] for r in results] == ["b1"]
+
+class TestUpsert:
+    """Verify upsert replaces rows and reuses given embeddings."""
+
+    def test_replaces_whole_metadata(self, numpy_store):
+        """Keys missing from the new metadata are dropped, not merged."""
+        numpy_store.store("u1", "old text", {"a": 1, "b": 2})
+        numpy_store.upsert_many(["u1"], ["new text"], [{"a": 3}])
+        assert numpy_store.get("u1") == {"id": "u1", "content": "new text", "metadata": {"a": 3}}
+
+    def test_given_embedding_not_recomputed(self, numpy_store):
+        """Only rows without an embedding reach the model."""
+        vector = [0.0] * 384
+        vector[7] = 2.0
+        calls = []
+        embed = numpy_store._embed
+        numpy_store._embed = lambda texts: calls.append(texts) or embed(texts)
+
+        numpy_store.upsert_many(["v1", "v2"], ["given", "computed"], [{}, {}], [vector, None])
+        assert calls == [["computed"]]
+        assert numpy_store._matrix[numpy_store._index["v1"]][7] == 1.0  # Normalized.
+
+
+class TestDelete:
+    """Verify permanent document deletion."""
+
+    def test_delete_keeps_other_rows_searchable(self, numpy_store):
+        """Compacting the matrix preserves the remaining documents."""
+        numpy_store.store("k1", "alpha", {"n": "1"})
+        numpy_store.store("k2", "beta", {"n": "2"})
+        numpy_store.delete("k1")
+
+        results = numpy_store.search("beta", n_results=5)
+        assert [r["id"] for r in results] == ["k2"]
+        assert results[0]["metadata"]["n"] == "2"
+
+
+class TestPersistence:
+    """Verify the collection survives process restarts."""
+
+    def test_reload_from_disk(self, numpy_store, tmp_path, settings):
+        """A fresh instance sees documents written by another."""
+        numpy_store.store("p1", "persisted memory", {"agent": "bot"})
+        numpy_store.update_metadata("p1", {"deleted": True})
+
+        reopened = NumpyStore(
+            path=str(tmp_path),
+            collection_name=settings.collection_name,
+            embedding_function=hashing_embedding_function,
+        )
+        result = reopened.get("p1")
+        assert result["content"] == "persisted memory"
+        assert result["metadata"] == {"agent": "bot", "deleted": True}
+        assert reopened.search("persisted", n_results=1)[0]["id"] == "p1"
+
+    def test_sees_writes_from_other_instance(self, numpy_store, tmp_path, settings):
+        """An open instance picks up changes saved by a second instance."""
+        other = NumpyStore(
+            path=str(tmp_path),
+            collection_name=settings.collection_name,
+            embedding_function=hashing_embedding_function,
+        )
+        assert numpy_store.count() == 0
+        other.store("w1", "written elsewhere", {})
+        assert numpy_store.count() == 1
+        assert numpy_store.get("w1") is not None
+
+    def test_reload_waits_for_writer(self, numpy_store, tmp_path, settings):
+        """A reader never loads a half-saved collection from another writer."""
+        other = NumpyStore(
+            path=str(tmp_path),
+            collection_name=settings.collection_name,
+            embedding_function=hashing_embedding_function,
+        )
+        other.store("w1", "first", {})
+        counts = []
+        reader = threading.Thread(target=lambda: counts.append(numpy_store.count()))
+        with other._locked(fcntl.LOCK_EX):
+            reader.start()
+            reader.join(0.2)
+            assert reader.is_alive()  # Blocked on the lock, not reading.
+        reader.join()
+        assert counts == [1]
+
+    def test_writes_append_to_log(self, numpy_store, tmp_path, settings):
+        """Small writes go to the log; a reopened store replays them."""
+        numpy_store.store_many(["a", "b", "c"], ["one", "two", "three"], [{}, {}, {}])
+        numpy_store.update_metadata("a", {"n": 1})
+        numpy_store.delete("b")
+        directory = tmp_path / settings.collection_name
+        assert not (directory / "records.json").exists()
+        assert len((directory / "log.jsonl").read_bytes().splitlines()) == 5
+
+        reopened = NumpyStore(
+            path=str(tmp_path),
+            collection_name=settings.collection_name,
+            embedding_function=hashing_embedding_function,
+        )
+        assert [d and d["metadata"] for d in reopened.get_many(["a", "b", "c"])] == [
+            {"n": 1}, None, {},
+        ]
+        assert reopened.search("three", n_results=1)[0]["id"] == "c"
+
+    def test_log_compacted_into_snapshot(self, numpy_store, tmp_path, settings, monkeypatch):
+        """Once the log is long enough it is folded into a new snapshot."""
+        monkeypatch.setattr(numpy_store_module, "_MIN_COMPACT_ENTRIES", 4)
+        for i in range(4):
+            numpy_store.store(f"s{i}", f"doc {i}", {"n": i})
+        directory = tmp_path / settings.collection_name
+        assert (directory / "records.json").exists()
+        assert (directory / "log.jsonl").read_bytes() == b""
+
+        numpy_store.delete("s0")
+        reopened = NumpyStore(
+            path=str(tmp_path),
+            collection_name=settings.collection_name,
+            embedding_function=hashing_embedding_function,
+        )
+        assert reopened.count() == 3
+        assert reopened.get("s3")["metadata"] == {"n": 3}
+
+    def test_torn_log_line_ignored(self, numpy_store, tmp_path, settings):
+        """A partial line from a crashed writer is skipped, then overwritten."""
+        numpy_store.store("t1", "kept", {})
+        with open(tmp_path / settings.collection_name / "log.jsonl", "ab") as f:
+            f.write(b'{"op":"put","id":"t2"')
+        reopened = NumpyStore(
+            path=str(tmp_path),
+            collection_name=settings.collection_name,
+            embedding_function=hashing_embedding_function,
+        )
+        assert reopened.count() == 1
+        reopened.store("t3", "after crash", {})
+        assert numpy_store.get("t3")["content"] == "after crash"
+
+
+class TestEmbeddingCache:
+    """Verify repeated queries are served from the embedding cache."""
+
+    def test_repeat_query_skips_embedder(self, tmp_path, settings):
+        """The second identical search embeds nothing."""
+        calls = []
+
+        def counting_embedder(texts):
+            calls.append(list(texts))
+            return hashing_embedding_function(texts)
+
+        cache = EmbeddingCache(str(tmp_path / "cache.sqlite"), max_entries=10)
+        store = NumpyStore(
+            path=str(tmp_path),
+            collection_name=settings.collection_name,
+            embedding_function=counting_embedder,
+            embedding_cache=cache,
+        )
+        store.store("e1", "user preferences", {})
+        calls.clear()
+
+        first = store.search("user preferences", n_results=1)
+        second = store.search("user  preferences", n_results=1)
+
+        assert calls == [["user preferences"]]
+        assert first == second
+        assert store.stats()["embedding_cache"]["hits"] == 1
@@ -0,0 +1,188 @@
+"""Unit tests for the write-ahead outbox and its store decorator."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from memories.models import MemoryCreate
+from memories.services.memory_service import DuplicateMemoryError, MemoryService
+from memories.stores.outbox import Outbox, OutboxStore
+
+_META = {"project": "p", "deleted": False, "decay_policy": "stable"}
+
+
+@pytest.fixture()
+def outbox_store(tmp_path, mock_vector_store):
+    """Return an OutboxStore wrapping the mock store, batches of two."""
+    mock_vector_store.search_many.return_value = [[]]
+    return OutboxStore(
+        mock_vector_store, Outbox(str(tmp_path / "outbox.sqlite")), batch_size=2
+    )
+
+
+class TestQueueing:
+    """Verify writes are queued locally and stay readable."""
+
+    def test_store_does_not_touch_backend(self, outbox_store, mock_vector_store):
+        outbox_store.store("a", "alpha", _META)
+        mock_vector_store.store.assert_not_called()
+        mock_vector_store.store_many.assert_not_called()
+        assert outbox_store.get("a") == {"id": "a", "content": "alpha", "metadata": _META}
+
+    def test_get_many_merges_pending_and_stored(self, outbox_store, mock_vector_store):
+        outbox_store.store("a", "alpha", _META)
+        mock_vector_store.get_many.return_value = [{"id": "b"}]
+        assert outbox_store.get_many(["a", "b"]) == [outbox_store.get("a"), {"id": "b"}]
+        mock_vector_store.get_many.assert_called_with(["b"], True)
+
+    def test_search_adds_matching_pending_entries(self, outbox_store, mock_vector_store):
+        """Pending entries sharing query words are ranked by overlap, filters apply."""
+        mock_vector_store.search_many.return_value = [
+            [{"id": "s", "content": "stored", "metadata": _META, "distance": 0.4}]
+        ]
+        outbox_store.store("full", "deploy the staging cluster", _META)
+        outbox_store.store("half", "staging notes", _META)
+        outbox_store.store("other", "deploy staging", {**_META, "project": "q"})
+
+        hits = outbox_store.search("deploy staging", n_results=3, where={"project": "p"})
+        assert [h["id"] for h in hits] == ["full", "s", "half"]
+        assert hits[0]["distance"] == 0.0
+
+    def test_metadata_updates_applied_in_place(self, outbox_store, mock_vector_store):
+        outbox_store.store("a", "alpha", _META)
+        outbox_store.update_metadata_many(["a", "b"], [{"deleted": True}, {"deleted": True}])
+        assert outbox_store.get("a")["metadata"]["deleted"] is True
+        mock_vector_store.update_metadata_many.assert_called_once_with(
+            ["b"], [{"deleted": True}]
+        )
+
+    def test_delete_removes_pending(self, outbox_store):
+        outbox_store.store("a", "alpha", _META)
+        outbox_store.delete("a")
+        assert outbox_store.stats()["outbox"]["pending"] == 0
+
+
+class TestFlush:
+    """Verify draining in batches with backoff."""
+
+    def test_flush_in_batches(self, outbox_store, mock_vector_store):
+        outbox_store.store_many(["a", "b", "c"], ["1", "2", "3"], [_META] * 3)
+        assert outbox_store.flush() == {"flushed": 3, "pending": 0}
+        assert [c[0][0] for c in mock_vector_store.store_many.call_args_list] == [
+            ["a", "b"], ["c"],
+        ]
+
+    def test_failure_keeps_entries_and_backs_off(self, outbox_store, mock_vector_store):
+        mock_vector_store.store_many.side_effect = ConnectionError("down")
+        outbox_store.store("a", "alpha", _META)
+
+        result = outbox_store.flush()
+        assert result["pending"] == 1 and result["error"] == "down"
+        # The idle-loop flush waits out the backoff instead of retrying.
+        mock_vector_store.store_many.reset_mock()
+        assert outbox_store.flush_due()["flushed"] == 0
+        mock_vector_store.store_many.assert_not_called()
+
+    def test_retries_with_growing_delay(self, outbox_store, mock_vector_store):
+        mock_vector_store.store_many.side_effect = [ConnectionError, ConnectionError, None]
+        outbox_store.store("a", "alpha", _META)
+        with patch("memories.stores.outbox.time.sleep") as sleep:
+            assert outbox_store.flush(retries=2) == {"flushed": 1, "pending": 0}
+        assert [c[0][0] for c in sleep.call_args_list] == [1.0, 2.0]
+        assert outbox_store.stats()["outbox"]["failures"] == 0
+
+    def test_claimed_entries_not_flushed_twice(self, tmp_path, outbox_store):
+        """A second flusher skips entries leased by the first."""
+        outbox_store.store("a", "alpha", _META)
+        other = Outbox(str(tmp_path / "outbox.sqlite"))
+        assert [d["id"] for d in other.claim(10)] == ["a"]
+        assert outbox_store.flush() == {"flushed": 0, "pending": 1}
+
+    def test_update_during_flush_is_written(self, outbox_store, mock_vector_store):
+        """A patch landing between claim and settle reaches the store."""
+        outbox_store.store("a", "alpha", _META)
+        mock_vector_store.store_many.side_effect = (
+            lambda *_: outbox_store.update_metadata("a", {"deleted": True})
+        )
+        assert outbox_store.flush() == {"flushed": 1, "pending": 0}
+        mock_vector_store.update_metadata_many.assert_called_once_with(
+            ["a"], [{**_META, "deleted": True}]
+        )
+
+    def test_delete_during_flush_is_not_resurrected(self, outbox_store, mock_vector_store):
+        """A hard delete of an in-flight entry removes the copy just added."""
+        outbox_store.store("a", "alpha", _META)
+        mock_vector_store.store_many.side_effect = lambda *_: outbox_store.delete("a")
+        outbox_store.flush()
+        assert mock_vector_store.delete_many.call_args_list[-1][0][0] == ["a"]
+        assert outbox_store.stats()["outbox"]["pending"] == 0
+
+    def test_retried_entry_rewrites_metadata(self, outbox_store, mock_vector_store):
+        """An entry patched after a failed flush has its metadata rewritten."""
+        mock_vector_store.store_many.side_effect = [ConnectionError("down"), None]
+        outbox_store.store("a", "alpha", _META)
+        outbox_store.flush()
+        outbox_store.update_metadata("a", {"deleted": True})
+        assert outbox_store.flush() == {"flushed": 1, "pending": 0}
+        mock_vector_store.update_metadata_many.assert_called_once_with(
+            ["a"], [{**_META, "deleted": True}]
+        )
+
+    def test_connects_lazily(self, tmp_path, mock_vector_store):
+        """Creates work while the store is unreachable; a flush connects later."""
+        connect = MagicMock(side_effect=[ConnectionError("down"), mock_vector_store])
+        outbox_store = OutboxStore(
+            None, Outbox(str(tmp_path / "outbox.sqlite")), connect=connect
+        )
+        outbox_store.store("a", "alpha", _META)
+        assert outbox_store.get("a")["content"] == "alpha"
+        connect.assert_not_called()
+
+        assert outbox_store.flush()["error"] == "down"
+        assert outbox_store.flush() == {"flushed": 1, "pending": 0}
+        assert connect.call_count == 2
+
+
+class TestServiceFlush:
+    """Verify MemoryService.flush_outbox."""
+
+    def test_without_outbox_is_noop(self, memory_service):
+        assert memory_service.flush_outbox() == {"flushed": 0, "pending": 0}
+
+    def test_create_then_flush(self, outbox_store, mock_vector_store, settings):
+        service = MemoryService(store=outbox_store, settings=settings)
+        created = service.create_memory(MemoryCreate(content="queued"))
+        assert service.get_memory(created.id).content == "queued"
+        assert service.flush_outbox() == {"flushed": 1, "pending": 0}
+        assert mock_vector_store.store_many.call_args[0][0] == [created.id]
+
+
+class TestServiceDuplicates:
+    """Verify duplicate checks behind an outbox never force a connect."""
+
+    def _service(self, tmp_path, settings, connect):
+        settings = settings.model_copy(update={"duplicate_policy": "reject"})
+        store = OutboxStore(None, Outbox(str(tmp_path / "outbox.sqlite")), connect=connect)
+        return MemoryService(store=store, settings=settings)
+
+    def test_pending_copy_caught_while_store_down(self, tmp_path, settings):
+        connect = MagicMock(side_effect=ConnectionError("down"))
+        service = self._service(tmp_path, settings, connect)
+        service.create_memory(MemoryCreate(content="same"))
+        with pytest.raises(DuplicateMemoryError):
+            service.create_memory(MemoryCreate(content="same"))
+        with pytest.raises(DuplicateMemoryError):
+            list(service.create_memories([MemoryCreate(content="same")]))
+        service.create_memory(MemoryCreate(content="same", project="other"))
+        connect.assert_not_called()
+
+    def test_stored_copy_checked_once_connected(self, tmp_path, settings, mock_vector_store):
+        service = self._service(tmp_path, settings, lambda: mock_vector_store)
+        service.create_memory(MemoryCreate(content="first"))
+        mock_vector_store.get_page.assert_not_called()
+
+        service.flush_outbox()
+        stored = {"id": "s", "content": "second", "metadata": {}}
+        mock_vector_store.get_page.return_value = ([stored], None)
+        with pytest.raises(DuplicateMemoryError):
+            service.create_memory(MemoryCreate(content="second"))
@@ -0,0 +1,68 @@
+"""Unit tests for the --profile timing spans."""
+
+import pytest
+
+from memories import profiling
+from memories.models import MemoryCreate
+
+
+@pytest.fixture(autouse=True)
+def no_active_profile():
+    """Never leak a started profile into other tests."""
+    profiling.stop()
+    yield
+    profiling.stop()
+
+
+class TestSpans:
+    """Verify spans are free when disabled and recorded when started."""
+
+    def test_disabled_span_is_shared_noop(self):
+        assert profiling.span("a") is profiling.span("b")
+        assert profiling.stop() is None
+
+    def test_timed_passes_through_when_disabled(self):
+        double = profiling.timed("double")(lambda x: x * 2)
+        assert double(3) == 6
+
+    def test_counts_and_nesting(self):
+        profile = profiling.start()
+        for _ in range(2):
+            with profiling.span("outer"):
+                with profiling.span("inner"):
+                    pass
+        assert profiling.stop() is profile
+
+        spans = profile.as_dict()["spans"]
+        assert [spans["outer"]["count"], spans["inner"]["count"]] == [2, 2]
+        assert spans["outer"]["total_ms"] >= spans["inner"]["total_ms"]
+
+    def test_start_keeps_active_profile(self):
+        """The client's profile (with the import span) survives the CLI's start()."""
+        assert profiling.start() is profiling.start()
+
+    def test_openmetrics_lines(self):
+        profile = profiling.start()
+        profile.command = "search"
+        profile.add("chromadb.query", 0.25)
+        profiling.stop()
+
+        lines = profile.to_openmetrics(timestamp=100.0).splitlines()
+        assert lines[0].startswith('memories_profile_total_seconds{command="search"} ')
+        assert lines[1:] == [
+            'memories_profile_span_seconds{command="search",span="chromadb.query"} '
+            "0.250000 100.000",
+            'memories_profile_span_calls{command="search",span="chromadb.query"} 1 100.000',
+        ]
+
+
+class TestServiceSpans:
+    """Verify MemoryService phases show up in a profile."""
+
+    def test_search_phases(self, memory_service, mock_vector_store):
+        mock_vector_store.search.return_value = []
+        profile = profiling.start()
+        memory_service.search_memories("query")
+        memory_service.create_memory(MemoryCreate(content="x"))
+        profiling.stop()
+        assert {"service.search", "service.results", "service.create"} <= set(profile.spans)
@@ -0,0 +1,97 @@
+"""Unit tests for the shared search-result cache."""
+
+import time
+
+from memories.services.result_cache import ResultCache, result_cache_key
+
+_HIT = [{"id": "a", "content": "A", "metadata": {"n": 1}, "distance": 0.25}]
+
+
+def _cache(tmp_path, ttl: float = 60, max_entries: int = 100) -> ResultCache:
+    return ResultCache(str(tmp_path / "results.sqlite"), ttl_seconds=ttl, max_entries=max_entries)
+
+
+class TestGeneration:
+    """Verify entries are only served for the generation they were stored at."""
+
+    def test_hit_at_same_generation(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put_many(["k"], [_HIT], cache.generation())
+        assert cache.get_many(["k", "other"], cache.generation()) == [_HIT, None]
+
+    def test_bump_invalidates(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put_many(["k"], [_HIT], cache.generation())
+        cache.bump()
+        assert cache.get_many(["k"], cache.generation()) == [None]
+
+    def test_racing_write_never_served(self, tmp_path):
+        """Results computed before a bump are stored but not returned."""
+        cache = _cache(tmp_path)
+        generation = cache.generation()
+        cache.bump()
+        cache.put_many(["k"], [_HIT], generation)
+        assert cache.get_many(["k"], cache.generation()) == [None]
+
+    def test_shared_between_instances(self, tmp_path):
+        """A bump in one process invalidates entries seen by another."""
+        writer, reader = _cache(tmp_path), _cache(tmp_path)
+        reader.put_many(["k"], [_HIT], reader.generation())
+        writer.bump()
+        assert reader.get_many(["k"], reader.generation()) == [None]
+
+
+class TestWrites:
+    """Verify lookups stay read-only and buffered counts are written later."""
+
+    def test_wal_mode(self, tmp_path):
+        cache = _cache(tmp_path)
+        assert cache._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_lookups_do_not_write(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put_many(["k"], [_HIT], cache.generation())
+        before = cache._db.total_changes
+        for _ in range(5):
+            cache.get_many(["k", "other"], cache.generation())
+        assert cache._db.total_changes == before
+
+        cache.flush()
+        assert cache._db.total_changes > before
+        stats = _cache(tmp_path).stats()
+        assert (stats["hits"], stats["misses"]) == (5, 5)
+
+    def test_counts_flushed_when_collected(self, tmp_path):
+        """Buffered counts reach the file when the cache goes away."""
+        cache = _cache(tmp_path)
+        cache.get_many(["k"], cache.generation())
+        del cache
+        assert _cache(tmp_path).stats()["misses"] == 1
+
+
+class TestExpiry:
+    """Verify TTL and size bounds."""
+
+    def test_ttl_expires_entries(self, tmp_path):
+        cache = _cache(tmp_path, ttl=0.05)
+        cache.put_many(["k"], [_HIT], cache.generation())
+        time.sleep(0.1)
+        assert cache.get_many(["k"], cache.generation()) == [None]
+
+    def test_oldest_evicted_beyond_max(self, tmp_path):
+        cache = _cache(tmp_path, max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put_many([key], [_HIT], cache.generation())
+        assert cache.stats()["entries"] == 2
+        assert cache.get_many(["a"], cache.generation()) == [None]
+
+
+class TestKey:
+    """Verify cache keys distinguish every search input."""
+
+    def test_filters_and_bucket_change_key(self):
+        base = result_cache_key("q", {"agent": "a"}, 10, 0.3)
+        assert base == result_cache_key("q", {"agent": "a"}, 10, 0.3)
+        assert base != result_cache_key("q", {"agent": "b"}, 10, 0.3)
+        assert base != result_cache_key("q", {"agent": "a"}, 5, 0.3)
+        assert base != result_cache_key("q", {"agent": "a"}, 10, 0.25)
@@ -0,0 +1,209 @@
+"""VectorStore contract tests, run against every backend.
+
+The ``vector_store`` fixture yields the NumPy store and the ChromaDB
+adapter in turn (the latter needs a running ChromaDB instance and is
+marked ``integration``).  Backend-specific behaviour lives in
+``test_numpy_store.py`` and ``test_chromadb_adapter.py``.
+"""
+
+
+class TestStoreAndGet:
+    """Verify round-trip persistence of documents."""
+
+    def test_store_get_round_trip(self, vector_store):
+        """A stored document can be retrieved with matching content and metadata."""
+        meta = {"agent": "bot", "type": "fact"}
+        vector_store.store("id-1", "the sky is blue", meta)
+
+        result = vector_store.get("id-1")
+        assert result is not None
+        assert result["id"] == "id-1"
+        assert result["content"] == "the sky is blue"
+        assert result["metadata"]["agent"] == "bot"
+        assert result["metadata"]["type"] == "fact"
+
+    def test_get_missing_returns_none(self, vector_store):
+        """Getting a non-existent ID returns None."""
+        assert vector_store.get("no-such-id") is None
+
+    def test_get_many_aligned_with_ids(self, vector_store):
+        """get_many returns one entry per ID, None where missing."""
+        vector_store.store_many(["a", "b"], ["one", "two"], [{"n": 1}, {"n": 2}])
+        docs = vector_store.get_many(["b", "missing", "a"])
+        assert [d and d["id"] for d in docs] == ["b", None, "a"]
+
+    def test_store_many_round_trip(self, vector_store):
+        """A batch stored in one call is fully retrievable and searchable."""
+        vector_store.store_many(
+            ["b1", "b2", "b3"],
+            ["red apples", "green pears", "yellow bananas"],
+            [{"n": 1}, {"n": 2}, {"n": 3}],
+        )
+        assert vector_store.count() == 3
+        assert vector_store.get("b2")["content"] == "green pears"
+        assert vector_store.search("pears", n_results=1)[0]["id"] == "b2"
+
+    def test_store_keeps_existing_id(self, vector_store):
+        """Storing an ID again leaves the first document untouched."""
+        vector_store.store("k1", "original", {"n": 1})
+        vector_store.store("k1", "replacement", {"n": 2})
+        assert vector_store.count() == 1
+        assert vector_store.get("k1")["content"] == "original"
+
+
+class TestSearch:
+    """Verify similarity search and metadata filtering."""
+
+    def test_search_returns_results_by_relevance(self, vector_store):
+        """Searching returns results ordered by relevance to the query."""
+        vector_store.store("s1", "Python is a programming language", {"tag": "a"})
+        vector_store.store("s2", "The weather is nice today", {"tag": "a"})
+        vector_store.store("s3", "JavaScript runs in the browser", {"tag": "a"})
+
+        results = vector_store.search("programming languages", n_results=3)
+        assert len(results) == 3
+        # The programming-related docs should rank higher than weather.
+        assert results[0]["id"] in ("s1", "s3")
+        distances = [r["distance"] for r in results]
+        assert distances == sorted(distances)
+
+    def test_search_many_groups_per_query(self, vector_store):
+        """One batched call returns a result list per query, in order."""
+        vector_store.store("m1", "cats purr", {"tag": "a"})
+        vector_store.store("m2", "dogs bark", {"tag": "a"})
+
+        grouped = vector_store.search_many(["dogs", "cats"], n_results=1)
+        assert [[r["id"] for r in g] for g in grouped] == [["m2"], ["m1"]]
+
+    def test_search_with_where_filter(self, vector_store):
+        """Only documents matching the where filter are returned."""
+        vector_store.store("f1", "apples are fruits", {"category": "food"})
+        vector_store.store("f2", "cars are vehicles", {"category": "transport"})
+
+        results = vector_store.search("fruits", n_results=10, where={"category": "food"})
+        assert [r["id"] for r in results] == ["f1"]
+
+    def test_search_with_compound_and_filter(self, vector_store):
+        """Multiple where conditions must all match."""
+        vector_store.store("c1", "doc one", {"agent": "a", "project": "x"})
+        vector_store.store("c2", "doc two", {"agent": "a", "project": "y"})
+        vector_store.store("c3", "doc three", {"agent": "b", "project": "x"})
+
+        results = vector_store.search(
+            "doc", n_results=10, where={"agent": "a", "project": "x"},
+        )
+        assert [r["id"] for r in results] == ["c1"]
+
+    def test_limit_caps_results(self, vector_store):
+        """Only the top n_results are returned."""
+        for i in range(10):
+            vector_store.store(f"l{i}", f"note number {i}", {"n": i})
+        assert len(vector_store.search("note", n_results=4)) == 4
+
+    def test_reads_without_content(self, vector_store):
+        """include_content=False blanks the text but keeps id and metadata."""
+        vector_store.store("p1", "a long document body", {"tag": "a"})
+
+        doc = vector_store.get("p1", include_content=False)
+        assert doc == {"id": "p1", "content": "", "metadata": {"tag": "a"}}
+        hit = vector_store.search("document", n_results=1, include_content=False)[0]
+        assert hit["content"] == "" and hit["metadata"] == {"tag": "a"}
+        assert "distance" in hit
+        page, _ = vector_store.get_page(include_content=False, include_embeddings=True)
+        assert page[0]["content"] == "" and page[0]["embedding"]
+        assert vector_store.get("p1")["content"] == "a long document body"
+
+
+class TestUpdateMetadata:
+    """Verify metadata updates are partial (merge, not replace)."""
+
+    def test_update_single_key(self, vector_store):
+        """Updating one metadata key does not affect other keys."""
+        vector_store.store("u1", "update test", {"key_a": "original", "key_b": "keep"})
+        vector_store.update_metadata("u1", {"key_a": "changed"})
+
+        result = vector_store.get("u1")
+        assert result["metadata"]["key_a"] == "changed"
+        assert result["metadata"]["key_b"] == "keep"
+
+    def test_update_metadata_many(self, vector_store):
+        """Each document receives its own metadata patch."""
+        vector_store.store_many(["x", "y"], ["one", "two"], [{"n": 0}, {"n": 0}])
+        vector_store.update_metadata_many(["x", "y"], [{"n": 1}, {"n": 2}])
+        assert vector_store.get("x")["metadata"]["n"] == 1
+        assert vector_store.get("y")["metadata"]["n"] == 2
+
+
+class TestPaging:
+    """Verify offset-cursor paging."""
+
+    def test_get_page_walks_all_matches(self, vector_store):
+        """Pages follow storage order and the last cursor is None."""
+        for i in range(5):
+            vector_store.store(f"g{i}", f"doc {i}", {"keep": i != 2})
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = vector_store.get_page(where={"keep": True}, limit=2, cursor=cursor)
+            seen.extend(doc["id"] for doc in page)
+            if cursor is None:
+                break
+        assert seen == ["g0", "g1", "g3", "g4"]
+
+    def test_get_page_with_embeddings(self, vector_store):
+        """Embeddings come back as float lists tagged with the model id."""
+        vector_store.store("e1", "embedded doc", {"n": 1})
+        (doc,), _ = vector_store.get_page(limit=5, include_embeddings=True)
+        assert len(doc["embedding"]) > 0
+        assert all(isinstance(x, float) for x in doc["embedding"])
+        assert doc["embedding_model"] == vector_store.embedding_model()
+        (plain,), _ = vector_store.get_page(limit=5)
+        assert "embedding" not in plain
+
+
+class TestUpsert:
+    """Verify upsert replaces rows in place."""
+
+    def test_replaces_existing_row(self, vector_store):
+        """Content and the given metadata keys are replaced; no duplicate row."""
+        vector_store.store("u1", "old text", {"a": 1})
+        vector_store.upsert_many(["u1", "u2"], ["new text", "other"], [{"a": 3}, {"a": 4}])
+        assert vector_store.count() == 2
+        assert vector_store.get("u1") == {"id": "u1", "content": "new text", "metadata": {"a": 3}}
+
+
+class TestDelete:
+    """Verify permanent document deletion."""
+
+    def test_delete_makes_get_return_none(self, vector_store):
+        """After deletion, get returns None for that ID."""
+        vector_store.store("d1", "to be deleted", {"a": "b"})
+        vector_store.delete("d1")
+        assert vector_store.get("d1") is None
+
+    def test_delete_many(self, vector_store):
+        """Several rows are removed in one call; unknown IDs are ignored."""
+        vector_store.store_many(["a", "b", "c"], ["one", "two", "three"], [{"n": 1}] * 3)
+        vector_store.delete_many(["a", "c", "missing"])
+        assert vector_store.count() == 1
+        assert vector_store.search("two", n_results=5)[0]["id"] == "b"
+
+
+class TestHeartbeat:
+    """Verify the health check."""
+
+    def test_heartbeat_returns_true(self, vector_store):
+        """A usable store responds to heartbeat."""
+        assert vector_store.heartbeat() is True
+
+
+class TestCount:
+    """Verify document counting."""
+
+    def test_count_matches_stored_documents(self, vector_store):
+        """Count reflects the number of stored documents."""
+        assert vector_store.count() == 0
+        vector_store.store("n1", "first", {"x": "1"})
+        vector_store.store("n2", "second", {"x": "2"})
+        vector_store.store("n3", "third", {"x": "3"})
+        assert vector_store.count() == 3